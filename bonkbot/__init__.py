@@ -1,3 +1,3 @@
-from . import core, pson, types, utils
+from . import core, pson, simulation, tools, types, utils
 
-__all__ = ['core', 'pson', 'types', 'utils']
+__all__ = ['core', 'pson', 'simulation', 'tools', 'types', 'utils']
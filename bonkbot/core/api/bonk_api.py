@@ -1,7 +1,7 @@
 import asyncio
 import re
 from asyncio import AbstractEventLoop
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from aiohttp import ClientSession
 
@@ -13,10 +13,12 @@ from ...types.room import RoomInfo
 from ...types.room.room_join_params import RoomJoinParams
 from ...types.server import ServerList
 from ...utils.api import parse_nullable_number
-from ..bot.bot_data import BotData
 from .endpoints import Endpoints
 from .socket_events import PROTOCOL_VERSION
 
+if TYPE_CHECKING:
+    from ..bot.bot_data import BotData
+
 
 class BonkAPI:
     def __init__(
@@ -61,6 +63,9 @@ class BonkAPI:
         response_data = await response.json()
         if response_data['r'] == 'fail':
             return ErrorType.from_string(response_data['e'])
+        # Imported here, the bot package imports this module.
+        from ..bot.bot_data import BotData
+
         return BotData.from_login_response(response_data)
 
     async def fetch_data_with_token(
@@ -77,6 +82,9 @@ class BonkAPI:
         response_data = await response.json()
         if response_data['r'] == 'fail':
             return ErrorType.from_string(response_data['e'])
+        # Imported here, the bot package imports this module.
+        from ..bot.bot_data import BotData
+
         return BotData.from_login_response(response_data)
 
     async def fetch_room_data(
@@ -6,6 +6,7 @@ if TYPE_CHECKING:
     from ...types.map.bonkmap import BonkMap
     from ...types.player_move import PlayerMove
     from ...types.room.game_settings import GameSettings
+    from ...types.room.initial_state import InitialState
     from ...types.room.room_action import RoomAction
     from ..room.player import Player
     from ..room.room import Room
@@ -134,7 +135,7 @@ class BotEvents:
         self,
         room: Room,
         unix_time: int,
-        initial_state: dict,
+        initial_state: InitialState,
         game_settings: GameSettings,
     ) -> None:
         pass
@@ -211,11 +212,30 @@ class BotEvents:
         room: Room,
         frame: int,
         random: List[int],
-        initial_state: dict,
+        initial_state: InitialState,
         state_id: int,
     ) -> None:
         pass
 
+    async def on_desync(
+        self,
+        room: Room,
+        player: Player,
+        frame: int,
+        last_synced_frame: int | None,
+    ) -> None:
+        """
+        Called when the game state checksum of a player differs from `room.checksums`.
+        Only frames recorded in `room.checksums` are compared, see `Room.checksums`.
+
+        :param room: The Room instance.
+        :param player: The Player whose state differs.
+        :param frame: The earliest frame known to differ.
+        :param last_synced_frame: The last frame both states agreed on, if any.
+        :return: None
+        """
+        pass
+
     async def on_player_tabbed(self, room: Room, player: Player) -> None:
         pass
 
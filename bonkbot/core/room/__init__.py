@@ -1,5 +1,6 @@
+from .frameclock import FrameClock
 from .player import Player
 from .room import Room
 from .timesyncer import TimeSyncer
 
-__all__ = ['Player', 'Room', 'TimeSyncer']
+__all__ = ['FrameClock', 'Player', 'Room', 'TimeSyncer']
@@ -0,0 +1,123 @@
+import math
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from ...simulation.simulation import TICK_RATE
+
+if TYPE_CHECKING:
+    from .timesyncer import TimeSyncer
+
+
+class FrameClock:
+    """
+    Server frame of the running game, estimated locally.
+
+    The clock is anchored to the server time of a known frame: the start of the game from
+    `on_game_start`, or the frame count a joining player receives with `INFORM_IN_GAME`.
+    From there it advances with :func:`time.monotonic`, so system clock changes do not
+    move it. Each time the `TimeSyncer` offset is resynchronized, :meth:`resync` measures
+    how far the monotonic estimate has drifted from the synced server time and slews the
+    difference in at ``slew_rate`` milliseconds per millisecond, so frames never repeat
+    or run backwards.
+    """
+
+    def __init__(
+        self,
+        timesyncer: Optional['TimeSyncer'] = None,
+        *,
+        tick_rate: int = TICK_RATE,
+        slew_rate: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.timesyncer: Optional[TimeSyncer] = timesyncer
+        self.tick_rate: int = tick_rate
+        self.slew_rate: float = slew_rate
+        self._clock: Callable[[], float] = clock
+        # Server time in milliseconds that `_start_frame` began at.
+        self._start: Optional[float] = None
+        self._start_frame: int = 0
+        self._base_time: float = 0.0
+        self._base_clock: float = 0.0
+        self._correction: float = 0.0
+        self._correction_clock: float = 0.0
+        self._drift: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._start is not None
+
+    @property
+    def frame_duration(self) -> float:
+        """Milliseconds per frame."""
+        return 1000 / self.tick_rate
+
+    @property
+    def drift(self) -> float:
+        """Milliseconds the synced server time was ahead of the clock at the last resync."""
+        return self._drift
+
+    def start(self, unix_time: float) -> None:
+        """Starts counting from frame 0 at ``unix_time``, server milliseconds."""
+        self._anchor()
+        self._start = unix_time
+        self._start_frame = 0
+
+    def set_frame(self, frame: int) -> None:
+        """Sets the current frame, for games joined while running."""
+        self._anchor()
+        self._start = self._base_time
+        self._start_frame = frame
+
+    def stop(self) -> None:
+        self._start = None
+
+    def resync(self) -> None:
+        """Measures the drift from the `TimeSyncer`, call after its offset changes."""
+        now = self._clock()
+        self._correction = self._applied_correction(now)
+        self._correction_clock = now
+        self._drift = self._synced_time() - self._monotonic_time(now)
+
+    def server_time(self) -> float:
+        """Drift corrected server time in milliseconds."""
+        now = self._clock()
+        return self._monotonic_time(now) + self._applied_correction(now)
+
+    def estimate(self) -> float:
+        """Current frame including the part of it already elapsed."""
+        if self._start is None:
+            raise ValueError('Frame clock is not running')
+        elapsed = self.server_time() - self._start
+        return self._start_frame + elapsed * self.tick_rate / 1000
+
+    @property
+    def frame(self) -> int:
+        return math.floor(self.estimate())
+
+    def time_to_next_frame(self) -> float:
+        """Seconds until the next frame starts."""
+        estimate = self.estimate()
+        return (math.floor(estimate) + 1 - estimate) / self.tick_rate
+
+    def _synced_time(self) -> float:
+        if self.timesyncer is None:
+            return time.time() * 1000
+        return self.timesyncer.now()
+
+    def _anchor(self) -> None:
+        self._base_time = self._synced_time()
+        self._base_clock = self._clock()
+        self._correction = 0.0
+        self._correction_clock = self._base_clock
+        self._drift = 0.0
+
+    def _monotonic_time(self, now: float) -> float:
+        return self._base_time + (now - self._base_clock) * 1000
+
+    def _applied_correction(self, now: float) -> float:
+        # The correction moves towards the measured drift at a bounded rate.
+        step = (now - self._correction_clock) * 1000 * self.slew_rate
+        remaining = self._drift - self._correction
+        if abs(remaining) <= step:
+            return self._drift
+        return self._correction + math.copysign(step, remaining)
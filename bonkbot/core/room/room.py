@@ -11,17 +11,18 @@ from peerjs_py import Peer, PeerOptions
 from peerjs_py.dataconnection.DataConnection import DataConnection
 from socketio import AsyncClient
 
-from ...pson import ByteBuffer, StaticPair
+from ...simulation.checksum import ChecksumHistory
 from ...types.avatar import Avatar
 from ...types.errors import ApiError, ErrorType
 from ...types.errors.error_type import CRITICAL_API_ERRORS
+from ...types.errors.map_validation_error import MapValidationError
 from ...types.errors.room_already_connected import RoomAlreadyConnected
 from ...types.errors.room_not_connected import RoomNotConnected
 from ...types.input import Inputs
 from ...types.map.bonkmap import DEFAULT_MAP, BonkMap
 from ...types.mode import Mode
 from ...types.player_move import PlayerMove
-from ...types.room.initial_state import PSON_KEYS
+from ...types.room.initial_state import InitialState
 from ...types.room.room_action import RoomAction
 from ...types.room.room_create_params import RoomCreateParams
 from ...types.room.room_data import RoomData
@@ -29,6 +30,7 @@ from ...types.team import Team, TeamState
 from ..api.endpoints import Endpoints
 from ..api.socket_events import PROTOCOL_VERSION, SocketEvents
 from ..bot.bot_event_handler import BotEventHandler
+from .frameclock import FrameClock
 from .player import Player
 from .timesyncer import TimeSyncer
 
@@ -40,6 +42,9 @@ if TYPE_CHECKING:
     from ...types.server import ServerList
     from ..bot.bot import BonkBot
 
+# Joins that land within this window are answered with a single settings serialization.
+LOBBY_INFORM_WINDOW = 0.05
+
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/network/NetworkEngine.ts
 class Room:
@@ -69,8 +74,21 @@ class Room:
         self._sequence: int = 0
         self._peer_event: Optional[Event] = None
         self._use_peers: bool = True
+        self._lobby_inform_ids: List[int] = []
+        self._lobby_inform_task: Optional[Task] = None
         self.timesyncer: Union[TimeSyncer, None] = None
+        self.frame_clock: FrameClock = FrameClock()
+        """Current frame of the running game, see :meth:`move`."""
         self.game_started: bool = False
+        self.checksums: ChecksumHistory = ChecksumHistory()
+        """
+        Game state checksums by frame, answered to and compared with desync probes.
+
+        The room does not simulate the game, so nothing is recorded here automatically.
+        Whoever steps a `Simulation` or `Replay` for the game records each frame, e.g.
+        ``room.checksums.record(state.frame, checksum.update(state))`` with a
+        `StateChecksum`. Cleared when a game starts.
+        """
 
         # Sugar
         self._connect_event: Optional[Event] = None
@@ -224,12 +242,15 @@ class Room:
             raise RoomNotConnected(self)
         if self.timesyncer:
             await self.timesyncer.stop()
+        self.frame_clock.stop()
         if self._p2p_revert_task and not self._p2p_revert_task.done():
             self._p2p_revert_task.cancel()
             try:
                 await self._p2p_revert_task
             except asyncio.CancelledError:
                 pass
+        if self._lobby_inform_task and not self._lobby_inform_task.done():
+            self._lobby_inform_task.cancel()
         if self._socket.connected:
             await self._socket.disconnect()
         if self.peer_ready and self._use_peers:
@@ -248,6 +269,8 @@ class Room:
         self._peer_event = None
         self._connections = []
         self._sequence = 0
+        self._lobby_inform_ids = []
+        self._lobby_inform_task = None
         self._bot.remove_room(
             self
         )  # TODO: fix with adding listener on_room_disconnect in BonkBot
@@ -383,6 +406,7 @@ class Room:
             repeat=5,
             socket=self._socket,
         )
+        self.frame_clock.timesyncer = self.timesyncer
 
         @self.timesyncer.event_emitter.on('sync')
         async def on_sync(state: str) -> None:
@@ -403,6 +427,7 @@ class Room:
 
         @self.timesyncer.event_emitter.on('change')
         async def on_change(offset: int) -> None:
+            self.frame_clock.resync()
             if self._time_offset is not None:
                 await self._bot.dispatch(
                     BotEventHandler.on_time_offset_change,
@@ -547,6 +572,8 @@ class Room:
         self.socket.on(SocketEvents.Incoming.INFORM_IN_GAME, self.__inform_in_game)
         self.socket.on(SocketEvents.Incoming.ROOM_ID_OBTAIN, self.__on_room_id_obtain)
         self.socket.on(SocketEvents.Incoming.PLAYER_TABBED, self.__on_player_tabbed)
+        self.socket.on(SocketEvents.Incoming.DESYNC_REQ, self.__on_desync_req)
+        self.socket.on(SocketEvents.Incoming.DESYNC_RES, self.__on_desync_res)
         self.socket.on(
             SocketEvents.Incoming.ROOM_NAME_CHANGE,
             self.__on_room_name_change,
@@ -656,15 +683,37 @@ class Room:
         self._room_data.players.append(player)
         self._room_data.game_settings.balance.append(0)
         if not self.game_started:
-            await self._socket.emit(
-                SocketEvents.Outgoing.INFORM_IN_LOBBY,
-                {
-                    'sid': player_id,
-                    'gs': self._room_data.game_settings.to_json(),
-                },
-            )
+            self._queue_lobby_inform(player_id)
         await self._bot.dispatch(BotEventHandler.on_player_join, self, player)
 
+    def _queue_lobby_inform(self, player_id: int) -> None:
+        self._lobby_inform_ids.append(player_id)
+        if self._lobby_inform_task is None or self._lobby_inform_task.done():
+            self._lobby_inform_task = asyncio.create_task(self._flush_lobby_informs())
+
+    async def _flush_lobby_informs(self) -> None:
+        await asyncio.sleep(LOBBY_INFORM_WINDOW)
+        # Players that join while this task emits are queued without a new task, so keep
+        # going until the queue stays empty.
+        while self._lobby_inform_ids:
+            if self.game_started or self._socket is None:
+                # Players in a running game are informed with INFORM_IN_GAME instead.
+                self._lobby_inform_ids = []
+                return
+            player_ids = self._lobby_inform_ids
+            self._lobby_inform_ids = []
+            game_settings = self._room_data.game_settings.to_json()
+            for player_id in player_ids:
+                if self.game_started or self._socket is None:
+                    return
+                player = self.get_player_by_id(player_id)
+                if player is None or player.is_left:
+                    continue
+                await self._socket.emit(
+                    SocketEvents.Outgoing.INFORM_IN_LOBBY,
+                    {'sid': player_id, 'gs': game_settings},
+                )
+
     async def __on_player_left(self, player_id: int, timestamp: int) -> None:
         player = self.get_player_by_id(player_id)
         player.is_left = True
@@ -776,10 +825,12 @@ class Room:
         )
 
     async def __on_game_end(self) -> None:
+        self.frame_clock.stop()
         await self.bot.dispatch(BotEventHandler.on_game_end, self)
         for player in self.players:
             player.moves.clear()
             player.prev_inputs.clear()
+        self.checksums.clear()
 
     async def __on_game_start(
         self,
@@ -790,14 +841,10 @@ class Room:
         for player in self.players:
             player.moves.clear()
             player.prev_inputs.clear()
+        self.checksums.clear()
+        self.frame_clock.start(unix_time)
         self._room_data.game_settings.from_json(game_settings)
-        pair = StaticPair(PSON_KEYS)
-        buffer = ByteBuffer().from_base64(
-            encoded_state,
-            lz_encoded=True,
-            case_encoded=True,
-        )
-        initial_state = pair.decode(buffer)
+        initial_state = InitialState.from_base64(encoded_state)
         await self.bot.dispatch(
             BotEventHandler.on_game_start,
             self,
@@ -957,13 +1004,8 @@ class Room:
         for input_data in inputs:
             player = self.get_player_by_id(input_data['p'])
             player.prev_inputs[input_data['f']] = Inputs.from_flags(input_data['i'])
-        pair = StaticPair(PSON_KEYS)
-        buffer = ByteBuffer().from_base64(
-            encoded_state,
-            case_encoded=True,
-            lz_encoded=True,
-        )
-        initial_state = pair.decode(buffer)
+        self.frame_clock.set_frame(data['fc'])
+        initial_state = InitialState.from_base64(encoded_state)
         await self._bot.dispatch(
             BotEventHandler.on_inform_in_game,
             self,
@@ -984,6 +1026,45 @@ class Room:
         player.tabbed = state
         await self._bot.dispatch(BotEventHandler.on_player_tabbed, self, player)
 
+    # Desync probes carry {'f': frame, 'h': checksum}, a convention of this library. Bonk
+    # clients do not send them, so anything else is ignored.
+    async def __on_desync_req(self, player_id: int, data: dict) -> None:
+        if not isinstance(data, dict):
+            return
+        frame = data.get('f')
+        checksum = self.checksums.get(frame) if isinstance(frame, int) else None
+        if checksum is not None:
+            await self.socket.emit(
+                SocketEvents.Outgoing.DESYNC_RES,
+                {'f': frame, 'h': checksum},
+            )
+        await self.__check_desync(player_id, data)
+
+    async def __on_desync_res(self, player_id: int, data: dict) -> None:
+        await self.__check_desync(player_id, data)
+
+    async def __check_desync(self, player_id: int, data: dict) -> None:
+        if not isinstance(data, dict):
+            return
+        frame = data.get('f')
+        checksum = data.get('h')
+        player = self.get_player_by_id(player_id)
+        if (
+            not isinstance(frame, int)
+            or not isinstance(checksum, int)
+            or player is None
+        ):
+            return
+        diverged = self.checksums.check(player_id, frame, checksum)
+        if diverged is not None:
+            await self._bot.dispatch(
+                BotEventHandler.on_desync,
+                self,
+                player,
+                diverged,
+                self.checksums.last_synced(player_id),
+            )
+
     async def __on_room_name_change(self, new_room_name: str) -> None:
         self._room_data.name = new_room_name
         await self._bot.dispatch(BotEventHandler.on_room_name_change, self)
@@ -1083,11 +1164,22 @@ class Room:
             raise ApiError(ErrorType.NOT_HOST)
         await self.socket.emit(SocketEvents.Outgoing.SET_TEAM_LOCK, {'teamLock': state})
 
-    async def set_map(self, bonk_map: 'BonkMap') -> None:
+    async def set_map(self, bonk_map: 'BonkMap', *, validate: bool = True) -> None:
         if not self.is_host:
             raise ApiError(ErrorType.NOT_HOST)
-        self._room_data.game_settings.map = bonk_map
+        if validate:
+            issues = bonk_map.validate()
+            if issues:
+                raise MapValidationError(issues)
+        current_map = self._room_data.game_settings.map
         encoded_map = bonk_map.encode_to_database()
+        self._room_data.game_settings.map = bonk_map
+        if (
+            bonk_map is not current_map
+            and encoded_map == current_map.encode_to_database()
+        ):
+            # The room already has this exact map, nothing to send.
+            return
         await self._socket.emit(SocketEvents.Outgoing.MAP_ADD, {'m': encoded_map})
 
     async def suggest_map(self, bonk_map: 'BonkMap') -> None:
@@ -1144,10 +1236,13 @@ class Room:
 
     async def move(
         self,
-        frame: int,
+        frame: Optional[int],
         inputs: 'Inputs',
         sequence: Optional[int] = None,
     ) -> None:
+        """Sends ``inputs`` for ``frame``, ``None`` for the current `frame_clock` frame."""
+        if frame is None:
+            frame = self.frame_clock.frame
         if sequence is None:
             sequence = self._sequence
             self._sequence += 1
@@ -1169,18 +1264,31 @@ class Room:
         )
         self.bot_player.moves[self._sequence] = move
 
-    async def start_game(self, initial_state: dict) -> None:
+    async def desync_test(self, frame: Optional[int] = None) -> None:
+        """Asks the room to compare the checksum of ``frame`` (default the latest recorded)."""
+        if frame is None:
+            if self.checksums.latest is None:
+                raise ValueError('No checksum recorded')
+            frame = self.checksums.latest[0]
+        checksum = self.checksums.get(frame)
+        if checksum is None:
+            raise ValueError(f'No checksum recorded for frame {frame}')
+        await self.socket.emit(
+            SocketEvents.Outgoing.DESYNC_TEST,
+            {'f': frame, 'h': checksum},
+        )
+
+    async def start_game(self, initial_state: Union['InitialState', dict]) -> None:
         # NOTE: This exists in Bonk, also, without it, Bonk will crash
         self.game_started = True
-        initial_state['rc'] = 0
-        pair = StaticPair(PSON_KEYS)
-        buffer = pair.encode(initial_state)
-        encoded_is = buffer.to_base64(
-            lz_encode=True,
-            case_encode=True,
-        )
-        gs = self.game_settings.to_json()
-        gs['map'] = self.game_settings.map.encode_to_database()
+        if isinstance(initial_state, dict):
+            initial_state = InitialState.from_json(initial_state)
+        initial_state.round_count = 0
+        encoded_is = initial_state.to_base64()
+        gs = {
+            **self.game_settings.to_json(),
+            'map': self.game_settings.map.encode_to_database(),
+        }
         await self.socket.emit(
             SocketEvents.Outgoing.GAME_START,
             {
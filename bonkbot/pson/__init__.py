@@ -1,9 +1,12 @@
 from .bytebuffer import ByteBuffer
+from .schema import BinaryField, BinarySchema
 from .staticpair import StaticPair
 from .type import JsonValue, PSONType
 from .utils import zigzag_decode32, zigzag_decode64, zigzag_encode32, zigzag_encode64
 
 __all__ = [
+    'BinaryField',
+    'BinarySchema',
     'ByteBuffer',
     'JsonValue',
     'PSONType',
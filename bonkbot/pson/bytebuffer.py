@@ -5,11 +5,35 @@ from urllib.parse import quote, unquote
 
 from lzstring import LZString
 
+try:
+    # Private helpers of lzstring 1.0.4, the public decoder rebuilds its reverse alphabet
+    # for every character it decodes. Without them the public decoder is used.
+    from lzstring import _decompress, keyStrUriSafe
+except ImportError:
+    _decompress = None
+    _URI_SAFE_VALUES = {}
+else:
+    _URI_SAFE_VALUES = {
+        character: value for value, character in enumerate(keyStrUriSafe)
+    }
+
+
+def _lz_decompress(data: str) -> Optional[str]:
+    if not data:
+        return None
+    if _decompress is None:
+        return LZString.decompressFromEncodedURIComponent(data)
+    data = data.replace(' ', '+')
+    values = _URI_SAFE_VALUES
+    return _decompress(len(data), 32, lambda index: values[data[index]])
+
 
 class ByteBuffer:
     __slots__ = ('bytes', 'endian', 'offset')
 
-    def __init__(self, _bytes: Optional[bytearray] = None, *, big_endian: bool = True) -> None:
+    def __init__(
+        self, _bytes: Optional[bytearray] = None, *, big_endian: bool = True
+    ) -> None:
         if _bytes is None:
             self.bytes: bytearray = bytearray()
         else:
@@ -43,6 +67,13 @@ class ByteBuffer:
         self.offset += count
         return data
 
+    def skip(self, count: int) -> None:
+        if self.offset + count > self.size:
+            raise EOFError(
+                f'Not enough bytes to skip. Requested {count}, available {self.size - self.offset}',
+            )
+        self.offset += count
+
     def from_base64(
         self,
         data: str,
@@ -57,7 +88,7 @@ class ByteBuffer:
             head, tail = data[:101], data[101:]
             data = head.swapcase() + tail
         if lz_encoded:
-            data = LZString.decompressFromEncodedURIComponent(data)
+            data = _lz_decompress(data)
             if data is None:
                 raise ValueError('LZString decompression failed')
         self.bytes += base64.b64decode(data)
@@ -0,0 +1,558 @@
+import struct
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from attrs import define, evolve, field
+
+if TYPE_CHECKING:
+    from .bytebuffer import ByteBuffer
+
+Step = Callable[[Any, 'ByteBuffer'], None]
+Reader = Callable[['ByteBuffer', Optional[int]], Any]
+Writer = Callable[[Any, 'ByteBuffer', Optional[int]], None]
+
+_MISSING = object()
+# Decoding bypasses `on_setattr` hooks, see `BinarySchema.on_decoded`.
+_set = object.__setattr__
+# Kinds with a fixed size, consecutive fixed fields are packed with one struct call.
+_FIXED_KINDS = frozenset(('scalar', 'point', 'const'))
+_FLOAT_FORMATS = frozenset(('e', 'f', 'd'))
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class BinaryField:
+    """
+    One entry of a :class:`BinarySchema`, normally created with the helpers below
+    (:func:`scalar`, :func:`utf`, :func:`nested`, ...).
+
+    ``attr`` may be a dotted path (``'shape.friction'``). The field is present in versions
+    ``since..until`` (both inclusive, ``None`` is unbounded). ``none`` is a wire sentinel
+    that means ``None`` in both directions, ``default`` is only written in place of ``None``.
+    ``to_wire``/``from_wire`` convert enums and flags.
+    """
+
+    kind: str
+    attr: str = field(default='')
+    fmt: str = field(default='')
+    since: Optional[int] = field(default=None)
+    until: Optional[int] = field(default=None)
+    none: Any = field(default=_MISSING)
+    default: Any = field(default=_MISSING)
+    to_wire: Optional[Callable[[Any], Any]] = field(default=None)
+    from_wire: Optional[Callable[[Any], Any]] = field(default=None)
+    count: str = field(default='h')
+    schema: Optional['BinarySchema'] = field(default=None)
+    fields: Tuple['BinaryField', ...] = field(default=())
+    when: Optional[Callable[[Any], bool]] = field(default=None)
+    write: Optional[Writer] = field(default=None)
+    read: Optional[Reader] = field(default=None)
+
+    def present_in(self, version: Optional[int]) -> bool:
+        # `None` is the latest version, fields that were dropped at some point are skipped.
+        if version is None:
+            return self.until is None
+        if self.since is not None and version < self.since:
+            return False
+        return self.until is None or version <= self.until
+
+
+def scalar(
+    attr: str,
+    fmt: str,
+    *,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    none: Any = _MISSING,
+    default: Any = _MISSING,
+    to_wire: Optional[Callable[[Any], Any]] = None,
+    from_wire: Optional[Callable[[Any], Any]] = None,
+) -> 'BinaryField':
+    """A single value in ``struct`` format ``fmt`` (``'?'``, ``'h'``, ``'I'``, ``'d'`` ...)."""
+    return BinaryField(
+        kind='scalar',
+        attr=attr,
+        fmt=fmt,
+        since=since,
+        until=until,
+        none=none,
+        default=default,
+        to_wire=to_wire,
+        from_wire=from_wire,
+    )
+
+
+def point(
+    attr: str,
+    fmt: str = 'd',
+    *,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """An ``(x, y)`` tuple stored as two values."""
+    return BinaryField(kind='point', attr=attr, fmt=fmt, since=since, until=until)
+
+
+def const(
+    fmt: str, value: Any, *, since: Optional[int] = None, until: Optional[int] = None
+) -> 'BinaryField':
+    """A fixed value that is written as is and skipped when reading."""
+    return BinaryField(kind='const', fmt=fmt, default=value, since=since, until=until)
+
+
+def utf(
+    attr: str,
+    *,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    to_wire: Optional[Callable[[Any], str]] = None,
+    from_wire: Optional[Callable[[str], Any]] = None,
+) -> 'BinaryField':
+    """A string with an uint16 byte length, see ``ByteBuffer.write_utf``."""
+    return BinaryField(
+        kind='utf',
+        attr=attr,
+        since=since,
+        until=until,
+        to_wire=to_wire,
+        from_wire=from_wire,
+    )
+
+
+def array(
+    attr: str,
+    fmt: str,
+    *,
+    count: str = 'h',
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """A list of numbers prefixed with its length in format ``count``."""
+    return BinaryField(
+        kind='array', attr=attr, fmt=fmt, count=count, since=since, until=until
+    )
+
+
+def point_array(
+    attr: str,
+    fmt: str = 'd',
+    *,
+    count: str = 'h',
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """A list of ``(x, y)`` tuples prefixed with its length in format ``count``."""
+    return BinaryField(
+        kind='point_array', attr=attr, fmt=fmt, count=count, since=since, until=until
+    )
+
+
+def utf_array(
+    attr: str,
+    *,
+    count: str = 'h',
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """A list of strings prefixed with its length in format ``count``."""
+    return BinaryField(
+        kind='utf_array', attr=attr, count=count, since=since, until=until
+    )
+
+
+def nested(
+    attr: str,
+    schema: 'BinarySchema',
+    *,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """The fields of ``schema`` applied to the object in ``attr``, inlined into the parent."""
+    return BinaryField(
+        kind='nested', attr=attr, schema=schema, since=since, until=until
+    )
+
+
+def group(
+    *fields: 'BinaryField',
+    when: Callable[[Any], bool],
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """
+    Fields that are only present when ``when(obj)`` is true. The condition is checked after
+    the fields before the group were read, so it may depend on them.
+    """
+    return BinaryField(kind='group', fields=fields, when=when, since=since, until=until)
+
+
+def custom(
+    attr: str,
+    write: Writer,
+    read: Reader,
+    *,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> 'BinaryField':
+    """Escape hatch for values with their own codec, ``write(value, buffer, version)`` and
+    ``read(buffer, version) -> value``."""
+    return BinaryField(
+        kind='custom', attr=attr, write=write, read=read, since=since, until=until
+    )
+
+
+def _join(prefix: str, attr: str) -> str:
+    return f'{prefix}.{attr}' if prefix and attr else prefix or attr
+
+
+def _nested_condition(
+    prefix: str, condition: Callable[[Any], bool]
+) -> Callable[[Any], bool]:
+    owner = attrgetter(prefix)
+    return lambda obj: condition(owner(obj))
+
+
+def _flatten(
+    fields: Tuple['BinaryField', ...], version: Optional[int], prefix: str = ''
+) -> List['BinaryField']:
+    """Drops fields missing in ``version`` and inlines nested schemas with prefixed paths."""
+    flat = []
+    for binary_field in fields:
+        if not binary_field.present_in(version):
+            continue
+        if binary_field.kind == 'nested':
+            flat.extend(
+                _flatten(
+                    binary_field.schema.fields,
+                    version,
+                    _join(prefix, binary_field.attr),
+                ),
+            )
+        elif binary_field.kind == 'group':
+            when = binary_field.when
+            if prefix:
+                # Conditions are written against the nested object, not the root.
+                when = _nested_condition(prefix, when)
+
+            flat.append(
+                evolve(
+                    binary_field,
+                    fields=tuple(_flatten(binary_field.fields, version, prefix)),
+                    when=when,
+                ),
+            )
+        elif prefix:
+            flat.append(evolve(binary_field, attr=_join(prefix, binary_field.attr)))
+        else:
+            flat.append(binary_field)
+    return flat
+
+
+def _getter(binary_field: 'BinaryField') -> Callable[[Any], Any]:
+    get = attrgetter(binary_field.attr)
+    to_wire = binary_field.to_wire
+    none = binary_field.none
+    if none is _MISSING:
+        none = binary_field.default
+    if to_wire is None and none is _MISSING:
+        return get
+
+    def getter(obj: Any) -> Any:
+        value = get(obj)
+        if value is None and none is not _MISSING:
+            return none
+        return to_wire(value) if to_wire is not None else value
+
+    return getter
+
+
+def _setter(binary_field: 'BinaryField') -> Callable[[Any, Any], None]:
+    parent, _, name = binary_field.attr.rpartition('.')
+    get_parent = attrgetter(parent) if parent else None
+    from_wire = binary_field.from_wire
+    none = binary_field.none
+    if from_wire is None and none is _MISSING:
+        if get_parent is None:
+            return lambda obj, value: _set(obj, name, value)
+        return lambda obj, value: _set(get_parent(obj), name, value)
+
+    def setter(obj: Any, value: Any) -> None:
+        if none is not _MISSING and value == none:
+            value = None
+        elif from_wire is not None:
+            value = from_wire(value)
+        _set(get_parent(obj) if get_parent is not None else obj, name, value)
+
+    return setter
+
+
+def _take(buffer: 'ByteBuffer', size: int) -> int:
+    """Advances ``buffer`` by ``size`` bytes and returns the old offset."""
+    offset = buffer.offset
+    if offset + size > len(buffer.bytes):
+        raise EOFError(
+            f'Not enough bytes to read. Requested {size}, available {len(buffer.bytes) - offset}',
+        )
+    buffer.offset = offset + size
+    return offset
+
+
+def _read_utf(buffer: 'ByteBuffer', endian: str) -> str:
+    (length,) = struct.unpack_from(endian + 'H', buffer.bytes, _take(buffer, 2))
+    offset = _take(buffer, length)
+    return buffer.bytes[offset : offset + length].decode('utf-8')
+
+
+def _utf_bytes(value: str, endian: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack(endian + 'H', len(data)) + data
+
+
+def _canonical(get: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda obj: get(obj) + 0.0
+
+
+def _fixed_steps(
+    fields: List['BinaryField'], endian: str, canonical: bool
+) -> Tuple['Step', 'Step']:
+    packer = struct.Struct(
+        endian
+        + ''.join(
+            item.fmt * 2 if item.kind == 'point' else item.fmt for item in fields
+        ),
+    )
+    getters = []
+    setters = []
+    for binary_field in fields:
+        index = len(getters)
+        if binary_field.kind == 'const':
+            getters.append(lambda obj, value=binary_field.default: value)
+        elif binary_field.kind == 'point':
+            get = attrgetter(binary_field.attr)
+            getters.append(lambda obj, get=get: get(obj)[0])
+            getters.append(lambda obj, get=get: get(obj)[1])
+            setters.append((_setter(binary_field), slice(index, index + 2)))
+        else:
+            getters.append(_getter(binary_field))
+            setters.append((_setter(binary_field), index))
+        if canonical and binary_field.fmt in _FLOAT_FORMATS:
+            getters[index:] = [_canonical(get) for get in getters[index:]]
+    pack = packer.pack
+    unpack_from = packer.unpack_from
+    size = packer.size
+
+    def encode(obj: Any, buffer: 'ByteBuffer') -> None:
+        buffer.write_bytes(pack(*[get(obj) for get in getters]))
+
+    def decode(obj: Any, buffer: 'ByteBuffer') -> None:
+        values = unpack_from(buffer.bytes, _take(buffer, size))
+        for setter, index in setters:
+            setter(obj, values[index])
+
+    return encode, decode
+
+
+def _variable_steps(
+    binary_field: 'BinaryField', endian: str, version: Optional[int], canonical: bool
+) -> Tuple['Step', 'Step']:
+    kind = binary_field.kind
+    get = attrgetter(binary_field.attr)
+    set_value = _setter(
+        BinaryField(
+            kind='scalar', attr=binary_field.attr, from_wire=binary_field.from_wire
+        )
+    )
+    count_format = endian + binary_field.count
+    count_size = struct.calcsize(count_format)
+
+    if kind == 'utf':
+        get = _getter(binary_field)
+
+        def encode(obj: Any, buffer: 'ByteBuffer') -> None:
+            buffer.write_bytes(_utf_bytes(get(obj), endian))
+
+        def decode(obj: Any, buffer: 'ByteBuffer') -> None:
+            set_value(obj, _read_utf(buffer, endian))
+
+    elif kind in ('array', 'point_array'):
+        width = 2 if kind == 'point_array' else 1
+        fmt = binary_field.fmt
+        canonical = canonical and fmt in _FLOAT_FORMATS
+
+        def encode(obj: Any, buffer: 'ByteBuffer') -> None:
+            items = get(obj)
+            values = (
+                [value for item in items for value in item] if width == 2 else items
+            )
+            if canonical:
+                values = [value + 0.0 for value in values]
+            buffer.write_bytes(
+                struct.pack(
+                    f'{endian}{binary_field.count}{len(values)}{fmt}',
+                    len(items),
+                    *values,
+                ),
+            )
+
+        def decode(obj: Any, buffer: 'ByteBuffer') -> None:
+            (length,) = struct.unpack_from(
+                count_format, buffer.bytes, _take(buffer, count_size)
+            )
+            item_format = f'{endian}{length * width}{fmt}'
+            values = struct.unpack_from(
+                item_format, buffer.bytes, _take(buffer, struct.calcsize(item_format))
+            )
+            if width == 2:
+                set_value(obj, list(zip(values[::2], values[1::2])))
+            else:
+                set_value(obj, list(values))
+
+    elif kind == 'utf_array':
+
+        def encode(obj: Any, buffer: 'ByteBuffer') -> None:
+            items = get(obj)
+            buffer.write_bytes(
+                b''.join(
+                    [struct.pack(count_format, len(items))]
+                    + [_utf_bytes(item, endian) for item in items],
+                ),
+            )
+
+        def decode(obj: Any, buffer: 'ByteBuffer') -> None:
+            (length,) = struct.unpack_from(
+                count_format, buffer.bytes, _take(buffer, count_size)
+            )
+            set_value(obj, [_read_utf(buffer, endian) for _ in range(length)])
+
+    elif kind == 'custom':
+        write = binary_field.write
+        read = binary_field.read
+
+        def encode(obj: Any, buffer: 'ByteBuffer') -> None:
+            write(get(obj), buffer, version)
+
+        def decode(obj: Any, buffer: 'ByteBuffer') -> None:
+            set_value(obj, read(buffer, version))
+
+    else:
+        raise ValueError(f'Unknown binary field kind: {kind}')
+    return encode, decode
+
+
+def _compile(
+    fields: List['BinaryField'], endian: str, version: Optional[int], canonical: bool
+) -> Tuple[List['Step'], List['Step']]:
+    encoders = []
+    decoders = []
+    pending = []
+
+    def flush() -> None:
+        if pending:
+            encode, decode = _fixed_steps(pending, endian, canonical)
+            encoders.append(encode)
+            decoders.append(decode)
+            pending.clear()
+
+    for binary_field in fields:
+        if binary_field.kind in _FIXED_KINDS:
+            pending.append(binary_field)
+            continue
+        flush()
+        if binary_field.kind == 'group':
+            group_encoders, group_decoders = _compile(
+                list(binary_field.fields), endian, version, canonical
+            )
+            encoders.append(_conditional(binary_field.when, group_encoders))
+            decoders.append(_conditional(binary_field.when, group_decoders))
+        else:
+            encode, decode = _variable_steps(binary_field, endian, version, canonical)
+            encoders.append(encode)
+            decoders.append(decode)
+    flush()
+    return encoders, decoders
+
+
+def _conditional(when: Callable[[Any], bool], steps: List['Step']) -> 'Step':
+    def step(obj: Any, buffer: 'ByteBuffer') -> None:
+        if when(obj):
+            for inner in steps:
+                inner(obj, buffer)
+
+    return step
+
+
+class BinarySchema:
+    """
+    Declarative layout of a ``to_buffer``/``from_buffer`` pair.
+
+    For every version and byte order the fields are compiled once into a list of steps,
+    runs of fixed-size fields become a single ``struct`` pack/unpack. ``endian=None`` uses
+    the byte order of the buffer. With ``version_attr`` the first field holds the layout
+    version of the record itself (like ``Settings.version``), otherwise the version is
+    passed in by the caller and ``None`` means the latest layout.
+
+    Decoded values are stored without running ``on_setattr`` hooks, ``on_decoded(obj)`` is
+    called once afterwards instead (tracked map objects adopt their children there).
+
+    Buffers with a true ``canonical`` attribute (the map fingerprint hasher) get floats
+    written with ``-0.0`` replaced by ``0.0``.
+    """
+
+    __slots__ = ('_plans', 'endian', 'fields', 'on_decoded', 'version_attr')
+
+    def __init__(
+        self,
+        *fields: 'BinaryField',
+        endian: Optional[str] = None,
+        version_attr: Optional[str] = None,
+        on_decoded: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        self.fields = fields
+        self.endian = endian
+        self.version_attr = version_attr
+        self.on_decoded = on_decoded
+        self._plans: Dict[tuple, Tuple[List[Step], List[Step]]] = {}
+
+    def _plan(
+        self,
+        version: Optional[int],
+        endian: str,
+        *,
+        header: bool = False,
+        canonical: bool = False,
+    ) -> Tuple[List['Step'], List['Step']]:
+        key = (version, endian, header, canonical)
+        plan = self._plans.get(key)
+        if plan is None:
+            fields = self.fields
+            if self.version_attr is not None:
+                fields = fields[:1] if header else fields[1:]
+            plan = self._plans[key] = _compile(
+                _flatten(fields, version), endian, version, canonical
+            )
+        return plan
+
+    def encode(
+        self, obj: Any, buffer: 'ByteBuffer', version: Optional[int] = None
+    ) -> None:
+        endian = self.endian or buffer.endian
+        canonical = getattr(buffer, 'canonical', False)
+        if self.version_attr is not None:
+            version = getattr(obj, self.version_attr)
+            for step in self._plan(None, endian, header=True, canonical=canonical)[0]:
+                step(obj, buffer)
+        for step in self._plan(version, endian, canonical=canonical)[0]:
+            step(obj, buffer)
+
+    def decode(
+        self, obj: Any, buffer: 'ByteBuffer', version: Optional[int] = None
+    ) -> Any:
+        endian = self.endian or buffer.endian
+        if self.version_attr is not None:
+            for step in self._plan(None, endian, header=True)[1]:
+                step(obj, buffer)
+            version = getattr(obj, self.version_attr)
+        for step in self._plan(version, endian)[1]:
+            step(obj, buffer)
+        if self.on_decoded is not None:
+            self.on_decoded(obj)
+        return obj
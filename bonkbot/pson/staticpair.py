@@ -164,3 +164,29 @@ class StaticPair:
         if code == PSONType.BINARY:
             return buffer.read_bytes(buffer.read_varint32())
         return None
+
+    def skip_value(self, buffer: 'ByteBuffer') -> None:
+        """Moves ``buffer`` past one value without decoding it."""
+        code = buffer.read_uint8()
+        if code <= PSONType.EMPTY_STRING:
+            # Small integers, null, booleans and empty values are a single byte.
+            return
+        if code == PSONType.OBJECT:
+            for _ in range(buffer.read_varint32()):
+                self.skip_value(buffer)
+                self.skip_value(buffer)
+        elif code == PSONType.ARRAY:
+            for _ in range(buffer.read_varint32()):
+                self.skip_value(buffer)
+        elif code == PSONType.INTEGER or code == PSONType.STRING_GET:
+            buffer.read_varint32()
+        elif code == PSONType.LONG:
+            buffer.read_varint64()
+        elif code == PSONType.FLOAT:
+            buffer.skip(4)
+        elif code == PSONType.DOUBLE:
+            buffer.skip(8)
+        elif code == PSONType.STRING:
+            buffer.skip(buffer.read_uint8())
+        elif code == PSONType.BINARY:
+            buffer.skip(buffer.read_varint32())
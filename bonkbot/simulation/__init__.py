@@ -0,0 +1,31 @@
+from .broadphase import StaticGrid, SweepAndPrune
+from .checksum import ChecksumHistory, StateChecksum, state_checksum
+from .collision import circle_circle, circle_convex, convex_normals
+from .prediction import PlayerPrediction, PlayerPredictor, latency_frames
+from .replay import Replay
+from .rollout import RolloutPool, RolloutResult, rollout
+from .simulation import TICK_RATE, TIME_STEP, Collider, Simulation
+from .state import SimulationState
+
+__all__ = [
+    'TICK_RATE',
+    'TIME_STEP',
+    'ChecksumHistory',
+    'Collider',
+    'PlayerPrediction',
+    'PlayerPredictor',
+    'Replay',
+    'RolloutPool',
+    'RolloutResult',
+    'Simulation',
+    'SimulationState',
+    'StateChecksum',
+    'StaticGrid',
+    'SweepAndPrune',
+    'circle_circle',
+    'circle_convex',
+    'convex_normals',
+    'latency_frames',
+    'rollout',
+    'state_checksum',
+]
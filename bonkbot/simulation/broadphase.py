@@ -0,0 +1,303 @@
+import bisect
+import math
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+AABB = Tuple[float, float, float, float]
+
+# Cells per axis of a `StaticGrid` at most, bounds a box's cost to the grid size.
+_MAX_CELLS = 64
+# Edges are encoded as ``proxy * 2 + is_max``, so at equal values a box starts before
+# another one ends and touching boxes overlap, like the inclusive AABB tests elsewhere.
+_MIN = 0
+_MAX = 1
+
+
+class SweepAndPrune:
+    """
+    Incremental sweep-and-prune broadphase over axis-aligned boxes.
+
+    Box edges are kept sorted on both axes. Moving a box re-sorts its edges in place
+    with insertion sort, which between two frames of a simulation is a handful of swaps,
+    and every swap of a start edge with an end edge updates the set of overlapping
+    pairs, so :meth:`neighbours` and :meth:`pairs` cost nothing to query.
+
+    Proxies have Box2D style ``category`` and ``mask`` bits, a pair is only tracked when
+    each proxy's category is in the other's mask (static geometry never pairs with
+    itself, for example). :meth:`query` finds the proxies overlapping any box.
+    """
+
+    __slots__ = (
+        '_boxes',
+        '_categories',
+        '_edges',
+        '_free',
+        '_masks',
+        '_max_width',
+        '_neighbours',
+        '_positions',
+        '_values',
+    )
+
+    def __init__(self) -> None:
+        self._boxes: List[Optional[AABB]] = []
+        self._categories: List[int] = []
+        self._masks: List[int] = []
+        self._neighbours: Dict[int, Set[int]] = {}
+        self._free: List[int] = []
+        # Widest box ever added, so queries know how far before them boxes can start.
+        self._max_width = 0.0
+        # Per axis: edge values and encoded edges in sorted order, and the position of
+        # every encoded edge in them.
+        self._values: Tuple[List[float], List[float]] = ([], [])
+        self._edges: Tuple[List[int], List[int]] = ([], [])
+        self._positions: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+
+    def __len__(self) -> int:
+        return len(self._neighbours)
+
+    def __contains__(self, proxy: int) -> bool:
+        return proxy in self._neighbours
+
+    def copy(self) -> 'SweepAndPrune':
+        other = SweepAndPrune.__new__(SweepAndPrune)
+        other._boxes = self._boxes.copy()
+        other._categories = self._categories.copy()
+        other._masks = self._masks.copy()
+        other._neighbours = {
+            proxy: neighbours.copy() for proxy, neighbours in self._neighbours.items()
+        }
+        other._free = self._free.copy()
+        other._max_width = self._max_width
+        other._values = (self._values[0].copy(), self._values[1].copy())
+        other._edges = (self._edges[0].copy(), self._edges[1].copy())
+        other._positions = (self._positions[0].copy(), self._positions[1].copy())
+        return other
+
+    def add(self, box: 'AABB', category: int = 1, mask: int = -1) -> int:
+        """Adds a box and returns its proxy id, ids of removed proxies are reused."""
+        if self._free:
+            proxy = self._free.pop()
+            self._boxes[proxy] = box
+            self._categories[proxy] = category
+            self._masks[proxy] = mask
+        else:
+            proxy = len(self._boxes)
+            self._boxes.append(box)
+            self._categories.append(category)
+            self._masks.append(mask)
+        self._max_width = max(self._max_width, box[2] - box[0])
+        self._neighbours[proxy] = set()
+        for axis in (0, 1):
+            values, edges, positions = (
+                self._values[axis],
+                self._edges[axis],
+                self._positions[axis],
+            )
+            # Both edges start past the end and sort down into place, which reports
+            # every overlap on the way.
+            for kind in (_MAX, _MIN):
+                edge = proxy * 2 + kind
+                positions[edge] = len(edges)
+                values.append(box[axis + 2 * kind])
+                edges.append(edge)
+                self._sift_down(axis, positions[edge])
+        return proxy
+
+    def update(self, proxy: int, box: 'AABB') -> None:
+        """Moves the box of ``proxy``, updating the pairs it is part of."""
+        old = self._boxes[proxy]
+        self._boxes[proxy] = box
+        self._max_width = max(self._max_width, box[2] - box[0])
+        for axis in (0, 1):
+            values, positions = self._values[axis], self._positions[axis]
+            # Grow before shrinking, so the edges of the box never cross each other.
+            order = (_MIN, _MAX) if box[axis] < old[axis] else (_MAX, _MIN)
+            for kind in order:
+                position = positions[proxy * 2 + kind]
+                value = box[axis + 2 * kind]
+                values[position] = value
+                if value < old[axis + 2 * kind]:
+                    self._sift_down(axis, position)
+                else:
+                    self._sift_up(axis, position)
+
+    def remove(self, proxy: int) -> None:
+        for axis in (0, 1):
+            values, edges, positions = (
+                self._values[axis],
+                self._edges[axis],
+                self._positions[axis],
+            )
+            for kind in (_MAX, _MIN):
+                position = positions.pop(proxy * 2 + kind)
+                del values[position]
+                del edges[position]
+                for later in range(position, len(edges)):
+                    positions[edges[later]] = later
+        for other in self._neighbours.pop(proxy):
+            self._neighbours[other].discard(proxy)
+        self._boxes[proxy] = None
+        self._free.append(proxy)
+
+    def box(self, proxy: int) -> 'AABB':
+        box = self._boxes[proxy]
+        if box is None:
+            raise KeyError(proxy)
+        return box
+
+    def neighbours(self, proxy: int) -> Set[int]:
+        """Proxies overlapping ``proxy``, a live view that must not be modified."""
+        return self._neighbours[proxy]
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        """Every overlapping pair once, as ``(lower id, higher id)``."""
+        for proxy, neighbours in self._neighbours.items():
+            for other in neighbours:
+                if proxy < other:
+                    yield proxy, other
+
+    def query(self, box: 'AABB') -> List[int]:
+        """Proxies overlapping ``box``, in ascending id order."""
+        min_x, min_y, max_x, max_y = box
+        values, edges = self._values[0], self._edges[0]
+        boxes = self._boxes
+        found = []
+        # Overlapping boxes start between the end of the query and the widest box width
+        # before its start.
+        first = bisect.bisect_left(values, min_x - self._max_width)
+        for position in range(first, bisect.bisect_right(values, max_x)):
+            edge = edges[position]
+            if edge & 1:
+                continue
+            other = boxes[edge >> 1]
+            if other[2] >= min_x and other[1] <= max_y and other[3] >= min_y:
+                found.append(edge >> 1)
+        found.sort()
+        return found
+
+    def _pairs_with(self, proxy: int, other: int) -> bool:
+        return bool(
+            self._categories[proxy] & self._masks[other]
+            and self._categories[other] & self._masks[proxy]
+        )
+
+    def _overlap(self, proxy: int, other: int) -> bool:
+        box, other_box = self._boxes[proxy], self._boxes[other]
+        return (
+            box[0] <= other_box[2]
+            and other_box[0] <= box[2]
+            and box[1] <= other_box[3]
+            and other_box[1] <= box[3]
+        )
+
+    def _swap(self, axis: int, lower: int) -> None:
+        """Swaps the edges at ``lower`` and ``lower + 1`` and updates the pairs."""
+        values, edges, positions = (
+            self._values[axis],
+            self._edges[axis],
+            self._positions[axis],
+        )
+        # `first` was below `second` and moves above it.
+        first, second = edges[lower], edges[lower + 1]
+        values[lower], values[lower + 1] = values[lower + 1], values[lower]
+        edges[lower], edges[lower + 1] = second, first
+        positions[first] = lower + 1
+        positions[second] = lower
+        proxy, other = first >> 1, second >> 1
+        if proxy == other or (first & 1) == (second & 1):
+            return
+        if first & 1:
+            # An end moved past a start: the boxes may have started to overlap.
+            if self._pairs_with(proxy, other) and self._overlap(proxy, other):
+                self._neighbours[proxy].add(other)
+                self._neighbours[other].add(proxy)
+        else:
+            # A start moved past an end: they no longer overlap on this axis.
+            self._neighbours[proxy].discard(other)
+            self._neighbours[other].discard(proxy)
+
+    def _sift_down(self, axis: int, position: int) -> None:
+        values, edges = self._values[axis], self._edges[axis]
+        while position > 0 and (values[position - 1], edges[position - 1] & 1) > (
+            values[position],
+            edges[position] & 1,
+        ):
+            self._swap(axis, position - 1)
+            position -= 1
+
+    def _sift_up(self, axis: int, position: int) -> None:
+        values, edges = self._values[axis], self._edges[axis]
+        last = len(edges) - 1
+        while position < last and (values[position], edges[position] & 1) > (
+            values[position + 1],
+            edges[position + 1] & 1,
+        ):
+            self._swap(axis, position)
+            position += 1
+
+
+class StaticGrid:
+    """
+    Uniform grid over boxes that never move, built once and shared by every reader.
+
+    Each cell lists the boxes overlapping it in ascending id order, so :meth:`at` is one
+    lookup and keeps the order boxes were given in. The grid covers ``bounds``: points
+    and boxes outside it fall into the border cells, which also hold every box reaching
+    past the border, so lookups stay exact anywhere. Cells are at least ``cell_size``
+    wide, the grid is coarsened to at most 64 cells per axis.
+    """
+
+    __slots__ = ('_cells', '_columns', '_rows', '_scale_x', '_scale_y', '_x', '_y')
+
+    def __init__(
+        self, boxes: Sequence['AABB'], bounds: 'AABB', cell_size: float
+    ) -> None:
+        min_x, min_y, max_x, max_y = bounds
+        width, height = max(max_x - min_x, cell_size), max(max_y - min_y, cell_size)
+        self._x, self._y = min_x, min_y
+        self._columns = min(max(int(width / cell_size), 1), _MAX_CELLS)
+        self._rows = min(max(int(height / cell_size), 1), _MAX_CELLS)
+        # Cells per unit, lookups multiply instead of dividing.
+        self._scale_x = self._columns / width
+        self._scale_y = self._rows / height
+        cells: List[List[int]] = [[] for _ in range(self._columns * self._rows)]
+        for index, box in enumerate(boxes):
+            first_column, first_row = self._cell(box[0], box[1])
+            last_column, last_row = self._cell(box[2], box[3])
+            for row in range(first_row, last_row + 1):
+                start = row * self._columns
+                for column in range(first_column, last_column + 1):
+                    cells[start + column].append(index)
+        self._cells: List[Tuple[int, ...]] = [tuple(cell) for cell in cells]
+
+    def at(self, x: float, y: float) -> Tuple[int, ...]:
+        """
+        Boxes that may contain ``(x, y)``, in ascending id order. Every box containing the
+        point is listed, boxes that only share its cell too.
+        """
+        # Inlined `_cell`, this runs for every disc on every frame.
+        column = (x - self._x) * self._scale_x
+        row = (y - self._y) * self._scale_y
+        columns, rows = self._columns, self._rows
+        column = 0 if column < 0 else columns - 1 if column >= columns else int(column)
+        row = 0 if row < 0 else rows - 1 if row >= rows else int(row)
+        return self._cells[row * columns + column]
+
+    def query(self, box: 'AABB') -> List[int]:
+        """Boxes whose cells overlap ``box``, a superset of the overlapping boxes, sorted."""
+        first_column, first_row = self._cell(box[0], box[1])
+        last_column, last_row = self._cell(box[2], box[3])
+        found: Set[int] = set()
+        for row in range(first_row, last_row + 1):
+            start = row * self._columns
+            for column in range(first_column, last_column + 1):
+                found.update(self._cells[start + column])
+        return sorted(found)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        column = math.floor((x - self._x) * self._scale_x)
+        row = math.floor((y - self._y) * self._scale_y)
+        return (
+            min(max(column, 0), self._columns - 1),
+            min(max(row, 0), self._rows - 1),
+        )
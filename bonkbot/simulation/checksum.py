@@ -0,0 +1,164 @@
+import struct
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .state import SimulationState
+
+_MASK = 0xFFFFFFFF
+# Tag, id and quantized values of one disc, body or capture zone.
+_DISC = struct.Struct('<Biiqqqqi')
+_BODY = struct.Struct('<Biqqqqqq')
+_CAP_ZONE = struct.Struct('<Biii')
+
+
+class StateChecksum:
+    """
+    Incremental 32-bit checksum of a :class:`SimulationState`.
+
+    Every disc, moving body and capture zone is hashed on its own (CRC-32 of its values
+    quantized to ``precision`` units) and the checksum is the sum of those hashes, so it
+    does not depend on the order entries are stored in. :meth:`update` only rehashes the
+    entries that changed since the previous call, which for a mostly resting map is a
+    small part of the state. Frames are not part of the checksum.
+    """
+
+    __slots__ = ('_entries', '_total', 'precision')
+
+    def __init__(self, precision: float = 1e-3) -> None:
+        self.precision = precision
+        self._entries: Dict[Hashable, Tuple[Tuple[int, ...], int]] = {}
+        self._total = 0
+
+    @property
+    def value(self) -> int:
+        return self._total & _MASK
+
+    def update(self, state: 'SimulationState') -> int:
+        """Brings the checksum up to date with ``state`` and returns it."""
+        scale = 1 / self.precision
+        seen = set()
+        for index, player_id in enumerate(state.player_ids):
+            values = (
+                int(state.teams[index]),
+                round(state.x[index] * scale),
+                round(state.y[index] * scale),
+                round(state.vx[index] * scale),
+                round(state.vy[index] * scale),
+                state.died_at[index],
+            )
+            self._set(('disc', player_id), values, _DISC, 1, player_id)
+            seen.add(('disc', player_id))
+        for index in range(len(state.body_x)):
+            values = (
+                round(state.body_x[index] * scale),
+                round(state.body_y[index] * scale),
+                round(state.body_angle[index] * scale),
+                round(state.body_vx[index] * scale),
+                round(state.body_vy[index] * scale),
+                round(state.body_av[index] * scale),
+            )
+            self._set(('body', index), values, _BODY, 2, index)
+            seen.add(('body', index))
+        for index, frames in enumerate(state.cap_frames):
+            values = (frames, state.captured_by[index])
+            self._set(('cap_zone', index), values, _CAP_ZONE, 3, index)
+            seen.add(('cap_zone', index))
+        if len(seen) != len(self._entries):
+            for key in [key for key in self._entries if key not in seen]:
+                self._total -= self._entries.pop(key)[1]
+        return self.value
+
+    def _set(
+        self,
+        key: Hashable,
+        values: Tuple[int, ...],
+        layout: struct.Struct,
+        tag: int,
+        entry_id: int,
+    ) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == values:
+                return
+            self._total -= entry[1]
+        digest = zlib.crc32(layout.pack(tag, entry_id, *values))
+        self._entries[key] = (values, digest)
+        self._total += digest
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._total = 0
+
+
+def state_checksum(state: 'SimulationState', precision: float = 1e-3) -> int:
+    """The :class:`StateChecksum` of a single state."""
+    return StateChecksum(precision).update(state)
+
+
+class ChecksumHistory:
+    """
+    Recent checksums by frame, and how the checksums of peers compared with them.
+
+    For every peer the history remembers the last frame both agreed on and the first
+    frame they were seen to differ on. Only the latest ``capacity`` frames are kept.
+    """
+
+    __slots__ = ('_checksums', '_diverged', '_synced', 'capacity')
+
+    def __init__(self, capacity: int = 300) -> None:
+        self.capacity = capacity
+        self._checksums: OrderedDict[int, int] = OrderedDict()
+        self._synced: Dict[int, int] = {}
+        self._diverged: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._checksums)
+
+    def record(self, frame: int, checksum: int) -> None:
+        self._checksums[frame] = checksum & _MASK
+        self._checksums.move_to_end(frame)
+        while len(self._checksums) > self.capacity:
+            self._checksums.popitem(last=False)
+
+    def get(self, frame: int) -> Optional[int]:
+        return self._checksums.get(frame)
+
+    @property
+    def latest(self) -> Optional[Tuple[int, int]]:
+        """The most recently recorded ``(frame, checksum)``."""
+        if not self._checksums:
+            return None
+        return next(reversed(self._checksums.items()))
+
+    def check(self, peer: int, frame: int, checksum: int) -> Optional[int]:
+        """
+        Compares the checksum a peer reported for ``frame`` with ours. Returns the first
+        frame known to differ if this report moved it earlier, otherwise ``None``.
+        Frames without a recorded checksum are ignored.
+        """
+
+        ours = self._checksums.get(frame)
+        if ours is None:
+            return None
+        if ours == checksum & _MASK:
+            if frame > self._synced.get(peer, -1):
+                self._synced[peer] = frame
+            return None
+        diverged = self._diverged.get(peer)
+        if diverged is not None and diverged <= frame:
+            return None
+        self._diverged[peer] = frame
+        return frame
+
+    def first_divergence(self, peer: int) -> Optional[int]:
+        return self._diverged.get(peer)
+
+    def last_synced(self, peer: int) -> Optional[int]:
+        return self._synced.get(peer)
+
+    def clear(self) -> None:
+        self._checksums.clear()
+        self._synced.clear()
+        self._diverged.clear()
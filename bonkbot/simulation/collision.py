@@ -0,0 +1,80 @@
+import math
+from typing import Optional, Sequence, Tuple
+
+Point = Tuple[float, float]
+# (normal x, normal y, depth), the normal points from the obstacle towards the circle.
+Contact = Tuple[float, float, float]
+
+
+def convex_normals(vertices: Sequence[Point]) -> Tuple[Point, ...]:
+    """Outward unit normals of a counter-clockwise convex polygon, one per edge ``i-1 -> i``."""
+    normals = []
+    for index in range(len(vertices)):
+        x1, y1 = vertices[index - 1]
+        x2, y2 = vertices[index]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        normals.append((dy / length, -dx / length) if length > 0 else (0.0, 0.0))
+    return tuple(normals)
+
+
+def circle_circle(
+    x: float,
+    y: float,
+    radius: float,
+    other_x: float,
+    other_y: float,
+    other_radius: float,
+) -> Optional['Contact']:
+    dx, dy = x - other_x, y - other_y
+    reach = radius + other_radius
+    distance_squared = dx * dx + dy * dy
+    if distance_squared >= reach * reach:
+        return None
+    distance = math.sqrt(distance_squared)
+    if distance == 0:
+        # Concentric, push straight up like Box2D does for a zero-length normal.
+        return 0.0, -1.0, reach
+    return dx / distance, dy / distance, reach - distance
+
+
+def circle_convex(
+    x: float,
+    y: float,
+    radius: float,
+    vertices: Sequence[Point],
+    normals: Sequence[Point],
+) -> Optional['Contact']:
+    """Contact of a circle with a counter-clockwise convex polygon, ``None`` if apart."""
+    # Separating axis over the edge normals, tracking the least separated edge.
+    best_index = 0
+    best_separation = -math.inf
+    for index, (normal_x, normal_y) in enumerate(normals):
+        vertex_x, vertex_y = vertices[index]
+        separation = normal_x * (x - vertex_x) + normal_y * (y - vertex_y)
+        if separation > radius:
+            return None
+        if separation > best_separation:
+            best_separation = separation
+            best_index = index
+
+    if best_separation <= 0:
+        # Centre inside the polygon, leave through the nearest edge.
+        normal_x, normal_y = normals[best_index]
+        return normal_x, normal_y, radius - best_separation
+
+    x1, y1 = vertices[best_index - 1]
+    x2, y2 = vertices[best_index]
+    edge_x, edge_y = x2 - x1, y2 - y1
+    length_squared = edge_x * edge_x + edge_y * edge_y
+    t = (
+        ((x - x1) * edge_x + (y - y1) * edge_y) / length_squared
+        if length_squared > 0
+        else 0.0
+    )
+    if 0 < t < 1:
+        normal_x, normal_y = normals[best_index]
+        return normal_x, normal_y, radius - best_separation
+    # Closest to a corner.
+    corner_x, corner_y = (x1, y1) if t <= 0 else (x2, y2)
+    return circle_circle(x, y, radius, corner_x, corner_y, 0.0)
@@ -0,0 +1,212 @@
+import math
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from attrs import define, field
+
+from .replay import Replay
+from .simulation import TICK_RATE
+
+if TYPE_CHECKING:
+    from ..core.room.frameclock import FrameClock
+    from ..core.room.player import Player
+    from ..types.player_move import PlayerMove
+    from ..types.room.initial_state import InitialState
+    from .simulation import InputsLike, Simulation
+    from .state import SimulationState
+
+Point = Tuple[float, float]
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class PlayerPrediction:
+    """Where a player is estimated to be on ``frame``, in physics units."""
+
+    player_id: int
+    frame: int
+    position: Point
+    velocity: Point
+    alive: bool
+    unseen_frames: int = field(default=0)
+    """Trailing frames the player may have sent inputs for that have not reached us yet."""
+
+
+def latency_frames(ping: float) -> int:
+    """Frames a player's inputs take to reach us, half the round trip of ``ping`` ms."""
+    return round(ping / 2 / 1000 * TICK_RATE)
+
+
+class PlayerPredictor:
+    """
+    Dead reckoning of player discs from their input timeline.
+
+    The predictor replays the inputs known so far from the last known state and lets
+    every player keep holding their latest inputs up to the frame asked for. Without an
+    explicit frame the current frame is taken from ``frame_clock`` (pass
+    `Room.frame_clock`) while it runs, otherwise it is the newest input received plus the
+    time passed since it arrived. A player's ping only decides how many of the latest
+    frames may hold inputs of theirs still in flight, see `PlayerPrediction.unseen_frames`.
+
+    Updates are incremental: a move or revert only drops the simulated frames after the
+    frame it changes, and predicting a later frame continues from the previous prediction.
+    Feed it from `on_player_move` and `on_move_revert` with :meth:`on_move`.
+    """
+
+    __slots__ = (
+        '_clock',
+        '_head',
+        '_last_input',
+        '_last_input_time',
+        'frame_clock',
+        'pings',
+        'replay',
+    )
+
+    def __init__(
+        self,
+        simulation: 'Simulation',
+        state: 'SimulationState',
+        *,
+        checkpoint_interval: int = 15,
+        frame_clock: Optional['FrameClock'] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.replay = Replay(
+            simulation,
+            state,
+            checkpoint_interval=checkpoint_interval,
+        )
+        self.pings: Dict[int, float] = {}
+        """Round trip times in milliseconds by player id, see :meth:`update_players`."""
+        self.frame_clock: Optional[FrameClock] = frame_clock
+        self._clock: Callable[[], float] = clock
+        self._last_input: Dict[int, int] = {}
+        # Newest input frame of any player and when it arrived, for when there is no clock.
+        self._last_input_time: Optional[Tuple[int, float]] = None
+        self._head: Optional[SimulationState] = None
+
+    @classmethod
+    def from_initial(
+        cls,
+        simulation: 'Simulation',
+        initial_state: Union['InitialState', dict],
+        frame: int = 0,
+        **options: Any,
+    ) -> 'PlayerPredictor':
+        """A predictor starting from a game state received on ``frame``."""
+        return cls(
+            simulation, simulation.state_from_initial(initial_state, frame), **options
+        )
+
+    @property
+    def simulation(self) -> 'Simulation':
+        return self.replay.simulation
+
+    def update_players(self, players: Iterable['Player']) -> None:
+        """Takes the current `Player.ping` of ``players``."""
+        for player in players:
+            self.pings[player.id] = player.ping
+
+    def _changed(self, player_id: int, frame: int) -> None:
+        if frame > self._last_input.get(player_id, -1):
+            self._last_input[player_id] = frame
+        if self._last_input_time is None or frame > self._last_input_time[0]:
+            self._last_input_time = (frame, self._clock())
+        if self._head is not None and self._head.frame > frame:
+            self._head = None
+
+    def set_input(self, player_id: int, frame: int, inputs: 'InputsLike') -> None:
+        self.replay.set_input(player_id, frame, inputs)
+        self._changed(player_id, frame)
+
+    def add_inputs(self, player_id: int, inputs: Mapping[int, 'InputsLike']) -> None:
+        """Records a frame -> inputs mapping, like `Player.prev_inputs`."""
+        for frame, value in inputs.items():
+            self.set_input(player_id, frame, value)
+
+    def on_move(self, player_id: int, move: 'PlayerMove') -> None:
+        """Records a move, or takes it back if it has been reverted."""
+        self.replay.add_moves(player_id, (move,))
+        self._changed(player_id, move.frame)
+
+    def latency(self, player_id: int) -> int:
+        """Frames between a player sending inputs and us receiving them."""
+        return latency_frames(self.pings.get(player_id, 0))
+
+    def unseen_frames(self, player_id: int, frame: int) -> int:
+        """
+        Trailing frames up to ``frame`` that ``player_id`` may have sent inputs for which
+        have not arrived yet: the player's latency, at most the frames since their newest
+        known input.
+        """
+
+        last_input = self._last_input.get(player_id, self.replay.start_frame)
+        return max(0, min(self.latency(player_id), frame - last_input))
+
+    def current_frame(self) -> int:
+        """
+        Estimated current frame: the frame of ``frame_clock`` while it runs, otherwise the
+        newest input received plus the frames passed since it arrived. Never before the
+        last known state.
+        """
+
+        start = self.replay.start_frame
+        if self.frame_clock is not None and self.frame_clock.running:
+            return max(self.frame_clock.frame, start)
+        if self._last_input_time is None:
+            return start
+        frame, arrived = self._last_input_time
+        elapsed = math.floor((self._clock() - arrived) * TICK_RATE)
+        return max(frame + elapsed, start)
+
+    def state_at(self, frame: int) -> 'SimulationState':
+        """A copy of the predicted state at ``frame``."""
+        return self._head_at(frame).copy()
+
+    def _head_at(self, frame: int) -> 'SimulationState':
+        # The last prediction is kept and continued when a later frame is asked for.
+        head = self._head
+        if head is None or head.frame > frame:
+            head = self.replay.state_at(frame)
+        else:
+            self.replay.advance(head, frame)
+        self._head = head
+        return head
+
+    def predict(
+        self, player_id: int, frame: Optional[int] = None
+    ) -> Optional['PlayerPrediction']:
+        """The predicted disc of ``player_id``, ``None`` if it has no disc."""
+        state = self._head_at(self.current_frame() if frame is None else frame)
+        if player_id not in state.player_ids:
+            return None
+        return self._prediction(state, state.index_of(player_id))
+
+    def predict_all(self, frame: Optional[int] = None) -> Dict[int, 'PlayerPrediction']:
+        """Predictions of every disc on ``frame`` (default :meth:`current_frame`)."""
+        state = self._head_at(self.current_frame() if frame is None else frame)
+        return {
+            player_id: self._prediction(state, index)
+            for index, player_id in enumerate(state.player_ids)
+        }
+
+    def _prediction(self, state: 'SimulationState', index: int) -> 'PlayerPrediction':
+        player_id = state.player_ids[index]
+        return PlayerPrediction(
+            player_id=player_id,
+            frame=state.frame,
+            position=(state.x[index], state.y[index]),
+            velocity=(state.vx[index], state.vy[index]),
+            alive=state.died_at[index] == -1,
+            unseen_frames=self.unseen_frames(player_id, state.frame),
+        )
@@ -0,0 +1,185 @@
+import bisect
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+)
+
+if TYPE_CHECKING:
+    from ..core.room.player import Player
+    from ..types.player_move import PlayerMove
+    from .simulation import InputsLike, Simulation
+    from .state import SimulationState
+
+
+def _flags(inputs: 'InputsLike') -> int:
+    return inputs if isinstance(inputs, int) else inputs.flags
+
+
+class Replay:
+    """
+    Rebuilds the state of a recorded game at any frame.
+
+    A replay holds the state the game started from (or was joined at) and a timeline of
+    player inputs by frame. Seeking runs the :class:`Simulation` from the nearest earlier
+    checkpoint; a checkpoint is kept every ``checkpoint_interval`` frames the replay has
+    been through, so once a game has been played through, seeking anywhere costs at most
+    ``checkpoint_interval`` steps. Changing an input drops the checkpoints after it.
+    """
+
+    __slots__ = (
+        '_checkpoint_frames',
+        '_checkpoints',
+        'checkpoint_interval',
+        'initial',
+        'inputs',
+        'simulation',
+    )
+
+    def __init__(
+        self,
+        simulation: 'Simulation',
+        initial: 'SimulationState',
+        *,
+        checkpoint_interval: int = 90,
+    ) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be at least 1')
+        self.simulation = simulation
+        self.initial = initial.copy()
+        self.checkpoint_interval = checkpoint_interval
+        self.inputs: Dict[int, Dict[int, int]] = {}
+        """Frame -> player id -> input flags sent for that frame."""
+        self._checkpoints: Dict[int, SimulationState] = {}
+        self._checkpoint_frames: List[int] = []
+
+    @classmethod
+    def from_players(
+        cls,
+        simulation: 'Simulation',
+        initial: 'SimulationState',
+        players: Iterable['Player'],
+        **options: int,
+    ) -> 'Replay':
+        """A replay of the ``moves`` and ``prev_inputs`` recorded on room players."""
+        replay = cls(simulation, initial, **options)
+        for player in players:
+            replay.add_inputs(player.id, player.prev_inputs)
+            replay.add_moves(player.id, player.moves.values())
+        return replay
+
+    @property
+    def start_frame(self) -> int:
+        return self.initial.frame
+
+    @property
+    def last_input_frame(self) -> int:
+        """Frame of the last recorded input, the start frame if there is none."""
+        return max(self.inputs, default=self.start_frame)
+
+    def set_input(self, player_id: int, frame: int, inputs: 'InputsLike') -> None:
+        """Records the inputs ``player_id`` holds from ``frame`` on."""
+        self.inputs.setdefault(frame, {})[player_id] = _flags(inputs)
+        self.invalidate(frame)
+
+    def remove_input(self, player_id: int, frame: int) -> None:
+        by_player = self.inputs.get(frame)
+        if by_player is None or by_player.pop(player_id, None) is None:
+            return
+        if not by_player:
+            del self.inputs[frame]
+        self.invalidate(frame)
+
+    def add_inputs(self, player_id: int, inputs: Mapping[int, 'InputsLike']) -> None:
+        """Records a frame -> inputs mapping, like `Player.prev_inputs`."""
+        for frame, value in inputs.items():
+            self.set_input(player_id, frame, value)
+
+    def add_moves(self, player_id: int, moves: Iterable['PlayerMove']) -> None:
+        """
+        Records the valid moves of ``player_id``, when several target one frame the one
+        with the highest sequence wins. A reverted move takes back the input it recorded.
+        """
+
+        for move in sorted(moves, key=lambda move: move.sequence):
+            if move.valid:
+                self.set_input(player_id, move.frame, move.inputs)
+            elif self.inputs.get(move.frame, {}).get(player_id) == move.inputs.flags:
+                self.remove_input(player_id, move.frame)
+
+    def invalidate(self, frame: int) -> None:
+        """Drops the checkpoints an input sent for ``frame`` can change."""
+        # Inputs of frame N apply from the step out of N, the state at N stays valid.
+        # Inputs from before the start are held into it, so the start is rebuilt too.
+        keep = frame + 1 if frame >= self.start_frame else self.start_frame
+        position = bisect.bisect_left(self._checkpoint_frames, keep)
+        for dropped in self._checkpoint_frames[position:]:
+            del self._checkpoints[dropped]
+        del self._checkpoint_frames[position:]
+
+    def _start(self) -> 'SimulationState':
+        state = self.initial.copy()
+        held: Dict[int, int] = {}
+        for frame in sorted(self.inputs):
+            if frame >= state.frame:
+                break
+            held.update(self.inputs[frame])
+        self.simulation.set_inputs(state, held)
+        return state
+
+    def _checkpoint(self, state: 'SimulationState') -> None:
+        bisect.insort(self._checkpoint_frames, state.frame)
+        self._checkpoints[state.frame] = state.copy()
+
+    def state_at(self, frame: int) -> 'SimulationState':
+        """The state at the start of ``frame``, before its inputs apply."""
+        if frame < self.start_frame:
+            raise ValueError(f'frame {frame} is before the replay start')
+        position = bisect.bisect_right(self._checkpoint_frames, frame)
+        if position:
+            state = self._checkpoints[self._checkpoint_frames[position - 1]].copy()
+        else:
+            state = self._start()
+            self._checkpoint(state)
+        self.advance(state, frame)
+        return state
+
+    def advance(self, state: 'SimulationState', frame: int) -> None:
+        """Steps ``state`` in place up to ``frame`` with the recorded inputs."""
+        interval = self.checkpoint_interval
+        step = self.simulation.step
+        inputs = self.inputs
+        while state.frame < frame:
+            step(state, inputs.get(state.frame))
+            if state.frame % interval == 0 and state.frame not in self._checkpoints:
+                self._checkpoint(state)
+
+    def states(
+        self, start: int, stop: Optional[int] = None
+    ) -> Iterator['SimulationState']:
+        """
+        Yields the state of every frame from ``start`` up to ``stop`` (exclusive, by
+        default through the last input frame). States are copies, they can be kept.
+        """
+
+        stop = self.last_input_frame + 1 if stop is None else stop
+        if start >= stop:
+            return
+        state = self.state_at(start)
+        yield state.copy()
+        while state.frame + 1 < stop:
+            self.advance(state, state.frame + 1)
+            yield state.copy()
+
+    def clear_checkpoints(self) -> None:
+        self._checkpoints.clear()
+        self._checkpoint_frames.clear()
+
+    @property
+    def checkpoints(self) -> List[int]:
+        """Frames of the checkpoints kept."""
+        return list(self._checkpoint_frames)
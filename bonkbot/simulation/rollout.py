@@ -0,0 +1,280 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from attrs import define, field
+
+from .simulation import InputsLike, Simulation
+from .state import SimulationState
+
+Point = Tuple[float, float]
+# One frame of a rollout: inputs of the rolled out player, or player id -> inputs.
+# ``None`` keeps the inputs held on the previous frame.
+RolloutStep = Union[None, InputsLike, Mapping[int, InputsLike]]
+_Job = Tuple[
+    SimulationState,
+    List[Tuple[int, Sequence[RolloutStep]]],
+    Optional[int],
+    int,
+    bool,
+]
+
+_worker_simulation: Optional[Simulation] = None
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class RolloutResult:
+    """Outcome of one input sequence, positions and velocities are in physics units."""
+
+    index: int
+    """Position of the sequence in the batch."""
+    frame: int
+    positions: Dict[int, Point]
+    """Positions of the players alive at the end."""
+    velocities: Dict[int, Point]
+    died_at: Dict[int, int]
+    """Frame each player that died on the way died on."""
+    captured_by: Tuple[int, ...]
+    state: Optional[SimulationState] = field(default=None, repr=False, eq=False)
+    """Final state, only kept with ``keep_states=True``."""
+
+    def alive(self, player_id: int) -> bool:
+        return player_id not in self.died_at
+
+    @property
+    def captured(self) -> bool:
+        return any(player_id != -1 for player_id in self.captured_by)
+
+    @classmethod
+    def from_state(
+        cls, index: int, state: 'SimulationState', *, keep_state: bool = False
+    ) -> 'RolloutResult':
+        return cls(
+            index=index,
+            frame=state.frame,
+            positions=state.positions(),
+            velocities={
+                player_id: (state.vx[i], state.vy[i])
+                for i, player_id in enumerate(state.player_ids)
+                if state.died_at[i] == -1
+            },
+            died_at={
+                player_id: state.died_at[i]
+                for i, player_id in enumerate(state.player_ids)
+                if state.died_at[i] != -1
+            },
+            captured_by=tuple(state.captured_by),
+            state=state if keep_state else None,
+        )
+
+
+def _step_key(step: 'RolloutStep') -> Hashable:
+    if step is None:
+        return ()
+    if isinstance(step, int):
+        return (step,)
+    if isinstance(step, Mapping):
+        return tuple(
+            sorted(
+                (player_id, value if isinstance(value, int) else value.flags)
+                for player_id, value in step.items()
+            )
+        )
+    return (step.flags,)
+
+
+def _apply(
+    simulation: 'Simulation',
+    state: 'SimulationState',
+    step: 'RolloutStep',
+    player_id: Optional[int],
+) -> None:
+    if step is None:
+        simulation.step(state)
+    elif player_id is None:
+        simulation.step(state, step)
+    else:
+        simulation.step(state, {player_id: step})
+
+
+def _run(
+    simulation: 'Simulation',
+    state: 'SimulationState',
+    sequences: List[Tuple[int, Sequence['RolloutStep']]],
+    player_id: Optional[int],
+    frames: int,
+    keep_states: bool,
+) -> List['RolloutResult']:
+    # Walk the prefix tree of the sequences, a prefix shared by several sequences is
+    # simulated once and its state copied where they part.
+    padding: Tuple[Hashable, ...] = ((),) * frames
+    keys = [
+        (tuple(_step_key(step) for step in sequence[:frames]) + padding)[:frames]
+        for _, sequence in sequences
+    ]
+    results = []
+    pending: List[Tuple[List[int], int, SimulationState]] = [
+        (list(range(len(sequences))), 0, state.copy()),
+    ]
+    while pending:
+        group, depth, working = pending.pop()
+        first = group[0]
+        sequence = sequences[first][1]
+        while depth < frames and all(
+            keys[other][depth] == keys[first][depth] for other in group
+        ):
+            _apply(
+                simulation,
+                working,
+                sequence[depth] if depth < len(sequence) else None,
+                player_id,
+            )
+            depth += 1
+        if depth == frames:
+            results.extend(
+                RolloutResult.from_state(
+                    sequences[current][0],
+                    working if position == 0 else working.copy(),
+                    keep_state=keep_states,
+                )
+                for position, current in enumerate(group)
+            )
+            continue
+        branches: Dict[Hashable, List[int]] = {}
+        for current in group:
+            branches.setdefault(keys[current][depth], []).append(current)
+        for position, branch in enumerate(branches.values()):
+            # Copies are taken before anything steps, the first branch is walked last.
+            pending.append(
+                (branch, depth, working if position == 0 else working.copy()),
+            )
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+def rollout(
+    simulation: 'Simulation',
+    state: 'SimulationState',
+    sequences: Sequence[Sequence['RolloutStep']],
+    *,
+    player_id: Optional[int] = None,
+    frames: Optional[int] = None,
+    keep_states: bool = False,
+) -> List['RolloutResult']:
+    """
+    Advances a copy of ``state`` through every input sequence of a batch.
+
+    A sequence holds one step per frame: the inputs of ``player_id``, or with no
+    ``player_id`` a mapping of player id to inputs; ``None`` keeps the held inputs. Every
+    rollout runs ``frames`` frames (by default the longest sequence), shorter sequences
+    hold their last inputs. Sequences sharing a prefix share its simulation, so a batch of
+    search candidates branching from a common plan costs about its number of distinct
+    steps rather than ``len(sequences) * frames``. ``state`` is not modified; results
+    come back in batch order.
+    """
+
+    if frames is None:
+        frames = max((len(sequence) for sequence in sequences), default=0)
+    return _run(
+        simulation,
+        state,
+        list(enumerate(sequences)),
+        player_id,
+        frames,
+        keep_states,
+    )
+
+
+def _init_worker(simulation: 'Simulation') -> None:
+    global _worker_simulation
+    _worker_simulation = simulation
+
+
+def _run_job(job: '_Job') -> List['RolloutResult']:
+    state, sequences, player_id, frames, keep_states = job
+    assert _worker_simulation is not None
+    return _run(_worker_simulation, state, sequences, player_id, frames, keep_states)
+
+
+class RolloutPool:
+    """
+    :func:`rollout` fanned out over a process pool, for batches too large for one core.
+
+    Workers receive the :class:`Simulation` once when they start, every batch only ships
+    the state and the sequences. Batches smaller than ``min_batch`` run in the calling
+    process, where the pool would cost more than it saves. Close the pool when done, or
+    use it as a context manager.
+    """
+
+    __slots__ = ('_executor', 'min_batch', 'processes', 'simulation')
+
+    def __init__(
+        self,
+        simulation: 'Simulation',
+        processes: Optional[int] = None,
+        *,
+        min_batch: int = 256,
+    ) -> None:
+        self.simulation = simulation
+        self.processes = processes if processes is not None else os.cpu_count() or 1
+        self.min_batch = min_batch
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(simulation,),
+        )
+
+    def run(
+        self,
+        state: 'SimulationState',
+        sequences: Sequence[Sequence['RolloutStep']],
+        *,
+        player_id: Optional[int] = None,
+        frames: Optional[int] = None,
+        keep_states: bool = False,
+    ) -> List['RolloutResult']:
+        """Same as :func:`rollout` with this pool's simulation."""
+        if frames is None:
+            frames = max((len(sequence) for sequence in sequences), default=0)
+        if len(sequences) < self.min_batch or self.processes <= 1:
+            return rollout(
+                self.simulation,
+                state,
+                sequences,
+                player_id=player_id,
+                frames=frames,
+                keep_states=keep_states,
+            )
+        # Contiguous slices of the sorted batch keep shared prefixes in one worker.
+        indexed = sorted(
+            enumerate(sequences),
+            key=lambda item: tuple(_step_key(step) for step in item[1][:frames]),
+        )
+        size = -(-len(indexed) // self.processes)
+        jobs = [
+            (state, indexed[start : start + size], player_id, frames, keep_states)
+            for start in range(0, len(indexed), size)
+        ]
+        results = [
+            result for chunk in self._executor.map(_run_job, jobs) for result in chunk
+        ]
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'RolloutPool':
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
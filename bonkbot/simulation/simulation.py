@@ -0,0 +1,686 @@
+import math
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..types.input import InputFlag, Inputs
+from ..types.map.physics.body.body_type import BodyType
+from ..types.map.physics.joint.revolute_joint import RevoluteJoint
+from ..types.room.initial_state import InitialState
+from ..types.team import Team
+from .broadphase import StaticGrid
+from .collision import circle_circle, circle_convex, convex_normals
+from .state import SimulationState
+
+if TYPE_CHECKING:
+    from ..types.map.bonkmap import BonkMap
+    from ..types.map.geometry import FixtureGeometry
+    from ..types.map.physics.body.body import Body
+    from ..types.map.physics.fixture import Fixture
+
+Point = Tuple[float, float]
+InputsLike = Union['Inputs', int]
+
+TICK_RATE = 30
+"""Physics steps per second of a bonk game, frames in moves count these steps."""
+TIME_STEP = 1 / TICK_RATE
+
+# Player and world constants in physics units, approximations of the bonk client.
+PLAYER_RADIUS = 1.0
+PLAYER_RESTITUTION = 0.8
+PLAYER_FRICTION = 0.3
+HEAVY_MASS = 3.0
+HEAVY_RESTITUTION = 0.3
+GRAVITY = 10.0
+# Slower impacts do not bounce, like Box2D's velocity threshold, so resting discs settle.
+RESTITUTION_THRESHOLD = 1.0
+MOVE_ACCELERATION = 10.0
+UP_ACCELERATION = 5.0
+FLY_ACCELERATION = 15.0
+# Cell size of the static collider grid, about a disc across.
+GRID_CELL = 2 * PLAYER_RADIUS
+# Players die once they leave the visible playfield (in map pixels) by this much.
+KILL_MARGIN = 150.0
+_PLAYFIELD = (-365.0, -250.0, 365.0, 250.0)
+
+_LEFT = int(InputFlag.LEFT)
+_RIGHT = int(InputFlag.RIGHT)
+_UP = int(InputFlag.UP)
+_DOWN = int(InputFlag.DOWN)
+_HEAVY = int(InputFlag.HEAVY)
+
+_TEAM_SPAWNS = {
+    Team.FFA: 'ffa',
+    Team.RED: 'red',
+    Team.BLUE: 'blue',
+    Team.GREEN: 'green',
+    Team.YELLOW: 'yellow',
+}
+
+
+class Collider:
+    """
+    One fixture of one body, in physics units.
+
+    Static colliders hold world-space geometry. Colliders of moving bodies hold geometry
+    relative to the body origin, which :meth:`Simulation.step` moves every frame.
+    """
+
+    __slots__ = (
+        'aabb',
+        'body',
+        'cap_zones',
+        'circle',
+        'death',
+        'fixture_id',
+        'friction',
+        'parts',
+        'reach',
+        'restitution',
+        'solid',
+    )
+
+    def __init__(
+        self,
+        body: int,
+        fixture_id: int,
+        *,
+        circle: Optional[Tuple[float, float, float]],
+        parts: List[Tuple[Tuple[Point, ...], Tuple[Point, ...]]],
+        death: bool,
+        solid: bool,
+        restitution: float,
+        friction: float,
+    ) -> None:
+        self.body = body
+        """Index into the moving bodies, ``-1`` for static bodies."""
+        self.fixture_id = fixture_id
+        self.circle = circle
+        self.parts = parts
+        self.death = death
+        self.solid = solid
+        self.restitution = restitution
+        self.friction = friction
+        self.cap_zones: Tuple[int, ...] = ()
+        points = [point for vertices, _ in parts for point in vertices]
+        if circle is not None:
+            cx, cy, radius = circle
+            points += [(cx - radius, cy - radius), (cx + radius, cy + radius)]
+        self.aabb = (
+            min(point[0] for point in points),
+            min(point[1] for point in points),
+            max(point[0] for point in points),
+            max(point[1] for point in points),
+        )
+        # Farthest point from the body origin, bounds a moving collider in any rotation.
+        self.reach = max(math.hypot(*point) for point in points)
+
+    def contact(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        origin: Optional[Tuple[float, float, float]] = None,
+    ) -> Optional[Tuple[float, float, float]]:
+        """Contact with a circle, ``origin`` is ``(x, y, angle)`` of a moving body."""
+        if origin is not None:
+            # Test in body space and rotate the normal back.
+            body_x, body_y, angle = origin
+            cos, sin = math.cos(angle), math.sin(angle)
+            dx, dy = x - body_x, y - body_y
+            x, y = dx * cos + dy * sin, -dx * sin + dy * cos
+        best = None
+        if self.circle is not None:
+            best = circle_circle(x, y, radius, *self.circle)
+        for vertices, normals in self.parts:
+            contact = circle_convex(x, y, radius, vertices, normals)
+            if contact is not None and (best is None or contact[2] > best[2]):
+                best = contact
+        if best is None or origin is None:
+            return best
+        normal_x, normal_y, depth = best
+        return normal_x * cos - normal_y * sin, normal_x * sin + normal_y * cos, depth
+
+
+class Simulation:
+    """
+    Headless, deterministic physics of player discs on a :class:`BonkMap`.
+
+    The map is converted once into colliders; everything that changes lives in a
+    :class:`SimulationState`, so one simulation can advance many states. Each
+    :meth:`step` advances one frame at :data:`TICK_RATE` with semi-implicit Euler
+    integration and plain float arithmetic in a fixed order, so the same state and
+    inputs always give the same result.
+
+    This is a model of bonk physics, not a port of its Box2D engine: discs collide with
+    fixtures and with each other, moving bodies follow their velocities, forces and
+    revolute joints to the world, but discs do not push bodies and bodies do not collide
+    with each other.
+    """
+
+    __slots__ = (
+        '_body_mass',
+        '_moving_colliders',
+        '_pivots',
+        '_static_colliders',
+        '_static_grid',
+        'bonk_map',
+        'cap_zone_seconds',
+        'colliders',
+        'kill_bounds',
+        'moving_bodies',
+        'players_collide',
+        'players_fly',
+        'ppm',
+    )
+
+    def __init__(self, bonk_map: 'BonkMap') -> None:
+        self.bonk_map = bonk_map
+        physics = bonk_map.physics
+        self.ppm = ppm = physics.ppm or 1
+        self.players_collide = not bonk_map.properties.players_dont_collide
+        self.players_fly = bonk_map.properties.players_can_fly
+        min_x, min_y, max_x, max_y = _PLAYFIELD
+        self.kill_bounds = (
+            (min_x - KILL_MARGIN) / ppm,
+            (min_y - KILL_MARGIN) / ppm,
+            (max_x + KILL_MARGIN) / ppm,
+            (max_y + KILL_MARGIN) / ppm,
+        )
+
+        self.moving_bodies: List[int] = [
+            body_id
+            for body_id, body in enumerate(physics.bodies)
+            if body.shape.body_type is not BodyType.STATIC
+        ]
+        moving = {body_id: index for index, body_id in enumerate(self.moving_bodies)}
+        self._body_mass: List[float] = [0.0] * len(self.moving_bodies)
+        # Moving index -> world pivot of a revolute joint holding the body to the world.
+        self._pivots: Dict[int, Tuple[float, float, RevoluteJoint]] = {}
+        for joint in physics.joints:
+            if not isinstance(joint, RevoluteJoint) or joint.body_b_id != -1:
+                continue
+            index = moving.get(joint.body_a_id)
+            if index is None:
+                continue
+            # The pivot is relative to the first body.
+            body = physics.bodies[joint.body_a_id]
+            cos, sin = math.cos(body.angle), math.sin(body.angle)
+            pivot_x, pivot_y = joint.pivot
+            self._pivots[index] = (
+                (body.position[0] + pivot_x * cos - pivot_y * sin) / ppm,
+                (body.position[1] + pivot_x * sin + pivot_y * cos) / ppm,
+                joint,
+            )
+
+        self.colliders: List[Collider] = []
+        fixtures = physics.fixtures
+        for geometry in bonk_map.geometry().fixtures:
+            if not geometry.is_circle and not geometry.convex_parts():
+                continue
+            body = physics.bodies[geometry.body_id]
+            index = moving.get(geometry.body_id, -1)
+            collider = self._collider(
+                geometry, body, fixtures[geometry.fixture_id], index
+            )
+            self.colliders.append(collider)
+            if index != -1:
+                self._body_mass[index] += _density(
+                    fixtures[geometry.fixture_id].density, body.shape.density
+                ) * (geometry.area / (ppm * ppm))
+
+        cap_zones: Dict[int, List[int]] = {}
+        for cap_zone_id, cap_zone in enumerate(bonk_map.cap_zones):
+            cap_zones.setdefault(cap_zone.shape_id, []).append(cap_zone_id)
+        for collider in self.colliders:
+            collider.cap_zones = tuple(cap_zones.get(collider.fixture_id, ()))
+        self.cap_zone_seconds = [cap_zone.seconds for cap_zone in bonk_map.cap_zones]
+        self._static_colliders = [c for c in self.colliders if c.body == -1]
+        self._moving_colliders = [c for c in self.colliders if c.body != -1]
+        # Static colliders never move, so one grid serves every state. Boxes grow by a bit
+        # more than the disc radius, a disc centre then only needs the cell it is in and
+        # rounding can not drop a collider the exact test in `candidates` would keep.
+        pad = PLAYER_RADIUS * 1.01
+        self._static_grid = StaticGrid(
+            [
+                (min_x - pad, min_y - pad, max_x + pad, max_y + pad)
+                for min_x, min_y, max_x, max_y in (
+                    collider.aabb for collider in self._static_colliders
+                )
+            ],
+            self.kill_bounds,
+            GRID_CELL,
+        )
+
+    def _collider(
+        self,
+        geometry: 'FixtureGeometry',
+        body: 'Body',
+        fixture: 'Fixture',
+        moving_index: int,
+    ) -> 'Collider':
+        ppm = self.ppm
+        if moving_index == -1:
+
+            def convert(point: Point) -> Point:
+                return point[0] / ppm, point[1] / ppm
+
+        else:
+            # Geometry is in world space at the initial pose, move it into body space.
+            cos, sin = math.cos(body.angle), math.sin(body.angle)
+            body_x, body_y = body.position
+
+            def convert(point: Point) -> Point:
+                dx, dy = point[0] - body_x, point[1] - body_y
+                return (dx * cos + dy * sin) / ppm, (-dx * sin + dy * cos) / ppm
+
+        circle = None
+        parts = []
+        if geometry.is_circle:
+            cx, cy = convert(geometry.center)
+            circle = (cx, cy, geometry.radius / ppm)
+        else:
+            for part in geometry.convex_parts():
+                vertices = tuple(convert(point) for point in part)
+                parts.append((vertices, convex_normals(vertices)))
+        return Collider(
+            moving_index,
+            geometry.fixture_id,
+            circle=circle,
+            parts=parts,
+            death=fixture.death,
+            solid=not fixture.no_physics,
+            restitution=_value(fixture.restitution, body.shape.restitution),
+            friction=_value(fixture.friction, body.shape.friction),
+        )
+
+    def new_state(self, players: Mapping[int, int]) -> 'SimulationState':
+        """
+        Places ``players`` (player id -> team number) on the map spawns.
+
+        Spawns allowed for the team are used by descending priority, in turn for every
+        player, so the placement does not depend on anything but the arguments.
+        """
+
+        state = self._empty_state()
+        spawns = self.bonk_map.spawns
+        used: Dict[int, int] = {}
+        for player_id in sorted(players):
+            team = players[player_id]
+            flag = _TEAM_SPAWNS.get(Team.from_number(team), 'ffa')
+            eligible = sorted(
+                (spawn for spawn in spawns if getattr(spawn, flag)),
+                key=lambda spawn: -spawn.priority,
+            )
+            if eligible:
+                turn = used.get(team, 0)
+                used[team] = turn + 1
+                spawn = eligible[turn % len(eligible)]
+                position, velocity = spawn.position, spawn.velocity
+            else:
+                position, velocity = (0.0, 0.0), (0.0, 0.0)
+            self._add_disc(
+                state,
+                player_id,
+                team,
+                (position[0] / self.ppm, position[1] / self.ppm),
+                (velocity[0] / self.ppm, velocity[1] / self.ppm),
+            )
+        return state
+
+    def state_from_initial(
+        self, initial_state: Union['InitialState', dict], frame: int = 0
+    ) -> 'SimulationState':
+        """
+        Reads the discs and moving bodies of a bonk game state, as passed to
+        ``on_game_start`` and ``on_inform_in_game`` (with its ``frame``). Disc ``i``
+        belongs to player id ``i``.
+        """
+
+        if isinstance(initial_state, dict):
+            initial_state = InitialState.from_json(initial_state)
+        state = self._empty_state()
+        state.frame = frame
+        for player_id, disc in enumerate(initial_state.discs):
+            if disc is None:
+                continue
+            self._add_disc(state, player_id, disc.team, disc.position, disc.velocity)
+        bodies = (initial_state.physics or {}).get('bodies') or ()
+        for index, body_id in enumerate(self.moving_bodies):
+            if body_id >= len(bodies) or not bodies[body_id]:
+                continue
+            body = bodies[body_id]
+            state.body_x[index] = body['p'][0] / self.ppm
+            state.body_y[index] = body['p'][1] / self.ppm
+            state.body_angle[index] = body.get('a', 0.0)
+            state.body_vx[index] = body['lv'][0] / self.ppm
+            state.body_vy[index] = body['lv'][1] / self.ppm
+            state.body_av[index] = body.get('av', 0.0)
+        return state
+
+    def _empty_state(self) -> 'SimulationState':
+        state = SimulationState()
+        bodies = self.bonk_map.physics.bodies
+        ppm = self.ppm
+        for body_id in self.moving_bodies:
+            body = bodies[body_id]
+            state.body_x.append(body.position[0] / ppm)
+            state.body_y.append(body.position[1] / ppm)
+            state.body_angle.append(body.angle)
+            state.body_vx.append(body.linear_velocity[0] / ppm)
+            state.body_vy.append(body.linear_velocity[1] / ppm)
+            state.body_av.append(body.angular_velocity)
+        state.cap_frames = [0] * len(self.cap_zone_seconds)
+        state.captured_by = [-1] * len(self.cap_zone_seconds)
+        return state
+
+    @staticmethod
+    def _add_disc(
+        state: 'SimulationState',
+        player_id: int,
+        team: int,
+        position: Point,
+        velocity: Point,
+    ) -> None:
+        state.player_ids.append(player_id)
+        state.teams.append(team)
+        state.x.append(float(position[0]))
+        state.y.append(float(position[1]))
+        state.vx.append(float(velocity[0]))
+        state.vy.append(float(velocity[1]))
+        state.inputs.append(0)
+        state.died_at.append(-1)
+
+    def set_inputs(
+        self, state: 'SimulationState', inputs: Mapping[int, 'InputsLike']
+    ) -> None:
+        """Holds ``inputs`` (player id -> `Inputs` or flags) from the next step on."""
+        player_ids = state.player_ids
+        for player_id, value in inputs.items():
+            if player_id in player_ids:
+                state.inputs[player_ids.index(player_id)] = (
+                    value if isinstance(value, int) else value.flags
+                )
+
+    def run(
+        self,
+        state: 'SimulationState',
+        frames: int,
+        inputs: Optional[Mapping[int, Mapping[int, 'InputsLike']]] = None,
+    ) -> 'SimulationState':
+        """Steps ``frames`` times, ``inputs`` maps a frame number to the inputs sent on it."""
+        for _ in range(frames):
+            self.step(state, inputs.get(state.frame) if inputs else None)
+        return state
+
+    def step(
+        self,
+        state: 'SimulationState',
+        inputs: Optional[Mapping[int, 'InputsLike']] = None,
+    ) -> 'SimulationState':
+        """Advances ``state`` by one frame in place, ``inputs`` apply from this frame on."""
+        if inputs:
+            self.set_inputs(state, inputs)
+        dt = TIME_STEP
+        self._move_bodies(state, dt)
+
+        xs, ys, vxs, vys = state.x, state.y, state.vx, state.vy
+        died_at, held = state.died_at, state.inputs
+        up_acceleration = FLY_ACCELERATION if self.players_fly else UP_ACCELERATION
+        living = [index for index in range(len(xs)) if died_at[index] == -1]
+        for index in living:
+            flags = held[index]
+            ax = 0.0
+            ay = GRAVITY
+            if flags & _LEFT:
+                ax -= MOVE_ACCELERATION
+            if flags & _RIGHT:
+                ax += MOVE_ACCELERATION
+            if flags & _UP:
+                ay -= up_acceleration
+            if flags & _DOWN:
+                ay += MOVE_ACCELERATION
+            vxs[index] += ax * dt
+            vys[index] += ay * dt
+            xs[index] += vxs[index] * dt
+            ys[index] += vys[index] * dt
+
+        occupied: Dict[int, int] = {}
+        for index in living:
+            self._collide_fixtures(state, index, occupied)
+        if self.players_collide:
+            self._collide_discs(state, living)
+
+        min_x, min_y, max_x, max_y = self.kill_bounds
+        for index in living:
+            if died_at[index] == -1 and not (
+                min_x <= xs[index] <= max_x and min_y <= ys[index] <= max_y
+            ):
+                died_at[index] = state.frame
+
+        self._update_cap_zones(state, occupied)
+        state.frame += 1
+        return state
+
+    def _move_bodies(self, state: 'SimulationState', dt: float) -> None:
+        bodies = self.bonk_map.physics.bodies
+        for index, body_id in enumerate(self.moving_bodies):
+            body = bodies[body_id]
+            shape = body.shape
+            pivot = self._pivots.get(index)
+            if shape.body_type is BodyType.DYNAMIC and pivot is None:
+                force_x, force_y = body.force.force
+                if body.force.is_relative:
+                    cos = math.cos(state.body_angle[index])
+                    sin = math.sin(state.body_angle[index])
+                    force_x, force_y = (
+                        force_x * cos - force_y * sin,
+                        force_x * sin + force_y * cos,
+                    )
+                mass = self._body_mass[index]
+                inverse_mass = 1 / mass if mass > 0 else 0.0
+                state.body_vx[index] += force_x * inverse_mass * dt
+                state.body_vy[index] += (GRAVITY + force_y * inverse_mass) * dt
+                if mass > 0:
+                    state.body_av[index] += body.force.torque * inverse_mass * dt
+            # Box2D style damping, stable for any step.
+            linear = 1 / (1 + dt * max(shape.linear_damping, 0.0))
+            state.body_vx[index] *= linear
+            state.body_vy[index] *= linear
+            state.body_av[index] *= 1 / (1 + dt * max(shape.angular_damping, 0.0))
+            if shape.fixed_rotation:
+                state.body_av[index] = 0.0
+
+            if pivot is not None:
+                pivot_x, pivot_y, joint = pivot
+                if joint.enable_motor:
+                    state.body_av[index] = joint.motor_speed
+                turn = state.body_av[index] * dt
+                cos, sin = math.cos(turn), math.sin(turn)
+                dx = state.body_x[index] - pivot_x
+                dy = state.body_y[index] - pivot_y
+                state.body_x[index] = pivot_x + dx * cos - dy * sin
+                state.body_y[index] = pivot_y + dx * sin + dy * cos
+                state.body_vx[index] = -dy * state.body_av[index]
+                state.body_vy[index] = dx * state.body_av[index]
+                state.body_angle[index] += turn
+            else:
+                state.body_x[index] += state.body_vx[index] * dt
+                state.body_y[index] += state.body_vy[index] * dt
+                state.body_angle[index] += state.body_av[index] * dt
+
+    def candidates(
+        self, state: 'SimulationState', x: float, y: float
+    ) -> Iterable[Collider]:
+        """Colliders whose bounds reach a disc at ``(x, y)``, static ones first."""
+        radius = PLAYER_RADIUS
+        static_colliders = self._static_colliders
+        found = []
+        if static_colliders:
+            for index in self._static_grid.at(x, y):
+                collider = static_colliders[index]
+                min_x, min_y, max_x, max_y = collider.aabb
+                if (
+                    x + radius >= min_x
+                    and x - radius <= max_x
+                    and y + radius >= min_y
+                    and y - radius <= max_y
+                ):
+                    found.append(collider)
+        for collider in self._moving_colliders:
+            body = collider.body
+            reach = collider.reach + radius
+            dx = x - state.body_x[body]
+            dy = y - state.body_y[body]
+            if dx * dx + dy * dy <= reach * reach:
+                found.append(collider)
+        return found
+
+    def _collide_fixtures(
+        self,
+        state: 'SimulationState',
+        index: int,
+        occupied: Dict[int, int],
+    ) -> None:
+        heavy = state.inputs[index] & _HEAVY
+        player_restitution = HEAVY_RESTITUTION if heavy else PLAYER_RESTITUTION
+        # Candidates are picked at the position the disc had before any contact.
+        x, y = state.x[index], state.y[index]
+        for collider in self.candidates(state, x, y):
+            body = collider.body
+            origin = (
+                None
+                if body == -1
+                else (state.body_x[body], state.body_y[body], state.body_angle[body])
+            )
+            contact = collider.contact(
+                state.x[index], state.y[index], PLAYER_RADIUS, origin
+            )
+            if contact is None:
+                continue
+            for cap_zone_id in collider.cap_zones:
+                occupied.setdefault(cap_zone_id, state.player_ids[index])
+            if collider.death:
+                state.died_at[index] = state.frame
+                return
+            if not collider.solid:
+                continue
+            normal_x, normal_y, depth = contact
+            state.x[index] += normal_x * depth
+            state.y[index] += normal_y * depth
+
+            # Velocity relative to the surface, moving bodies carry the disc along.
+            surface_vx = surface_vy = 0.0
+            if origin is not None:
+                angular = state.body_av[body]
+                arm_x = state.x[index] - origin[0]
+                arm_y = state.y[index] - origin[1]
+                surface_vx = state.body_vx[body] - angular * arm_y
+                surface_vy = state.body_vy[body] + angular * arm_x
+            relative_x = state.vx[index] - surface_vx
+            relative_y = state.vy[index] - surface_vy
+            normal_speed = relative_x * normal_x + relative_y * normal_y
+            if normal_speed >= 0:
+                continue
+            restitution = (
+                max(player_restitution, collider.restitution)
+                if normal_speed < -RESTITUTION_THRESHOLD
+                else 0.0
+            )
+            impulse = -(1 + restitution) * normal_speed
+            relative_x += impulse * normal_x
+            relative_y += impulse * normal_y
+            # Coulomb friction on the tangential part.
+            tangent_x = (
+                relative_x - (relative_x * normal_x + relative_y * normal_y) * normal_x
+            )
+            tangent_y = (
+                relative_y - (relative_x * normal_x + relative_y * normal_y) * normal_y
+            )
+            tangent_speed = math.hypot(tangent_x, tangent_y)
+            if tangent_speed > 0:
+                friction = math.sqrt(max(PLAYER_FRICTION * collider.friction, 0.0))
+                scale = max(tangent_speed - friction * impulse, 0.0) / tangent_speed
+                relative_x -= tangent_x * (1 - scale)
+                relative_y -= tangent_y * (1 - scale)
+            state.vx[index] = relative_x + surface_vx
+            state.vy[index] = relative_y + surface_vy
+
+    def _collide_discs(self, state: 'SimulationState', living: Sequence[int]) -> None:
+        xs, ys, vxs, vys = state.x, state.y, state.vx, state.vy
+        died_at, held = state.died_at, state.inputs
+        reach_squared = (2 * PLAYER_RADIUS) ** 2
+        for position, first in enumerate(living):
+            if died_at[first] != -1:
+                continue
+            for second in living[position + 1 :]:
+                if died_at[second] != -1:
+                    continue
+                # The test `circle_circle` starts with, most pairs stop here.
+                dx, dy = xs[second] - xs[first], ys[second] - ys[first]
+                if dx * dx + dy * dy >= reach_squared:
+                    continue
+                contact = circle_circle(
+                    xs[second],
+                    ys[second],
+                    PLAYER_RADIUS,
+                    xs[first],
+                    ys[first],
+                    PLAYER_RADIUS,
+                )
+                if contact is None:
+                    continue
+                normal_x, normal_y, depth = contact
+                mass_first = HEAVY_MASS if held[first] & _HEAVY else 1.0
+                mass_second = HEAVY_MASS if held[second] & _HEAVY else 1.0
+                inverse_first, inverse_second = 1 / mass_first, 1 / mass_second
+                share = depth / (inverse_first + inverse_second)
+                xs[first] -= normal_x * share * inverse_first
+                ys[first] -= normal_y * share * inverse_first
+                xs[second] += normal_x * share * inverse_second
+                ys[second] += normal_y * share * inverse_second
+                normal_speed = (vxs[second] - vxs[first]) * normal_x + (
+                    vys[second] - vys[first]
+                ) * normal_y
+                if normal_speed >= 0:
+                    continue
+                restitution = (
+                    PLAYER_RESTITUTION if normal_speed < -RESTITUTION_THRESHOLD else 0.0
+                )
+                impulse = (
+                    -(1 + restitution) * normal_speed / (inverse_first + inverse_second)
+                )
+                vxs[first] -= impulse * inverse_first * normal_x
+                vys[first] -= impulse * inverse_first * normal_y
+                vxs[second] += impulse * inverse_second * normal_x
+                vys[second] += impulse * inverse_second * normal_y
+
+    def _update_cap_zones(
+        self, state: 'SimulationState', occupied: Dict[int, int]
+    ) -> None:
+        for cap_zone_id, seconds in enumerate(self.cap_zone_seconds):
+            if state.captured_by[cap_zone_id] != -1:
+                continue
+            player_id = occupied.get(cap_zone_id)
+            if player_id is None:
+                state.cap_frames[cap_zone_id] = 0
+                continue
+            state.cap_frames[cap_zone_id] += 1
+            if state.cap_frames[cap_zone_id] >= seconds * TICK_RATE:
+                state.captured_by[cap_zone_id] = player_id
+
+
+def _value(value: Optional[float], default: float) -> float:
+    return default if value is None else value
+
+
+def _density(value: Optional[float], default: float) -> float:
+    return max(_value(value, default), 0.0)
@@ -0,0 +1,86 @@
+from typing import Dict, List, Tuple
+
+from attrs import define, field
+
+Point = Tuple[float, float]
+
+
+@define(slots=True, auto_attribs=True)
+class SimulationState:
+    """
+    Everything that changes while a game runs, as flat per-component vectors.
+
+    Discs (players) and moving bodies are stored structure-of-arrays style: index ``i`` of
+    every disc list describes the player ``player_ids[i]``. Positions are in physics units
+    (map pixels divided by ``ppm``), velocities in units per second. Static data lives in
+    :class:`Simulation`, so :meth:`copy` is a handful of list copies.
+    """
+
+    frame: int = field(default=0)
+
+    player_ids: List[int] = field(factory=list)
+    teams: List[int] = field(factory=list)
+    x: List[float] = field(factory=list)
+    y: List[float] = field(factory=list)
+    vx: List[float] = field(factory=list)
+    vy: List[float] = field(factory=list)
+    inputs: List[int] = field(factory=list)
+    """Held input flags, inputs stay active until the player sends new ones."""
+    died_at: List[int] = field(factory=list)
+    """Frame the disc died on, ``-1`` while alive."""
+
+    # Moving (dynamic and kinematic) bodies in body id order, see `Simulation.moving_bodies`.
+    body_x: List[float] = field(factory=list)
+    body_y: List[float] = field(factory=list)
+    body_angle: List[float] = field(factory=list)
+    body_vx: List[float] = field(factory=list)
+    body_vy: List[float] = field(factory=list)
+    body_av: List[float] = field(factory=list)
+
+    cap_frames: List[int] = field(factory=list)
+    """Frames each capture zone has been held, reset when it is left empty."""
+    captured_by: List[int] = field(factory=list)
+    """Player id that completed each capture zone, ``-1`` if none did."""
+
+    def copy(self) -> 'SimulationState':
+        return SimulationState(
+            frame=self.frame,
+            player_ids=self.player_ids.copy(),
+            teams=self.teams.copy(),
+            x=self.x.copy(),
+            y=self.y.copy(),
+            vx=self.vx.copy(),
+            vy=self.vy.copy(),
+            inputs=self.inputs.copy(),
+            died_at=self.died_at.copy(),
+            body_x=self.body_x.copy(),
+            body_y=self.body_y.copy(),
+            body_angle=self.body_angle.copy(),
+            body_vx=self.body_vx.copy(),
+            body_vy=self.body_vy.copy(),
+            body_av=self.body_av.copy(),
+            cap_frames=self.cap_frames.copy(),
+            captured_by=self.captured_by.copy(),
+        )
+
+    def index_of(self, player_id: int) -> int:
+        return self.player_ids.index(player_id)
+
+    def position(self, player_id: int) -> 'Point':
+        index = self.player_ids.index(player_id)
+        return self.x[index], self.y[index]
+
+    def velocity(self, player_id: int) -> 'Point':
+        index = self.player_ids.index(player_id)
+        return self.vx[index], self.vy[index]
+
+    def alive(self, player_id: int) -> bool:
+        return self.died_at[self.player_ids.index(player_id)] == -1
+
+    def positions(self) -> Dict[int, 'Point']:
+        """Positions of the living players by player id."""
+        return {
+            player_id: (self.x[index], self.y[index])
+            for index, player_id in enumerate(self.player_ids)
+            if self.died_at[index] == -1
+        }
@@ -0,0 +1,27 @@
+from .generator import MapGenerator, MapTemplate
+from .ingest import IngestRecord, IngestStats, ingest_dump, iter_dump, read_dump
+from .rasterizer import RasterImage, render_map, render_thumbnails
+from .search import MapEntry, MapQuery, MapSearchIndex, MapStats, SearchPage, tokenize
+from .similarity import MapSignature, MapSimilarityIndex, map_shingles
+
+__all__ = [
+    'IngestRecord',
+    'IngestStats',
+    'MapEntry',
+    'MapGenerator',
+    'MapQuery',
+    'MapSearchIndex',
+    'MapSignature',
+    'MapSimilarityIndex',
+    'MapStats',
+    'MapTemplate',
+    'RasterImage',
+    'SearchPage',
+    'ingest_dump',
+    'iter_dump',
+    'map_shingles',
+    'read_dump',
+    'render_map',
+    'render_thumbnails',
+    'tokenize',
+]
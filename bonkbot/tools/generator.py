@@ -0,0 +1,271 @@
+import random
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from attrs import define, field
+
+from ..types.map.binary_format import encode_binary
+from ..types.map.bonkmap import BonkMap
+from ..types.map.capture_zone import CaptureZone
+from ..types.map.geometry import AABB
+from ..types.map.map_metadata import MapMetadata
+from ..types.map.physics.body.body import Body
+from ..types.map.physics.body.body_shape import BodyShape
+from ..types.map.physics.body.body_type import BodyType
+from ..types.map.physics.fixture import Fixture
+from ..types.map.physics.joint.revolute_joint import RevoluteJoint
+from ..types.map.physics.map_physics import MapPhysics
+from ..types.map.physics.shape.box_shape import BoxShape
+from ..types.map.physics.shape.circle_shape import CircleShape
+from ..types.map.spawn import Spawn
+from ..types.mode import Mode
+
+Seed = Union[int, str]
+Range = Tuple[float, float]
+
+# Strong enough that players can not stop a spinner, the editor maximum.
+_SPINNER_FORCE = 99999999
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MapTemplate:
+    """
+    Parameters of a generated map. Counts and sizes are ``(min, max)`` ranges that are
+    sampled for every seed, sizes are in map pixels.
+    """
+
+    name: str = field(default='Generated')
+    author: str = field(default='bonkbot')
+    mode: 'Mode' = field(default=Mode.CLASSIC)
+    area: 'AABB' = field(default=AABB(-330, -200, 330, 220))
+
+    platforms: Tuple[int, int] = field(default=(4, 9))
+    platform_width: Range = field(default=(60.0, 260.0))
+    platform_height: Range = field(default=(12.0, 30.0))
+    platform_angle: Range = field(default=(-0.3, 0.3))
+    round_platforms: float = field(default=0.15)
+    """Share of platforms that are circles instead of boxes."""
+
+    death_zones: Tuple[int, int] = field(default=(0, 2))
+    death_zone_size: Range = field(default=(40.0, 160.0))
+    spinners: Tuple[int, int] = field(default=(0, 2))
+    spinner_speed: Range = field(default=(0.5, 2.5))
+    cap_zones: Tuple[int, int] = field(default=(0, 0))
+    cap_zone_seconds: float = field(default=10.0)
+
+    spawns_per_team: int = field(default=1)
+    symmetric: bool = field(default=True)
+    """Mirror the left half onto the right half so neither team is favoured."""
+
+    ppm: int = field(default=12)
+    colors: Tuple[int, ...] = field(default=(0x4F7CAC, 0x69BA76, 0xB28B5E, 0x8E6FB1))
+    death_color: int = field(default=0xE0463B)
+    cap_zone_color: int = field(default=0xF2C14E)
+
+
+class _Builder:
+    __slots__ = ('bodies', 'cap_zones', 'fixtures', 'joints', 'shapes', 'spawns')
+
+    def __init__(self) -> None:
+        self.shapes: list = []
+        self.fixtures: List[Fixture] = []
+        self.bodies: List[Body] = []
+        self.joints: list = []
+        self.spawns: List[Spawn] = []
+        self.cap_zones: List[CaptureZone] = []
+
+    def body(
+        self,
+        name: str,
+        position: Tuple[float, float],
+        angle: float,
+        shape: Union[BoxShape, CircleShape],
+        fixture: Fixture,
+        body_type: BodyType = BodyType.STATIC,
+    ) -> int:
+        fixture.shape_id = len(self.shapes)
+        self.shapes.append(shape)
+        self.fixtures.append(fixture)
+        self.bodies.append(
+            Body(
+                name=name,
+                position=position,
+                angle=angle,
+                fixtures=[len(self.fixtures) - 1],
+                shape=BodyShape(body_type=body_type, name=name),
+            ),
+        )
+        return len(self.bodies) - 1
+
+
+class MapGenerator:
+    """
+    Builds maps from a :class:`MapTemplate`, the same seed always gives the same map.
+
+    Maps are assembled directly from constructors, without validation round trips;
+    the template ranges keep every value inside the editor limits.
+    """
+
+    __slots__ = ('template',)
+
+    def __init__(self, template: Optional['MapTemplate'] = None) -> None:
+        self.template = template if template is not None else MapTemplate()
+
+    def generate(self, seed: Seed) -> 'BonkMap':
+        template = self.template
+        rng = random.Random(f'{template.name}:{seed}')
+        builder = _Builder()
+        area = template.area
+        center_x = (area.min_x + area.max_x) / 2
+        mirrors = (1, -1) if template.symmetric else (1,)
+
+        def x_range() -> Range:
+            # Symmetric maps place everything on the left and mirror it.
+            return (
+                (area.min_x, center_x)
+                if template.symmetric
+                else (area.min_x, area.max_x)
+            )
+
+        def mirrored(x: float, sign: int) -> float:
+            return x if sign == 1 else 2 * center_x - x
+
+        platform_tops = []
+        for _ in range(rng.randint(*template.platforms)):
+            x = rng.uniform(*x_range())
+            y = rng.uniform(area.min_y + 60, area.max_y)
+            color = rng.choice(template.colors)
+            if rng.random() < template.round_platforms:
+                radius = rng.uniform(*template.platform_width) / 4
+                for sign in mirrors:
+                    builder.body(
+                        'Platform',
+                        (mirrored(x, sign), y),
+                        0.0,
+                        CircleShape(radius=radius),
+                        Fixture(name='Platform', color=color),
+                    )
+                platform_tops.append((x, y - radius))
+            else:
+                width = rng.uniform(*template.platform_width)
+                height = rng.uniform(*template.platform_height)
+                angle = rng.uniform(*template.platform_angle)
+                for sign in mirrors:
+                    builder.body(
+                        'Platform',
+                        (mirrored(x, sign), y),
+                        angle * sign,
+                        BoxShape(width=width, height=height),
+                        Fixture(name='Platform', color=color),
+                    )
+                platform_tops.append((x, y - height / 2))
+
+        for _ in range(rng.randint(*template.death_zones)):
+            x = rng.uniform(*x_range())
+            y = rng.uniform(area.min_y, area.max_y)
+            width = rng.uniform(*template.death_zone_size)
+            height = rng.uniform(*template.death_zone_size) / 4
+            for sign in mirrors:
+                builder.body(
+                    'Death',
+                    (mirrored(x, sign), y),
+                    0.0,
+                    BoxShape(width=width, height=height),
+                    Fixture(name='Death', color=template.death_color, death=True),
+                )
+
+        for _ in range(rng.randint(*template.spinners)):
+            x = rng.uniform(*x_range())
+            y = rng.uniform(area.min_y + 60, area.max_y)
+            width = rng.uniform(*template.platform_width)
+            speed = rng.uniform(*template.spinner_speed)
+            for sign in mirrors:
+                body_id = builder.body(
+                    'Spinner',
+                    (mirrored(x, sign), y),
+                    0.0,
+                    BoxShape(width=width, height=template.platform_height[0]),
+                    Fixture(name='Spinner', color=rng.choice(template.colors)),
+                    BodyType.DYNAMIC,
+                )
+                builder.joints.append(
+                    RevoluteJoint(
+                        body_a_id=body_id,
+                        body_b_id=-1,
+                        enable_motor=True,
+                        motor_speed=speed * sign,
+                        turn_force=_SPINNER_FORCE,
+                        draw_line=False,
+                    ),
+                )
+
+        for _ in range(rng.randint(*template.cap_zones)):
+            size = rng.uniform(*template.death_zone_size) / 2
+            x = center_x if template.symmetric else rng.uniform(area.min_x, area.max_x)
+            y = rng.uniform(area.min_y, area.max_y)
+            builder.body(
+                'Cap Zone',
+                (x, y),
+                0.0,
+                CircleShape(radius=size),
+                Fixture(
+                    name='Cap Zone', color=template.cap_zone_color, no_physics=True
+                ),
+            )
+            builder.cap_zones.append(
+                CaptureZone(
+                    shape_id=len(builder.fixtures) - 1,
+                    seconds=template.cap_zone_seconds,
+                ),
+            )
+
+        if not platform_tops:
+            platform_tops.append((center_x, area.max_y))
+        for _ in range(template.spawns_per_team):
+            x, y = rng.choice(platform_tops)
+            teams = (
+                ((True, False), (False, True))
+                if template.symmetric
+                else ((True, True),)
+            )
+            for sign, (red, blue) in zip(mirrors, teams):
+                builder.spawns.append(
+                    Spawn(
+                        position=(mirrored(x, sign), y - 25),
+                        red=red,
+                        blue=blue,
+                        green=False,
+                        yellow=False,
+                    ),
+                )
+
+        return BonkMap(
+            metadata=MapMetadata(
+                name=f'{template.name} {seed}'[:25],
+                author=template.author,
+                mode=template.mode,
+            ),
+            physics=MapPhysics(
+                bodies=builder.bodies,
+                fixtures=builder.fixtures,
+                joints=builder.joints,
+                shapes=builder.shapes,
+                bro=list(range(len(builder.bodies))),
+                ppm=template.ppm,
+            ),
+            spawns=builder.spawns,
+            cap_zones=builder.cap_zones,
+        )
+
+    def generate_many(self, seeds: Iterable[Seed]) -> Iterator['BonkMap']:
+        for seed in seeds:
+            yield self.generate(seed)
+
+    def generate_encoded(self, seeds: Iterable[Seed]) -> Iterator[str]:
+        """Database strings ready for ``Room.set_map`` or the map API."""
+        for seed in seeds:
+            yield self.generate(seed).encode_to_database()
+
+    def generate_binary(self, seeds: Iterable[Seed]) -> Iterator[bytes]:
+        """Maps in the native binary format, the fast path for building local map libraries."""
+        for seed in seeds:
+            yield encode_binary(self.generate(seed))
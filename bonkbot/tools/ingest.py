@@ -0,0 +1,263 @@
+import copy
+import gzip
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    MutableSet,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from attrs import define, field
+
+from ..types.map.bonkmap import BonkMap
+from ..types.map.map_metadata import MapMetadata
+from .search import MapStats
+
+DumpSource = Union[str, PathLike, IO[str], Iterable[str]]
+_Chunk = Tuple[List[Tuple[int, str]], str, bool, bool]
+# (line, fingerprint or None on failure, leveldata, row, metadata, stats, issues or error)
+_Result = Tuple[
+    int,
+    Optional[str],
+    str,
+    dict,
+    Optional[MapMetadata],
+    Optional[MapStats],
+    Tuple[str, ...],
+]
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class IngestRecord:
+    """A decoded dump row, ``row`` holds the other columns of the row (ids, votes, ...)."""
+
+    line: int
+    fingerprint: str
+    leveldata: str
+    metadata: 'MapMetadata'
+    stats: 'MapStats'
+    row: dict = field(factory=dict, repr=False)
+    issues: Tuple[str, ...] = field(default=())
+
+
+@define(slots=True, auto_attribs=True)
+class IngestStats:
+    rows: int = field(default=0)
+    bytes_read: int = field(default=0)
+    failed: int = field(default=0)
+    """Rows that are not JSON, have no map or do not decode."""
+    invalid: int = field(default=0)
+    """Maps with validation issues, skipped unless ``skip_invalid=False``."""
+    duplicates: int = field(default=0)
+    stored: int = field(default=0)
+    started: float = field(factory=time.monotonic, repr=False)
+    finished: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / max(self.elapsed, 1e-9)
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_read / 1e6 / max(self.elapsed, 1e-9)
+
+    def __str__(self) -> str:
+        return (
+            f'{self.rows} rows ({self.rows_per_second:.0f}/s, '
+            f'{self.megabytes_per_second:.1f} MB/s): {self.stored} stored, '
+            f'{self.duplicates} duplicates, {self.invalid} invalid, {self.failed} failed'
+        )
+
+
+def read_dump(source: 'DumpSource') -> Iterator[Tuple[int, str]]:
+    """
+    Yields ``(line number, line)`` for every non-empty line of a JSONL dump.
+
+    ``source`` is a path (``.gz`` files are decompressed on the fly), an open text file or
+    any iterable of lines. Lines are read one at a time, the dump is never loaded whole.
+    """
+
+    if isinstance(source, (str, PathLike)):
+        path = Path(source)
+        opener = gzip.open if path.suffix == '.gz' else Path.open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            yield from read_dump(file)
+        return
+    for number, line in enumerate(source, 1):
+        if line.strip():
+            yield number, line
+
+
+def _process_chunk(chunk: '_Chunk') -> List['_Result']:
+    lines, column, validate, include_metadata = chunk
+    results = []
+    for number, line in lines:
+        leveldata = ''
+        row = {}
+        try:
+            data = json.loads(line)
+            if isinstance(data, str):
+                leveldata = data
+            else:
+                row = data
+                leveldata = row.pop(column)
+            bonk_map = BonkMap.decode_from_database(leveldata)
+            issues = tuple(map(str, bonk_map.validate())) if validate else ()
+            fingerprint = bonk_map.fingerprint(include_metadata=include_metadata)
+        except Exception as error:
+            # A broken row must not stop the dump.
+            results.append(
+                (number, None, leveldata, row, None, None, (repr(error),)),
+            )
+            continue
+        # A detached copy, the metadata would otherwise keep the whole map alive.
+        metadata = copy.copy(bonk_map.metadata)
+        stats = MapStats.from_map(bonk_map, size=len(leveldata))
+        results.append(
+            (number, fingerprint, leveldata, row, metadata, stats, issues),
+        )
+    return results
+
+
+def _chunks(
+    lines: Iterator[Tuple[int, str]],
+    chunksize: int,
+    stats: 'IngestStats',
+) -> Iterator[List[Tuple[int, str]]]:
+    chunk = []
+    for number, line in lines:
+        stats.rows += 1
+        stats.bytes_read += len(line)
+        chunk.append((number, line))
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_dump(
+    source: 'DumpSource',
+    *,
+    column: str = 'leveldata',
+    processes: Optional[int] = None,
+    chunksize: int = 64,
+    max_pending: Optional[int] = None,
+    validate: bool = True,
+    skip_invalid: bool = True,
+    include_metadata: bool = False,
+    seen: Optional[MutableSet[str]] = None,
+    stats: Optional['IngestStats'] = None,
+    progress: Optional[Callable[['IngestStats'], None]] = None,
+    progress_interval: float = 1.0,
+) -> Iterator['IngestRecord']:
+    """
+    Streams the unique, decodable maps of a JSONL dump of map rows, in dump order.
+
+    Lines are read lazily and decoded, validated and fingerprinted in chunks of
+    ``chunksize`` rows on a process pool (``processes=0`` works in the calling process).
+    At most ``max_pending`` chunks are in flight and the next chunk is only read once the
+    oldest one has been consumed, so memory does not grow with the dump. Rows are JSON
+    objects with the map in ``column``, or bare JSON strings.
+
+    Duplicates are detected by :meth:`BonkMap.fingerprint` against ``seen``, which only
+    grows with the number of distinct maps; pass a persistent set to dedupe across runs.
+    ``progress`` is called with ``stats`` at most every ``progress_interval`` seconds and
+    once at the end.
+    """
+
+    stats = stats if stats is not None else IngestStats()
+    seen = seen if seen is not None else set()
+    workers = processes if processes is not None else os.cpu_count() or 1
+    max_pending = max_pending if max_pending is not None else 2 * max(workers, 1)
+    chunks = _chunks(read_dump(source), chunksize, stats)
+    last_report = time.monotonic()
+
+    def consume(results: List['_Result']) -> Iterator['IngestRecord']:
+        nonlocal last_report
+        for number, fingerprint, leveldata, row, metadata, map_stats, issues in results:
+            if fingerprint is None:
+                stats.failed += 1
+                continue
+            if issues:
+                stats.invalid += 1
+                if skip_invalid:
+                    continue
+            if fingerprint in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(fingerprint)
+            stats.stored += 1
+            yield IngestRecord(
+                line=number,
+                fingerprint=fingerprint,
+                leveldata=leveldata,
+                metadata=metadata,
+                stats=map_stats,
+                row=row,
+                issues=issues,
+            )
+        if progress is not None and time.monotonic() - last_report >= progress_interval:
+            last_report = time.monotonic()
+            progress(stats)
+
+    try:
+        if workers == 0:
+            for chunk in chunks:
+                yield from consume(
+                    _process_chunk((chunk, column, validate, include_metadata)),
+                )
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future] = deque()
+            try:
+                for chunk in chunks:
+                    pending.append(
+                        executor.submit(
+                            _process_chunk,
+                            (chunk, column, validate, include_metadata),
+                        ),
+                    )
+                    if len(pending) >= max_pending:
+                        yield from consume(pending.popleft().result())
+                while pending:
+                    yield from consume(pending.popleft().result())
+            finally:
+                # Stopping early must not wait for chunks nobody will consume.
+                for future in pending:
+                    future.cancel()
+    finally:
+        stats.finished = time.monotonic()
+        if progress is not None:
+            progress(stats)
+
+
+def ingest_dump(
+    source: 'DumpSource',
+    store: Callable[['IngestRecord'], object],
+    **options: Any,
+) -> 'IngestStats':
+    """Feeds every record of :func:`iter_dump` to ``store`` and returns the final stats."""
+    stats = IngestStats()
+    for record in iter_dump(source, stats=stats, **options):
+        store(record)
+    return stats
@@ -0,0 +1,243 @@
+import math
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from attrs import define, field
+
+from ..types.map.bonkmap import BonkMap
+from ..types.map.geometry import AABB, FixtureGeometry
+
+Point = Tuple[float, float]
+
+# Visible playfield of a bonk room at the default zoom, the origin is the centre.
+DEFAULT_VIEW = AABB(-365, -250, 365, 250)
+DEFAULT_BACKGROUND = 0x222222
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _rgb(color: int) -> bytes:
+    return bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+
+
+@define(slots=True, auto_attribs=True)
+class RasterImage:
+    """Packed 8-bit RGB pixels, row by row from the top left corner."""
+
+    width: int
+    height: int
+    pixels: bytearray = field(repr=False)
+
+    @classmethod
+    def blank(
+        cls, width: int, height: int, color: int = DEFAULT_BACKGROUND
+    ) -> 'RasterImage':
+        return cls(
+            width=width, height=height, pixels=bytearray(_rgb(color) * (width * height))
+        )
+
+    def get_pixel(self, x: int, y: int) -> int:
+        offset = (y * self.width + x) * 3
+        red, green, blue = self.pixels[offset : offset + 3]
+        return (red << 16) | (green << 8) | blue
+
+    def fill_span(self, y: int, x0: int, x1: int, color: bytes) -> None:
+        x0 = max(x0, 0)
+        x1 = min(x1, self.width)
+        if x0 >= x1 or not 0 <= y < self.height:
+            return
+        row = y * self.width
+        self.pixels[(row + x0) * 3 : (row + x1) * 3] = color * (x1 - x0)
+
+    def to_png(self, compress_level: int = 6) -> bytes:
+        stride = self.width * 3
+        raw = bytearray()
+        for y in range(self.height):
+            raw.append(0)  # filter type None
+            raw += self.pixels[y * stride : (y + 1) * stride]
+        header = struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)
+        return b''.join(
+            (
+                _PNG_SIGNATURE,
+                _png_chunk(b'IHDR', header),
+                _png_chunk(b'IDAT', zlib.compress(bytes(raw), compress_level)),
+                _png_chunk(b'IEND', b''),
+            ),
+        )
+
+    def save(
+        self, file: Union[str, PathLike, BinaryIO], compress_level: int = 6
+    ) -> None:
+        data = self.to_png(compress_level)
+        if isinstance(file, (str, PathLike)):
+            Path(file).write_bytes(data)
+        else:
+            file.write(data)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack('>I', len(data))
+        + kind
+        + data
+        + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+    )
+
+
+def _fill_polygon(image: 'RasterImage', points: Sequence[Point], color: bytes) -> None:
+    """Even-odd scanline fill, sampling at pixel centres."""
+    ys = [point[1] for point in points]
+    top = max(math.ceil(min(ys) - 0.5), 0)
+    bottom = min(math.ceil(max(ys) - 0.5), image.height)
+    edges = [
+        (points[i - 1], points[i])
+        for i in range(len(points))
+        if points[i - 1][1] != points[i][1]
+    ]
+    for y in range(top, bottom):
+        center = y + 0.5
+        crossings = []
+        for (x1, y1), (x2, y2) in edges:
+            if (y1 <= center) != (y2 <= center):
+                crossings.append(x1 + (center - y1) * (x2 - x1) / (y2 - y1))
+        crossings.sort()
+        for i in range(0, len(crossings) - 1, 2):
+            image.fill_span(
+                y,
+                math.ceil(crossings[i] - 0.5),
+                math.ceil(crossings[i + 1] - 0.5),
+                color,
+            )
+
+
+def _fill_circle(
+    image: 'RasterImage', center: Point, radius: float, color: bytes
+) -> None:
+    cx, cy = center
+    top = max(math.ceil(cy - radius - 0.5), 0)
+    bottom = min(math.ceil(cy + radius - 0.5), image.height)
+    for y in range(top, bottom):
+        dy = y + 0.5 - cy
+        dx_squared = radius * radius - dy * dy
+        if dx_squared <= 0:
+            continue
+        dx = math.sqrt(dx_squared)
+        image.fill_span(y, math.ceil(cx - dx - 0.5), math.ceil(cx + dx - 0.5), color)
+
+
+def _render_order(
+    bonk_map: 'BonkMap', geometries: List['FixtureGeometry']
+) -> List['FixtureGeometry']:
+    """
+    Orders fixtures back to front. ``physics.bro`` lists bodies front to back (the editor
+    puts new bodies first), bodies missing from it are drawn behind the rest.
+    """
+
+    by_body: Dict[int, List[FixtureGeometry]] = {}
+    for fixture_geometry in geometries:
+        by_body.setdefault(fixture_geometry.body_id, []).append(fixture_geometry)
+    front_to_back = dict.fromkeys(bonk_map.physics.bro)
+    ordered = [body_id for body_id in by_body if body_id not in front_to_back]
+    ordered += reversed(list(front_to_back))
+    return [
+        fixture_geometry
+        for body_id in ordered
+        for fixture_geometry in by_body.get(body_id, ())
+    ]
+
+
+def render_map(
+    bonk_map: 'BonkMap',
+    width: int = 365,
+    height: int = 250,
+    *,
+    view: Optional['AABB'] = None,
+    fit: bool = False,
+    background: int = DEFAULT_BACKGROUND,
+) -> 'RasterImage':
+    """
+    Draws every fixture of ``bonk_map`` with its colour into a new image.
+
+    By default the image shows the playfield a bonk client sees (``DEFAULT_VIEW``).
+    ``fit=True`` frames the map bounds instead, ``view`` sets an explicit area. The
+    aspect ratio of the view is kept, extra space is left as background.
+    """
+
+    geometry = bonk_map.geometry()
+    if view is None:
+        view = DEFAULT_VIEW
+        if fit and geometry.bounds is not None:
+            view = geometry.bounds
+    scale = min(width / max(view.width, 1e-9), height / max(view.height, 1e-9))
+    offset_x = (width - view.width * scale) / 2 - view.min_x * scale
+    offset_y = (height - view.height * scale) / 2 - view.min_y * scale
+
+    image = RasterImage.blank(width, height, background)
+    fixtures = bonk_map.physics.fixtures
+    colors = {}
+    for fixture_geometry in _render_order(bonk_map, geometry.fixtures):
+        color_value = fixtures[fixture_geometry.fixture_id].color
+        color = colors.get(color_value)
+        if color is None:
+            color = colors[color_value] = _rgb(color_value)
+        if fixture_geometry.is_circle:
+            x, y = fixture_geometry.center
+            _fill_circle(
+                image,
+                (x * scale + offset_x, y * scale + offset_y),
+                fixture_geometry.radius * scale,
+                color,
+            )
+        else:
+            _fill_polygon(
+                image,
+                [
+                    (x * scale + offset_x, y * scale + offset_y)
+                    for x, y in fixture_geometry.vertices
+                ],
+                color,
+            )
+    return image
+
+
+def _render_encoded(args: Tuple[str, int, int, bool]) -> bytes:
+    encoded, width, height, fit = args
+    return render_map(
+        BonkMap.decode_from_database(encoded), width, height, fit=fit
+    ).to_png()
+
+
+def render_thumbnails(
+    encoded_maps: Iterable[str],
+    width: int = 365,
+    height: int = 250,
+    *,
+    fit: bool = False,
+    processes: Optional[int] = None,
+    chunksize: int = 16,
+) -> List[bytes]:
+    """
+    Renders database-encoded maps to PNG bytes across a process pool, in input order.
+
+    Maps are passed as database strings so only short strings and PNG bytes cross
+    process boundaries. ``processes=0`` renders in the calling process.
+    """
+
+    jobs = [(encoded, width, height, fit) for encoded in encoded_maps]
+    if processes == 0:
+        return [_render_encoded(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_render_encoded, jobs, chunksize=chunksize))
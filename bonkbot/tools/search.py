@@ -0,0 +1,456 @@
+import bisect
+import gzip
+import heapq
+import json
+import re
+from itertools import islice
+from operator import attrgetter
+from os import PathLike
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from attrs import define, field
+
+from ..types.mode import Mode
+
+if TYPE_CHECKING:
+    from ..types.map.bonkmap import BonkMap
+    from ..types.map.map_metadata import MapMetadata
+    from .ingest import IngestRecord
+
+Key = Union[str, int]
+Bound = Optional[Union[int, float, str]]
+Range = Tuple[Bound, Bound]
+
+_INDEX_VERSION = 1
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a map name, punctuation and underscores split words."""
+    return _TOKEN.findall(text.lower())
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MapStats:
+    """Structural counts that can be filtered on without decoding the map again."""
+
+    shapes: int = field(default=0)
+    fixtures: int = field(default=0)
+    bodies: int = field(default=0)
+    joints: int = field(default=0)
+    spawns: int = field(default=0)
+    cap_zones: int = field(default=0)
+    size: int = field(default=0)
+    """Length of the database encoding."""
+
+    @classmethod
+    def from_map(cls, bonk_map: 'BonkMap', *, size: Optional[int] = None) -> 'MapStats':
+        """``size`` skips encoding the map when the database string is at hand."""
+        physics = bonk_map.physics
+        return cls(
+            shapes=len(physics.shapes),
+            fixtures=len(physics.fixtures),
+            bodies=len(physics.bodies),
+            joints=len(physics.joints),
+            spawns=len(bonk_map.spawns),
+            cap_zones=len(bonk_map.cap_zones),
+            size=len(bonk_map.encode_to_database()) if size is None else size,
+        )
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MapEntry:
+    key: Key
+    name: str
+    author: str
+    mode: 'Mode'
+    contributors: Tuple[str, ...]
+    date: str
+    published: bool
+    votes_up: int
+    votes_down: int
+    database_id: int
+    stats: 'MapStats'
+
+    @classmethod
+    def from_metadata(
+        cls, key: Key, metadata: 'MapMetadata', stats: 'MapStats'
+    ) -> 'MapEntry':
+        return cls(
+            key=key,
+            name=metadata.name,
+            author=metadata.author,
+            mode=metadata.mode,
+            contributors=tuple(metadata.contributors),
+            date=metadata.date,
+            published=metadata.is_published,
+            votes_up=metadata.votes_up or 0,
+            votes_down=metadata.votes_down or 0,
+            database_id=metadata.database_id,
+            stats=stats,
+        )
+
+
+_STATS_FIELDS = [attribute.name for attribute in MapStats.__attrs_attrs__]
+# Fields that can be range-filtered and sorted on, ``score`` is up minus down votes.
+_SORT_FIELDS: Dict[str, Callable[['MapEntry'], Any]] = {
+    'name': lambda entry: entry.name.lower(),
+    'author': lambda entry: entry.author.lower(),
+    'date': attrgetter('date'),
+    'votes_up': attrgetter('votes_up'),
+    'votes_down': attrgetter('votes_down'),
+    'score': lambda entry: entry.votes_up - entry.votes_down,
+    'database_id': attrgetter('database_id'),
+    **{name: attrgetter(f'stats.{name}') for name in _STATS_FIELDS},
+}
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MapQuery:
+    """
+    A compound query, every given filter must match.
+
+    ``name`` matches maps that have a name token starting with each query token, so
+    ``'arena'`` finds "Big Arenas". ``author`` and ``contributor`` are case-insensitive
+    exact matches. ``ranges`` maps a sortable field (``votes_up``, ``score``, ``date``,
+    ``shapes``, ``size``, ...) to inclusive ``(min, max)`` bounds, ``None`` leaves a side
+    open. ``order_by`` is such a field, prefixed with ``-`` for descending order.
+    """
+
+    name: Optional[str] = field(default=None)
+    author: Optional[str] = field(default=None)
+    contributor: Optional[str] = field(default=None)
+    mode: Optional['Mode'] = field(default=None)
+    published: Optional[bool] = field(default=None)
+    ranges: Dict[str, Range] = field(factory=dict)
+    order_by: Optional[str] = field(default=None)
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class SearchPage:
+    entries: Tuple['MapEntry', ...]
+    total: int
+    """Number of matches across all pages."""
+    offset: int
+    limit: int
+
+    @property
+    def keys(self) -> List[Key]:
+        return [entry.key for entry in self.entries]
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.entries) < self.total
+
+
+@define(slots=True, auto_attribs=True)
+class MapSearchIndex:
+    """
+    Inverted index over the metadata and structural stats of a map collection.
+
+    Name tokens, authors, contributors and modes have posting sets, range filters use
+    sorted columns built on first use after a change. Queries never touch map data,
+    entries are small records, so an index of 100k maps answers in milliseconds.
+    :meth:`save` and :meth:`load` persist the entries, postings are rebuilt on load.
+    """
+
+    _entries: List[Optional['MapEntry']] = field(init=False, factory=list, repr=False)
+    _documents: Dict[Key, int] = field(init=False, factory=dict, repr=False)
+    _tokens: Dict[str, Set[int]] = field(init=False, factory=dict, repr=False)
+    _authors: Dict[str, Set[int]] = field(init=False, factory=dict, repr=False)
+    _contributors: Dict[str, Set[int]] = field(init=False, factory=dict, repr=False)
+    _modes: Dict['Mode', Set[int]] = field(init=False, factory=dict, repr=False)
+    # Sorted token vocabulary for prefix matches and (value, document) columns for ranges,
+    # dropped on every change.
+    _vocabulary: Optional[List[str]] = field(init=False, default=None, repr=False)
+    _columns: Dict[str, List[Tuple[Any, int]]] = field(
+        init=False, factory=dict, repr=False
+    )
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._documents
+
+    def __iter__(self) -> Iterator['MapEntry']:
+        return (entry for entry in self._entries if entry is not None)
+
+    def get(self, key: Key) -> Optional['MapEntry']:
+        document = self._documents.get(key)
+        return None if document is None else self._entries[document]
+
+    def add(self, key: Key, bonk_map: 'BonkMap') -> 'MapEntry':
+        """Indexes ``bonk_map`` under ``key``, replacing any map stored under the same key."""
+        return self.add_entry(
+            MapEntry.from_metadata(key, bonk_map.metadata, MapStats.from_map(bonk_map)),
+        )
+
+    def add_record(
+        self, record: 'IngestRecord', key: Optional[Key] = None
+    ) -> 'MapEntry':
+        """Indexes a dump record without decoding it again, keyed by its fingerprint."""
+        return self.add_entry(
+            MapEntry.from_metadata(
+                record.fingerprint if key is None else key,
+                record.metadata,
+                record.stats,
+            ),
+        )
+
+    def add_entry(self, entry: 'MapEntry') -> 'MapEntry':
+        if entry.key in self._documents:
+            self.remove(entry.key)
+        document = len(self._entries)
+        self._entries.append(entry)
+        self._documents[entry.key] = document
+        for token in set(tokenize(entry.name)):
+            self._tokens.setdefault(token, set()).add(document)
+        self._authors.setdefault(entry.author.lower(), set()).add(document)
+        for contributor in {name.lower() for name in entry.contributors}:
+            self._contributors.setdefault(contributor, set()).add(document)
+        self._modes.setdefault(entry.mode, set()).add(document)
+        self._invalidate()
+        return entry
+
+    def remove(self, key: Key) -> None:
+        document = self._documents.pop(key)
+        entry = self._entries[document]
+        self._entries[document] = None
+        for token in set(tokenize(entry.name)):
+            _discard(self._tokens, token, document)
+        _discard(self._authors, entry.author.lower(), document)
+        for contributor in {name.lower() for name in entry.contributors}:
+            _discard(self._contributors, contributor, document)
+        _discard(self._modes, entry.mode, document)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._vocabulary = None
+        if self._columns:
+            self._columns = {}
+
+    def _name_documents(self, token: str) -> Set[int]:
+        exact = self._tokens.get(token)
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            vocabulary = self._vocabulary = sorted(self._tokens)
+        start = bisect.bisect_left(vocabulary, token)
+        end = bisect.bisect_left(vocabulary, token + '\U0010ffff', start)
+        if end - start == 1 and exact is not None:
+            return exact
+        documents: Set[int] = set()
+        for index in range(start, end):
+            documents |= self._tokens[vocabulary[index]]
+        return documents
+
+    def _column(self, name: str) -> List[Tuple[Any, int]]:
+        column = self._columns.get(name)
+        if column is None:
+            getter = _SORT_FIELDS[name]
+            column = self._columns[name] = sorted(
+                (getter(entry), document)
+                for document, entry in enumerate(self._entries)
+                if entry is not None
+            )
+        return column
+
+    def _range_documents(self, name: str, bounds: 'Range') -> List[int]:
+        column = self._column(name)
+        low, high = bounds
+        start = 0 if low is None else bisect.bisect_left(column, (low,))
+        # Every document id is smaller than the length of the entries list.
+        end = (
+            len(column)
+            if high is None
+            else bisect.bisect_right(column, (high, len(self._entries)))
+        )
+        return [document for _, document in column[start:end]]
+
+    def _matching(self, query: 'MapQuery') -> Optional[Set[int]]:
+        """Documents matching ``query``, ``None`` when it has no filters at all."""
+        sets: List[Set[int]] = []
+        if query.name is not None:
+            sets.extend(self._name_documents(token) for token in tokenize(query.name))
+        if query.author is not None:
+            sets.append(self._authors.get(query.author.lower(), set()))
+        if query.contributor is not None:
+            sets.append(self._contributors.get(query.contributor.lower(), set()))
+        if query.mode is not None:
+            sets.append(self._modes.get(query.mode, set()))
+        for name in query.ranges:
+            if name not in _SORT_FIELDS:
+                raise ValueError(f'Unknown range field: {name}')
+
+        ranges = list(query.ranges.items())
+        if sets:
+            sets.sort(key=len)
+            documents = set(sets[0])
+            for other in sets[1:]:
+                documents &= other
+        elif ranges:
+            # Without term filters the first range seeds the candidates.
+            name, bounds = ranges.pop(0)
+            documents = set(self._range_documents(name, bounds))
+        elif query.published is None:
+            return None
+        else:
+            documents = set(self._documents.values())
+
+        entries = self._entries
+        for name, (low, high) in ranges:
+            getter = _SORT_FIELDS[name]
+            documents = {
+                document
+                for document in documents
+                if (low is None or getter(entries[document]) >= low)
+                and (high is None or getter(entries[document]) <= high)
+            }
+        if query.published is not None:
+            documents = {
+                document
+                for document in documents
+                if entries[document].published == query.published
+            }
+        return documents
+
+    def search(
+        self,
+        query: Optional['MapQuery'] = None,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> 'SearchPage':
+        """Returns one page of maps matching ``query``, in insertion order by default."""
+        query = query if query is not None else MapQuery()
+        documents = self._matching(query)
+        total = len(self._documents) if documents is None else len(documents)
+        entries = self._entries
+        wanted = offset + limit
+        order_by = query.order_by
+        if order_by is None:
+            if documents is None:
+                page = list(islice(self._documents.values(), wanted))
+            else:
+                page = heapq.nsmallest(wanted, documents)
+        else:
+            name = order_by.lstrip('-')
+            descending = order_by.startswith('-')
+            if name not in _SORT_FIELDS:
+                raise ValueError(f'Unknown order field: {name}')
+            if documents is None or len(documents) * 8 > total:
+                # Broad matches walk the sorted column instead of sorting the matches.
+                column = self._column(name)
+                ordered = (
+                    document
+                    for _, document in (reversed(column) if descending else column)
+                )
+                if documents is not None:
+                    ordered = (
+                        document for document in ordered if document in documents
+                    )
+                page = list(islice(ordered, wanted))
+            else:
+                getter = _SORT_FIELDS[name]
+                select = heapq.nlargest if descending else heapq.nsmallest
+                page = select(
+                    wanted,
+                    documents,
+                    key=lambda document: (getter(entries[document]), document),
+                )
+        return SearchPage(
+            entries=tuple(entries[document] for document in page[offset:]),
+            total=total,
+            offset=offset,
+            limit=limit,
+        )
+
+    def save(self, path: Union[str, PathLike]) -> None:
+        """Writes the entries as JSON, gzipped when the path ends with ``.gz``."""
+        rows = [
+            [
+                entry.key,
+                entry.name,
+                entry.author,
+                entry.mode.value.id,
+                list(entry.contributors),
+                entry.date,
+                entry.published,
+                entry.votes_up,
+                entry.votes_down,
+                entry.database_id,
+                [getattr(entry.stats, name) for name in _STATS_FIELDS],
+            ]
+            for entry in self
+        ]
+        data = json.dumps(
+            {'version': _INDEX_VERSION, 'stats': _STATS_FIELDS, 'entries': rows},
+            separators=(',', ':'),
+        )
+        path = Path(path)
+        if path.suffix == '.gz':
+            path.write_bytes(gzip.compress(data.encode()))
+        else:
+            path.write_text(data, encoding='utf-8')
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike]) -> 'MapSearchIndex':
+        path = Path(path)
+        raw = path.read_bytes()
+        if path.suffix == '.gz':
+            raw = gzip.decompress(raw)
+        data = json.loads(raw)
+        if data['version'] != _INDEX_VERSION:
+            raise ValueError(f'Unsupported index version: {data["version"]}')
+        stats_fields = data['stats']
+        index = cls()
+        for row in data['entries']:
+            (
+                key,
+                name,
+                author,
+                mode_id,
+                contributors,
+                date,
+                published,
+                votes_up,
+                votes_down,
+                database_id,
+                stats,
+            ) = row
+            index.add_entry(
+                MapEntry(
+                    key=key,
+                    name=name,
+                    author=author,
+                    mode=Mode.from_mode_id(mode_id),
+                    contributors=tuple(contributors),
+                    date=date,
+                    published=published,
+                    votes_up=votes_up,
+                    votes_down=votes_down,
+                    database_id=database_id,
+                    stats=MapStats(**dict(zip(stats_fields, stats))),
+                ),
+            )
+        return index
+
+
+def _discard(postings: Dict[Any, Set[int]], key: Any, document: int) -> None:
+    documents = postings.get(key)
+    if documents is not None:
+        documents.discard(document)
+        if not documents:
+            del postings[key]
@@ -0,0 +1,222 @@
+import hashlib
+import math
+import random
+from typing import TYPE_CHECKING, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from attrs import define, field
+
+from ..types.map.physics.shape.box_shape import BoxShape
+from ..types.map.physics.shape.circle_shape import CircleShape
+from ..types.map.physics.shape.polygon_shape import PolygonShape
+
+if TYPE_CHECKING:
+    from ..types.map.bonkmap import BonkMap
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_ANGLE_STEPS = 24
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MapSignature:
+    minhash: Tuple[int, ...]
+    shingles: int
+
+    def similarity(self, other: 'MapSignature') -> float:
+        """Estimated Jaccard similarity of the two maps' shape descriptors."""
+        if len(self.minhash) != len(other.minhash):
+            raise ValueError('Signatures were built with different permutation counts')
+        if self.shingles == 0 or other.shingles == 0:
+            return 1.0 if self.shingles == other.shingles else 0.0
+        same = sum(1 for a, b in zip(self.minhash, other.minhash) if a == b)
+        return same / len(self.minhash)
+
+
+def _quantize(value: float, step: float) -> int:
+    return math.floor(value / step + 0.5)
+
+
+def _quantize_angle(angle: float) -> int:
+    return _quantize(angle % math.tau, math.tau / _ANGLE_STEPS) % _ANGLE_STEPS
+
+
+def _rotate(point: Tuple[float, float], angle: float) -> Tuple[float, float]:
+    cos, sin = math.cos(angle), math.sin(angle)
+    return point[0] * cos - point[1] * sin, point[0] * sin + point[1] * cos
+
+
+def map_shingles(bonk_map: 'BonkMap', grid: float = 16.0) -> Iterator[tuple]:
+    """
+    Yields quantized descriptors of every fixture and spawn in ``bonk_map``.
+
+    A descriptor is the shape kind, its world position, size and angle snapped to ``grid``
+    pixels or 15 degree steps, plus the flags that change gameplay. Small nudges of a remix
+    keep most descriptors identical, which is what MinHash estimates.
+    """
+
+    physics = bonk_map.physics
+    shapes = physics.shapes
+    fixtures = physics.fixtures
+    for body in physics.bodies:
+        body_type = body.shape.body_type.value
+        for fixture_id in body.fixtures:
+            if not 0 <= fixture_id < len(fixtures):
+                continue
+            fixture = fixtures[fixture_id]
+            if not 0 <= fixture.shape_id < len(shapes):
+                continue
+            shape = shapes[fixture.shape_id]
+            offset = _rotate(shape.position, body.angle)
+            x = _quantize(body.position[0] + offset[0], grid)
+            y = _quantize(body.position[1] + offset[1], grid)
+            flags = (body_type, fixture.death, fixture.no_physics, fixture.no_grapple)
+            if isinstance(shape, BoxShape):
+                size = (_quantize(shape.width, grid), _quantize(shape.height, grid))
+                angle = _quantize_angle(body.angle + shape.angle)
+            elif isinstance(shape, CircleShape):
+                size = (_quantize(shape.radius, grid),)
+                angle = 0
+            elif isinstance(shape, PolygonShape):
+                xs = [vertex[0] * shape.scale for vertex in shape.vertices] or [0.0]
+                ys = [vertex[1] * shape.scale for vertex in shape.vertices] or [0.0]
+                size = (
+                    len(shape.vertices),
+                    _quantize(max(xs) - min(xs), grid),
+                    _quantize(max(ys) - min(ys), grid),
+                )
+                angle = _quantize_angle(body.angle + shape.angle)
+            else:
+                size = ()
+                angle = 0
+            yield (type(shape).__name__, x, y, angle, size, flags)
+    for spawn in bonk_map.spawns:
+        yield (
+            'Spawn',
+            _quantize(spawn.position[0], grid),
+            _quantize(spawn.position[1], grid),
+            spawn.ffa,
+            spawn.red,
+            spawn.blue,
+        )
+
+
+def _hash_shingle(shingle: tuple) -> int:
+    digest = hashlib.blake2b(repr(shingle).encode(), digest_size=4).digest()
+    return int.from_bytes(digest, 'little')
+
+
+@define(slots=True, auto_attribs=True)
+class MapSimilarityIndex:
+    """
+    Incremental MinHash / LSH index for finding near-duplicate maps.
+
+    Every map is reduced to a :class:`MapSignature` once, on :meth:`add`. The signature is cut
+    into ``bands`` and each band is a key into its own hash table, so :meth:`query` only
+    compares against maps that share at least one band instead of the whole collection.
+    Two maps with Jaccard similarity ``s`` collide with probability ``1 - (1 - s**r)**b``.
+    """
+
+    num_perm: int = field(default=64)
+    bands: int = field(default=16)
+    grid: float = field(default=16.0)
+    seed: int = field(default=1)
+
+    _permutations: List[Tuple[int, int]] = field(init=False, repr=False)
+    _buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = field(init=False, repr=False)
+    _signatures: Dict[Hashable, MapSignature] = field(
+        init=False, repr=False, factory=dict
+    )
+
+    def __attrs_post_init__(self) -> None:
+        if self.num_perm % self.bands != 0:
+            raise ValueError('num_perm must be a multiple of bands')
+        rng = random.Random(self.seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(self.num_perm)
+        ]
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    @property
+    def rows(self) -> int:
+        return self.num_perm // self.bands
+
+    def signature(self, bonk_map: 'BonkMap') -> 'MapSignature':
+        hashes = {
+            _hash_shingle(shingle) for shingle in map_shingles(bonk_map, self.grid)
+        }
+        minhash = []
+        for a, b in self._permutations:
+            minhash.append(
+                min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+                if hashes
+                else _MAX_HASH,
+            )
+        return MapSignature(minhash=tuple(minhash), shingles=len(hashes))
+
+    def _band_keys(self, signature: 'MapSignature') -> Iterator[Tuple[int, ...]]:
+        rows = self.rows
+        for band in range(self.bands):
+            yield signature.minhash[band * rows : (band + 1) * rows]
+
+    def add(self, key: Hashable, bonk_map: 'BonkMap') -> 'MapSignature':
+        """Indexes ``bonk_map`` under ``key``, replacing any map stored under the same key."""
+        return self.add_signature(key, self.signature(bonk_map))
+
+    def add_signature(self, key: Hashable, signature: 'MapSignature') -> 'MapSignature':
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, set()).add(key)
+        return signature
+
+    def remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def get_signature(self, key: Hashable) -> Optional['MapSignature']:
+        return self._signatures.get(key)
+
+    def query(
+        self,
+        bonk_map: 'BonkMap',
+        *,
+        threshold: float = 0.5,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """Returns ``(key, similarity)`` of indexed maps similar to ``bonk_map``, best first."""
+        return self.query_signature(
+            self.signature(bonk_map), threshold=threshold, limit=limit
+        )
+
+    def query_signature(
+        self,
+        signature: 'MapSignature',
+        *,
+        threshold: float = 0.5,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        candidates: Set[Hashable] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = signature.similarity(self._signatures[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        if limit is not None:
+            del matches[limit:]
+        return matches
@@ -71,15 +71,7 @@ class Avatar:
             else:
                 buffer.write_uint8(0x05)
 
-            buffer.write_int16(1)
-            buffer.write_int16(layer.id)
-            buffer.write_float32(layer.scale)
-            buffer.write_float32(layer.angle)
-            buffer.write_float32(layer.x)
-            buffer.write_float32(layer.y)
-            buffer.write_bool(layer.flip_x)
-            buffer.write_bool(layer.flip_y)
-            buffer.write_int32(layer.color)
+            layer.to_buffer(buffer)
 
         buffer.write_int32(self.base_color)
 
@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING, Optional
 
 from attrs import define, field
 
+from ...pson.schema import BinarySchema, const, scalar
+
 if TYPE_CHECKING:
     from ...pson.bytebuffer import ByteBuffer
 
@@ -27,18 +29,11 @@ class Layer:
             buffer.read_uint8()
             buffer.read_uint8()
             buffer.read_uint8()
-        buffer.read_int16()
-        layer = Layer(
-            id=buffer.read_uint16(),
-            scale=buffer.read_float32(),
-            angle=buffer.read_float32(),
-            x=buffer.read_float32(),
-            y=buffer.read_float32(),
-            flip_x=buffer.read_bool(),
-            flip_y=buffer.read_bool(),
-            color=buffer.read_int32(),
-        )
-        return layer
+        return LAYER_SCHEMA.decode(Layer(), buffer)
+
+    def to_buffer(self, buffer: 'ByteBuffer') -> None:
+        """Writes the layer body, the markers in front of it are written by `Avatar`."""
+        LAYER_SCHEMA.encode(self, buffer)
 
     @staticmethod
     def from_json(data: dict) -> 'Layer':
@@ -65,3 +60,16 @@ class Layer:
             'flipY': self.flip_y,
             'color': self.color,
         }
+
+
+LAYER_SCHEMA = BinarySchema(
+    const('h', 1),
+    scalar('id', 'H'),
+    scalar('scale', 'f'),
+    scalar('angle', 'f'),
+    scalar('x', 'f'),
+    scalar('y', 'f'),
+    scalar('flip_x', '?'),
+    scalar('flip_y', '?'),
+    scalar('color', 'i'),
+)
@@ -2,6 +2,7 @@ from .api_error import ApiError
 from .bot_already_logged_error import BotAlreadyLoggedInError
 from .bot_not_logged_error import BotNotLoggedInError
 from .error_type import ErrorType
+from .map_validation_error import MapValidationError
 from .room_already_connected import RoomAlreadyConnected
 from .room_not_connected import RoomNotConnected
 
@@ -10,6 +11,7 @@ __all__ = [
     'BotAlreadyLoggedInError',
     'BotNotLoggedInError',
     'ErrorType',
+    'MapValidationError',
     'RoomAlreadyConnected',
     'RoomNotConnected',
 ]
@@ -0,0 +1,13 @@
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from ..map.validation import MapIssue
+
+
+class MapValidationError(Exception):
+    def __init__(self, issues: List['MapIssue']):
+        self.issues = issues
+        details = '; '.join(str(issue) for issue in issues[:5])
+        if len(issues) > 5:
+            details += f'; and {len(issues) - 5} more'
+        super().__init__(f'Map failed validation: {details}')
@@ -1,17 +1,35 @@
 from . import physics
+from .binary_format import binary_to_database, database_to_binary
 from .bonkmap import BonkMap
 from .capture_type import CaptureType
 from .capture_zone import CaptureZone
+from .compaction import CompactResult
+from .geometry import AABB, FixtureGeometry, MapGeometry
 from .map_metadata import MapMetadata
 from .map_properties import MapProperties
+from .minifier import MinifyReport
+from .physics_graph import PhysicsGraph
 from .spawn import Spawn
+from .transform import AffineTransform
+from .validation import MapIssue, MapIssueType
 
 __all__ = [
+    'AABB',
+    'AffineTransform',
     'BonkMap',
     'CaptureType',
     'CaptureZone',
+    'CompactResult',
+    'FixtureGeometry',
+    'MapGeometry',
+    'MapIssue',
+    'MapIssueType',
     'MapMetadata',
     'MapProperties',
+    'MinifyReport',
+    'PhysicsGraph',
     'Spawn',
+    'binary_to_database',
+    'database_to_binary',
     'physics',
 ]
@@ -0,0 +1,739 @@
+import math
+import struct
+import sys
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from ..mode import Mode
+from .capture_type import CaptureType
+from .capture_zone import CaptureZone
+from .map_metadata import MapMetadata
+from .map_properties import MapProperties
+from .physics.body.body import Body
+from .physics.body.body_force import BodyForce
+from .physics.body.body_shape import BodyShape
+from .physics.body.body_type import BodyType
+from .physics.body.force_zone import ForceZone, ForceZoneType
+from .physics.collide import CollideFlag, CollideGroup
+from .physics.fixture import Fixture
+from .physics.joint.distance_joint import DistanceJoint
+from .physics.joint.gear_joint import GearJoint
+from .physics.joint.lpj_joint import LPJJoint
+from .physics.joint.lsj_joint import LSJJoint
+from .physics.joint.revolute_joint import RevoluteJoint
+from .physics.map_physics import MapPhysics
+from .physics.shape.box_shape import BoxShape
+from .physics.shape.circle_shape import CircleShape
+from .physics.shape.polygon_shape import PolygonShape
+from .spawn import Spawn
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+
+BINARY_MAGIC = b'BKMB'
+BINARY_FORMAT_VERSION = 1
+
+# Sentinels for optional values, the layout itself has no room for None.
+_NO_STRING = 0xFFFFFFFF
+_NO_INT = -(2**63)
+_NO_FLOAT = math.nan
+
+# magic, format version, map version, ppm, then the length of every section in order:
+# strings, string bytes, contributors, bro, shapes, vertices, fixtures, bodies,
+# body fixture ids, spawns, cap zones, joints.
+_HEADER = struct.Struct('<4sHhh12I')
+_PROPERTIES = struct.Struct('<d4?3b')
+_METADATA = struct.Struct('<IIqqIIqq?Iqiqq')
+_SHAPE = struct.Struct('<B?2xII5d')
+_FIXTURE = struct.Struct('<iIIddd3b3?xIq')
+_BODY = struct.Struct('<III11d3?BB3d?B?3d3?xII')
+_SPAWN = struct.Struct('<I3?2bh4d')
+_CAP_ZONE = struct.Struct('<IidB3x')
+_JOINT = struct.Struct('<BB2xiiI9d')
+
+_SHAPE_KINDS: Dict[Type[Any], int] = {BoxShape: 1, CircleShape: 2, PolygonShape: 3}
+
+# Joint type -> (kind, flag fields, id fields, float fields); tuples count as two floats.
+_JOINT_LAYOUTS: Dict[
+    Type[Any], Tuple[int, Tuple[str, ...], Tuple[str, str], Tuple[str, ...]]
+] = {
+    RevoluteJoint: (
+        1,
+        ('enable_limit', 'enable_motor', 'collide_connected', 'draw_line'),
+        ('body_a_id', 'body_b_id'),
+        ('from_angle', 'to_angle', 'turn_force', 'motor_speed', 'pivot', 'break_force'),
+    ),
+    DistanceJoint: (
+        2,
+        ('collide_connected', 'draw_line'),
+        ('body_a_id', 'body_b_id'),
+        ('softness', 'damping', 'pivot', 'attach', 'break_force'),
+    ),
+    LPJJoint: (
+        3,
+        ('collide_connected', 'draw_line'),
+        ('body_a_id', 'body_b_id'),
+        (
+            'position',
+            'angle',
+            'force',
+            'pl',
+            'pu',
+            'path_length',
+            'path_speed',
+            'break_force',
+        ),
+    ),
+    LSJJoint: (
+        4,
+        ('collide_connected', 'draw_line'),
+        ('body_a_id', 'body_b_id'),
+        ('position', 'spring_force', 'spring_length', 'break_force'),
+    ),
+    GearJoint: (5, (), ('joint_a_id', 'joint_b_id'), ('ratio',)),
+}
+_JOINT_TYPES = {layout[0]: joint_type for joint_type, layout in _JOINT_LAYOUTS.items()}
+_POINT_FIELDS = frozenset(('pivot', 'attach', 'position'))
+
+
+def _tri(value: Optional[bool]) -> int:
+    return -1 if value is None else int(value)
+
+
+def _from_tri(value: int) -> Optional[bool]:
+    return None if value < 0 else bool(value)
+
+
+def _optional_float(value: Optional[float]) -> float:
+    return _NO_FLOAT if value is None else value
+
+
+def _from_optional_float(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def _optional_int(value: Optional[int]) -> int:
+    return _NO_INT if value is None else value
+
+
+def _from_optional_int(value: int) -> Optional[int]:
+    return None if value == _NO_INT else value
+
+
+def _array_bytes(typecode: str, values: Sequence) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_array(
+    typecode: str, view: memoryview, offset: int, count: int
+) -> Tuple[array, int]:
+    data = array(typecode)
+    end = offset + count * data.itemsize
+    data.frombytes(view[offset:end])
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data, end
+
+
+class _StringTable:
+    __slots__ = ('ids', 'strings')
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[bytes] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value.encode('utf-8'))
+        return string_id
+
+
+def encode_binary(bonk_map: 'BonkMap') -> bytes:
+    """
+    Serializes ``bonk_map`` into the native binary format.
+
+    The format is little-endian and made of fixed-size records grouped by kind, so every
+    section loads with a single ``struct.iter_unpack`` or ``array.frombytes``. Strings live
+    in one deduplicated table, polygon vertices and body fixture ids in flat arrays.
+    """
+
+    strings = _StringTable()
+    physics = bonk_map.physics
+    metadata = bonk_map.metadata
+    properties = bonk_map.properties
+
+    properties_record = _PROPERTIES.pack(
+        properties.grid_size,
+        properties.players_dont_collide,
+        properties.respawn_on_death,
+        properties.players_can_fly,
+        properties.complex_physics,
+        _tri(properties.a1),
+        _tri(properties.a2),
+        _tri(properties.a3),
+    )
+    metadata_record = _METADATA.pack(
+        strings.add(metadata.name),
+        strings.add(metadata.author),
+        metadata.database_version,
+        metadata.database_id,
+        strings.add(metadata.original_author),
+        strings.add(metadata.original_name),
+        metadata.original_database_version,
+        metadata.original_database_id,
+        metadata.is_published,
+        strings.add(metadata.date),
+        metadata.auth_id,
+        metadata.mode.id,
+        _optional_int(metadata.votes_down),
+        _optional_int(metadata.votes_up),
+    )
+    contributors = [strings.add(contributor) for contributor in metadata.contributors]
+
+    shape_records = []
+    vertices: List[float] = []
+    for shape in physics.shapes:
+        kind = _SHAPE_KINDS.get(type(shape))
+        if kind is None:
+            raise ValueError(f'Unsupported shape type: {type(shape).__name__}')
+        vertex_start = len(vertices) // 2
+        if kind == 1:
+            values = (shape.width, shape.height, shape.angle)
+        elif kind == 2:
+            values = (shape.radius, 0.0, 0.0)
+        else:
+            values = (shape.scale, 0.0, shape.angle)
+            for x, y in shape.vertices:
+                vertices.append(x)
+                vertices.append(y)
+        shape_records.append(
+            _SHAPE.pack(
+                kind,
+                getattr(shape, 'shrink', False),
+                vertex_start,
+                len(vertices) // 2 - vertex_start,
+                shape.position[0],
+                shape.position[1],
+                *values,
+            ),
+        )
+
+    fixture_records = [
+        _FIXTURE.pack(
+            fixture.shape_id,
+            strings.add(fixture.name),
+            fixture.color,
+            _optional_float(fixture.density),
+            _optional_float(fixture.restitution),
+            _optional_float(fixture.friction),
+            _tri(fixture.friction_players),
+            _tri(fixture.inner_grapple),
+            _tri(fixture.sn),
+            fixture.no_grapple,
+            fixture.no_physics,
+            fixture.death,
+            strings.add(fixture.fs),
+            _optional_int(fixture.zp),
+        )
+        for fixture in physics.fixtures
+    ]
+
+    body_records = []
+    body_fixtures: List[int] = []
+    for body in physics.bodies:
+        shape = body.shape
+        force_zone = body.force_zone
+        body_records.append(
+            _BODY.pack(
+                strings.add(body.name),
+                strings.add(shape.body_type.value),
+                strings.add(shape.name),
+                body.position[0],
+                body.position[1],
+                body.linear_velocity[0],
+                body.linear_velocity[1],
+                body.angle,
+                body.angular_velocity,
+                shape.density,
+                shape.restitution,
+                shape.friction,
+                shape.linear_damping,
+                shape.angular_damping,
+                shape.fixed_rotation,
+                shape.friction_players,
+                shape.anti_tunnel,
+                shape.collide_mask,
+                shape.collide_group,
+                body.force.force[0],
+                body.force.force[1],
+                body.force.torque,
+                body.force.is_relative,
+                force_zone.type,
+                force_zone.enabled,
+                force_zone.force[0],
+                force_zone.force[1],
+                force_zone.center_force,
+                force_zone.push_players,
+                force_zone.push_bodies,
+                force_zone.push_arrows,
+                len(body_fixtures),
+                len(body.fixtures),
+            ),
+        )
+        body_fixtures.extend(body.fixtures)
+
+    spawn_records = [
+        _SPAWN.pack(
+            strings.add(spawn.name),
+            spawn.ffa,
+            spawn.blue,
+            spawn.red,
+            _tri(spawn.green),
+            _tri(spawn.yellow),
+            spawn.priority,
+            spawn.position[0],
+            spawn.position[1],
+            spawn.velocity[0],
+            spawn.velocity[1],
+        )
+        for spawn in bonk_map.spawns
+    ]
+
+    cap_zone_records = [
+        _CAP_ZONE.pack(
+            strings.add(cap_zone.name),
+            cap_zone.shape_id,
+            cap_zone.seconds,
+            cap_zone.type,
+        )
+        for cap_zone in bonk_map.cap_zones
+    ]
+
+    joint_records = []
+    for joint in physics.joints:
+        layout = _JOINT_LAYOUTS.get(type(joint))
+        if layout is None:
+            raise ValueError(f'Unsupported joint type: {type(joint).__name__}')
+        kind, flag_fields, id_fields, float_fields = layout
+        flags = 0
+        for bit, name in enumerate(flag_fields):
+            if getattr(joint, name):
+                flags |= 1 << bit
+        floats: List[float] = []
+        for name in float_fields:
+            if name in _POINT_FIELDS:
+                floats.extend(getattr(joint, name))
+            else:
+                floats.append(getattr(joint, name))
+        floats.extend([0.0] * (9 - len(floats)))
+        joint_records.append(
+            _JOINT.pack(
+                kind,
+                flags,
+                getattr(joint, id_fields[0]),
+                getattr(joint, id_fields[1]),
+                strings.add(getattr(joint, 'name', None)),
+                *floats,
+            ),
+        )
+
+    string_data = b''.join(strings.strings)
+    header = _HEADER.pack(
+        BINARY_MAGIC,
+        BINARY_FORMAT_VERSION,
+        bonk_map.version,
+        physics.ppm,
+        len(strings.strings),
+        len(string_data),
+        len(contributors),
+        len(physics.bro),
+        len(shape_records),
+        len(vertices) // 2,
+        len(fixture_records),
+        len(body_records),
+        len(body_fixtures),
+        len(spawn_records),
+        len(cap_zone_records),
+        len(joint_records),
+    )
+    return b''.join(
+        (
+            header,
+            properties_record,
+            metadata_record,
+            _array_bytes('I', [len(string) for string in strings.strings]),
+            string_data,
+            _array_bytes('I', contributors),
+            _array_bytes('i', physics.bro),
+            *shape_records,
+            _array_bytes('d', vertices),
+            *fixture_records,
+            *body_records,
+            _array_bytes('i', body_fixtures),
+            *spawn_records,
+            *cap_zone_records,
+            *joint_records,
+        ),
+    )
+
+
+def _iter_records(
+    view: memoryview, offset: int, record: struct.Struct, count: int
+) -> Tuple[Any, int]:
+    end = offset + record.size * count
+    return record.iter_unpack(view[offset:end]), end
+
+
+def decode_binary(data: Union[bytes, bytearray, memoryview]) -> 'BonkMap':
+    """
+    Loads a map written by :func:`encode_binary`.
+
+    ``data`` can be any buffer, including an ``mmap`` of a file holding the map.
+    """
+
+    from .bonkmap import BonkMap
+
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError('Not a binary bonk map')
+    (
+        magic,
+        format_version,
+        map_version,
+        ppm,
+        strings_count,
+        string_bytes,
+        contributors_count,
+        bro_count,
+        shapes_count,
+        vertices_count,
+        fixtures_count,
+        bodies_count,
+        body_fixtures_count,
+        spawns_count,
+        cap_zones_count,
+        joints_count,
+    ) = _HEADER.unpack_from(view)
+    if magic != BINARY_MAGIC:
+        raise ValueError('Not a binary bonk map')
+    if format_version > BINARY_FORMAT_VERSION:
+        raise NotImplementedError('Future binary map format version.')
+    offset = _HEADER.size
+
+    properties_values = _PROPERTIES.unpack_from(view, offset)
+    offset += _PROPERTIES.size
+    metadata_values = _METADATA.unpack_from(view, offset)
+    offset += _METADATA.size
+
+    lengths, offset = _read_array('I', view, offset, strings_count)
+    string_blob = bytes(view[offset : offset + string_bytes])
+    offset += string_bytes
+    strings = []
+    position = 0
+    for length in lengths:
+        strings.append(string_blob[position : position + length].decode('utf-8'))
+        position += length
+
+    def string(string_id: int) -> Optional[str]:
+        return None if string_id == _NO_STRING else strings[string_id]
+
+    contributors, offset = _read_array('I', view, offset, contributors_count)
+    bro, offset = _read_array('i', view, offset, bro_count)
+
+    shape_records, offset = _iter_records(view, offset, _SHAPE, shapes_count)
+    shape_records = list(shape_records)
+    vertex_values, offset = _read_array('d', view, offset, vertices_count * 2)
+
+    shapes = []
+    for (
+        kind,
+        shrink,
+        vertex_start,
+        vertex_count,
+        x,
+        y,
+        first,
+        second,
+        angle,
+    ) in shape_records:
+        if kind == 1:
+            shape = BoxShape(
+                position=(x, y), width=first, height=second, angle=angle, shrink=shrink
+            )
+        elif kind == 2:
+            shape = CircleShape(position=(x, y), radius=first, shrink=shrink)
+        elif kind == 3:
+            start = vertex_start * 2
+            end = start + vertex_count * 2
+            shape = PolygonShape(
+                position=(x, y),
+                scale=first,
+                angle=angle,
+                vertices=list(
+                    zip(vertex_values[start:end:2], vertex_values[start + 1 : end : 2])
+                ),
+            )
+        else:
+            raise ValueError(f'Invalid shape id: {kind}')
+        shapes.append(shape)
+
+    fixture_records, offset = _iter_records(view, offset, _FIXTURE, fixtures_count)
+    fixtures = [
+        Fixture(
+            shape_id=shape_id,
+            name=string(name),
+            color=color,
+            density=_from_optional_float(density),
+            restitution=_from_optional_float(restitution),
+            friction=_from_optional_float(friction),
+            friction_players=_from_tri(friction_players),
+            inner_grapple=_from_tri(inner_grapple),
+            sn=_from_tri(sn),
+            no_grapple=no_grapple,
+            no_physics=no_physics,
+            death=death,
+            fs=string(fs),
+            zp=_from_optional_int(zp),
+        )
+        for (
+            shape_id,
+            name,
+            color,
+            density,
+            restitution,
+            friction,
+            friction_players,
+            inner_grapple,
+            sn,
+            no_grapple,
+            no_physics,
+            death,
+            fs,
+            zp,
+        ) in fixture_records
+    ]
+
+    body_records, offset = _iter_records(view, offset, _BODY, bodies_count)
+    body_records = list(body_records)
+    body_fixtures, offset = _read_array('i', view, offset, body_fixtures_count)
+    bodies = []
+    for (
+        name,
+        body_type,
+        shape_name,
+        x,
+        y,
+        velocity_x,
+        velocity_y,
+        angle,
+        angular_velocity,
+        density,
+        restitution,
+        friction,
+        linear_damping,
+        angular_damping,
+        fixed_rotation,
+        friction_players,
+        anti_tunnel,
+        collide_mask,
+        collide_group,
+        force_x,
+        force_y,
+        torque,
+        is_relative,
+        force_zone_type,
+        force_zone_enabled,
+        force_zone_x,
+        force_zone_y,
+        center_force,
+        push_players,
+        push_bodies,
+        push_arrows,
+        fixtures_start,
+        fixtures_count,
+    ) in body_records:
+        bodies.append(
+            Body(
+                name=string(name),
+                position=(x, y),
+                linear_velocity=(velocity_x, velocity_y),
+                angle=angle,
+                angular_velocity=angular_velocity,
+                fixtures=body_fixtures[
+                    fixtures_start : fixtures_start + fixtures_count
+                ].tolist(),
+                shape=BodyShape(
+                    body_type=BodyType.from_name(string(body_type)),
+                    name=string(shape_name),
+                    density=density,
+                    restitution=restitution,
+                    friction=friction,
+                    linear_damping=linear_damping,
+                    angular_damping=angular_damping,
+                    fixed_rotation=fixed_rotation,
+                    friction_players=friction_players,
+                    anti_tunnel=anti_tunnel,
+                    collide_mask=CollideFlag(collide_mask),
+                    collide_group=CollideGroup.from_id(collide_group),
+                ),
+                force=BodyForce(
+                    force=(force_x, force_y), is_relative=is_relative, torque=torque
+                ),
+                force_zone=ForceZone(
+                    enabled=force_zone_enabled,
+                    type=ForceZoneType.from_id(force_zone_type),
+                    force=(force_zone_x, force_zone_y),
+                    center_force=center_force,
+                    push_players=push_players,
+                    push_bodies=push_bodies,
+                    push_arrows=push_arrows,
+                ),
+            ),
+        )
+
+    spawn_records, offset = _iter_records(view, offset, _SPAWN, spawns_count)
+    spawns = [
+        Spawn(
+            name=string(name),
+            ffa=ffa,
+            blue=blue,
+            green=_from_tri(green),
+            yellow=_from_tri(yellow),
+            priority=priority,
+            red=red,
+            position=(x, y),
+            velocity=(velocity_x, velocity_y),
+        )
+        for name, ffa, blue, red, green, yellow, priority, x, y, velocity_x, velocity_y in spawn_records
+    ]
+
+    cap_zone_records, offset = _iter_records(view, offset, _CAP_ZONE, cap_zones_count)
+    cap_zones = [
+        CaptureZone(
+            name=string(name),
+            shape_id=shape_id,
+            seconds=seconds,
+            type=CaptureType.from_id(capture_type),
+        )
+        for name, shape_id, seconds, capture_type in cap_zone_records
+    ]
+
+    joint_records, offset = _iter_records(view, offset, _JOINT, joints_count)
+    joints = []
+    for kind, flags, first_id, second_id, name, *floats in joint_records:
+        joint_type = _JOINT_TYPES.get(kind)
+        if joint_type is None:
+            raise ValueError(f'Invalid joint id: {kind}')
+        _, flag_fields, id_fields, float_fields = _JOINT_LAYOUTS[joint_type]
+        values: Dict[str, Any] = {id_fields[0]: first_id, id_fields[1]: second_id}
+        for bit, field_name in enumerate(flag_fields):
+            values[field_name] = bool(flags & (1 << bit))
+        index = 0
+        for field_name in float_fields:
+            if field_name in _POINT_FIELDS:
+                values[field_name] = (floats[index], floats[index + 1])
+                index += 2
+            else:
+                values[field_name] = floats[index]
+                index += 1
+        if name != _NO_STRING:
+            values['name'] = strings[name]
+        joints.append(joint_type(**values))
+
+    (
+        grid_size,
+        players_dont_collide,
+        respawn_on_death,
+        players_can_fly,
+        complex_physics,
+        a1,
+        a2,
+        a3,
+    ) = properties_values
+    (
+        name,
+        author,
+        database_version,
+        database_id,
+        original_author,
+        original_name,
+        original_database_version,
+        original_database_id,
+        is_published,
+        date,
+        auth_id,
+        mode_id,
+        votes_down,
+        votes_up,
+    ) = metadata_values
+    modes = {mode.id: mode for mode in Mode}
+
+    return BonkMap(
+        version=map_version,
+        metadata=MapMetadata(
+            name=string(name),
+            author=string(author),
+            database_version=database_version,
+            database_id=database_id,
+            original_author=string(original_author),
+            original_name=string(original_name),
+            original_database_version=original_database_version,
+            original_database_id=original_database_id,
+            is_published=is_published,
+            contributors=[strings[string_id] for string_id in contributors],
+            date=string(date),
+            auth_id=auth_id,
+            mode=modes.get(mode_id, Mode.NONE),
+            votes_down=_from_optional_int(votes_down),
+            votes_up=_from_optional_int(votes_up),
+        ),
+        properties=MapProperties(
+            grid_size=grid_size,
+            players_dont_collide=players_dont_collide,
+            respawn_on_death=respawn_on_death,
+            players_can_fly=players_can_fly,
+            complex_physics=complex_physics,
+            a1=_from_tri(a1),
+            a2=_from_tri(a2),
+            a3=_from_tri(a3),
+        ),
+        physics=MapPhysics(
+            bodies=bodies,
+            fixtures=fixtures,
+            joints=joints,
+            shapes=shapes,
+            bro=bro.tolist(),
+            ppm=ppm,
+        ),
+        spawns=spawns,
+        cap_zones=cap_zones,
+    )
+
+
+def database_to_binary(encoded_data: str) -> bytes:
+    """Converts a bonk database string into the native binary format."""
+    from .bonkmap import BonkMap
+
+    return encode_binary(BonkMap.decode_from_database(encoded_data))
+
+
+def binary_to_database(data: Union[bytes, bytearray, memoryview]) -> str:
+    """Converts the native binary format back into a bonk database string."""
+    return decode_binary(data).encode_to_database()
@@ -1,30 +1,37 @@
-from typing import List
+from typing import Dict, List, Optional, Union
 
-from attrs import define, field
+from attrs import define, field, setters
 
 from ...pson.bytebuffer import ByteBuffer
+from .binary_format import decode_binary, encode_binary
 from .capture_zone import CaptureZone
+from .compaction import CompactResult, compact_map
+from .fingerprint import map_fingerprint
+from .geometry import MapGeometry
 from .map_metadata import MapMetadata
 from .map_properties import MapProperties
+from .minifier import MinifyReport, minify_map
 from .physics.body.body import Body
+from .physics.codec import JOINT_CODECS, SHAPE_CODECS
 from .physics.fixture import Fixture
-from .physics.joint.distance_joint import DistanceJoint
-from .physics.joint.gear_joint import GearJoint
-from .physics.joint.lpj_joint import LPJJoint
-from .physics.joint.lsj_joint import LSJJoint
-from .physics.joint.revolute_joint import RevoluteJoint
 from .physics.map_physics import MapPhysics
-from .physics.shape.box_shape import BoxShape
-from .physics.shape.circle_shape import CircleShape
-from .physics.shape.polygon_shape import PolygonShape
+from .physics_graph import PhysicsGraph
 from .spawn import Spawn
+from .tracking import Tracked, track_changes
+from .transform import AffineTransform, transform_map
+from .validation import MapIssue, validate_map
 
 MAP_VERSION = 15
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IMap.ts
-@define(slots=True, auto_attribs=True)
-class BonkMap:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class BonkMap(Tracked):
     version: int = field(default=MAP_VERSION)
     metadata: 'MapMetadata' = field(factory=MapMetadata)
     properties: 'MapProperties' = field(factory=MapProperties)
@@ -32,7 +39,144 @@ class BonkMap:
     spawns: List['Spawn'] = field(factory=list)
     cap_zones: List['CaptureZone'] = field(factory=list)
 
+    # Encodings are cached until anything in the map changes, see `Tracked`.
+    _json_cache: Optional[dict] = field(
+        default=None,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+    _database_cache: Optional[str] = field(
+        default=None,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+    _fingerprint_cache: Dict[bool, str] = field(
+        factory=dict,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+
+    _geometry_cache: Optional['MapGeometry'] = field(
+        default=None,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+
+    _validation_cache: Optional[List['MapIssue']] = field(
+        default=None,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+
+    # Open editing session, survives changes and is written back before encoding.
+    _physics_graph: Optional['PhysicsGraph'] = field(
+        default=None,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+
+    def _changed(self) -> None:
+        self._json_cache = None
+        self._database_cache = None
+        self._geometry_cache = None
+        self._validation_cache = None
+        if self._fingerprint_cache:
+            self._fingerprint_cache = {}
+        super()._changed()
+
+    def physics_graph(self) -> 'PhysicsGraph':
+        """
+        Returns the editing graph of the physics, created on first use, see `PhysicsGraph`.
+
+        Pending graph edits are written back before the map is encoded, fingerprinted,
+        measured or validated. Do not edit the physics lists directly while it is open,
+        `close_physics_graph` ends the session.
+        """
+        if self._physics_graph is None:
+            self._physics_graph = PhysicsGraph(self)
+        return self._physics_graph
+
+    def close_physics_graph(self) -> None:
+        """Writes back pending graph edits and drops the graph."""
+        self._sync_physics()
+        self._physics_graph = None
+
+    def _sync_physics(self) -> None:
+        graph = self._physics_graph
+        if graph is not None and graph.dirty:
+            graph.apply()
+
     def to_json(self) -> dict:
+        """Returns the map in bonk JSON format. The result is cached, treat it as read-only."""
+        self._sync_physics()
+        if self._json_cache is None:
+            self._json_cache = self._build_json()
+        return self._json_cache
+
+    def encode_to_database(self) -> str:
+        """Returns the map in bonk database format. The result is cached until the map changes."""
+        self._sync_physics()
+        if self._database_cache is None:
+            self._database_cache = self._build_database()
+        return self._database_cache
+
+    def fingerprint(self, *, include_metadata: bool = False) -> str:
+        """Returns a cached content digest, see `map_fingerprint`."""
+        self._sync_physics()
+        fingerprint = self._fingerprint_cache.get(include_metadata)
+        if fingerprint is None:
+            fingerprint = map_fingerprint(self, include_metadata=include_metadata)
+            self._fingerprint_cache[include_metadata] = fingerprint
+        return fingerprint
+
+    def geometry(self) -> 'MapGeometry':
+        """Returns cached world-space geometry, rebuilt after the map changes."""
+        self._sync_physics()
+        if self._geometry_cache is None:
+            self._geometry_cache = MapGeometry(self)
+        return self._geometry_cache
+
+    def validate(self) -> List['MapIssue']:
+        """Returns problems that would make the server or clients reject the map, cached."""
+        self._sync_physics()
+        if self._validation_cache is None:
+            self._validation_cache = validate_map(self)
+        return list(self._validation_cache)
+
+    def compact(self) -> 'CompactResult':
+        """Removes unreachable shapes, fixtures, bodies and joints, see `compact_map`."""
+        self.close_physics_graph()
+        return compact_map(self)
+
+    def minify(
+        self,
+        *,
+        quantize: bool = False,
+        grid: float = 1 / 16,
+        angle_grid: float = 1 / 4096,
+    ) -> 'MinifyReport':
+        """Shrinks the encoded map in place, see `minify_map`."""
+        self.close_physics_graph()
+        return minify_map(self, quantize=quantize, grid=grid, angle_grid=angle_grid)
+
+    def transform(self, transform: 'AffineTransform') -> None:
+        """Moves, rotates, scales or mirrors the whole map in place, see `transform_map`."""
+        self.close_physics_graph()
+        transform_map(self, transform)
+
+    def _build_json(self) -> dict:
         data = {
             'v': self.version,
             'm': self.metadata.to_json(),
@@ -63,7 +207,7 @@ class BonkMap:
 
         return data
 
-    def encode_to_database(self) -> 'BonkMap':
+    def _build_database(self) -> str:
         buffer = ByteBuffer()
         buffer.set_big_endian()
 
@@ -78,13 +222,7 @@ class BonkMap:
 
         buffer.write_int16(len(self.physics.shapes))
         for shape in self.physics.shapes:
-            if isinstance(shape, BoxShape):
-                buffer.write_int16(1)
-            elif isinstance(shape, CircleShape):
-                buffer.write_int16(2)
-            elif isinstance(shape, PolygonShape):
-                buffer.write_int16(3)
-            shape.to_buffer(buffer)
+            SHAPE_CODECS.encode(shape, buffer)
 
         buffer.write_int16(len(self.physics.fixtures))
         for fixture in self.physics.fixtures:
@@ -101,17 +239,7 @@ class BonkMap:
 
         buffer.write_int16(len(self.physics.joints))
         for joint in self.physics.joints:
-            if isinstance(joint, RevoluteJoint):
-                buffer.write_int16(1)
-            elif isinstance(joint, DistanceJoint):
-                buffer.write_int16(2)
-            elif isinstance(joint, LPJJoint):
-                buffer.write_int16(3)
-            elif isinstance(joint, LSJJoint):
-                buffer.write_int16(4)
-            elif isinstance(joint, GearJoint):
-                buffer.write_int16(5)
-            joint.to_buffer(buffer)
+            JOINT_CODECS.encode(joint, buffer)
 
         return buffer.to_base64(lz_encode=True)
 
@@ -134,19 +262,7 @@ class BonkMap:
 
         shapes_count = buffer.read_int16()
         for _ in range(shapes_count):
-            shape_id = buffer.read_int16()
-            if shape_id == 1:
-                shape = BoxShape()
-                shape.from_buffer(buffer)
-            elif shape_id == 2:
-                shape = CircleShape()
-                shape.from_buffer(buffer)
-            elif shape_id == 3:
-                shape = PolygonShape()
-                shape.from_buffer(buffer)
-            else:
-                raise ValueError(f'Invalid shape id: {shape_id}')
-            bonk_map.physics.shapes.append(shape)
+            bonk_map.physics.shapes.append(SHAPE_CODECS.decode(buffer))
 
         fixtures_count = buffer.read_int16()
         for _ in range(fixtures_count):
@@ -166,28 +282,19 @@ class BonkMap:
             )
         joint_count = buffer.read_int16()
         for _ in range(joint_count):
-            joint_type_id = buffer.read_int16()
-            if joint_type_id == 1:
-                joint = RevoluteJoint()
-                joint.from_buffer(buffer)
-            elif joint_type_id == 2:
-                joint = DistanceJoint()
-                joint.from_buffer(buffer)
-            elif joint_type_id == 3:
-                joint = LPJJoint()
-                joint.from_buffer(buffer)
-            elif joint_type_id == 4:
-                joint = LSJJoint()
-                joint.from_buffer(buffer)
-            elif joint_type_id == 5:
-                joint = GearJoint()
-                joint.from_buffer(buffer)
-            else:
-                raise ValueError(f'Invalid joint id: {joint_type_id}')
-            bonk_map.physics.joints.append(joint)
+            bonk_map.physics.joints.append(JOINT_CODECS.decode(buffer))
 
         return bonk_map
 
+    def to_binary(self) -> bytes:
+        """Encodes the map into the native binary format, see `encode_binary`."""
+        self._sync_physics()
+        return encode_binary(self)
+
+    @staticmethod
+    def from_binary(data: Union[bytes, bytearray, memoryview]) -> 'BonkMap':
+        return decode_binary(data)
+
     @classmethod
     def from_json(cls, json_data: dict) -> 'BonkMap':
         bonk_map = BonkMap()
@@ -199,37 +306,9 @@ class BonkMap:
         for fixture_data in json_data['physics']['fixtures']:
             bonk_map.physics.fixtures.append(Fixture().from_json(fixture_data))
         for joint_data in json_data['physics']['joints']:
-            if joint_data['type'] == 'rv':
-                joint = RevoluteJoint()
-                joint.from_json(joint_data)
-            elif joint_data['type'] == 'd':
-                joint = DistanceJoint()
-                joint.from_json(joint_data)
-            elif joint_data['type'] == 'lpj':
-                joint = LPJJoint()
-                joint.from_json(joint_data)
-            elif joint_data['type'] == 'lsj':
-                joint = LSJJoint()
-                joint.from_json(joint_data)
-            elif joint_data['type'] == 'g':
-                joint = GearJoint()
-                joint.from_json(joint_data)
-            else:
-                raise ValueError(f'Invalid joint type: {joint_data["type"]}')
-            bonk_map.physics.joints.append(joint)
+            bonk_map.physics.joints.append(JOINT_CODECS.from_json(joint_data))
         for shape_data in json_data['physics']['shapes']:
-            if shape_data['type'] == 'bx':
-                shape = BoxShape()
-                shape.from_json(shape_data)
-            elif shape_data['type'] == 'ci':
-                shape = CircleShape()
-                shape.from_json(shape_data)
-            elif shape_data['type'] == 'po':
-                shape = PolygonShape()
-                shape.from_json(shape_data)
-            else:
-                raise ValueError(f'Invalid shape type: {shape_data["type"]}')
-            bonk_map.physics.shapes.append(shape)
+            bonk_map.physics.shapes.append(SHAPE_CODECS.from_json(shape_data))
         bonk_map.physics.bro = json_data['physics']['bro'].copy()
         bonk_map.physics.ppm = json_data['physics']['ppm']
         for spawn_data in json_data['spawns']:
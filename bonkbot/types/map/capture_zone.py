@@ -2,15 +2,22 @@ from typing import TYPE_CHECKING
 
 from attrs import define, field
 
+from ...pson.schema import BinarySchema, scalar, utf
 from .capture_type import CaptureType
+from .tracking import Tracked, track_changes
 
 if TYPE_CHECKING:
     from ...pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/ICapZone.ts
-@define(slots=True, auto_attribs=True)
-class CaptureZone:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class CaptureZone(Tracked):
     name: str = field(default='Cap Zone')  # 29 chars
     shape_id: int = field(default=-1)
     seconds: float = field(default=10)  # 0.01-1000
@@ -34,15 +41,16 @@ class CaptureZone:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_utf(self.name)
-        buffer.write_float64(self.seconds)
-        buffer.write_int16(self.shape_id)
-        buffer.write_int16(self.type.value)
+        CAPTURE_ZONE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer', version: int) -> 'CaptureZone':
-        self.name = buffer.read_utf()
-        self.seconds = buffer.read_float64()
-        self.shape_id = buffer.read_int16()
-        if version >= 6:
-            self.type = CaptureType.from_id(buffer.read_int16())
-        return self
+        return CAPTURE_ZONE_SCHEMA.decode(self, buffer, version)
+
+
+CAPTURE_ZONE_SCHEMA = BinarySchema(
+    utf('name'),
+    scalar('seconds', 'd'),
+    scalar('shape_id', 'h'),
+    scalar('type', 'h', since=6, from_wire=CaptureType.from_id),
+    on_decoded=Tracked._decoded,
+)
@@ -0,0 +1,152 @@
+from typing import TYPE_CHECKING, Dict, List, Set
+
+import attrs
+from attrs import define
+
+from .physics.joint.gear_joint import GearJoint
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class CompactResult:
+    removed_shapes: int
+    removed_fixtures: int
+    removed_bodies: int
+    removed_joints: int
+    removed_cap_zones: int
+    size_before: int
+    size_after: int
+
+    @property
+    def removed(self) -> int:
+        return (
+            self.removed_shapes
+            + self.removed_fixtures
+            + self.removed_bodies
+            + self.removed_joints
+            + self.removed_cap_zones
+        )
+
+    @property
+    def bytes_saved(self) -> int:
+        """Difference in length of the encoded database string."""
+        return self.size_before - self.size_after
+
+
+def _renumber(kept: List[int]) -> Dict[int, int]:
+    return {old_id: new_id for new_id, old_id in enumerate(kept)}
+
+
+def compact_map(bonk_map: 'BonkMap') -> 'CompactResult':
+    """
+    Removes physics entries that can not affect the game and renumbers references.
+
+    * fixtures that no body uses, or whose shape id is dangling;
+    * shapes that no remaining fixture uses;
+    * bodies without fixtures that no joint holds on to;
+    * joints with a dangling body, and gear joints whose joints were removed;
+    * capture zones attached to a removed fixture.
+    """
+
+    physics = bonk_map.physics
+    size_before = len(bonk_map.encode_to_database())
+    index = physics.reference_index()
+
+    shapes_count = len(physics.shapes)
+    fixtures_count = len(physics.fixtures)
+    bodies_count = len(physics.bodies)
+
+    live_fixtures: Set[int] = set()
+    for fixtures in index.body_fixtures:
+        for fixture_id in fixtures:
+            if 0 <= fixture_id < fixtures_count:
+                shape_id = index.fixture_shape[fixture_id]
+                if 0 <= shape_id < shapes_count:
+                    live_fixtures.add(fixture_id)
+    live_shapes = {index.fixture_shape[fixture_id] for fixture_id in live_fixtures}
+
+    def valid_body(body_id: int) -> bool:
+        return 0 <= body_id < bodies_count
+
+    live_joints: Set[int] = set()
+    for joint_id, bodies in enumerate(index.joint_bodies):
+        if joint_id in index.gear_joints:
+            continue
+        body_a_id, body_b_id = bodies
+        if valid_body(body_a_id) and (body_b_id == -1 or valid_body(body_b_id)):
+            live_joints.add(joint_id)
+    for joint_id, (joint_a_id, joint_b_id) in index.gear_joints.items():
+        if joint_a_id in live_joints and joint_b_id in live_joints:
+            live_joints.add(joint_id)
+
+    live_bodies: Set[int] = set()
+    for body_id, fixtures in enumerate(index.body_fixtures):
+        if any(fixture_id in live_fixtures for fixture_id in fixtures):
+            live_bodies.add(body_id)
+    for joint_id in live_joints:
+        live_bodies.update(
+            body_id for body_id in index.joint_bodies[joint_id] if body_id != -1
+        )
+
+    live_cap_zones = [
+        cap_zone
+        for cap_zone in bonk_map.cap_zones
+        if cap_zone.shape_id in live_fixtures
+    ]
+
+    kept_shapes = sorted(live_shapes)
+    kept_fixtures = sorted(live_fixtures)
+    kept_bodies = sorted(live_bodies)
+    kept_joints = sorted(live_joints)
+
+    result = CompactResult(
+        removed_shapes=shapes_count - len(kept_shapes),
+        removed_fixtures=fixtures_count - len(kept_fixtures),
+        removed_bodies=bodies_count - len(kept_bodies),
+        removed_joints=len(physics.joints) - len(kept_joints),
+        removed_cap_zones=len(bonk_map.cap_zones) - len(live_cap_zones),
+        size_before=size_before,
+        size_after=size_before,
+    )
+    if result.removed == 0:
+        return result
+
+    shape_ids = _renumber(kept_shapes)
+    fixture_ids = _renumber(kept_fixtures)
+    body_ids = _renumber(kept_bodies)
+    joint_ids = _renumber(kept_joints)
+
+    fixtures = [physics.fixtures[fixture_id] for fixture_id in kept_fixtures]
+    for fixture in fixtures:
+        fixture.shape_id = shape_ids[fixture.shape_id]
+
+    bodies = [physics.bodies[body_id] for body_id in kept_bodies]
+    for body in bodies:
+        body.fixtures = [
+            fixture_ids[fixture_id]
+            for fixture_id in body.fixtures
+            if fixture_id in fixture_ids
+        ]
+
+    joints = [physics.joints[joint_id] for joint_id in kept_joints]
+    for joint in joints:
+        if isinstance(joint, GearJoint):
+            joint.joint_a_id = joint_ids[joint.joint_a_id]
+            joint.joint_b_id = joint_ids[joint.joint_b_id]
+        else:
+            joint.body_a_id = body_ids[joint.body_a_id]
+            joint.body_b_id = body_ids.get(joint.body_b_id, -1)
+
+    for cap_zone in live_cap_zones:
+        cap_zone.shape_id = fixture_ids[cap_zone.shape_id]
+
+    physics.shapes = [physics.shapes[shape_id] for shape_id in kept_shapes]
+    physics.fixtures = fixtures
+    physics.bodies = bodies
+    physics.joints = joints
+    physics.bro = [body_ids[body_id] for body_id in physics.bro if body_id in body_ids]
+    bonk_map.cap_zones = live_cap_zones
+
+    return attrs.evolve(result, size_after=len(bonk_map.encode_to_database()))
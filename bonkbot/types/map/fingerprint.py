@@ -0,0 +1,126 @@
+import hashlib
+import struct
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+
+FINGERPRINT_SIZE = 16
+
+_INT16 = struct.Struct('>h')
+_UINT32 = struct.Struct('>I')
+_INT32 = struct.Struct('>i')
+_FLOAT32 = struct.Struct('>f')
+_FLOAT64 = struct.Struct('>d')
+
+
+class HashingBuffer:
+    """
+    Write-only stand-in for :class:`ByteBuffer` that feeds a hash instead of storing bytes.
+
+    The map types encode themselves into it with their regular ``to_buffer`` methods, so the
+    fingerprint follows the database layout without building the database string.
+    Values are canonicalized on the way: ``-0.0`` hashes as ``0.0`` and a missing flag as ``False``.
+    """
+
+    __slots__ = ('_hash',)
+
+    # Read by `BinarySchema`, which packs whole records with `write_bytes`.
+    endian = '>'
+    canonical = True
+
+    def __init__(self) -> None:
+        self._hash = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def write_tag(self, tag: bytes) -> None:
+        self._hash.update(tag)
+
+    def write_bytes(self, data: bytes) -> None:
+        self._hash.update(data)
+
+    def write_uint8(self, value: int) -> None:
+        self._hash.update(bytes((value,)))
+
+    def write_bool(self, value: bool) -> None:
+        self._hash.update(b'\x01' if value else b'\x00')
+
+    def write_int16(self, value: int) -> None:
+        self._hash.update(_INT16.pack(value))
+
+    def write_uint32(self, value: int) -> None:
+        self._hash.update(_UINT32.pack(value or 0))
+
+    def write_int32(self, value: int) -> None:
+        self._hash.update(_INT32.pack(value))
+
+    def write_float32(self, value: float) -> None:
+        self._hash.update(_FLOAT32.pack(value + 0.0))
+
+    def write_float64(self, value: float) -> None:
+        self._hash.update(_FLOAT64.pack(value + 0.0))
+
+    def write_utf(self, value: str) -> None:
+        data = value.encode('utf-8')
+        self._hash.update(_INT16.pack(len(data)))
+        self._hash.update(data)
+
+
+def map_fingerprint(bonk_map: 'BonkMap', *, include_metadata: bool = False) -> str:
+    """
+    Returns a hex digest of the gameplay content of ``bonk_map``, computed in one pass.
+
+    Without ``include_metadata`` only the mode is taken from the metadata, so re-uploads,
+    votes, dates and database ids do not change the fingerprint.
+    """
+
+    buffer = HashingBuffer()
+    bonk_map.properties.to_buffer(buffer)
+    if include_metadata:
+        buffer.write_tag(b'm')
+        bonk_map.metadata.to_buffer(buffer)
+    else:
+        buffer.write_utf(bonk_map.metadata.mode.mode)
+
+    physics = bonk_map.physics
+    buffer.write_int16(physics.ppm)
+    buffer.write_tag(b'r')
+    buffer.write_int32(len(physics.bro))
+    for body_id in physics.bro:
+        buffer.write_int16(body_id)
+
+    buffer.write_tag(b's')
+    buffer.write_int32(len(physics.shapes))
+    for shape in physics.shapes:
+        buffer.write_utf(type(shape).__name__)
+        shape.to_buffer(buffer)
+
+    buffer.write_tag(b'f')
+    buffer.write_int32(len(physics.fixtures))
+    for fixture in physics.fixtures:
+        fixture.to_buffer(buffer)
+
+    buffer.write_tag(b'b')
+    buffer.write_int32(len(physics.bodies))
+    for body in physics.bodies:
+        body.to_buffer(buffer)
+
+    buffer.write_tag(b'p')
+    buffer.write_int32(len(bonk_map.spawns))
+    for spawn in bonk_map.spawns:
+        spawn.to_buffer(buffer)
+
+    buffer.write_tag(b'z')
+    buffer.write_int32(len(bonk_map.cap_zones))
+    for cap_zone in bonk_map.cap_zones:
+        cap_zone.to_buffer(buffer)
+
+    buffer.write_tag(b'j')
+    buffer.write_int32(len(physics.joints))
+    for joint in physics.joints:
+        buffer.write_utf(type(joint).__name__)
+        joint.to_buffer(buffer)
+
+    return buffer.hexdigest()
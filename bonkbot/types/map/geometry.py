@@ -0,0 +1,388 @@
+import math
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from attrs import define, field
+
+from .physics.shape.box_shape import BoxShape
+from .physics.shape.circle_shape import CircleShape
+from .physics.shape.polygon_shape import PolygonShape
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+    from .physics.body.body import Body
+    from .physics.shape.shape import Shape
+
+Point = Tuple[float, float]
+
+_EPSILON = 1e-9
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class AABB:
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+    @classmethod
+    def from_points(cls, points: Sequence[Point]) -> 'AABB':
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    @property
+    def width(self) -> float:
+        return self.max_x - self.min_x
+
+    @property
+    def height(self) -> float:
+        return self.max_y - self.min_y
+
+    @property
+    def center(self) -> Point:
+        return (self.min_x + self.max_x) / 2, (self.min_y + self.max_y) / 2
+
+    def overlaps(self, other: 'AABB') -> bool:
+        return (
+            self.min_x <= other.max_x
+            and other.min_x <= self.max_x
+            and self.min_y <= other.max_y
+            and other.min_y <= self.max_y
+        )
+
+    def contains(self, point: Point) -> bool:
+        return (
+            self.min_x <= point[0] <= self.max_x
+            and self.min_y <= point[1] <= self.max_y
+        )
+
+    def union(self, other: 'AABB') -> 'AABB':
+        return AABB(
+            min(self.min_x, other.min_x),
+            min(self.min_y, other.min_y),
+            max(self.max_x, other.max_x),
+            max(self.max_y, other.max_y),
+        )
+
+
+@define(slots=True, auto_attribs=True)
+class FixtureGeometry:
+    """
+    World-space geometry of one fixture on one body.
+
+    Circles have an empty ``vertices`` tuple and use ``center`` and ``radius``;
+    boxes and polygons have ``radius == 0`` and their outline in ``vertices``,
+    counter-clockwise in the usual math orientation.
+    """
+
+    body_id: int
+    fixture_id: int
+    shape_id: int
+    vertices: Tuple[Point, ...]
+    center: Point
+    radius: float
+    aabb: 'AABB'
+    area: float
+    centroid: Point
+
+    _convex_parts: Optional[List[Tuple[Point, ...]]] = field(
+        default=None, init=False, repr=False, eq=False
+    )
+
+    @property
+    def is_circle(self) -> bool:
+        return not self.vertices
+
+    def convex_parts(self) -> List[Tuple[Point, ...]]:
+        """Convex pieces of the outline, computed on first use. Circles have none."""
+        if self._convex_parts is None:
+            self._convex_parts = convex_decomposition(self.vertices)
+        return self._convex_parts
+
+
+def _cross(origin: Point, a: Point, b: Point) -> float:
+    return (a[0] - origin[0]) * (b[1] - origin[1]) - (a[1] - origin[1]) * (
+        b[0] - origin[0]
+    )
+
+
+def signed_area(points: Sequence[Point]) -> float:
+    area = 0.0
+    for i in range(len(points)):
+        x1, y1 = points[i - 1]
+        x2, y2 = points[i]
+        area += x1 * y2 - x2 * y1
+    return area / 2
+
+
+def polygon_centroid(points: Sequence[Point]) -> Point:
+    area = signed_area(points)
+    if abs(area) < _EPSILON:
+        count = len(points)
+        return sum(p[0] for p in points) / count, sum(p[1] for p in points) / count
+    cx = cy = 0.0
+    for i in range(len(points)):
+        x1, y1 = points[i - 1]
+        x2, y2 = points[i]
+        cross = x1 * y2 - x2 * y1
+        cx += (x1 + x2) * cross
+        cy += (y1 + y2) * cross
+    return cx / (6 * area), cy / (6 * area)
+
+
+def is_convex(points: Sequence[Point]) -> bool:
+    """Whether a counter-clockwise polygon is convex."""
+    count = len(points)
+    return all(
+        _cross(points[i - 2], points[i - 1], points[i]) >= -_EPSILON
+        for i in range(count)
+    )
+
+
+def _in_triangle(point: Point, a: Point, b: Point, c: Point) -> bool:
+    return (
+        _cross(a, b, point) >= -_EPSILON
+        and _cross(b, c, point) >= -_EPSILON
+        and _cross(c, a, point) >= -_EPSILON
+    )
+
+
+def _triangulate(points: Sequence[Point]) -> List[Tuple[int, int, int]]:
+    """Ear clipping of a counter-clockwise simple polygon."""
+    remaining = list(range(len(points)))
+    triangles = []
+    while len(remaining) > 3:
+        count = len(remaining)
+        for k in range(count):
+            i0, i1, i2 = remaining[k - 1], remaining[k], remaining[(k + 1) % count]
+            a, b, c = points[i0], points[i1], points[i2]
+            cross = _cross(a, b, c)
+            if abs(cross) <= _EPSILON:
+                # Collinear or repeated vertex, it does not contribute any area.
+                del remaining[k]
+                break
+            if cross < 0:
+                continue
+            if any(
+                _in_triangle(points[j], a, b, c)
+                for j in remaining
+                if j not in (i0, i1, i2)
+            ):
+                continue
+            triangles.append((i0, i1, i2))
+            del remaining[k]
+            break
+        else:
+            # Self-intersecting outline, fall back to a fan over what is left.
+            triangles.extend(
+                (remaining[0], remaining[k], remaining[k + 1])
+                for k in range(1, len(remaining) - 1)
+            )
+            return triangles
+    if len(remaining) == 3:
+        triangles.append((remaining[0], remaining[1], remaining[2]))
+    return triangles
+
+
+def _edges(polygon: List[int]) -> Iterator[Tuple[int, int]]:
+    for k in range(len(polygon)):
+        yield polygon[k - 1], polygon[k]
+
+
+def _merge(first: List[int], second: List[int], a: int, b: int) -> List[int]:
+    """Joins two polygons along the edge ``a -> b`` of ``first`` (``b -> a`` of ``second``)."""
+    start = first.index(b)
+    first = first[start:] + first[:start]
+    start = second.index(a)
+    second = second[start:] + second[:start]
+    return first + second[1:-1]
+
+
+def convex_decomposition(vertices: Sequence[Point]) -> List[Tuple[Point, ...]]:
+    """
+    Splits a simple polygon into convex pieces.
+
+    The polygon is ear-clipped into triangles, then neighbouring pieces are merged back
+    while the result stays convex (Hertel-Mehlhorn), which gives at most four times the
+    optimal number of pieces.
+    """
+
+    if len(vertices) < 3:
+        return []
+    points = list(vertices)
+    if signed_area(points) < 0:
+        points.reverse()
+    if is_convex(points):
+        return [tuple(points)]
+
+    polygons: Dict[int, List[int]] = {
+        polygon_id: list(triangle)
+        for polygon_id, triangle in enumerate(_triangulate(points))
+    }
+    owners: Dict[Tuple[int, int], int] = {}
+    for polygon_id, polygon in polygons.items():
+        for edge in _edges(polygon):
+            owners[edge] = polygon_id
+
+    for a, b in list(owners):
+        first_id = owners.get((a, b))
+        second_id = owners.get((b, a))
+        if first_id is None or second_id is None or first_id == second_id:
+            continue
+        merged = _merge(polygons[first_id], polygons[second_id], a, b)
+        if not is_convex([points[i] for i in merged]):
+            continue
+        del polygons[second_id]
+        polygons[first_id] = merged
+        del owners[(a, b)]
+        del owners[(b, a)]
+        for edge in _edges(merged):
+            owners[edge] = first_id
+
+    return [tuple(points[i] for i in polygon) for polygon in polygons.values()]
+
+
+def _to_world(
+    body: 'Body', shape: 'Shape', local: Sequence[Point], angle: float
+) -> List[Point]:
+    shape_cos, shape_sin = math.cos(angle), math.sin(angle)
+    body_cos, body_sin = math.cos(body.angle), math.sin(body.angle)
+    shape_x, shape_y = shape.position
+    body_x, body_y = body.position
+    points = []
+    for x, y in local:
+        x, y = (
+            x * shape_cos - y * shape_sin + shape_x,
+            x * shape_sin + y * shape_cos + shape_y,
+        )
+        points.append(
+            (x * body_cos - y * body_sin + body_x, x * body_sin + y * body_cos + body_y)
+        )
+    return points
+
+
+def fixture_geometry(
+    body_id: int,
+    fixture_id: int,
+    body: 'Body',
+    shape_id: int,
+    shape: 'Shape',
+) -> Optional['FixtureGeometry']:
+    if isinstance(shape, CircleShape):
+        cos, sin = math.cos(body.angle), math.sin(body.angle)
+        x, y = shape.position
+        center = (
+            x * cos - y * sin + body.position[0],
+            x * sin + y * cos + body.position[1],
+        )
+        radius = abs(shape.radius)
+        return FixtureGeometry(
+            body_id=body_id,
+            fixture_id=fixture_id,
+            shape_id=shape_id,
+            vertices=(),
+            center=center,
+            radius=radius,
+            aabb=AABB(
+                center[0] - radius,
+                center[1] - radius,
+                center[0] + radius,
+                center[1] + radius,
+            ),
+            area=math.pi * radius * radius,
+            centroid=center,
+        )
+
+    if isinstance(shape, BoxShape):
+        half_width, half_height = shape.width / 2, shape.height / 2
+        local = [
+            (-half_width, -half_height),
+            (half_width, -half_height),
+            (half_width, half_height),
+            (-half_width, half_height),
+        ]
+        points = _to_world(body, shape, local, shape.angle)
+    elif isinstance(shape, PolygonShape):
+        if len(shape.vertices) < 3:
+            return None
+        local = [(x * shape.scale, y * shape.scale) for x, y in shape.vertices]
+        points = _to_world(body, shape, local, shape.angle)
+    else:
+        return None
+
+    if signed_area(points) < 0:
+        points.reverse()
+    vertices = tuple(points)
+    aabb = AABB.from_points(vertices)
+    return FixtureGeometry(
+        body_id=body_id,
+        fixture_id=fixture_id,
+        shape_id=shape_id,
+        vertices=vertices,
+        center=aabb.center,
+        radius=0.0,
+        aabb=aabb,
+        area=abs(signed_area(vertices)),
+        centroid=polygon_centroid(vertices),
+    )
+
+
+class MapGeometry:
+    """
+    Derived world-space geometry of a :class:`BonkMap`.
+
+    Instances are created and cached by :meth:`BonkMap.geometry`, which drops the cache on
+    any change to the map. The fixture outlines are computed when the instance is created,
+    so a held instance keeps describing the map as it was then. Lookups by fixture and the
+    bounds are derived from those outlines on first access, convex pieces on first request.
+    """
+
+    __slots__ = ('_bounds', '_by_fixture', '_fixtures')
+
+    def __init__(self, bonk_map: 'BonkMap') -> None:
+        physics = bonk_map.physics
+        shapes, fixtures = physics.shapes, physics.fixtures
+        geometries = []
+        for body_id, body in enumerate(physics.bodies):
+            for fixture_id in body.fixtures:
+                if not 0 <= fixture_id < len(fixtures):
+                    continue
+                shape_id = fixtures[fixture_id].shape_id
+                if not 0 <= shape_id < len(shapes):
+                    continue
+                geometry = fixture_geometry(
+                    body_id, fixture_id, body, shape_id, shapes[shape_id]
+                )
+                if geometry is not None:
+                    geometries.append(geometry)
+        self._fixtures: List[FixtureGeometry] = geometries
+        self._by_fixture: Optional[Dict[int, List[FixtureGeometry]]] = None
+        self._bounds: Optional[AABB] = None
+
+    @property
+    def fixtures(self) -> List['FixtureGeometry']:
+        """Every body fixture in body order, skipping dangling ids and degenerate polygons."""
+        return self._fixtures
+
+    def for_fixture(self, fixture_id: int) -> List['FixtureGeometry']:
+        """Geometry of ``fixture_id`` on every body that uses it."""
+        if self._by_fixture is None:
+            by_fixture: Dict[int, List[FixtureGeometry]] = {}
+            for geometry in self.fixtures:
+                by_fixture.setdefault(geometry.fixture_id, []).append(geometry)
+            self._by_fixture = by_fixture
+        return self._by_fixture.get(fixture_id, [])
+
+    @property
+    def bounds(self) -> Optional['AABB']:
+        """Union of all fixture bounds, ``None`` for a map without fixtures."""
+        if self._bounds is None and self.fixtures:
+            bounds = self.fixtures[0].aabb
+            for geometry in self.fixtures[1:]:
+                bounds = bounds.union(geometry.aabb)
+            self._bounds = bounds
+        return self._bounds
+
+    @property
+    def total_area(self) -> float:
+        return sum(geometry.area for geometry in self.fixtures)
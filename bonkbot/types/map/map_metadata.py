@@ -2,15 +2,22 @@ from typing import TYPE_CHECKING, List, Optional
 
 from attrs import define, field
 
+from ...pson.schema import BinarySchema, scalar, utf, utf_array
 from ..mode import Mode
+from .tracking import Tracked, track_changes
 
 if TYPE_CHECKING:
     from ...pson import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IMapMetadata.ts
-@define(slots=True, auto_attribs=True)
-class MapMetadata:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class MapMetadata(Tracked):
     name: str = field(default='noname')  # 25 chars
     author: str = field(default='noauthor')
     database_version: int = field(default=2)
@@ -68,42 +75,25 @@ class MapMetadata:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_utf(self.original_name)
-        buffer.write_utf(self.original_author)
-        buffer.write_uint32(self.original_database_id)
-        buffer.write_int16(self.original_database_version)
-        buffer.write_utf(self.name)
-        buffer.write_utf(self.author)
-        buffer.write_uint32(self.votes_up)
-        buffer.write_uint32(self.votes_down)
-        buffer.write_int16(len(self.contributors))
-        for contributor in self.contributors:
-            buffer.write_utf(contributor)
-        buffer.write_utf(self.mode.mode)
-        buffer.write_int32(self.database_id)
-        buffer.write_bool(self.is_published)
-        buffer.write_int32(self.database_version)
+        MAP_METADATA_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer', version: int) -> 'MapMetadata':
-        self.original_name = buffer.read_utf()
-        self.original_author = buffer.read_utf()
-        self.original_database_id = buffer.read_uint32()
-        self.original_database_version = buffer.read_int16()
-        self.name = buffer.read_utf()
-        self.author = buffer.read_utf()
-        if version >= 10:
-            self.votes_up = buffer.read_uint32()
-            self.votes_down = buffer.read_uint32()
-        if version >= 4:
-            self.contributors = []
-            contributors_count = buffer.read_int16()
-            for _ in range(contributors_count):
-                self.contributors.append(buffer.read_utf())
-        if version >= 5:
-            self.mode = Mode.from_mode_code(buffer.read_utf())
-            self.database_id = buffer.read_int32()
-        if version >= 7:
-            self.is_published = buffer.read_bool()
-        if version >= 8:
-            self.database_version = buffer.read_int32()
-        return self
+        return MAP_METADATA_SCHEMA.decode(self, buffer, version)
+
+
+MAP_METADATA_SCHEMA = BinarySchema(
+    utf('original_name'),
+    utf('original_author'),
+    scalar('original_database_id', 'I'),
+    scalar('original_database_version', 'h'),
+    utf('name'),
+    utf('author'),
+    scalar('votes_up', 'I', since=10, default=0),
+    scalar('votes_down', 'I', since=10, default=0),
+    utf_array('contributors', since=4),
+    utf('mode', since=5, to_wire=lambda mode: mode.mode, from_wire=Mode.from_mode_code),
+    scalar('database_id', 'i', since=5),
+    scalar('is_published', '?', since=7),
+    scalar('database_version', 'i', since=8),
+    on_decoded=Tracked._decoded,
+)
@@ -2,13 +2,21 @@ from typing import TYPE_CHECKING, Optional
 
 from attrs import define, field
 
+from ...pson.schema import BinarySchema, scalar
+from .tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from ...pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IMapProperties.ts
-@define(slots=True, auto_attribs=True)
-class MapProperties:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class MapProperties(Tracked):
     grid_size: float = field(default=25)  # 2-100
     players_dont_collide: bool = field(default=False)
     respawn_on_death: bool = field(default=False)
@@ -46,22 +54,24 @@ class MapProperties:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_bool(self.respawn_on_death)
-        buffer.write_bool(self.players_dont_collide)
-        buffer.write_int16(2 if self.complex_physics else 1)
-        buffer.write_float32(self.grid_size)
-        buffer.write_bool(self.players_can_fly)
+        MAP_PROPERTIES_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer', version: int) -> 'MapProperties':
-        self.respawn_on_death = buffer.read_bool()
-        self.players_dont_collide = buffer.read_bool()
-        if version >= 3:
-            self.complex_physics = buffer.read_int16() == 2
-        if 4 <= version <= 12:
-            self.grid_size = buffer.read_int16()
-        elif version >= 13:
-            self.grid_size = buffer.read_float32()
-        if version >= 9:
-            self.players_can_fly = buffer.read_bool()
+        return MAP_PROPERTIES_SCHEMA.decode(self, buffer, version)
 
-        return self
+
+MAP_PROPERTIES_SCHEMA = BinarySchema(
+    scalar('respawn_on_death', '?'),
+    scalar('players_dont_collide', '?'),
+    scalar(
+        'complex_physics',
+        'h',
+        since=3,
+        to_wire=lambda complex_physics: 2 if complex_physics else 1,
+        from_wire=lambda engine: engine == 2,
+    ),
+    scalar('grid_size', 'h', since=4, until=12),
+    scalar('grid_size', 'f', since=13),
+    scalar('players_can_fly', '?', since=9),
+    on_decoded=Tracked._decoded,
+)
@@ -0,0 +1,225 @@
+import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Tuple, Type
+
+from attrs import define
+
+from .physics.joint.distance_joint import DistanceJoint
+from .physics.joint.lpj_joint import LPJJoint
+from .physics.joint.lsj_joint import LSJJoint
+from .physics.joint.revolute_joint import RevoluteJoint
+from .physics.shape.box_shape import BoxShape
+from .physics.shape.circle_shape import CircleShape
+from .physics.shape.polygon_shape import PolygonShape
+from .tracking import Tracked
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+
+_MAX_SAFE_INTEGER = 2**53
+
+# Type -> (length fields, point fields, angle fields) that `quantize` snaps to the grid.
+# Body and spawn positions are handled separately.
+_GEOMETRY_FIELDS: Dict[Type[Any], Tuple[Tuple[str, ...], ...]] = {
+    BoxShape: (('width', 'height'), ('position',), ('angle',)),
+    CircleShape: (('radius',), ('position',), ()),
+    PolygonShape: ((), ('position',), ('angle',)),
+    RevoluteJoint: ((), ('pivot',), ('from_angle', 'to_angle')),
+    DistanceJoint: ((), ('pivot', 'attach'), ()),
+    LPJJoint: (('path_length',), ('position',), ('angle',)),
+    LSJJoint: (('spring_length',), ('position',), ()),
+}
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MinifyReport:
+    """
+    Sizes of the map before and after :func:`minify_map`.
+
+    ``size_*`` is the length of the database string, where every number is a float64, so
+    the lossless mode only shrinks it by the polygon vertices it drops. ``json_size_*`` is
+    the length of the JSON form sent with the lobby game settings, which is what turning
+    floats into ints shortens.
+    """
+
+    size_before: int
+    size_after: int
+    json_size_before: int
+    json_size_after: int
+    encode_time_before: float
+    encode_time_after: float
+    changed_values: int
+
+    @property
+    def size_saved(self) -> int:
+        return self.size_before - self.size_after
+
+    @property
+    def json_size_saved(self) -> int:
+        return self.json_size_before - self.json_size_after
+
+    @property
+    def size_ratio(self) -> float:
+        if self.size_before == 0:
+            return 1.0
+        return self.size_after / self.size_before
+
+    @property
+    def encode_time_saved(self) -> float:
+        return self.encode_time_before - self.encode_time_after
+
+
+def _canonical(value: Any) -> Any:
+    if type(value) is not float:
+        return value
+    if value == 0.0:
+        return 0
+    if value.is_integer() and abs(value) <= _MAX_SAFE_INTEGER:
+        return int(value)
+    return value
+
+
+def _canonical_point(point: Any) -> Any:
+    if not isinstance(point, (tuple, list)):
+        return point
+    canonical = tuple(_canonical(value) for value in point)
+    if all(a is b for a, b in zip(canonical, point)):
+        return point
+    return canonical
+
+
+def _snap(value: float, grid: float) -> Any:
+    return _canonical(round(value / grid) * grid)
+
+
+def _snap_point(point: Any, grid: float) -> Any:
+    return (_snap(point[0], grid), _snap(point[1], grid))
+
+
+def _json_size(data: dict) -> int:
+    return len(json.dumps(data, separators=(',', ':')))
+
+
+def _walk(node: Tracked) -> Iterator[Tracked]:
+    yield node
+    for attribute in node.__attrs_attrs__:
+        value = getattr(node, attribute.name)
+        if isinstance(value, Tracked):
+            yield from _walk(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, Tracked):
+                    yield from _walk(item)
+
+
+class _Minifier:
+    __slots__ = ('angle_grid', 'changed', 'grid')
+
+    def __init__(self, grid: float, angle_grid: float) -> None:
+        self.grid = grid
+        self.angle_grid = angle_grid
+        self.changed = 0
+
+    def set(self, node: Tracked, name: str, value: Any) -> None:
+        old = getattr(node, name)
+        if value is old or (value == old and type(value) is type(old) and value != 0):
+            return
+        setattr(node, name, value)
+        self.changed += 1
+
+    def canonicalize(self, node: Tracked) -> None:
+        for attribute in node.__attrs_attrs__:
+            if not attribute.init:
+                continue
+            value = getattr(node, attribute.name)
+            if type(value) is float:
+                self.set(node, attribute.name, _canonical(value))
+            elif isinstance(value, (tuple, list)):
+                self.set(node, attribute.name, _canonical_point(value))
+        if isinstance(node, PolygonShape):
+            self.canonicalize_vertices(node)
+
+    def canonicalize_vertices(self, polygon: PolygonShape) -> None:
+        vertices = []
+        for vertex in polygon.vertices:
+            vertex = _canonical_point(vertex)
+            if vertices and tuple(vertices[-1]) == tuple(vertex):
+                continue
+            vertices.append(vertex)
+        if len(vertices) > 1 and tuple(vertices[0]) == tuple(vertices[-1]):
+            vertices.pop()
+        if len(vertices) < 3 or (
+            len(vertices) == len(polygon.vertices)
+            and all(a is b for a, b in zip(vertices, polygon.vertices))
+        ):
+            return
+        polygon.vertices = vertices
+        self.changed += 1
+
+    def quantize(self, node: Tracked) -> None:
+        fields = _GEOMETRY_FIELDS.get(type(node))
+        if fields is not None:
+            lengths, points, angles = fields
+            for name in lengths:
+                self.set(node, name, _snap(getattr(node, name), self.grid))
+            for name in points:
+                self.set(node, name, _snap_point(getattr(node, name), self.grid))
+            for name in angles:
+                self.set(node, name, _snap(getattr(node, name), self.angle_grid))
+        if isinstance(node, PolygonShape):
+            # Vertices are snapped in shape-local units, before `scale` is applied.
+            vertices = [_snap_point(vertex, self.grid) for vertex in node.vertices]
+            if vertices != [tuple(vertex) for vertex in node.vertices]:
+                node.vertices = vertices
+                self.changed += 1
+            self.canonicalize_vertices(node)
+
+
+def minify_map(
+    bonk_map: 'BonkMap',
+    *,
+    quantize: bool = False,
+    grid: float = 1 / 16,
+    angle_grid: float = 1 / 4096,
+) -> 'MinifyReport':
+    """
+    Shrinks the encoded forms of ``bonk_map`` in place.
+
+    The default mode is lossless: ``-0.0`` and integral floats become plain ints and
+    duplicate polygon vertices are dropped. The database string stores every number as a
+    float64, so only the dropped vertices make it shorter; the ints shorten the JSON form.
+    With ``quantize=True`` positions, sizes and vertices are also rounded to ``grid`` pixels
+    and angles to ``angle_grid`` radians. Powers of two keep the rounded values exact,
+    which is what lets LZString find repeats in the float64 fields of the database string.
+    """
+
+    json_size_before = _json_size(bonk_map._build_json())
+    start = time.perf_counter()
+    size_before = len(bonk_map._build_database())
+    encode_time_before = time.perf_counter() - start
+
+    minifier = _Minifier(grid, angle_grid)
+    for node in _walk(bonk_map):
+        if quantize:
+            minifier.quantize(node)
+        minifier.canonicalize(node)
+    if quantize:
+        for body in bonk_map.physics.bodies:
+            minifier.set(body, 'position', _snap_point(body.position, minifier.grid))
+            minifier.set(body, 'angle', _snap(body.angle, minifier.angle_grid))
+        for spawn in bonk_map.spawns:
+            minifier.set(spawn, 'position', _snap_point(spawn.position, minifier.grid))
+
+    start = time.perf_counter()
+    size_after = len(bonk_map.encode_to_database())
+    encode_time_after = time.perf_counter() - start
+
+    return MinifyReport(
+        size_before=size_before,
+        size_after=size_after,
+        json_size_before=json_size_before,
+        json_size_after=_json_size(bonk_map.to_json()),
+        encode_time_before=encode_time_before,
+        encode_time_after=encode_time_after,
+        changed_values=minifier.changed,
+    )
@@ -1,13 +1,20 @@
 from . import body, joint, shape
+from .codec import JOINT_CODECS, SHAPE_CODECS, CodecEntry, TypeRegistry
 from .collide import CollideFlag, CollideGroup
 from .fixture import Fixture
 from .map_physics import MapPhysics
+from .reference_index import ReferenceIndex
 
 __all__ = [
+    'JOINT_CODECS',
+    'SHAPE_CODECS',
+    'CodecEntry',
     'CollideFlag',
     'CollideGroup',
     'Fixture',
     'MapPhysics',
+    'ReferenceIndex',
+    'TypeRegistry',
     'body',
     'joint',
     'shape',
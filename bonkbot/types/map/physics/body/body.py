@@ -2,19 +2,26 @@ from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, array, custom, nested, point, scalar, utf
+from ...tracking import Tracked, track_changes
 from ..collide import CollideFlag, CollideGroup
-from .body_force import BodyForce
+from .body_force import BODY_FORCE_SCHEMA, BodyForce
 from .body_shape import BodyShape
 from .body_type import BodyType
-from .force_zone import ForceZone
+from .force_zone import FORCE_ZONE_SCHEMA, ForceZone
 
 if TYPE_CHECKING:
     from .....pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IBody.ts
-@define(slots=True, auto_attribs=True)
-class Body:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class Body(Tracked):
     name: Optional[str] = field(default=None)  # 30
 
     position: Tuple[float, float] = field(default=(0, 0))  # -99999,+99999
@@ -56,51 +63,39 @@ class Body:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_utf(self.shape.body_type.value)
-        buffer.write_utf(self.shape.name)
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_float64(self.angle)
-        buffer.write_float64(self.shape.friction)
-        buffer.write_bool(self.shape.friction_players)
-        buffer.write_float64(self.shape.restitution)
-        buffer.write_float64(self.shape.density)
-        buffer.write_float64(self.linear_velocity[0])
-        buffer.write_float64(self.linear_velocity[1])
-        buffer.write_float64(self.angular_velocity)
-        buffer.write_float64(self.shape.linear_damping)
-        buffer.write_float64(self.shape.angular_damping)
-        buffer.write_bool(self.shape.fixed_rotation)
-        buffer.write_bool(self.shape.anti_tunnel)
-        self.force.to_buffer(buffer)
-        buffer.write_int16(self.shape.collide_group.value)
-        self.shape.collide_mask.to_buffer(buffer)
-        self.force_zone.to_buffer(buffer)
-        buffer.write_int16(len(self.fixtures))
-        for fixture in self.fixtures:
-            buffer.write_int16(fixture)
+        BODY_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer', version: int) -> 'Body':
-        self.shape.body_type = BodyType.from_name(buffer.read_utf())
-        self.shape.name = buffer.read_utf()
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        self.angle = buffer.read_float64()
-        self.shape.friction = buffer.read_float64()
-        self.shape.friction_players = buffer.read_bool()
-        self.shape.restitution = buffer.read_float64()
-        self.shape.density = buffer.read_float64()
-        self.linear_velocity = (buffer.read_float64(), buffer.read_float64())
-        self.angular_velocity = buffer.read_float64()
-        self.shape.linear_damping = buffer.read_float64()
-        self.shape.angular_damping = buffer.read_float64()
-        self.shape.fixed_rotation = buffer.read_bool()
-        self.shape.anti_tunnel = buffer.read_bool()
-        self.force.from_buffer(buffer)
-        self.shape.collide_group = CollideGroup.from_id(buffer.read_int16())
-        self.shape.collide_mask = CollideFlag.from_buffer(buffer, version)
-        if version >= 14:
-            self.force_zone.from_buffer(buffer, version)
-        fixtures_count = buffer.read_int16()
-        for _ in range(fixtures_count):
-            self.fixtures.append(buffer.read_int16())
-        return self
+        return BODY_SCHEMA.decode(self, buffer, version)
+
+
+BODY_SCHEMA = BinarySchema(
+    utf(
+        'shape.body_type',
+        to_wire=lambda body_type: body_type.value,
+        from_wire=BodyType.from_name,
+    ),
+    utf('shape.name'),
+    point('position'),
+    scalar('angle', 'd'),
+    scalar('shape.friction', 'd'),
+    scalar('shape.friction_players', '?'),
+    scalar('shape.restitution', 'd'),
+    scalar('shape.density', 'd'),
+    point('linear_velocity'),
+    scalar('angular_velocity', 'd'),
+    scalar('shape.linear_damping', 'd'),
+    scalar('shape.angular_damping', 'd'),
+    scalar('shape.fixed_rotation', '?'),
+    scalar('shape.anti_tunnel', '?'),
+    nested('force', BODY_FORCE_SCHEMA),
+    scalar('shape.collide_group', 'h', from_wire=CollideGroup.from_id),
+    custom(
+        'shape.collide_mask',
+        lambda collide_mask, buffer, version: collide_mask.to_buffer(buffer),
+        CollideFlag.from_buffer,
+    ),
+    nested('force_zone', FORCE_ZONE_SCHEMA, since=14),
+    array('fixtures', 'h'),
+    on_decoded=Tracked._decoded,
+)
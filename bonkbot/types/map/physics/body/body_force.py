@@ -2,13 +2,21 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from .....pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IBodyForce.ts
-@define(slots=True, auto_attribs=True)
-class BodyForce:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class BodyForce(Tracked):
     force: Tuple[float, float] = field(default=(0, 0))  # -999999,+999999
     is_relative: bool = field(default=True)
     torque: float = field(default=0)  # -999999,+999999
@@ -28,13 +36,15 @@ class BodyForce:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.force[0])
-        buffer.write_float64(self.force[1])
-        buffer.write_float64(self.torque)
-        buffer.write_bool(self.is_relative)
+        BODY_FORCE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'BodyForce':
-        self.force = (buffer.read_float64(), buffer.read_float64())
-        self.torque = buffer.read_float64()
-        self.is_relative = buffer.read_bool()
-        return self
+        return BODY_FORCE_SCHEMA.decode(self, buffer)
+
+
+BODY_FORCE_SCHEMA = BinarySchema(
+    point('force'),
+    scalar('torque', 'd'),
+    scalar('is_relative', '?'),
+    on_decoded=Tracked._decoded,
+)
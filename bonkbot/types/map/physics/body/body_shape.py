@@ -1,12 +1,18 @@
 from attrs import define, field
 
+from ...tracking import Tracked, track_changes
 from ..collide import CollideFlag, CollideGroup
 from .body_type import BodyType
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IBodyShape.ts
-@define(slots=True, auto_attribs=True)
-class BodyShape:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class BodyShape(Tracked):
     body_type: 'BodyType' = field(default=BodyType.STATIC)
     name: str = field(default='Unnamed')  # 30
 
@@ -3,6 +3,9 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, group, point, scalar
+from ...tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from .....pson.bytebuffer import ByteBuffer
 
@@ -21,8 +24,13 @@ class ForceZoneType(enum.IntEnum):
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IBodyForceZoneProperties.ts
-@define(slots=True, auto_attribs=True)
-class ForceZone:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class ForceZone(Tracked):
     enabled: bool = field(default=False)
     type: 'ForceZoneType' = field(default=ForceZoneType.ABSOLUTE)
     force: Tuple[float, float] = field(default=(0, 0))  # -999999,+999999
@@ -56,24 +64,22 @@ class ForceZone:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_bool(self.enabled)
-        if self.enabled:
-            buffer.write_float64(self.force[0])
-            buffer.write_float64(self.force[1])
-            buffer.write_bool(self.push_players)
-            buffer.write_bool(self.push_bodies)
-            buffer.write_bool(self.push_arrows)
-            buffer.write_int16(self.type.value)
-            buffer.write_float64(self.center_force)
+        FORCE_ZONE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer', version: int) -> 'ForceZone':
-        self.enabled = buffer.read_bool()
-        if self.enabled:
-            self.force = (buffer.read_float64(), buffer.read_float64())
-            self.push_players = buffer.read_bool()
-            self.push_bodies = buffer.read_bool()
-            self.push_arrows = buffer.read_bool()
-            if version >= 15:
-                self.type = ForceZoneType.from_id(buffer.read_int16())
-                self.center_force = buffer.read_float64()
-        return self
+        return FORCE_ZONE_SCHEMA.decode(self, buffer, version)
+
+
+FORCE_ZONE_SCHEMA = BinarySchema(
+    scalar('enabled', '?'),
+    group(
+        point('force'),
+        scalar('push_players', '?'),
+        scalar('push_bodies', '?'),
+        scalar('push_arrows', '?'),
+        scalar('type', 'h', since=15, from_wire=ForceZoneType.from_id),
+        scalar('center_force', 'd', since=15),
+        when=lambda force_zone: force_zone.enabled,
+    ),
+    on_decoded=Tracked._decoded,
+)
@@ -0,0 +1,116 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Type, TypeVar
+
+from attrs import define
+
+from .joint.distance_joint import DistanceJoint
+from .joint.gear_joint import GearJoint
+from .joint.lpj_joint import LPJJoint
+from .joint.lsj_joint import LSJJoint
+from .joint.revolute_joint import RevoluteJoint
+from .shape.box_shape import BoxShape
+from .shape.circle_shape import CircleShape
+from .shape.polygon_shape import PolygonShape
+
+if TYPE_CHECKING:
+    from ....pson.bytebuffer import ByteBuffer
+    from .joint.joint import Joint
+    from .shape.shape import Shape
+
+T = TypeVar('T')
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class CodecEntry:
+    type: type
+    wire_id: int
+    json_type: str
+
+    def decode(self, buffer: 'ByteBuffer') -> Any:
+        return self.type().from_buffer(buffer)
+
+    def from_json(self, data: dict) -> Any:
+        return self.type().from_json(data)
+
+
+class TypeRegistry(Generic[T]):
+    """
+    Maps the polymorphic map elements to their database wire id and JSON ``type`` tag.
+
+    Every lookup is a single dict access, and new element kinds are added with
+    :meth:`register` without touching the map codec.
+    """
+
+    __slots__ = ('_by_json_type', '_by_type', '_by_wire_id', 'kind')
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self._by_type: Dict[type, CodecEntry] = {}
+        self._by_wire_id: Dict[int, CodecEntry] = {}
+        self._by_json_type: Dict[str, CodecEntry] = {}
+
+    def register(self, cls: Type[T], wire_id: int, json_type: str) -> Type[T]:
+        if wire_id in self._by_wire_id or json_type in self._by_json_type:
+            raise ValueError(
+                f'{self.kind.capitalize()} id {wire_id} / {json_type!r} is already registered'
+            )
+        entry = CodecEntry(type=cls, wire_id=wire_id, json_type=json_type)
+        self._by_type[cls] = entry
+        self._by_wire_id[wire_id] = entry
+        self._by_json_type[json_type] = entry
+        return cls
+
+    def registered(self, wire_id: int, json_type: str) -> Callable[[Type[T]], Type[T]]:
+        """Class decorator form of :meth:`register`."""
+        return lambda cls: self.register(cls, wire_id, json_type)
+
+    def unregister(self, cls: Type[T]) -> None:
+        entry = self._by_wire_id.pop(self._by_type[cls].wire_id)
+        del self._by_json_type[entry.json_type]
+        # Also drops subclasses that were resolved to this entry.
+        self._by_type = {
+            registered: other
+            for registered, other in self._by_type.items()
+            if other is not entry
+        }
+
+    def entry(self, value: Any) -> 'CodecEntry':
+        entry = self._by_type.get(type(value))
+        if entry is None:
+            # Unregistered subclasses encode like their closest registered base.
+            for base in type(value).__mro__[1:]:
+                entry = self._by_type.get(base)
+                if entry is not None:
+                    self._by_type[type(value)] = entry
+                    return entry
+            raise ValueError(f'Unregistered {self.kind} type: {type(value).__name__}')
+        return entry
+
+    def encode(self, value: T, buffer: 'ByteBuffer') -> None:
+        buffer.write_int16(self.entry(value).wire_id)
+        value.to_buffer(buffer)
+
+    def decode(self, buffer: 'ByteBuffer') -> T:
+        wire_id = buffer.read_int16()
+        entry = self._by_wire_id.get(wire_id)
+        if entry is None:
+            raise ValueError(f'Invalid {self.kind} id: {wire_id}')
+        return entry.decode(buffer)
+
+    def from_json(self, data: dict) -> T:
+        entry = self._by_json_type.get(data['type'])
+        if entry is None:
+            raise ValueError(f'Invalid {self.kind} type: {data["type"]}')
+        return entry.from_json(data)
+
+
+SHAPE_CODECS: 'TypeRegistry[Shape]' = TypeRegistry('shape')
+SHAPE_CODECS.register(BoxShape, 1, 'bx')
+SHAPE_CODECS.register(CircleShape, 2, 'ci')
+SHAPE_CODECS.register(PolygonShape, 3, 'po')
+
+JOINT_CODECS: 'TypeRegistry[Joint]' = TypeRegistry('joint')
+JOINT_CODECS.register(RevoluteJoint, 1, 'rv')
+JOINT_CODECS.register(DistanceJoint, 2, 'd')
+JOINT_CODECS.register(LPJJoint, 3, 'lpj')
+JOINT_CODECS.register(LSJJoint, 4, 'lsj')
+JOINT_CODECS.register(GearJoint, 5, 'g')
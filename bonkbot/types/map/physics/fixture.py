@@ -2,13 +2,21 @@ from typing import TYPE_CHECKING, Optional
 
 from attrs import define, field
 
+from ....pson.schema import BinarySchema, scalar, utf
+from ..tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from ....pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IFixture.ts
-@define(slots=True, auto_attribs=True)
-class Fixture:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class Fixture(Tracked):
     shape_id: int = field(default=-1)
 
     name: str = field(default='Def Fix')
@@ -65,55 +73,32 @@ class Fixture:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_int16(self.shape_id)
-        buffer.write_utf(self.name)
-        buffer.write_float64(
-            self.friction if self.friction is not None else 1.7976931348623157e308,
-        )
-        buffer.write_int16((None, False, True).index(self.friction_players))
-        buffer.write_float64(
-            self.restitution
-            if self.restitution is not None
-            else 1.7976931348623157e308,
-        )
-        buffer.write_float64(
-            self.density if self.density is not None else 1.7976931348623157e308,
-        )
-        buffer.write_uint32(self.color)
-        buffer.write_bool(self.death)
-        buffer.write_bool(self.no_physics)
-        buffer.write_bool(self.no_grapple)
-        buffer.write_bool(
-            self.inner_grapple if self.inner_grapple is not None else False,
-        )
+        FIXTURE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer', version: int) -> 'Fixture':
-        self.shape_id = buffer.read_int16()
-        self.name = buffer.read_utf()
-
-        friction = buffer.read_float64()
-        if friction == 1.7976931348623157e308:
-            friction = None
-        self.friction = friction
-
-        self.friction_players = (None, False, True)[buffer.read_int16()]
-
-        restitution = buffer.read_float64()
-        if restitution == 1.7976931348623157e308:
-            restitution = None
-        self.restitution = restitution
-
-        density = buffer.read_float64()
-        if density == 1.7976931348623157e308:
-            density = None
-        self.density = density
-
-        self.color = buffer.read_uint32()
-        self.death = buffer.read_bool()
-        self.no_physics = buffer.read_bool()
-
-        if version >= 11:
-            self.no_grapple = buffer.read_bool()
-        if version >= 12:
-            self.inner_grapple = buffer.read_bool()
-        return self
+        return FIXTURE_SCHEMA.decode(self, buffer, version)
+
+
+# Bonk writes the largest double for optional numbers that are not set.
+_UNSET = 1.7976931348623157e308
+_FRICTION_PLAYERS = (None, False, True)
+
+FIXTURE_SCHEMA = BinarySchema(
+    scalar('shape_id', 'h'),
+    utf('name'),
+    scalar('friction', 'd', none=_UNSET),
+    scalar(
+        'friction_players',
+        'h',
+        to_wire=_FRICTION_PLAYERS.index,
+        from_wire=_FRICTION_PLAYERS.__getitem__,
+    ),
+    scalar('restitution', 'd', none=_UNSET),
+    scalar('density', 'd', none=_UNSET),
+    scalar('color', 'I'),
+    scalar('death', '?'),
+    scalar('no_physics', '?'),
+    scalar('no_grapple', '?', since=11),
+    scalar('inner_grapple', '?', since=12, default=False),
+    on_decoded=Tracked._decoded,
+)
@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
 from .joint import Joint
 
 if TYPE_CHECKING:
@@ -10,7 +12,12 @@ if TYPE_CHECKING:
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJoint.ts
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJointProperties.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class DistanceJoint(Joint):
     softness: float = field(default=0.0)  # -99999,+99999
     damping: float = field(default=0.0)  # -99999,+99999
@@ -51,26 +58,21 @@ class DistanceJoint(Joint):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.softness)
-        buffer.write_float64(self.damping)
-        buffer.write_float64(self.pivot[0])
-        buffer.write_float64(self.pivot[1])
-        buffer.write_float64(self.attach[0])
-        buffer.write_float64(self.attach[1])
-        buffer.write_int16(self.body_a_id)
-        buffer.write_int16(self.body_b_id)
-        buffer.write_bool(self.collide_connected)
-        buffer.write_float64(self.break_force)
-        buffer.write_bool(self.draw_line)
+        DISTANCE_JOINT_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'DistanceJoint':
-        self.softness = buffer.read_float64()
-        self.damping = buffer.read_float64()
-        self.pivot = (buffer.read_float64(), buffer.read_float64())
-        self.attach = (buffer.read_float64(), buffer.read_float64())
-        self.body_a_id = buffer.read_int16()
-        self.body_b_id = buffer.read_int16()
-        self.collide_connected = buffer.read_bool()
-        self.break_force = buffer.read_float64()
-        self.draw_line = buffer.read_bool()
-        return self
+        return DISTANCE_JOINT_SCHEMA.decode(self, buffer)
+
+
+DISTANCE_JOINT_SCHEMA = BinarySchema(
+    scalar('softness', 'd'),
+    scalar('damping', 'd'),
+    point('pivot'),
+    point('attach'),
+    scalar('body_a_id', 'h'),
+    scalar('body_b_id', 'h'),
+    scalar('collide_connected', '?'),
+    scalar('break_force', 'd'),
+    scalar('draw_line', '?'),
+    on_decoded=Tracked._decoded,
+)
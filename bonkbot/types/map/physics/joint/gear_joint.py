@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, scalar, utf
+from ...tracking import Tracked, track_changes
 from .joint import Joint
 
 if TYPE_CHECKING:
@@ -10,7 +12,12 @@ if TYPE_CHECKING:
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJoint.ts
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJointProperties.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class GearJoint(Joint):
     name: str = field(default='Gear Joint')  # 29
     ratio: float = field(default=0.0)  # -99999999,+99999999
@@ -34,14 +41,16 @@ class GearJoint(Joint):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_utf(self.name)
-        buffer.write_float64(self.ratio)
-        buffer.write_int16(self.joint_a_id)
-        buffer.write_int16(self.joint_b_id)
+        GEAR_JOINT_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'GearJoint':
-        self.name = buffer.read_utf()
-        self.ratio = buffer.read_float64()
-        self.joint_a_id = buffer.read_int16()
-        self.joint_b_id = buffer.read_int16()
-        return self
+        return GEAR_JOINT_SCHEMA.decode(self, buffer)
+
+
+GEAR_JOINT_SCHEMA = BinarySchema(
+    utf('name'),
+    scalar('ratio', 'd'),
+    scalar('joint_a_id', 'h'),
+    scalar('joint_b_id', 'h'),
+    on_decoded=Tracked._decoded,
+)
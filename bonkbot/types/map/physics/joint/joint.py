@@ -2,13 +2,20 @@ from typing import TYPE_CHECKING
 
 from attrs import define
 
+from ...tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from .....pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJoint.ts
-@define(slots=True, auto_attribs=True)
-class Joint:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class Joint(Tracked):
     def to_json(self) -> dict: ...
 
     def from_json(self, data: dict) -> 'Joint': ...
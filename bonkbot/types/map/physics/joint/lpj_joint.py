@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
 from .joint import Joint
 
 if TYPE_CHECKING:
@@ -10,7 +12,12 @@ if TYPE_CHECKING:
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJoint.ts
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJointProperties.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class LPJJoint(Joint):
     position: Tuple[float, float] = field(default=(0, 0))  # -99999999,+99999999
     angle: float = field(default=0)  # -99999999,+99999999
@@ -61,31 +68,24 @@ class LPJJoint(Joint):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_float64(self.angle)
-        buffer.write_float64(self.force)
-        buffer.write_float64(self.pl)
-        buffer.write_float64(self.pu)
-        buffer.write_float64(self.path_length)
-        buffer.write_float64(self.path_speed)
-        buffer.write_int16(self.body_a_id)
-        buffer.write_int16(self.body_b_id)
-        buffer.write_bool(self.collide_connected)
-        buffer.write_float64(self.break_force)
-        buffer.write_bool(self.draw_line)
+        LPJ_JOINT_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'LPJJoint':
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        self.angle = buffer.read_float64()
-        self.force = buffer.read_float64()
-        self.pl = buffer.read_float64()
-        self.pu = buffer.read_float64()
-        self.path_length = buffer.read_float64()
-        self.path_speed = buffer.read_float64()
-        self.body_a_id = buffer.read_int16()
-        self.body_b_id = buffer.read_int16()
-        self.collide_connected = buffer.read_bool()
-        self.break_force = buffer.read_float64()
-        self.draw_line = buffer.read_bool()
-        return self
+        return LPJ_JOINT_SCHEMA.decode(self, buffer)
+
+
+LPJ_JOINT_SCHEMA = BinarySchema(
+    point('position'),
+    scalar('angle', 'd'),
+    scalar('force', 'd'),
+    scalar('pl', 'd'),
+    scalar('pu', 'd'),
+    scalar('path_length', 'd'),
+    scalar('path_speed', 'd'),
+    scalar('body_a_id', 'h'),
+    scalar('body_b_id', 'h'),
+    scalar('collide_connected', '?'),
+    scalar('break_force', 'd'),
+    scalar('draw_line', '?'),
+    on_decoded=Tracked._decoded,
+)
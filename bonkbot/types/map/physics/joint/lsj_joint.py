@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
 from .joint import Joint
 
 if TYPE_CHECKING:
@@ -10,7 +12,12 @@ if TYPE_CHECKING:
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJoint.ts
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJointProperties.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class LSJJoint(Joint):
     position: Tuple[float, float] = field(default=(0, 0))  # -99999999,+99999999
     spring_force: float = field(default=0.0)  # -99999999,+99999999
@@ -49,23 +56,20 @@ class LSJJoint(Joint):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_float64(self.spring_force)
-        buffer.write_float64(self.spring_length)
-        buffer.write_int16(self.body_a_id)
-        buffer.write_int16(self.body_b_id)
-        buffer.write_bool(self.collide_connected)
-        buffer.write_float64(self.break_force)
-        buffer.write_bool(self.draw_line)
+        LSJ_JOINT_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'LSJJoint':
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        self.spring_force = buffer.read_float64()
-        self.spring_length = buffer.read_float64()
-        self.body_a_id = buffer.read_int16()
-        self.body_b_id = buffer.read_int16()
-        self.collide_connected = buffer.read_bool()
-        self.break_force = buffer.read_float64()
-        self.draw_line = buffer.read_bool()
-        return self
+        return LSJ_JOINT_SCHEMA.decode(self, buffer)
+
+
+LSJ_JOINT_SCHEMA = BinarySchema(
+    point('position'),
+    scalar('spring_force', 'd'),
+    scalar('spring_length', 'd'),
+    scalar('body_a_id', 'h'),
+    scalar('body_b_id', 'h'),
+    scalar('collide_connected', '?'),
+    scalar('break_force', 'd'),
+    scalar('draw_line', '?'),
+    on_decoded=Tracked._decoded,
+)
@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
 from .joint import Joint
 
 if TYPE_CHECKING:
@@ -10,7 +12,12 @@ if TYPE_CHECKING:
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJoint.ts
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IJointProperties.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class RevoluteJoint(Joint):
     from_angle: float = field(default=0.0)  # -999,+999
     to_angle: float = field(default=0.0)  # -999,+999
@@ -60,31 +67,24 @@ class RevoluteJoint(Joint):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.from_angle)
-        buffer.write_float64(self.to_angle)
-        buffer.write_float64(self.turn_force)
-        buffer.write_float64(self.motor_speed)
-        buffer.write_bool(self.enable_limit)
-        buffer.write_bool(self.enable_motor)
-        buffer.write_float64(self.pivot[0])
-        buffer.write_float64(self.pivot[1])
-        buffer.write_int16(self.body_a_id)
-        buffer.write_int16(self.body_b_id)
-        buffer.write_bool(self.collide_connected)
-        buffer.write_float64(self.break_force)
-        buffer.write_bool(self.draw_line)
+        REVOLUTE_JOINT_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'RevoluteJoint':
-        self.from_angle = buffer.read_float64()
-        self.to_angle = buffer.read_float64()
-        self.turn_force = buffer.read_float64()
-        self.motor_speed = buffer.read_float64()
-        self.enable_limit = buffer.read_bool()
-        self.enable_motor = buffer.read_bool()
-        self.pivot = (buffer.read_float64(), buffer.read_float64())
-        self.body_a_id = buffer.read_int16()
-        self.body_b_id = buffer.read_int16()
-        self.collide_connected = buffer.read_bool()
-        self.break_force = buffer.read_float64()
-        self.draw_line = buffer.read_bool()
-        return self
+        return REVOLUTE_JOINT_SCHEMA.decode(self, buffer)
+
+
+REVOLUTE_JOINT_SCHEMA = BinarySchema(
+    scalar('from_angle', 'd'),
+    scalar('to_angle', 'd'),
+    scalar('turn_force', 'd'),
+    scalar('motor_speed', 'd'),
+    scalar('enable_limit', '?'),
+    scalar('enable_motor', '?'),
+    point('pivot'),
+    scalar('body_a_id', 'h'),
+    scalar('body_b_id', 'h'),
+    scalar('collide_connected', '?'),
+    scalar('break_force', 'd'),
+    scalar('draw_line', '?'),
+    on_decoded=Tracked._decoded,
+)
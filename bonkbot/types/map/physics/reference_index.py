@@ -0,0 +1,95 @@
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from attrs import define, field
+
+from .joint.gear_joint import GearJoint
+
+if TYPE_CHECKING:
+    from .map_physics import MapPhysics
+
+
+@define(slots=True, auto_attribs=True)
+class ReferenceIndex:
+    """
+    Snapshot of the id references inside :class:`MapPhysics`.
+
+    Forward edges mirror the map data (fixture -> shape, body -> fixtures, joint -> bodies,
+    gear joint -> joints), reverse edges answer "who uses this" without scanning the lists.
+    References that point outside the lists are kept in the forward edges only.
+    """
+
+    fixture_shape: List[int] = field(factory=list)
+    body_fixtures: List[Tuple[int, ...]] = field(factory=list)
+    joint_bodies: List[Tuple[int, ...]] = field(factory=list)
+    gear_joints: Dict[int, Tuple[int, int]] = field(factory=dict)
+
+    shape_fixtures: List[List[int]] = field(factory=list)
+    fixture_bodies: List[List[int]] = field(factory=list)
+    body_joints: List[List[int]] = field(factory=list)
+    joint_gears: List[List[int]] = field(factory=list)
+
+    @classmethod
+    def from_physics(cls, physics: 'MapPhysics') -> 'ReferenceIndex':
+        shapes_count = len(physics.shapes)
+        fixtures_count = len(physics.fixtures)
+        bodies_count = len(physics.bodies)
+        joints_count = len(physics.joints)
+
+        index = cls(
+            shape_fixtures=[[] for _ in range(shapes_count)],
+            fixture_bodies=[[] for _ in range(fixtures_count)],
+            body_joints=[[] for _ in range(bodies_count)],
+            joint_gears=[[] for _ in range(joints_count)],
+        )
+
+        for fixture_id, fixture in enumerate(physics.fixtures):
+            shape_id = fixture.shape_id
+            index.fixture_shape.append(shape_id)
+            if 0 <= shape_id < shapes_count:
+                index.shape_fixtures[shape_id].append(fixture_id)
+
+        for body_id, body in enumerate(physics.bodies):
+            fixtures = tuple(body.fixtures)
+            index.body_fixtures.append(fixtures)
+            for fixture_id in fixtures:
+                if 0 <= fixture_id < fixtures_count:
+                    index.fixture_bodies[fixture_id].append(body_id)
+
+        for joint_id, joint in enumerate(physics.joints):
+            if isinstance(joint, GearJoint):
+                index.joint_bodies.append(())
+                index.gear_joints[joint_id] = (joint.joint_a_id, joint.joint_b_id)
+                for target_id in (joint.joint_a_id, joint.joint_b_id):
+                    if 0 <= target_id < joints_count:
+                        index.joint_gears[target_id].append(joint_id)
+                continue
+            bodies = (joint.body_a_id, joint.body_b_id)
+            index.joint_bodies.append(bodies)
+            for body_id in bodies:
+                if 0 <= body_id < bodies_count:
+                    index.body_joints[body_id].append(joint_id)
+
+        return index
+
+    def unused_shapes(self) -> List[int]:
+        return [
+            shape_id
+            for shape_id, fixtures in enumerate(self.shape_fixtures)
+            if not fixtures
+        ]
+
+    def unused_fixtures(self) -> List[int]:
+        return [
+            fixture_id
+            for fixture_id, bodies in enumerate(self.fixture_bodies)
+            if not bodies
+        ]
+
+    def dangling_fixtures(self) -> List[int]:
+        """Fixtures whose shape id points outside the shapes list."""
+        shapes_count = len(self.shape_fixtures)
+        return [
+            fixture_id
+            for fixture_id, shape_id in enumerate(self.fixture_shape)
+            if not 0 <= shape_id < shapes_count
+        ]
@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
 from .shape import Shape
 
 if TYPE_CHECKING:
@@ -9,7 +11,12 @@ if TYPE_CHECKING:
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IShape.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class BoxShape(Shape):
     width: float = field(default=10.0)  # 0-99999
     height: float = field(default=40.0)  # 0-99999
@@ -35,17 +42,17 @@ class BoxShape(Shape):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.width)
-        buffer.write_float64(self.height)
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_float64(self.angle)
-        buffer.write_bool(self.shrink)
+        BOX_SHAPE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'BoxShape':
-        self.width = buffer.read_float64()
-        self.height = buffer.read_float64()
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        self.angle = buffer.read_float64()
-        self.shrink = buffer.read_bool()
-        return self
+        return BOX_SHAPE_SCHEMA.decode(self, buffer)
+
+
+BOX_SHAPE_SCHEMA = BinarySchema(
+    scalar('width', 'd'),
+    scalar('height', 'd'),
+    point('position'),
+    scalar('angle', 'd'),
+    scalar('shrink', '?'),
+    on_decoded=Tracked._decoded,
+)
@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, scalar
+from ...tracking import Tracked, track_changes
 from .shape import Shape
 
 if TYPE_CHECKING:
@@ -9,7 +11,12 @@ if TYPE_CHECKING:
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IShape.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class CircleShape(Shape):
     radius: float = field(default=25.0)  # 0-99999
     shrink: bool = field(default=False)
@@ -29,13 +36,15 @@ class CircleShape(Shape):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.radius)
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_bool(self.shrink)
+        CIRCLE_SHAPE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'CircleShape':
-        self.radius = buffer.read_float64()
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        self.shrink = buffer.read_bool()
-        return self
+        return CIRCLE_SHAPE_SCHEMA.decode(self, buffer)
+
+
+CIRCLE_SHAPE_SCHEMA = BinarySchema(
+    scalar('radius', 'd'),
+    point('position'),
+    scalar('shrink', '?'),
+    on_decoded=Tracked._decoded,
+)
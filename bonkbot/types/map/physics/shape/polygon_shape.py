@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING, List, Tuple
 
 from attrs import define, field
 
+from .....pson.schema import BinarySchema, point, point_array, scalar
+from ...tracking import Tracked, track_changes
 from .shape import Shape
 
 if TYPE_CHECKING:
@@ -9,7 +11,12 @@ if TYPE_CHECKING:
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/IShape.ts
-@define(slots=True, auto_attribs=True)
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
 class PolygonShape(Shape):
     angle: float = field(default=0.0)  # -999,+999
     scale: float = field(default=1.0)  # -999,+999
@@ -32,21 +39,16 @@ class PolygonShape(Shape):
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.scale)
-        buffer.write_float64(self.angle)
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_int16(len(self.vertices))
-        for x, y in self.vertices:
-            buffer.write_float64(x)
-            buffer.write_float64(y)
+        POLYGON_SHAPE_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'PolygonShape':
-        self.scale = buffer.read_float64()
-        self.angle = buffer.read_float64()
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        vertices = []
-        for _ in range(buffer.read_int16()):
-            vertices.append((buffer.read_float64(), buffer.read_float64()))
-        self.vertices = vertices
-        return self
+        return POLYGON_SHAPE_SCHEMA.decode(self, buffer)
+
+
+POLYGON_SHAPE_SCHEMA = BinarySchema(
+    scalar('scale', 'd'),
+    scalar('angle', 'd'),
+    point('position'),
+    point_array('vertices'),
+    on_decoded=Tracked._decoded,
+)
@@ -2,12 +2,19 @@ from typing import TYPE_CHECKING, Tuple
 
 from attrs import define, field
 
+from ...tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from .....pson.bytebuffer import ByteBuffer
 
 
-@define(slots=True, auto_attribs=True)
-class Shape:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class Shape(Tracked):
     position: Tuple[float, float] = field(default=(0, 0))  # -99999,+99999
 
     def to_json(self) -> dict: ...
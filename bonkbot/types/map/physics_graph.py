@@ -0,0 +1,548 @@
+import copy
+from itertools import count
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .physics.joint.gear_joint import GearJoint
+from .validation import MapIssueType
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+    from .capture_zone import CaptureZone
+    from .physics.body.body import Body
+    from .physics.fixture import Fixture
+    from .physics.joint.joint import Joint
+    from .physics.shape.shape import Shape
+
+Handle = int
+# Ordered set of handles, dicts keep insertion order and give O(1) removal.
+_HandleSet = Dict[Handle, None]
+_WORLD = -1
+
+
+class PhysicsGraph:
+    """
+    Editable adjacency index over the physics of a :class:`BonkMap`.
+
+    Shapes, fixtures, bodies, joints and capture zones are addressed by handles that stay
+    valid while other elements are added or removed. Every edge is stored in both
+    directions, so neighbour lookups and cascading removals never scan the map lists.
+
+    Edits do not touch the id fields of the map objects. Ids are assigned once in
+    :meth:`apply`, which :class:`BonkMap` calls before it encodes, fingerprints, measures or
+    validates the map. While edits are pending, read the physics through the graph, the
+    lists in ``bonk_map.physics`` still hold the old numbering.
+
+    Elements that already belong to another map are deep copied when they are added, like
+    the map lists do, so read them back through their handle.
+    """
+
+    __slots__ = (
+        '_bodies',
+        '_body_fixtures',
+        '_body_joints',
+        '_bonk_map',
+        '_bro',
+        '_cap_zone_fixture',
+        '_cap_zones',
+        '_dirty',
+        '_fixture_bodies',
+        '_fixture_cap_zones',
+        '_fixture_shape',
+        '_fixtures',
+        '_gear_joints',
+        '_handles',
+        '_joint_bodies',
+        '_joint_gears',
+        '_joints',
+        '_next_handle',
+        '_shape_fixtures',
+        '_shapes',
+    )
+
+    def __init__(self, bonk_map: 'BonkMap') -> None:
+        self._bonk_map = bonk_map
+        self._next_handle = count()
+        self._dirty = False
+        # id(element) -> handle, map objects are mutable and not hashable.
+        self._handles: Dict[int, Handle] = {}
+
+        self._shapes: Dict[Handle, Shape] = {}
+        self._fixtures: Dict[Handle, Fixture] = {}
+        self._bodies: Dict[Handle, Body] = {}
+        self._joints: Dict[Handle, Joint] = {}
+        self._cap_zones: Dict[Handle, CaptureZone] = {}
+        self._bro: _HandleSet = {}
+
+        self._fixture_shape: Dict[Handle, Handle] = {}
+        self._shape_fixtures: Dict[Handle, _HandleSet] = {}
+        self._body_fixtures: Dict[Handle, List[Handle]] = {}
+        self._fixture_bodies: Dict[Handle, _HandleSet] = {}
+        self._joint_bodies: Dict[Handle, Tuple[Handle, Handle]] = {}
+        self._body_joints: Dict[Handle, _HandleSet] = {}
+        self._gear_joints: Dict[Handle, Tuple[Handle, Handle]] = {}
+        self._joint_gears: Dict[Handle, _HandleSet] = {}
+        self._cap_zone_fixture: Dict[Handle, Handle] = {}
+        self._fixture_cap_zones: Dict[Handle, _HandleSet] = {}
+
+        self._load()
+
+    def _load(self) -> None:
+        bonk_map = self._bonk_map
+        physics = bonk_map.physics
+        issues = [
+            issue
+            for issue in bonk_map.validate()
+            if issue.type is MapIssueType.DANGLING_REFERENCE
+        ]
+        if issues:
+            raise ValueError(
+                f'Map has dangling references, compact it first: {issues[0]}',
+            )
+
+        shapes = [self._add_shape(shape) for shape in physics.shapes]
+        fixtures = [
+            self._add_fixture(fixture, shapes[fixture.shape_id])
+            for fixture in physics.fixtures
+        ]
+        bodies = [
+            self._add_body(body, [fixtures[fixture_id] for fixture_id in body.fixtures])
+            for body in physics.bodies
+        ]
+        self._bro = dict.fromkeys(bodies[body_id] for body_id in physics.bro)
+
+        joints: List[Handle] = []
+        for joint in physics.joints:
+            if isinstance(joint, GearJoint):
+                joints.append(self._new_handle(joint, self._joints))
+                continue
+            joints.append(
+                self._add_joint(
+                    joint,
+                    _WORLD if joint.body_a_id == -1 else bodies[joint.body_a_id],
+                    _WORLD if joint.body_b_id == -1 else bodies[joint.body_b_id],
+                ),
+            )
+        # Gear joints may come before the joints they connect.
+        for handle in joints:
+            joint = self._joints[handle]
+            if isinstance(joint, GearJoint):
+                self._link_gear(
+                    handle, joints[joint.joint_a_id], joints[joint.joint_b_id]
+                )
+
+        for cap_zone in bonk_map.cap_zones:
+            self._add_cap_zone(cap_zone, fixtures[cap_zone.shape_id])
+
+    @property
+    def dirty(self) -> bool:
+        """``True`` while edits have not been written back with :meth:`apply`."""
+        return self._dirty
+
+    def handle(self, element: Any) -> Handle:
+        """Returns the handle of a shape, fixture, body, joint or capture zone in the graph."""
+        try:
+            return self._handles[id(element)]
+        except KeyError:
+            raise KeyError(f'{element!r} is not in the graph') from None
+
+    def shape(self, handle: Handle) -> 'Shape':
+        return self._shapes[handle]
+
+    def fixture(self, handle: Handle) -> 'Fixture':
+        return self._fixtures[handle]
+
+    def body(self, handle: Handle) -> 'Body':
+        return self._bodies[handle]
+
+    def joint(self, handle: Handle) -> 'Joint':
+        return self._joints[handle]
+
+    def cap_zone(self, handle: Handle) -> 'CaptureZone':
+        return self._cap_zones[handle]
+
+    @property
+    def shapes(self) -> List[Handle]:
+        return list(self._shapes)
+
+    @property
+    def fixtures(self) -> List[Handle]:
+        return list(self._fixtures)
+
+    @property
+    def bodies(self) -> List[Handle]:
+        return list(self._bodies)
+
+    @property
+    def joints(self) -> List[Handle]:
+        return list(self._joints)
+
+    @property
+    def cap_zones(self) -> List[Handle]:
+        return list(self._cap_zones)
+
+    # Neighbours
+
+    def shape_of(self, fixture: Handle) -> Handle:
+        return self._fixture_shape[fixture]
+
+    def fixtures_of_shape(self, shape: Handle) -> List[Handle]:
+        return list(self._shape_fixtures[shape])
+
+    def fixtures_of(self, body: Handle) -> List[Handle]:
+        return list(self._body_fixtures[body])
+
+    def bodies_of(self, fixture: Handle) -> List[Handle]:
+        return list(self._fixture_bodies[fixture])
+
+    def joints_of(self, body: Handle) -> List[Handle]:
+        return list(self._body_joints[body])
+
+    def joint_bodies(self, joint: Handle) -> Tuple[Optional[Handle], Optional[Handle]]:
+        """Bodies of a joint, ``None`` for the world. Gear joints return ``(None, None)``."""
+        body_a, body_b = self._joint_bodies.get(joint, (_WORLD, _WORLD))
+        return (
+            None if body_a == _WORLD else body_a,
+            None if body_b == _WORLD else body_b,
+        )
+
+    def gear_joints(self, gear: Handle) -> Tuple[Handle, Handle]:
+        return self._gear_joints[gear]
+
+    def gears_of(self, joint: Handle) -> List[Handle]:
+        return list(self._joint_gears[joint])
+
+    def fixture_of_cap_zone(self, cap_zone: Handle) -> Handle:
+        return self._cap_zone_fixture[cap_zone]
+
+    def cap_zones_of(self, fixture: Handle) -> List[Handle]:
+        return list(self._fixture_cap_zones[fixture])
+
+    # Insertion
+
+    def add_shape(self, shape: 'Shape') -> Handle:
+        handle = self._add_shape(self._claim(shape))
+        self._edited()
+        return handle
+
+    def add_fixture(self, fixture: 'Fixture', shape: Union[Handle, 'Shape']) -> Handle:
+        """Adds ``fixture`` using ``shape``, a shape object not in the graph yet is added."""
+        fixture = self._claim(fixture)
+        self._require_new(fixture)
+        self._require_handles((shape,), self._shapes, 'shape')
+        handle = self._add_fixture(fixture, self._resolve(shape, self._add_shape))
+        self._edited()
+        return handle
+
+    def add_body(self, body: 'Body', fixtures: Iterable[Handle] = ()) -> Handle:
+        """Adds ``body`` at the end of the draw order, holding existing ``fixtures``."""
+        body = self._claim(body)
+        fixtures = list(fixtures)
+        self._require_new(body)
+        self._require_handles(fixtures, self._fixtures, 'fixture')
+        handle = self._add_body(body, fixtures)
+        self._bro[handle] = None
+        self._edited()
+        return handle
+
+    def insert_body(
+        self,
+        body: 'Body',
+        parts: Iterable[Tuple['Fixture', Union[Handle, 'Shape']]],
+    ) -> Handle:
+        """Adds ``body`` together with new fixtures, given as ``(fixture, shape)`` pairs."""
+        body = self._claim(body)
+        parts = [(self._claim(fixture), shape) for fixture, shape in parts]
+        self._require_new(body, *(fixture for fixture, _ in parts))
+        self._require_handles([shape for _, shape in parts], self._shapes, 'shape')
+        # Parts may share a shape object, it is added (or copied) once.
+        shapes: Dict[int, Handle] = {}
+        fixtures = []
+        for fixture, shape in parts:
+            if not isinstance(shape, int):
+                key = id(shape)
+                if key not in shapes:
+                    shapes[key] = self._resolve(shape, self._add_shape)
+                shape = shapes[key]
+            fixtures.append(self._add_fixture(fixture, shape))
+        return self.add_body(body, fixtures)
+
+    def add_joint(
+        self,
+        joint: 'Joint',
+        body_a: Optional[Handle],
+        body_b: Optional[Handle] = None,
+    ) -> Handle:
+        """Adds a joint between two bodies, ``None`` attaches it to the world."""
+        if isinstance(joint, GearJoint):
+            raise TypeError('Gear joints connect joints, use add_gear')
+        joint = self._claim(joint)
+        self._require_new(joint)
+        self._require_handles(
+            [body for body in (body_a, body_b) if body is not None],
+            self._bodies,
+            'body',
+        )
+        handle = self._add_joint(
+            joint,
+            _WORLD if body_a is None else body_a,
+            _WORLD if body_b is None else body_b,
+        )
+        self._edited()
+        return handle
+
+    def add_gear(self, gear: 'GearJoint', joint_a: Handle, joint_b: Handle) -> Handle:
+        gear = self._claim(gear)
+        self._require_new(gear)
+        self._require_handles((joint_a, joint_b), self._joints, 'joint')
+        handle = self._new_handle(gear, self._joints)
+        self._link_gear(handle, joint_a, joint_b)
+        self._edited()
+        return handle
+
+    def add_cap_zone(self, cap_zone: 'CaptureZone', fixture: Handle) -> Handle:
+        cap_zone = self._claim(cap_zone)
+        self._require_new(cap_zone)
+        self._require_handles((fixture,), self._fixtures, 'fixture')
+        handle = self._add_cap_zone(cap_zone, fixture)
+        self._edited()
+        return handle
+
+    def attach_fixture(self, body: Handle, fixture: Handle) -> None:
+        """Adds an existing fixture to ``body``, fixtures can be shared between bodies."""
+        self._require_handles((body,), self._bodies, 'body')
+        self._require_handles((fixture,), self._fixtures, 'fixture')
+        self._body_fixtures[body].append(fixture)
+        self._fixture_bodies[fixture][body] = None
+        self._edited()
+
+    def detach_fixture(self, body: Handle, fixture: Handle) -> None:
+        """Removes ``fixture`` from ``body``, and from the map once no body holds it."""
+        self._detach_fixture(body, fixture)
+        if not self._fixture_bodies[fixture]:
+            self._remove_fixture(fixture)
+        self._edited()
+
+    # Removal
+
+    def remove_shape(self, shape: Handle) -> None:
+        """Removes ``shape`` and every fixture drawn with it."""
+        for fixture in list(self._shape_fixtures[shape]):
+            self._remove_fixture(fixture)
+        # The last fixture already took an orphaned shape with it.
+        if shape in self._shapes:
+            self._drop_shape(shape)
+        self._edited()
+
+    def remove_fixture(self, fixture: Handle) -> None:
+        """Removes ``fixture`` from its bodies, with its capture zones and orphaned shape."""
+        self._remove_fixture(fixture)
+        self._edited()
+
+    def remove_body(self, body: Handle) -> None:
+        """
+        Removes ``body`` with its joints (and gear joints on those), fixtures no other body
+        holds, shapes no other fixture uses and capture zones on removed fixtures.
+        """
+        for joint in list(self._body_joints[body]):
+            self._remove_joint(joint)
+        for fixture in list(dict.fromkeys(self._body_fixtures[body])):
+            self._detach_fixture(body, fixture)
+            if not self._fixture_bodies[fixture]:
+                self._remove_fixture(fixture)
+        del self._body_fixtures[body]
+        del self._body_joints[body]
+        self._bro.pop(body, None)
+        self._forget(self._bodies.pop(body))
+        self._edited()
+
+    def remove_joint(self, joint: Handle) -> None:
+        """Removes ``joint`` and the gear joints that connect it."""
+        self._remove_joint(joint)
+        self._edited()
+
+    def remove_cap_zone(self, cap_zone: Handle) -> None:
+        self._remove_cap_zone(cap_zone)
+        self._edited()
+
+    # Write back
+
+    def apply(self) -> None:
+        """Renumbers every element and writes the lists back into the map, once per edit batch."""
+        if not self._dirty:
+            return
+        shape_ids = {handle: index for index, handle in enumerate(self._shapes)}
+        fixture_ids = {handle: index for index, handle in enumerate(self._fixtures)}
+        body_ids = {handle: index for index, handle in enumerate(self._bodies)}
+        body_ids[_WORLD] = -1
+        joint_ids = {handle: index for index, handle in enumerate(self._joints)}
+
+        for handle, fixture in self._fixtures.items():
+            fixture.shape_id = shape_ids[self._fixture_shape[handle]]
+        for handle, body in self._bodies.items():
+            body.fixtures = [
+                fixture_ids[fixture] for fixture in self._body_fixtures[handle]
+            ]
+        for handle, joint in self._joints.items():
+            gear = self._gear_joints.get(handle)
+            if gear is not None:
+                joint.joint_a_id = joint_ids[gear[0]]
+                joint.joint_b_id = joint_ids[gear[1]]
+            else:
+                body_a, body_b = self._joint_bodies[handle]
+                joint.body_a_id = body_ids[body_a]
+                joint.body_b_id = body_ids[body_b]
+        for handle, cap_zone in self._cap_zones.items():
+            cap_zone.shape_id = fixture_ids[self._cap_zone_fixture[handle]]
+
+        bonk_map = self._bonk_map
+        physics = bonk_map.physics
+        physics.shapes = list(self._shapes.values())
+        physics.fixtures = list(self._fixtures.values())
+        physics.bodies = list(self._bodies.values())
+        physics.joints = list(self._joints.values())
+        physics.bro = [body_ids[body] for body in self._bro]
+        bonk_map.cap_zones = list(self._cap_zones.values())
+        self._dirty = False
+
+    def _edited(self) -> None:
+        self._dirty = True
+        self._bonk_map._changed()
+
+    def _new_handle(self, element: Any, nodes: Dict[Handle, Any]) -> Handle:
+        key = id(element)
+        if key in self._handles:
+            raise ValueError(f'{element!r} is already in the graph')
+        handle = next(self._next_handle)
+        self._handles[key] = handle
+        nodes[handle] = element
+        return handle
+
+    def _forget(self, element: Any) -> None:
+        del self._handles[id(element)]
+
+    def _claim(self, element: Any) -> Any:
+        # Same rule as `adopt`: the map lists copy elements another map still owns, so
+        # copy them here already and keep the graph and the map on the same objects.
+        owner = element._owner
+        if owner is None or any(owner is nodes for nodes in self._map_lists()):
+            return element
+        return copy.deepcopy(element)
+
+    def _map_lists(self) -> Tuple[Any, ...]:
+        physics = self._bonk_map.physics
+        return (
+            physics.shapes,
+            physics.fixtures,
+            physics.bodies,
+            physics.joints,
+            self._bonk_map.cap_zones,
+        )
+
+    def _require_new(self, *elements: Any) -> None:
+        # Checked before an insertion touches the graph, so a failed one adds nothing.
+        keys = [id(element) for element in elements]
+        for element, key in zip(elements, keys):
+            if key in self._handles or keys.count(key) > 1:
+                raise ValueError(f'{element!r} is already in the graph')
+
+    @staticmethod
+    def _require_handles(
+        handles: Iterable[Any],
+        nodes: Dict[Handle, Any],
+        kind: str,
+    ) -> None:
+        for handle in handles:
+            if isinstance(handle, int) and handle not in nodes:
+                raise KeyError(f'No {kind} with handle {handle} in the graph')
+
+    def _resolve(self, element: Any, add: Any) -> Handle:
+        if isinstance(element, int):
+            return element
+        handle = self._handles.get(id(element))
+        return add(self._claim(element)) if handle is None else handle
+
+    def _add_shape(self, shape: 'Shape') -> Handle:
+        handle = self._new_handle(shape, self._shapes)
+        self._shape_fixtures[handle] = {}
+        return handle
+
+    def _add_fixture(self, fixture: 'Fixture', shape: Handle) -> Handle:
+        handle = self._new_handle(fixture, self._fixtures)
+        self._fixture_shape[handle] = shape
+        self._shape_fixtures[shape][handle] = None
+        self._fixture_bodies[handle] = {}
+        self._fixture_cap_zones[handle] = {}
+        return handle
+
+    def _add_body(self, body: 'Body', fixtures: List[Handle]) -> Handle:
+        handle = self._new_handle(body, self._bodies)
+        self._body_fixtures[handle] = fixtures
+        self._body_joints[handle] = {}
+        for fixture in fixtures:
+            self._fixture_bodies[fixture][handle] = None
+        return handle
+
+    def _add_joint(self, joint: 'Joint', body_a: Handle, body_b: Handle) -> Handle:
+        handle = self._new_handle(joint, self._joints)
+        self._joint_bodies[handle] = (body_a, body_b)
+        self._joint_gears[handle] = {}
+        for body in (body_a, body_b):
+            if body != _WORLD:
+                self._body_joints[body][handle] = None
+        return handle
+
+    def _link_gear(self, gear: Handle, joint_a: Handle, joint_b: Handle) -> None:
+        self._gear_joints[gear] = (joint_a, joint_b)
+        self._joint_gears.setdefault(gear, {})
+        for joint in (joint_a, joint_b):
+            self._joint_gears.setdefault(joint, {})[gear] = None
+
+    def _add_cap_zone(self, cap_zone: 'CaptureZone', fixture: Handle) -> Handle:
+        handle = self._new_handle(cap_zone, self._cap_zones)
+        self._cap_zone_fixture[handle] = fixture
+        self._fixture_cap_zones[fixture][handle] = None
+        return handle
+
+    def _detach_fixture(self, body: Handle, fixture: Handle) -> None:
+        fixtures = self._body_fixtures[body]
+        # Bodies hold a handful of fixtures, rebuilding the list is cheap.
+        fixtures[:] = [handle for handle in fixtures if handle != fixture]
+        self._fixture_bodies[fixture].pop(body, None)
+
+    def _remove_fixture(self, fixture: Handle) -> None:
+        for body in list(self._fixture_bodies.pop(fixture)):
+            fixtures = self._body_fixtures[body]
+            fixtures[:] = [handle for handle in fixtures if handle != fixture]
+        for cap_zone in list(self._fixture_cap_zones[fixture]):
+            self._remove_cap_zone(cap_zone)
+        del self._fixture_cap_zones[fixture]
+        shape = self._fixture_shape.pop(fixture)
+        users = self._shape_fixtures[shape]
+        del users[fixture]
+        if not users:
+            self._drop_shape(shape)
+        self._forget(self._fixtures.pop(fixture))
+
+    def _drop_shape(self, shape: Handle) -> None:
+        del self._shape_fixtures[shape]
+        self._forget(self._shapes.pop(shape))
+
+    def _remove_joint(self, joint: Handle) -> None:
+        for gear in list(self._joint_gears.pop(joint, ())):
+            self._remove_joint(gear)
+        gear_joints = self._gear_joints.pop(joint, None)
+        if gear_joints is not None:
+            for target in gear_joints:
+                gears = self._joint_gears.get(target)
+                if gears is not None:
+                    gears.pop(joint, None)
+        else:
+            for body in self._joint_bodies.pop(joint):
+                if body != _WORLD:
+                    self._body_joints[body].pop(joint, None)
+        self._forget(self._joints.pop(joint))
+
+    def _remove_cap_zone(self, cap_zone: Handle) -> None:
+        fixture = self._cap_zone_fixture.pop(cap_zone)
+        self._fixture_cap_zones[fixture].pop(cap_zone, None)
+        self._forget(self._cap_zones.pop(cap_zone))
@@ -2,13 +2,21 @@ from typing import TYPE_CHECKING, Optional, Tuple
 
 from attrs import define, field
 
+from ...pson.schema import BinarySchema, point, scalar, utf
+from .tracking import Tracked, track_changes
+
 if TYPE_CHECKING:
     from ...pson.bytebuffer import ByteBuffer
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/map/types/ISpawn.ts
-@define(slots=True, auto_attribs=True)
-class Spawn:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class Spawn(Tracked):
     name: str = field(default='Spawn')  # 59 chars
     ffa: bool = field(default=True)
     blue: bool = field(default=True)
@@ -52,26 +60,21 @@ class Spawn:
         return self
 
     def to_buffer(self, buffer: 'ByteBuffer') -> None:
-        buffer.write_float64(self.position[0])
-        buffer.write_float64(self.position[1])
-        buffer.write_float64(self.velocity[0])
-        buffer.write_float64(self.velocity[1])
-        buffer.write_int16(self.priority)
-        buffer.write_bool(self.red)
-        buffer.write_bool(self.ffa)
-        buffer.write_bool(self.blue)
-        buffer.write_bool(self.green)
-        buffer.write_bool(self.yellow)
-        buffer.write_utf(self.name)
+        SPAWN_SCHEMA.encode(self, buffer)
 
     def from_buffer(self, buffer: 'ByteBuffer') -> 'Spawn':
-        self.position = (buffer.read_float64(), buffer.read_float64())
-        self.velocity = (buffer.read_float64(), buffer.read_float64())
-        self.priority = buffer.read_int16()
-        self.red = buffer.read_bool()
-        self.ffa = buffer.read_bool()
-        self.blue = buffer.read_bool()
-        self.green = buffer.read_bool()
-        self.yellow = buffer.read_bool()
-        self.name = buffer.read_utf()
-        return self
+        return SPAWN_SCHEMA.decode(self, buffer)
+
+
+SPAWN_SCHEMA = BinarySchema(
+    point('position'),
+    point('velocity'),
+    scalar('priority', 'h'),
+    scalar('red', '?'),
+    scalar('ffa', '?'),
+    scalar('blue', '?'),
+    scalar('green', '?', default=False),
+    scalar('yellow', '?', default=False),
+    utf('name'),
+    on_decoded=Tracked._decoded,
+)
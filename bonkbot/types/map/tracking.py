@@ -0,0 +1,200 @@
+import copy
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from attrs import Attribute
+
+# Values of these types never hold tracked children, skipped without further checks.
+_LEAF_TYPES = frozenset((int, float, str, bool, tuple, type(None)))
+_attribute_names: Dict[type, Tuple[str, ...]] = {}
+
+
+class Tracked:
+    """
+    Base for map objects that report in-place mutations to their owner.
+
+    Every tracked object remembers the object (or list) it is stored in, so a change anywhere
+    in the tree walks up to the ``BonkMap`` and drops its cached encodings. An object has a
+    single owner: storing one that is still held elsewhere stores a copy of it, see
+    :func:`adopt`.
+    """
+
+    __slots__ = ('_owner',)
+
+    def __attrs_post_init__(self) -> None:
+        # Bypasses the attrs `__setattr__`, `_owner` has no hooks.
+        object.__setattr__(self, '_owner', None)
+        self._adopt_children()
+
+    def __getstate__(self) -> dict:
+        return {
+            attribute.name: getattr(self, attribute.name)
+            for attribute in self.__attrs_attrs__
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._owner = None
+        self._adopt_children()
+
+    def _adopt_children(self) -> None:
+        # Runs for every constructed map object, so it avoids `adopt` for plain values.
+        cls = type(self)
+        names = _attribute_names.get(cls)
+        if names is None:
+            names = _attribute_names[cls] = tuple(
+                attribute.name for attribute in cls.__attrs_attrs__
+            )
+        for name in names:
+            value = getattr(self, name)
+            value_type = type(value)
+            if value_type in _LEAF_TYPES:
+                continue
+            if value_type is list:
+                object.__setattr__(self, name, TrackedList(value, self))
+            elif isinstance(value, (Tracked, TrackedList)):
+                if value._owner is not None and value._owner is not self:
+                    value = copy.deepcopy(value)
+                    object.__setattr__(self, name, value)
+                object.__setattr__(value, '_owner', self)
+
+    def _changed(self) -> None:
+        owner = self._owner
+        if owner is not None:
+            owner._changed()
+
+    def _decoded(self) -> None:
+        """``on_decoded`` hook of the binary schemas, which assign without ``on_setattr``."""
+        for name in _attribute_names[type(self)]:
+            value = getattr(self, name)
+            if isinstance(value, Tracked):
+                value._decoded()
+        self._adopt_children()
+        self._changed()
+
+
+class TrackedList(list):
+    """A list that reports in-place mutations to its owner."""
+
+    __slots__ = ('_owner',)
+
+    def __init__(self, iterable: Iterable = (), owner: Optional[Any] = None) -> None:
+        self._owner = None
+        super().__init__(adopt(self, item) for item in iterable)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # The owner is restored by whoever adopts the list after unpickling / copying.
+        return TrackedList, (list(self),)
+
+    def _changed(self) -> None:
+        owner = self._owner
+        if owner is not None:
+            owner._changed()
+
+    def append(self, item: Any) -> None:
+        super().append(adopt(self, item))
+        self._changed()
+
+    def extend(self, items: Iterable) -> None:
+        super().extend(adopt(self, item) for item in items)
+        self._changed()
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, adopt(self, item))
+        self._changed()
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        release(self, item)
+        self._changed()
+        return item
+
+    def remove(self, item: Any) -> None:
+        self.pop(self.index(item))
+
+    def clear(self) -> None:
+        for item in self:
+            release(self, item)
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        # Replaced items are released first, so they can be stored again in place.
+        if isinstance(index, slice):
+            value = list(value)
+            for item in self[index]:
+                release(self, item)
+            value = [adopt(self, item) for item in value]
+        else:
+            release(self, self[index])
+            value = adopt(self, value)
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index: Any) -> None:
+        for item in self[index] if isinstance(index, slice) else (self[index],):
+            release(self, item)
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, items: Iterable) -> 'TrackedList':
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: int) -> 'TrackedList':
+        super().__imul__(count)
+        self._changed()
+        return self
+
+
+def adopt(owner: Any, value: Any) -> Any:
+    """
+    Attach ``value`` to ``owner`` so its mutations propagate upwards.
+
+    Plain lists are wrapped into :class:`TrackedList`, tracked objects get their owner updated,
+    everything else (numbers, strings, tuples, enums) is immutable and returned as is. A tracked
+    object that still belongs to another owner is deep copied first, otherwise the other owner
+    would silently stop seeing its changes; objects taken out of a map with ``pop``, ``del`` or
+    by replacing them are released and are stored as they are.
+    """
+
+    if isinstance(value, (Tracked, TrackedList)):
+        if value._owner is not None and value._owner is not owner:
+            value = copy.deepcopy(value)
+        value._owner = owner
+        return value
+    if type(value) is list:
+        return TrackedList(value, owner)
+    return value
+
+
+def release(owner: Any, value: Any) -> None:
+    """Detaches ``value`` from ``owner`` after it was removed from it."""
+
+    if isinstance(value, (Tracked, TrackedList)) and value._owner is owner:
+        value._owner = None
+        if isinstance(value, TrackedList):
+            # The list is gone from the map, so are its items.
+            for item in value:
+                release(value, item)
+
+
+def track_changes(instance: 'Tracked', attribute: 'Attribute', value: Any) -> Any:
+    """``on_setattr`` hook for tracked attrs classes."""
+
+    old = getattr(instance, attribute.name, None)
+    if old is not value:
+        release(instance, old)
+    value = adopt(instance, value)
+    instance._changed()
+    return value
@@ -0,0 +1,243 @@
+import math
+from array import array
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+from attrs import define
+
+from .physics.body.force_zone import ForceZoneType
+from .physics.joint.distance_joint import DistanceJoint
+from .physics.joint.lpj_joint import LPJJoint
+from .physics.joint.lsj_joint import LSJJoint
+from .physics.joint.revolute_joint import RevoluteJoint
+from .physics.shape.box_shape import BoxShape
+from .physics.shape.circle_shape import CircleShape
+from .physics.shape.polygon_shape import PolygonShape
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+
+_EPSILON = 1e-9
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class AffineTransform:
+    """
+    2D affine transform ``(x, y) -> (a*x + b*y + tx, c*x + d*y + ty)`` in map pixels.
+
+    Bonk stores bodies as a position and an angle, so only similarity transforms
+    (translation, rotation, uniform scale and mirroring) can be applied to a map.
+    """
+
+    a: float = 1.0
+    b: float = 0.0
+    c: float = 0.0
+    d: float = 1.0
+    tx: float = 0.0
+    ty: float = 0.0
+
+    @classmethod
+    def translation(cls, dx: float, dy: float) -> 'AffineTransform':
+        return cls(tx=dx, ty=dy)
+
+    @classmethod
+    def rotation(
+        cls,
+        angle: float,
+        origin: Tuple[float, float] = (0, 0),
+    ) -> 'AffineTransform':
+        cos, sin = math.cos(angle), math.sin(angle)
+        return cls._around(cls(a=cos, b=-sin, c=sin, d=cos), origin)
+
+    @classmethod
+    def scaling(
+        cls,
+        factor: float,
+        origin: Tuple[float, float] = (0, 0),
+    ) -> 'AffineTransform':
+        return cls._around(cls(a=factor, d=factor), origin)
+
+    @classmethod
+    def mirror_x(cls, axis: float = 0) -> 'AffineTransform':
+        """Mirrors left to right around the vertical line ``x = axis``."""
+        return cls(a=-1.0, tx=2 * axis)
+
+    @classmethod
+    def mirror_y(cls, axis: float = 0) -> 'AffineTransform':
+        """Mirrors top to bottom around the horizontal line ``y = axis``."""
+        return cls(d=-1.0, ty=2 * axis)
+
+    @classmethod
+    def _around(
+        cls,
+        linear: 'AffineTransform',
+        origin: Tuple[float, float],
+    ) -> 'AffineTransform':
+        x, y = origin
+        return cls.translation(-x, -y).then(linear).then(cls.translation(x, y))
+
+    def then(self, other: 'AffineTransform') -> 'AffineTransform':
+        """Returns the transform that applies ``self`` first and ``other`` second."""
+        return AffineTransform(
+            a=other.a * self.a + other.b * self.c,
+            b=other.a * self.b + other.b * self.d,
+            c=other.c * self.a + other.d * self.c,
+            d=other.c * self.b + other.d * self.d,
+            tx=other.a * self.tx + other.b * self.ty + other.tx,
+            ty=other.c * self.tx + other.d * self.ty + other.ty,
+        )
+
+    def apply(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        x, y = point
+        return (
+            self.a * x + self.b * y + self.tx,
+            self.c * x + self.d * y + self.ty,
+        )
+
+    @property
+    def determinant(self) -> float:
+        return self.a * self.d - self.b * self.c
+
+    def decompose(self) -> Tuple[float, float, bool]:
+        """
+        Splits the linear part into ``scale * rotate(angle) * mirror`` where mirror, if set,
+        negates the y axis. Raises ``ValueError`` for shears and non-uniform scales.
+        """
+
+        mirrored = self.determinant < 0
+        b, d = (-self.b, -self.d) if mirrored else (self.b, self.d)
+        scale = math.hypot(self.a, self.c)
+        if (
+            scale < _EPSILON
+            or abs(self.a - d) > _EPSILON * max(1.0, scale)
+            or abs(b + self.c) > _EPSILON * max(1.0, scale)
+        ):
+            raise ValueError(
+                'Only translation, rotation, uniform scale and mirroring are supported'
+            )
+        return scale, math.atan2(self.c, self.a), mirrored
+
+
+class _PointBatch:
+    """Collects points from all over the map, transforms them in one pass and writes them back."""
+
+    __slots__ = ('targets', 'xs', 'ys')
+
+    def __init__(self) -> None:
+        self.xs = array('d')
+        self.ys = array('d')
+        self.targets: List[Tuple[Any, str]] = []
+
+    def add(self, node: Any, name: str) -> None:
+        x, y = getattr(node, name)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.targets.append((node, name))
+
+    def add_vertices(self, polygon: 'PolygonShape') -> None:
+        for x, y in polygon.vertices:
+            self.xs.append(x)
+            self.ys.append(y)
+        self.targets.append((polygon, 'vertices'))
+
+    def apply(
+        self, a: float, b: float, c: float, d: float, tx: float, ty: float
+    ) -> None:
+        xs, ys = self.xs, self.ys
+        new_xs = array('d', [a * x + b * y + tx for x, y in zip(xs, ys)])
+        new_ys = array('d', [c * x + d * y + ty for x, y in zip(xs, ys)])
+        points = list(zip(new_xs, new_ys))
+        offset = 0
+        for node, name in self.targets:
+            if name == 'vertices':
+                count = len(node.vertices)
+                node.vertices = points[offset : offset + count]
+                offset += count
+            else:
+                setattr(node, name, points[offset])
+                offset += 1
+
+
+def transform_map(bonk_map: 'BonkMap', transform: 'AffineTransform') -> None:
+    """
+    Applies ``transform`` to every piece of geometry in ``bonk_map`` in place.
+
+    Body and spawn positions take the full transform. Shapes and joint anchors are
+    body-local, so they only take the scale and the mirror, while the rotation goes into the
+    body angle. Velocities and absolute forces rotate with the map. Mirroring also flips
+    every rotation direction: angles, angular velocities, torques, motor speeds and joint
+    limits. The polygon winding is reversed so the vertices keep their orientation.
+    """
+
+    scale, angle, mirrored = transform.decompose()
+    sign = -1 if mirrored else 1
+    cos, sin = math.cos(angle), math.sin(angle)
+
+    world_points = _PointBatch()  # full transform
+    world_vectors = _PointBatch()  # scale * rotation * mirror
+    directions = _PointBatch()  # rotation * mirror
+    local_points = _PointBatch()  # scale * mirror
+    local_vectors = _PointBatch()  # mirror
+
+    physics = bonk_map.physics
+    for body in physics.bodies:
+        world_points.add(body, 'position')
+        world_vectors.add(body, 'linear_velocity')
+        body.angle = angle + sign * body.angle
+        body.angular_velocity = sign * body.angular_velocity
+        if body.force.is_relative:
+            local_vectors.add(body.force, 'force')
+        else:
+            directions.add(body.force, 'force')
+        body.force.torque = sign * body.force.torque
+        if body.force_zone.type == ForceZoneType.RELATIVE:
+            local_vectors.add(body.force_zone, 'force')
+        elif body.force_zone.type == ForceZoneType.ABSOLUTE:
+            directions.add(body.force_zone, 'force')
+
+    for spawn in bonk_map.spawns:
+        world_points.add(spawn, 'position')
+        world_vectors.add(spawn, 'velocity')
+
+    for shape in physics.shapes:
+        local_points.add(shape, 'position')
+        if isinstance(shape, BoxShape):
+            shape.width *= scale
+            shape.height *= scale
+            shape.angle = sign * shape.angle
+        elif isinstance(shape, CircleShape):
+            shape.radius *= scale
+        elif isinstance(shape, PolygonShape):
+            shape.angle = sign * shape.angle
+            local_points.add_vertices(shape)
+
+    for joint in physics.joints:
+        if isinstance(joint, RevoluteJoint):
+            local_points.add(joint, 'pivot')
+            joint.motor_speed = sign * joint.motor_speed
+            if mirrored:
+                joint.from_angle, joint.to_angle = -joint.to_angle, -joint.from_angle
+        elif isinstance(joint, DistanceJoint):
+            local_points.add(joint, 'pivot')
+            local_points.add(joint, 'attach')
+        elif isinstance(joint, LPJJoint):
+            local_points.add(joint, 'position')
+            joint.angle = sign * joint.angle
+            joint.path_length *= scale
+            joint.pl *= scale
+            joint.pu *= scale
+        elif isinstance(joint, LSJJoint):
+            local_points.add(joint, 'position')
+            joint.spring_length *= scale
+
+    world_points.apply(
+        transform.a, transform.b, transform.c, transform.d, transform.tx, transform.ty
+    )
+    world_vectors.apply(transform.a, transform.b, transform.c, transform.d, 0, 0)
+    directions.apply(cos, -sin * sign, sin, cos * sign, 0, 0)
+    local_points.apply(scale, 0, 0, scale * sign, 0, 0)
+    local_vectors.apply(1, 0, 0, sign, 0, 0)
+
+    if mirrored:
+        for shape in physics.shapes:
+            if isinstance(shape, PolygonShape):
+                shape.vertices.reverse()
@@ -0,0 +1,284 @@
+import enum
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
+
+from attrs import define
+
+from .capture_zone import CaptureZone
+from .map_metadata import MapMetadata
+from .map_properties import MapProperties
+from .physics.body.body import Body
+from .physics.body.body_force import BodyForce
+from .physics.body.body_shape import BodyShape
+from .physics.body.force_zone import ForceZone
+from .physics.fixture import Fixture
+from .physics.joint.distance_joint import DistanceJoint
+from .physics.joint.gear_joint import GearJoint
+from .physics.joint.lpj_joint import LPJJoint
+from .physics.joint.lsj_joint import LSJJoint
+from .physics.joint.revolute_joint import RevoluteJoint
+from .physics.shape.box_shape import BoxShape
+from .physics.shape.circle_shape import CircleShape
+from .physics.shape.polygon_shape import PolygonShape
+from .spawn import Spawn
+
+if TYPE_CHECKING:
+    from .bonkmap import BonkMap
+
+MAX_ELEMENTS = 32767
+MAX_JOINTS = 100
+MIN_PPM = 5
+MAX_PPM = 30
+
+_FORCE = 999999
+_JOINT_VALUE = 99999999
+
+# Type -> (field, min, max) for numbers, limits match the map editor.
+_RANGES: Dict[type, Tuple[Tuple[str, float, float], ...]] = {
+    BoxShape: (('width', 0, 99999), ('height', 0, 99999), ('angle', -999, 999)),
+    CircleShape: (('radius', 0, 99999),),
+    PolygonShape: (('scale', -999, 999), ('angle', -999, 999)),
+    Fixture: (
+        ('density', 0, 99999),
+        ('restitution', -99999, 99999),
+        ('friction', 0, 99999),
+    ),
+    Body: (('angle', -9999, 9999), ('angular_velocity', -9999, 9999)),
+    BodyShape: (
+        ('density', -99999, 99999),
+        ('restitution', -99999, 99999),
+        ('friction', -99999, 99999),
+        ('linear_damping', -99999, 99999),
+        ('angular_damping', -99999, 99999),
+    ),
+    BodyForce: (('torque', -_FORCE, _FORCE),),
+    ForceZone: (('center_force', 0, _FORCE),),
+    Spawn: (('priority', 0, 1000),),
+    CaptureZone: (('seconds', 0.01, 1000),),
+    MapProperties: (('grid_size', 2, 100),),
+    RevoluteJoint: (
+        ('from_angle', -999, 999),
+        ('to_angle', -999, 999),
+        ('turn_force', -_JOINT_VALUE, _JOINT_VALUE),
+        ('motor_speed', -_JOINT_VALUE, _JOINT_VALUE),
+        ('break_force', 0, _JOINT_VALUE),
+    ),
+    DistanceJoint: (
+        ('softness', -99999, 99999),
+        ('damping', -99999, 99999),
+        ('break_force', 0, _JOINT_VALUE),
+    ),
+    LPJJoint: (
+        ('angle', -_JOINT_VALUE, _JOINT_VALUE),
+        ('force', -_JOINT_VALUE, _JOINT_VALUE),
+        ('path_length', -_JOINT_VALUE, _JOINT_VALUE),
+        ('path_speed', -_JOINT_VALUE, _JOINT_VALUE),
+        ('break_force', 0, _JOINT_VALUE),
+    ),
+    LSJJoint: (
+        ('spring_force', -_JOINT_VALUE, _JOINT_VALUE),
+        ('spring_length', -_JOINT_VALUE, _JOINT_VALUE),
+        ('break_force', 0, _JOINT_VALUE),
+    ),
+    GearJoint: (('ratio', -_JOINT_VALUE, _JOINT_VALUE),),
+}
+# Type -> (field, limit) for points, both coordinates must be within +-limit.
+_POINT_RANGES: Dict[type, Tuple[Tuple[str, float], ...]] = {
+    BoxShape: (('position', 99999),),
+    CircleShape: (('position', 99999),),
+    PolygonShape: (('position', 99999),),
+    Body: (('position', 99999), ('linear_velocity', 99999)),
+    BodyForce: (('force', _FORCE),),
+    ForceZone: (('force', _FORCE),),
+    Spawn: (('position', 10000), ('velocity', 10000)),
+    RevoluteJoint: (('pivot', 99999),),
+    DistanceJoint: (('pivot', 99999), ('attach', 99999)),
+    LPJJoint: (('position', _JOINT_VALUE),),
+    LSJJoint: (('position', _JOINT_VALUE),),
+}
+# Type -> (field, max length) for strings.
+_LENGTHS: Dict[type, Tuple[Tuple[str, int], ...]] = {
+    Body: (('name', 30),),
+    BodyShape: (('name', 30),),
+    Spawn: (('name', 59),),
+    CaptureZone: (('name', 29),),
+    GearJoint: (('name', 29),),
+    MapMetadata: (('name', 25), ('original_name', 25)),
+}
+
+
+class MapIssueType(enum.Enum):
+    OUT_OF_RANGE = 'out_of_range'
+    NOT_FINITE = 'not_finite'
+    TOO_LONG = 'too_long'
+    TOO_MANY = 'too_many'
+    DANGLING_REFERENCE = 'dangling_reference'
+    DEGENERATE = 'degenerate'
+
+
+@define(slots=True, auto_attribs=True, frozen=True)
+class MapIssue:
+    type: 'MapIssueType'
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f'{self.path}: {self.message}'
+
+
+class _Validator:
+    __slots__ = ('issues',)
+
+    def __init__(self) -> None:
+        self.issues: List[MapIssue] = []
+
+    def add(self, issue_type: 'MapIssueType', path: str, message: str) -> None:
+        self.issues.append(MapIssue(type=issue_type, path=path, message=message))
+
+    def number(self, path: str, value: Any, low: float, high: float) -> None:
+        if value is None or isinstance(value, bool):
+            return
+        if not math.isfinite(value):
+            self.add(MapIssueType.NOT_FINITE, path, f'{value} is not a finite number')
+        elif not low <= value <= high:
+            self.add(
+                MapIssueType.OUT_OF_RANGE, path, f'{value} is outside {low}..{high}'
+            )
+
+    def node(self, node: Any, path: str) -> None:
+        node_type = type(node)
+        for name, low, high in _RANGES.get(node_type, ()):
+            self.number(f'{path}.{name}', getattr(node, name), low, high)
+        for name, limit in _POINT_RANGES.get(node_type, ()):
+            point = getattr(node, name)
+            for axis, value in zip('xy', point):
+                self.number(f'{path}.{name}.{axis}', value, -limit, limit)
+        for name, limit in _LENGTHS.get(node_type, ()):
+            value = getattr(node, name)
+            if value is not None and len(value) > limit:
+                self.add(
+                    MapIssueType.TOO_LONG,
+                    f'{path}.{name}',
+                    f'{len(value)} characters, at most {limit} allowed',
+                )
+
+    def count(self, path: str, items: Sequence, limit: int) -> None:
+        if len(items) > limit:
+            self.add(
+                MapIssueType.TOO_MANY,
+                path,
+                f'{len(items)} entries, at most {limit} allowed',
+            )
+
+    def reference(self, path: str, value: int, count: int, what: str) -> None:
+        if not 0 <= value < count:
+            self.add(
+                MapIssueType.DANGLING_REFERENCE,
+                path,
+                f'{what} {value} does not exist ({count} defined)',
+            )
+
+
+def validate_map(bonk_map: 'BonkMap') -> List['MapIssue']:
+    """
+    Checks ``bonk_map`` against the limits of the map editor and for broken references.
+
+    Everything is checked in one pass over the map and every problem is reported, an empty
+    list means the map is safe to send.
+    """
+
+    validator = _Validator()
+    physics = bonk_map.physics
+    shapes_count = len(physics.shapes)
+    fixtures_count = len(physics.fixtures)
+    bodies_count = len(physics.bodies)
+    joints_count = len(physics.joints)
+
+    validator.node(bonk_map.metadata, 'metadata')
+    validator.node(bonk_map.properties, 'properties')
+    validator.number('physics.ppm', physics.ppm, MIN_PPM, MAX_PPM)
+    validator.count('physics.shapes', physics.shapes, MAX_ELEMENTS)
+    validator.count('physics.fixtures', physics.fixtures, MAX_ELEMENTS)
+    validator.count('physics.bodies', physics.bodies, MAX_ELEMENTS)
+    validator.count('physics.joints', physics.joints, MAX_JOINTS)
+    validator.count('physics.bro', physics.bro, MAX_ELEMENTS)
+    validator.count('spawns', bonk_map.spawns, MAX_ELEMENTS)
+    validator.count('cap_zones', bonk_map.cap_zones, MAX_ELEMENTS)
+
+    for index, body_id in enumerate(physics.bro):
+        validator.reference(f'physics.bro[{index}]', body_id, bodies_count, 'Body')
+
+    for shape_id, shape in enumerate(physics.shapes):
+        path = f'physics.shapes[{shape_id}]'
+        validator.node(shape, path)
+        if isinstance(shape, PolygonShape):
+            if len(shape.vertices) < 3:
+                validator.add(
+                    MapIssueType.DEGENERATE,
+                    f'{path}.vertices',
+                    f'{len(shape.vertices)} vertices, a polygon needs at least 3',
+                )
+            validator.count(f'{path}.vertices', shape.vertices, MAX_ELEMENTS)
+            for vertex_id, (x, y) in enumerate(shape.vertices):
+                validator.number(f'{path}.vertices[{vertex_id}].x', x, -99999, 99999)
+                validator.number(f'{path}.vertices[{vertex_id}].y', y, -99999, 99999)
+
+    for fixture_id, fixture in enumerate(physics.fixtures):
+        path = f'physics.fixtures[{fixture_id}]'
+        validator.node(fixture, path)
+        validator.reference(f'{path}.shape_id', fixture.shape_id, shapes_count, 'Shape')
+
+    for body_id, body in enumerate(physics.bodies):
+        path = f'physics.bodies[{body_id}]'
+        validator.node(body, path)
+        validator.node(body.shape, f'{path}.shape')
+        validator.node(body.force, f'{path}.force')
+        validator.node(body.force_zone, f'{path}.force_zone')
+        validator.count(f'{path}.fixtures', body.fixtures, MAX_ELEMENTS)
+        for index, fixture_id in enumerate(body.fixtures):
+            validator.reference(
+                f'{path}.fixtures[{index}]',
+                fixture_id,
+                fixtures_count,
+                'Fixture',
+            )
+
+    for joint_id, joint in enumerate(physics.joints):
+        path = f'physics.joints[{joint_id}]'
+        validator.node(joint, path)
+        if isinstance(joint, GearJoint):
+            for name in ('joint_a_id', 'joint_b_id'):
+                target_id = getattr(joint, name)
+                validator.reference(f'{path}.{name}', target_id, joints_count, 'Joint')
+                if 0 <= target_id < joints_count and isinstance(
+                    physics.joints[target_id],
+                    GearJoint,
+                ):
+                    validator.add(
+                        MapIssueType.DANGLING_REFERENCE,
+                        f'{path}.{name}',
+                        f'Joint {target_id} is a gear joint',
+                    )
+        else:
+            validator.reference(
+                f'{path}.body_a_id', joint.body_a_id, bodies_count, 'Body'
+            )
+            if joint.body_b_id != -1:
+                validator.reference(
+                    f'{path}.body_b_id',
+                    joint.body_b_id,
+                    bodies_count,
+                    'Body',
+                )
+
+    for spawn_id, spawn in enumerate(bonk_map.spawns):
+        validator.node(spawn, f'spawns[{spawn_id}]')
+
+    for cap_zone_id, cap_zone in enumerate(bonk_map.cap_zones):
+        path = f'cap_zones[{cap_zone_id}]'
+        validator.node(cap_zone, path)
+        validator.reference(
+            f'{path}.shape_id', cap_zone.shape_id, fixtures_count, 'Fixture'
+        )
+
+    return validator.issues
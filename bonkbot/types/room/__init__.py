@@ -1,4 +1,5 @@
 from .game_settings import GameSettings
+from .initial_state import DiscState, InitialState
 from .room_action import RoomAction
 from .room_create_params import RoomCreateParams
 from .room_data import RoomData
@@ -6,7 +7,9 @@ from .room_info import RoomInfo
 from .room_join_params import RoomJoinParams
 
 __all__ = [
+    'DiscState',
     'GameSettings',
+    'InitialState',
     'RoomAction',
     'RoomCreateParams',
     'RoomData',
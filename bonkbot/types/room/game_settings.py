@@ -1,14 +1,20 @@
-from typing import List
+from typing import List, Optional
 
-from attrs import define, field
+from attrs import define, field, setters
 
 from ..map.bonkmap import BonkMap
+from ..map.tracking import Tracked, track_changes
 from ..mode import Mode
 from ..team import TeamState
 
 
-@define(slots=True, auto_attribs=True)
-class GameSettings:
+@define(
+    slots=True,
+    auto_attribs=True,
+    on_setattr=track_changes,
+    getstate_setstate=False,
+)
+class GameSettings(Tracked):
     map: 'BonkMap' = field(factory=BonkMap)
     is_quick_play: bool = field(default=False)
     rounds: int = field(default=3)
@@ -21,7 +27,26 @@ class GameSettings:
         factory=list,
     )
 
+    # Dropped whenever a setting or anything inside the map changes, see `Tracked`.
+    _json_cache: Optional[dict] = field(
+        default=None,
+        init=False,
+        repr=False,
+        eq=False,
+        on_setattr=setters.NO_OP,
+    )
+
+    def _changed(self) -> None:
+        self._json_cache = None
+        super()._changed()
+
     def to_json(self) -> dict:
+        """Returns the settings in bonk JSON format. The result is cached, treat it as read-only."""
+        if self._json_cache is None:
+            self._json_cache = self._build_json()
+        return self._json_cache
+
+    def _build_json(self) -> dict:
         return {
             'map': self.map.to_json(),
             'gt': 1 if self.is_quick_play else 2,
@@ -1,3 +1,11 @@
+import warnings
+from typing import Any, Dict, KeysView, List, Optional, Tuple
+
+from attrs import define, field
+
+from ...pson import ByteBuffer, PSONType, StaticPair
+from ..team import Team
+
 PSON_KEYS = [
     'physics',
     'shapes',
@@ -70,3 +78,320 @@ PSON_KEYS = [
     65535,
     16777215,
 ]
+
+# Sections only some consumers need, kept as encoded bytes until first accessed.
+_LAZY_KEYS = ('physics', 'projectiles')
+_DISC_KEYS = ('x', 'y', 'xv', 'yv', 'a', 'av', 'team')
+_STATE_KEYS = ('discs', 'scores', 'seed', 'rc', 'ftu', 'fte')
+
+
+class _Lazy:
+    """A PSON value decoded on first access, re-encoded as is while untouched."""
+
+    __slots__ = ('raw', 'value')
+
+    def __init__(self, raw: Optional[bytearray] = None, value: Any = None) -> None:
+        self.raw = raw
+        self.value = value
+
+    def get(self) -> Any:
+        if self.raw is not None:
+            self.value = _pair().decode(self.raw)
+            self.raw = None
+        return self.value
+
+    def set(self, value: Any) -> None:
+        self.raw = None
+        self.value = value
+
+    def encode(self, pair: 'StaticPair', buffer: 'ByteBuffer') -> None:
+        if self.raw is not None:
+            buffer.write_bytes(self.raw)
+        else:
+            pair.encode_value(self.value, buffer)
+
+
+def _pair() -> 'StaticPair':
+    return StaticPair(PSON_KEYS)
+
+
+def _peek(buffer: 'ByteBuffer') -> int:
+    if buffer.offset >= buffer.size:
+        raise EOFError('Not enough bytes to read. Requested 1, available 0')
+    return buffer.bytes[buffer.offset]
+
+
+def _warn_dict_access() -> None:
+    warnings.warn(
+        'Using InitialState like a dict is deprecated, use its attributes or to_json()',
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
+
+@define(slots=True, auto_attribs=True)
+class DiscState:
+    """A player disc, entry ``i`` of `InitialState.discs` belongs to the player id ``i``."""
+
+    position: Tuple[float, float] = field(default=(0.0, 0.0))
+    velocity: Tuple[float, float] = field(default=(0.0, 0.0))
+    angle: float = field(default=0.0)
+    angular_velocity: float = field(default=0.0)
+    team: 'Team' = field(default=Team.FFA)
+    extra: Dict[str, Any] = field(factory=dict, repr=False)
+    """Disc keys without a field, kept so the disc encodes back unchanged."""
+    _order: Tuple[str, ...] = field(default=(), repr=False, eq=False)
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'DiscState':
+        disc = cls()
+        for key, value in data.items():
+            disc._set(key, value)
+        disc._order = tuple(data)
+        return disc
+
+    @classmethod
+    def decode(cls, pair: 'StaticPair', buffer: 'ByteBuffer') -> 'DiscState':
+        disc = cls()
+        code = buffer.read_uint8()
+        if code == PSONType.EMPTY_OBJECT:
+            return disc
+        if code != PSONType.OBJECT:
+            raise ValueError(f'Disc is not an object: {code:#x}')
+        order = []
+        for _ in range(buffer.read_varint32()):
+            key = pair.decode_value(buffer)
+            disc._set(key, pair.decode_value(buffer))
+            order.append(key)
+        disc._order = tuple(order)
+        return disc
+
+    def _set(self, key: str, value: Any) -> None:
+        if key == 'x':
+            self.position = (value, self.position[1])
+        elif key == 'y':
+            self.position = (self.position[0], value)
+        elif key == 'xv':
+            self.velocity = (value, self.velocity[1])
+        elif key == 'yv':
+            self.velocity = (self.velocity[0], value)
+        elif key == 'a':
+            self.angle = value
+        elif key == 'av':
+            self.angular_velocity = value
+        elif key == 'team':
+            self.team = Team.from_number(value)
+        else:
+            self.extra[key] = value
+
+    def to_json(self) -> dict:
+        values = {
+            'x': self.position[0],
+            'y': self.position[1],
+            'xv': self.velocity[0],
+            'yv': self.velocity[1],
+            'a': self.angle,
+            'av': self.angular_velocity,
+            'team': int(self.team),
+            **self.extra,
+        }
+        order = [key for key in self._order if key in values]
+        order += [key for key in values if key not in self._order]
+        return {key: values[key] for key in order}
+
+
+@define(slots=True, auto_attribs=True)
+class InitialState:
+    """
+    A game state as sent when a game starts (`on_game_start`) or to a player joining a
+    running game (`on_inform_in_game`), and as passed to `Room.start_game`.
+
+    :meth:`decode` reads it straight from PSON into typed records. ``physics`` and
+    ``projectiles`` stay encoded until they are first read and are written back byte for
+    byte if they are never touched. State keys without a field are kept in ``extra``.
+    """
+
+    discs: List[Optional['DiscState']] = field(factory=list)
+    """Indexed by player id, ``None`` for ids without a disc."""
+    scores: List[Any] = field(factory=list)
+    seed: int = field(default=0)
+    round_count: int = field(default=0)
+    frames_to_unpause: int = field(default=0)
+    frames_to_end: int = field(default=-1)
+    """Frames until the round ends, ``-1`` while nobody has won it."""
+    extra: Dict[str, Any] = field(factory=dict, repr=False)
+    _physics: '_Lazy' = field(factory=_Lazy, repr=False, eq=False)
+    _projectiles: '_Lazy' = field(factory=_Lazy, repr=False, eq=False)
+    _order: Tuple[str, ...] = field(default=(), repr=False, eq=False)
+
+    @property
+    def physics(self) -> Optional[dict]:
+        """Bodies, joints and fixtures in their current pose, in bonk JSON format."""
+        return self._physics.get()
+
+    @physics.setter
+    def physics(self, value: Optional[dict]) -> None:
+        self._physics.set(value)
+
+    @property
+    def projectiles(self) -> Optional[list]:
+        return self._projectiles.get()
+
+    @projectiles.setter
+    def projectiles(self, value: Optional[list]) -> None:
+        self._projectiles.set(value)
+
+    @classmethod
+    def decode(cls, buffer: 'ByteBuffer') -> 'InitialState':
+        pair = _pair()
+        endian = buffer.endian
+        buffer.set_little_endian()
+        try:
+            return cls._decode(pair, buffer)
+        finally:
+            buffer.set_endian(endian)
+
+    @classmethod
+    def _decode(cls, pair: 'StaticPair', buffer: 'ByteBuffer') -> 'InitialState':
+        state = cls()
+        code = buffer.read_uint8()
+        if code == PSONType.EMPTY_OBJECT:
+            return state
+        if code != PSONType.OBJECT:
+            raise ValueError(f'Initial state is not an object: {code:#x}')
+        order = []
+        for _ in range(buffer.read_varint32()):
+            key = pair.decode_value(buffer)
+            order.append(key)
+            if key in _LAZY_KEYS:
+                start = buffer.offset
+                pair.skip_value(buffer)
+                getattr(state, f'_{key}').raw = buffer.bytes[start : buffer.offset]
+            elif key == 'discs' and _peek(buffer) == PSONType.ARRAY:
+                buffer.read_uint8()
+                discs = state.discs
+                for _ in range(buffer.read_varint32()):
+                    if _peek(buffer) == PSONType.NULL:
+                        buffer.read_uint8()
+                        discs.append(None)
+                    else:
+                        discs.append(DiscState.decode(pair, buffer))
+            else:
+                state._set(key, pair.decode_value(buffer))
+        state._order = tuple(order)
+        return state
+
+    @classmethod
+    def from_base64(cls, encoded: str) -> 'InitialState':
+        """Decodes a state in the encoding of game start packets."""
+        buffer = ByteBuffer().from_base64(encoded, lz_encoded=True, case_encoded=True)
+        return cls.decode(buffer)
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'InitialState':
+        state = cls()
+        for key, value in data.items():
+            state._set(key, value)
+        state._order = tuple(data)
+        return state
+
+    def _set(self, key: str, value: Any) -> None:
+        if key == 'discs':
+            self.discs = [
+                None if disc is None else DiscState.from_json(disc)
+                for disc in value or ()
+            ]
+        elif key == 'scores':
+            self.scores = value
+        elif key == 'seed':
+            self.seed = value
+        elif key == 'rc':
+            self.round_count = value
+        elif key == 'ftu':
+            self.frames_to_unpause = value
+        elif key == 'fte':
+            self.frames_to_end = value
+        elif key in _LAZY_KEYS:
+            getattr(self, f'_{key}').set(value)
+        else:
+            self.extra[key] = value
+
+    def _keys(self) -> List[str]:
+        keys = [*_STATE_KEYS, *_LAZY_KEYS, *self.extra]
+        return [key for key in self._order if key in keys] + [
+            key for key in keys if key not in self._order
+        ]
+
+    def _value(self, key: str) -> Any:
+        if key == 'discs':
+            return [None if disc is None else disc.to_json() for disc in self.discs]
+        if key == 'scores':
+            return self.scores
+        if key == 'seed':
+            return self.seed
+        if key == 'rc':
+            return self.round_count
+        if key == 'ftu':
+            return self.frames_to_unpause
+        if key == 'fte':
+            return self.frames_to_end
+        if key in _LAZY_KEYS:
+            return getattr(self, f'_{key}').get()
+        return self.extra[key]
+
+    # Read only dict access, for handlers written when `on_game_start` and
+    # `on_inform_in_game` passed the decoded dict. To be removed in the next release.
+    def __getitem__(self, key: str) -> Any:
+        _warn_dict_access()
+        if key not in self:
+            raise KeyError(key)
+        return self._value(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys() and self._value(key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        _warn_dict_access()
+        return self._value(key) if key in self else default
+
+    def keys(self) -> KeysView[str]:
+        return self.to_json().keys()
+
+    def to_json(self) -> dict:
+        """The state as the nested dict bonk uses, decoding the lazy sections."""
+        values = {key: self._value(key) for key in self._keys()}
+        return {key: value for key, value in values.items() if value is not None}
+
+    def encode(self, buffer: Optional['ByteBuffer'] = None) -> 'ByteBuffer':
+        """Encodes the state as PSON, untouched lazy sections are copied as they came."""
+        pair = _pair()
+        buffer = buffer if buffer is not None else ByteBuffer()
+        endian = buffer.endian
+        buffer.set_little_endian()
+        entries = []
+        for key in self._keys():
+            if key in _LAZY_KEYS:
+                section = getattr(self, f'_{key}')
+                if section.raw is not None or section.value is not None:
+                    entries.append((key, section))
+            else:
+                value = self._value(key)
+                if value is not None:
+                    entries.append((key, value))
+        if not entries:
+            buffer.write_uint8(PSONType.EMPTY_OBJECT)
+        else:
+            buffer.write_uint8(PSONType.OBJECT)
+            buffer.write_varint32(len(entries))
+            for key, value in entries:
+                pair.encode_value(key, buffer)
+                if isinstance(value, _Lazy):
+                    value.encode(pair, buffer)
+                else:
+                    pair.encode_value(value, buffer)
+        buffer.set_endian(endian)
+        return buffer
+
+    def to_base64(self) -> str:
+        """Encodes the state for `Room.start_game`."""
+        return self.encode().to_base64(lz_encode=True, case_encode=True)
@@ -2,6 +2,7 @@
 from attrs import define, field
 
 from ..pson.bytebuffer import ByteBuffer
+from ..pson.schema import BinarySchema, scalar
 
 
 # Source: https://github.com/MerinPrime/ReBonk/blob/master/src/core/CustomControls.ts
@@ -46,47 +47,52 @@ class Settings:
         settings = Settings()
         if buffer.size == 0:
             return settings
-        settings.version = buffer.read_uint16()
-
-        if settings.version >= 1:
-            settings.up1 = buffer.read_uint16()
-            settings.up2 = buffer.read_uint16()
-            settings.down1 = buffer.read_uint16()
-            settings.down2 = buffer.read_uint16()
-            settings.left1 = buffer.read_uint16()
-            settings.left2 = buffer.read_uint16()
-            settings.right1 = buffer.read_uint16()
-            settings.right2 = buffer.read_uint16()
-            settings.heavy1 = buffer.read_uint16()
-            settings.heavy2 = buffer.read_uint16()
-            settings.special1 = buffer.read_uint16()
-            settings.special2 = buffer.read_uint16()
-
-        if settings.version >= 2:
-            settings.filter = buffer.read_bool()
-
-        if settings.version >= 3:
-            settings.stats = buffer.read_bool()
-
-        if 3 <= settings.version <= 5:
-            legacyQualityFlag = buffer.read_bool()
-            if legacyQualityFlag:
-                settings.quality = 3
-            else:
-                settings.quality = 2
-
-        if settings.version >= 4:
-            settings.help = buffer.read_bool()
-
-        if settings.version >= 3:
-            settings.up3 = buffer.read_uint16()
-            settings.down3 = buffer.read_uint16()
-            settings.left3 = buffer.read_uint16()
-            settings.right3 = buffer.read_uint16()
-            settings.heavy3 = buffer.read_uint16()
-            settings.special3 = buffer.read_uint16()
-
-        if settings.version >= 6:
-            settings.quality = buffer.read_uint16()
-
-        return settings
+        return SETTINGS_SCHEMA.decode(settings, buffer)
+
+    def to_base64(self) -> str:
+        buffer = ByteBuffer(big_endian=True)
+        self.to_buffer(buffer)
+        return buffer.to_base64()
+
+    def to_buffer(self, buffer: 'ByteBuffer') -> None:
+        SETTINGS_SCHEMA.encode(self, buffer)
+
+
+# The layout depends on the version stored in the first field.
+SETTINGS_SCHEMA = BinarySchema(
+    scalar('version', 'H'),
+    *(
+        scalar(name, 'H', since=1)
+        for name in (
+            'up1',
+            'up2',
+            'down1',
+            'down2',
+            'left1',
+            'left2',
+            'right1',
+            'right2',
+            'heavy1',
+            'heavy2',
+            'special1',
+            'special2',
+        )
+    ),
+    scalar('filter', '?', since=2),
+    scalar('stats', '?', since=3),
+    scalar(
+        'quality',
+        '?',
+        since=3,
+        until=5,
+        to_wire=lambda quality: quality >= 3,
+        from_wire=lambda high_quality: 3 if high_quality else 2,
+    ),
+    scalar('help', '?', since=4),
+    *(
+        scalar(name, 'H', since=3)
+        for name in ('up3', 'down3', 'left3', 'right3', 'heavy3', 'special3')
+    ),
+    scalar('quality', 'H', since=6),
+    version_attr='version',
+)
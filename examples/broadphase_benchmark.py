@@ -0,0 +1,163 @@
+import random
+import time
+from typing import Dict, List, Set, Tuple
+
+from bonkbot.simulation import Collider, Simulation, SimulationState, SweepAndPrune
+from bonkbot.simulation.simulation import PLAYER_RADIUS
+from bonkbot.tools import MapGenerator, MapTemplate
+
+"""
+This example benchmarks the simulation broadphase.
+For generated maps of growing size it compares the static grid collider lookup with a
+scan over every collider, and whole simulation steps with either lookup, then times the
+sweep-and-prune broadphase on its own against testing every pair of moving boxes.
+"""
+
+PLATFORM_COUNTS = (8, 32, 128, 512)
+PLAYERS = 8
+FRAMES = 300
+BOX_COUNTS = (50, 200, 800)
+BOX_FRAMES = 100
+
+Box = Tuple[float, float, float, float]
+
+
+def linear_candidates(
+    simulation: 'Simulation', state: 'SimulationState', x: float, y: float
+) -> List['Collider']:
+    found = []
+    for collider in simulation.colliders:
+        if collider.body == -1:
+            min_x, min_y, max_x, max_y = collider.aabb
+            if (
+                x + PLAYER_RADIUS >= min_x
+                and x - PLAYER_RADIUS <= max_x
+                and y + PLAYER_RADIUS >= min_y
+                and y - PLAYER_RADIUS <= max_y
+            ):
+                found.append(collider)
+        else:
+            reach = collider.reach + PLAYER_RADIUS
+            dx = x - state.body_x[collider.body]
+            dy = y - state.body_y[collider.body]
+            if dx * dx + dy * dy <= reach * reach:
+                found.append(collider)
+    return found
+
+
+class LinearSimulation(Simulation):
+    """The simulation with the collider lookup scanning every collider."""
+
+    def candidates(
+        self, state: 'SimulationState', x: float, y: float
+    ) -> List['Collider']:
+        return linear_candidates(self, state, x, y)
+
+
+def time_steps(
+    simulation: 'Simulation', inputs: Dict[int, Dict[int, int]]
+) -> Tuple[float, 'SimulationState']:
+    state = simulation.new_state(dict.fromkeys(range(PLAYERS), 1))
+    start = time.perf_counter()
+    simulation.run(state, FRAMES, inputs)
+    return (time.perf_counter() - start) / FRAMES, state
+
+
+def benchmark_maps() -> None:
+    print(
+        'platforms colliders  linear lookup  grid lookup  linear step  grid step  alive'
+    )
+    for platforms in PLATFORM_COUNTS:
+        template = MapTemplate(
+            platforms=(platforms, platforms),
+            death_zones=(0, 0),
+            spawns_per_team=PLAYERS,
+        )
+        bonk_map = MapGenerator(template).generate(platforms)
+        simulation = Simulation(bonk_map)
+        state = simulation.new_state(dict.fromkeys(range(PLAYERS), 1))
+        rng = random.Random(platforms)
+        inputs = {
+            frame: {player_id: rng.randrange(16) for player_id in range(PLAYERS)}
+            for frame in range(0, FRAMES, 10)
+        }
+
+        points = [(rng.uniform(-365, 365), rng.uniform(-250, 250)) for _ in range(1000)]
+        start = time.perf_counter()
+        linear = [linear_candidates(simulation, state, x, y) for x, y in points]
+        linear_time = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [list(simulation.candidates(state, x, y)) for x, y in points]
+        grid_time = time.perf_counter() - start
+        assert all(
+            sorted(map(id, a)) == sorted(map(id, b)) for a, b in zip(linear, found)
+        )
+
+        linear_step, linear_state = time_steps(LinearSimulation(bonk_map), inputs)
+        grid_step, state = time_steps(simulation, inputs)
+        # Both lookups give the colliders in the same order, so the games are identical.
+        assert state == linear_state
+
+        print(
+            f'{platforms:>9} {len(simulation.colliders):>9}'
+            f'  {linear_time / len(points) * 1e6:>10.1f} us'
+            f'  {grid_time / len(points) * 1e6:>8.1f} us'
+            f'  {linear_step * 1e3:>8.3f} ms'
+            f'  {grid_step * 1e3:>6.3f} ms'
+            f'  {state.died_at.count(-1)}/{PLAYERS}'
+        )
+
+
+def brute_force_pairs(boxes: List['Box']) -> Set[Tuple[int, int]]:
+    pairs = set()
+    for first in range(len(boxes)):
+        a = boxes[first]
+        for second in range(first + 1, len(boxes)):
+            b = boxes[second]
+            if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                pairs.add((first, second))
+    return pairs
+
+
+def player_boxes(centers: List[List[float]]) -> List['Box']:
+    return [(x - 15, y - 15, x + 15, y + 15) for x, y in centers]
+
+
+def benchmark_boxes() -> None:
+    print('boxes  brute force  sweep and prune')
+    for count in BOX_COUNTS:
+        rng = random.Random(count)
+        # Boxes about the size of a player, spread so each touches a few others.
+        side = 800 * (count / 50) ** 0.5
+        centers = [[rng.uniform(0, side), rng.uniform(0, side)] for _ in range(count)]
+        velocities = [(rng.uniform(-2, 2), rng.uniform(-2, 2)) for _ in range(count)]
+        broadphase = SweepAndPrune()
+        for box in player_boxes(centers):
+            broadphase.add(box)
+
+        brute_force_time = broadphase_time = 0.0
+        for _ in range(BOX_FRAMES):
+            for center, (vx, vy) in zip(centers, velocities):
+                center[0] += vx
+                center[1] += vy
+            current = player_boxes(centers)
+            start = time.perf_counter()
+            expected = brute_force_pairs(current)
+            brute_force_time += time.perf_counter() - start
+            start = time.perf_counter()
+            for proxy, box in enumerate(current):
+                broadphase.update(proxy, box)
+            pairs = set(broadphase.pairs())
+            broadphase_time += time.perf_counter() - start
+            assert pairs == expected
+
+        print(
+            f'{count:>5}  {brute_force_time / BOX_FRAMES * 1e3:>8.2f} ms'
+            f'  {broadphase_time / BOX_FRAMES * 1e3:>12.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+    benchmark_maps()
+    print()
+    benchmark_boxes()
@@ -0,0 +1,22 @@
+import pytest
+
+from bonkbot.pson import ByteBuffer, bytebuffer
+
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_lz_round_trip(monkeypatch: pytest.MonkeyPatch, fast: bool) -> None:
+    if not fast:
+        monkeypatch.setattr(bytebuffer, '_decompress', None)
+    buffer = ByteBuffer()
+    for value in range(500):
+        buffer.write_int16(value * 37)
+    encoded = buffer.to_base64(lz_encode=True, case_encode=True, uri_encode=True)
+    decoded = ByteBuffer().from_base64(
+        encoded, lz_encoded=True, case_encoded=True, uri_encoded=True
+    )
+    assert decoded.bytes == buffer.bytes
+
+
+def test_lz_rejects_empty_data() -> None:
+    with pytest.raises(ValueError):
+        ByteBuffer().from_base64('', lz_encoded=True)
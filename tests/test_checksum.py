@@ -0,0 +1,83 @@
+import random
+
+from bonkbot.simulation import (
+    ChecksumHistory,
+    Simulation,
+    SimulationState,
+    StateChecksum,
+    state_checksum,
+)
+from bonkbot.tools import MapGenerator, MapTemplate
+
+
+def make_simulation() -> 'Simulation':
+    return Simulation(MapGenerator(MapTemplate(spawns_per_team=3)).generate(7))
+
+
+def new_state(simulation: 'Simulation') -> 'SimulationState':
+    return simulation.new_state({0: 1, 1: 1, 2: 1})
+
+
+def reversed_players(state: 'SimulationState') -> 'SimulationState':
+    reordered = state.copy()
+    for name in ('player_ids', 'teams', 'x', 'y', 'vx', 'vy', 'inputs', 'died_at'):
+        getattr(reordered, name).reverse()
+    return reordered
+
+
+def test_checksum_ignores_player_order() -> None:
+    simulation = make_simulation()
+    state = simulation.run(new_state(simulation), 30, {0: {0: 2, 1: 4}})
+    assert state_checksum(reversed_players(state)) == state_checksum(state)
+
+
+def test_checksum_sees_changes() -> None:
+    simulation = make_simulation()
+    state = new_state(simulation)
+    before = state_checksum(state)
+    state.x[1] += 0.01
+    assert state_checksum(state) != before
+    # Changes below the precision are ignored.
+    state.x[1] = 0.5
+    nudged = state.copy()
+    nudged.x[1] += 1e-6
+    assert state_checksum(nudged) == state_checksum(state)
+
+
+def test_incremental_update_matches_fresh_checksum() -> None:
+    simulation = make_simulation()
+    state = new_state(simulation)
+    rng = random.Random(8)
+    checksum = StateChecksum()
+    for frame in range(90):
+        inputs = {player_id: rng.randrange(16) for player_id in range(3)}
+        simulation.step(state, inputs if frame % 10 == 0 else None)
+        assert checksum.update(state) == state_checksum(state)
+
+    # Removed players drop out of the checksum.
+    smaller = simulation.new_state({0: 1})
+    assert checksum.update(smaller) == state_checksum(smaller)
+    checksum.reset()
+    assert checksum.value == 0
+
+
+def test_history_compares_peers() -> None:
+    history = ChecksumHistory(capacity=3)
+    for frame in range(5):
+        history.record(frame, 100 + frame)
+    assert len(history) == 3
+    assert history.get(1) is None
+    assert history.latest == (4, 104)
+
+    assert history.check(7, 2, 102) is None
+    assert history.last_synced(7) == 2
+    assert history.check(7, 1, 999) is None  # not recorded any more
+    assert history.check(7, 4, 999) == 4
+    assert history.check(7, 3, 998) == 3
+    assert history.check(7, 4, 999) is None  # not earlier than the known divergence
+    assert history.first_divergence(7) == 3
+    assert history.first_divergence(8) is None
+
+    history.clear()
+    assert history.latest is None
+    assert history.last_synced(7) is None
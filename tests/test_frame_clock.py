@@ -0,0 +1,100 @@
+from typing import Tuple
+
+import pytest
+
+from bonkbot.core.room.frameclock import FrameClock
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 50.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTimeSyncer:
+    """Server time in milliseconds, ``offset`` ahead of the fake clock."""
+
+    def __init__(self, clock: 'FakeClock') -> None:
+        self.clock = clock
+        self.offset = 1_000_000.0
+
+    def now(self) -> float:
+        return self.clock.now * 1000 + self.offset
+
+
+def make_clock() -> Tuple['FrameClock', 'FakeClock', 'FakeTimeSyncer']:
+    clock = FakeClock()
+    timesyncer = FakeTimeSyncer(clock)
+    return FrameClock(timesyncer, clock=clock), clock, timesyncer
+
+
+def test_not_running_until_started() -> None:
+    frame_clock, _, _ = make_clock()
+    assert not frame_clock.running
+    with pytest.raises(ValueError):
+        frame_clock.estimate()
+    with pytest.raises(ValueError):
+        _ = frame_clock.frame
+
+
+def test_start_anchors_frame_zero() -> None:
+    frame_clock, clock, timesyncer = make_clock()
+    # The game started 100 ms before the start packet was handled.
+    frame_clock.start(timesyncer.now() - 100)
+    assert frame_clock.running
+    assert frame_clock.frame == 3
+    clock.now += 0.9
+    assert frame_clock.frame == 30
+    assert frame_clock.estimate() == pytest.approx(30)
+    frame_clock.stop()
+    assert not frame_clock.running
+
+
+def test_frame_boundaries() -> None:
+    frame_clock, clock, _ = make_clock()
+    frame_clock.set_frame(200)
+    assert frame_clock.frame == 200
+    assert frame_clock.time_to_next_frame() == pytest.approx(1 / 30)
+    # Check the middle of every frame, exact boundaries depend on float rounding.
+    clock.now += 0.5 / 30
+    for frame in range(200, 400):
+        assert frame_clock.frame == frame
+        assert frame_clock.time_to_next_frame() == pytest.approx(0.5 / 30)
+        clock.now += 1 / 30
+    assert frame_clock.frame_duration == pytest.approx(1000 / 30)
+
+
+def test_resync_slews_monotonically() -> None:
+    frame_clock, clock, timesyncer = make_clock()
+    frame_clock.set_frame(0)
+    clock.now += 1
+    # The synced time jumps 300 ms ahead of the monotonic estimate.
+    timesyncer.offset += 300
+    frame_clock.resync()
+    assert frame_clock.drift == pytest.approx(300)
+
+    previous = frame_clock.estimate()
+    for _ in range(100):
+        clock.now += 0.05
+        estimate = frame_clock.estimate()
+        assert estimate > previous
+        previous = estimate
+    # After 5 s at 0.1 ms/ms the whole 300 ms are applied.
+    assert frame_clock.server_time() == pytest.approx(timesyncer.now())
+
+
+def test_resync_backwards_never_repeats_frames() -> None:
+    frame_clock, clock, timesyncer = make_clock()
+    frame_clock.set_frame(0)
+    timesyncer.offset -= 500
+    frame_clock.resync()
+    previous = frame_clock.estimate()
+    for _ in range(200):
+        clock.now += 0.01
+        estimate = frame_clock.estimate()
+        assert estimate > previous
+        previous = estimate
+    clock.now += 10
+    assert frame_clock.server_time() == pytest.approx(timesyncer.now())
@@ -0,0 +1,106 @@
+import gzip
+import json
+from pathlib import Path
+from typing import List
+
+from bonkbot.tools import (
+    IngestRecord,
+    IngestStats,
+    MapGenerator,
+    MapTemplate,
+    ingest_dump,
+    iter_dump,
+    read_dump,
+)
+from bonkbot.types.map import BonkMap
+
+
+def generate(seed: int) -> str:
+    return MapGenerator(MapTemplate()).generate(seed).encode_to_database()
+
+
+def invalid_map() -> str:
+    bonk_map = BonkMap()
+    bonk_map.physics.bro = [4]
+    return bonk_map.encode_to_database()
+
+
+def make_lines() -> List[str]:
+    return [
+        json.dumps({'id': 1, 'leveldata': generate(1)}),
+        '',
+        json.dumps(generate(2)),
+        '{"id": 3, "leveldata": ',
+        json.dumps({'id': 4}),
+        json.dumps({'id': 5, 'leveldata': generate(1)}),
+        json.dumps({'id': 6, 'leveldata': invalid_map()}),
+        json.dumps({'id': 7, 'leveldata': 'not a map'}),
+        json.dumps({'id': 8, 'leveldata': generate(3)}),
+    ]
+
+
+def test_read_dump_skips_blank_lines(tmp_path: Path) -> None:
+    path = tmp_path / 'dump.jsonl.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        file.write('a\n\n  \nb\n')
+    assert list(read_dump(path)) == [(1, 'a\n'), (4, 'b\n')]
+    assert list(read_dump(['a', '', 'b'])) == [(1, 'a'), (3, 'b')]
+
+
+def test_iter_dump_dedupes_and_counts() -> None:
+    stats = IngestStats()
+    records = list(iter_dump(make_lines(), processes=0, chunksize=3, stats=stats))
+
+    assert [record.line for record in records] == [1, 3, 9]
+    assert records[0].row == {'id': 1}
+    assert records[1].row == {}
+    assert records[0].leveldata == generate(1)
+    assert records[0].stats.size == len(generate(1))
+    assert records[0].fingerprint == BonkMap.decode_from_database(
+        generate(1)
+    ).fingerprint(include_metadata=False)
+    assert (stats.rows, stats.stored, stats.duplicates) == (8, 3, 1)
+    assert (stats.invalid, stats.failed) == (1, 3)
+    assert stats.finished is not None
+
+
+def test_invalid_maps_can_be_kept() -> None:
+    records = list(iter_dump(make_lines(), processes=0, skip_invalid=False))
+    assert [record.line for record in records] == [1, 3, 7, 9]
+    assert records[2].issues
+
+    records = list(iter_dump(make_lines(), processes=0, validate=False))
+    assert [record.line for record in records] == [1, 3, 7, 9]
+    assert records[2].issues == ()
+
+
+def test_seen_dedupes_across_runs() -> None:
+    seen = set()
+    first = list(iter_dump(make_lines(), processes=0, seen=seen))
+    second = list(iter_dump(make_lines(), processes=0, seen=seen))
+    assert len(first) == 3
+    assert second == []
+    assert len(seen) == 3
+
+
+def test_process_pool_keeps_dump_order(tmp_path: Path) -> None:
+    path = tmp_path / 'dump.jsonl'
+    lines = [
+        json.dumps({'id': seed, 'leveldata': generate(seed)}) for seed in range(12)
+    ]
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    stored: List[IngestRecord] = []
+    progress: List[int] = []
+
+    stats = ingest_dump(
+        path,
+        stored.append,
+        processes=2,
+        chunksize=2,
+        max_pending=2,
+        progress=lambda stats: progress.append(stats.rows),
+        progress_interval=0.0,
+    )
+    assert [record.row['id'] for record in stored] == list(range(12))
+    assert stats.stored == 12
+    assert progress[-1] == 12
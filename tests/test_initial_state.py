@@ -0,0 +1,113 @@
+import pytest
+
+from bonkbot.pson import ByteBuffer, StaticPair
+from bonkbot.types.room.initial_state import PSON_KEYS, DiscState, InitialState
+from bonkbot.types.team import Team
+
+
+def make_json() -> dict:
+    # PSON may store floats as float32, these values survive that exactly.
+    return {
+        'discs': [
+            {
+                'x': 1.5,
+                'y': -2.0,
+                'xv': 0.25,
+                'yv': 0.0,
+                'a': 0.5,
+                'av': 0.0,
+                'team': 1,
+            },
+            None,
+            {
+                'x': 3.0,
+                'y': 4.0,
+                'xv': 0.0,
+                'yv': 1.0,
+                'a': 0.0,
+                'av': 2.0,
+                'team': 3,
+                'swing': False,
+            },
+        ],
+        'physics': {
+            'bodies': [{'p': [1, 2], 'lv': [0, 0], 'a': 0, 'av': 0}],
+            'ppm': 12,
+        },
+        'projectiles': [],
+        'scores': [0, 2],
+        'seed': 1234,
+        'rc': 1,
+        'ftu': 60,
+        'fte': -1,
+        'lscr': 3,
+    }
+
+
+def encode_json(data: dict) -> bytes:
+    return bytes(StaticPair(PSON_KEYS).encode(data).bytes)
+
+
+def decode(data: bytes) -> 'InitialState':
+    return InitialState.decode(ByteBuffer(bytearray(data)))
+
+
+def test_decode_reads_typed_fields() -> None:
+    state = decode(encode_json(make_json()))
+    assert state.seed == 1234
+    assert state.round_count == 1
+    assert state.frames_to_unpause == 60
+    assert state.scores == [0, 2]
+    assert state.extra == {'lscr': 3}
+    assert state.discs[1] is None
+    disc = state.discs[2]
+    assert disc.position == (3.0, 4.0)
+    assert disc.velocity == (0.0, 1.0)
+    assert disc.angular_velocity == 2.0
+    assert disc.team == Team.from_number(3)
+    assert disc.extra == {'swing': False}
+    assert state.physics['ppm'] == 12
+
+
+def test_round_trip() -> None:
+    data = make_json()
+    encoded = encode_json(data)
+    state = decode(encoded)
+    assert state.to_json() == data
+    assert bytes(state.encode().bytes) == encoded
+    assert InitialState.from_json(data).to_json() == data
+    assert bytes(InitialState.from_json(data).encode().bytes) == encoded
+    assert InitialState.from_base64(state.to_base64()).to_json() == data
+
+
+def test_untouched_sections_stay_encoded() -> None:
+    encoded = encode_json(make_json())
+    state = decode(encoded)
+    state.seed = 99
+    state.discs[0].position = (0.0, 0.0)
+    decoded = decode(bytes(state.encode().bytes))
+    assert decoded.seed == 99
+    assert decoded.discs[0] == DiscState(
+        team=Team.from_number(1), angle=0.5, velocity=(0.25, 0.0)
+    )
+    assert decoded.physics == make_json()['physics']
+
+
+def test_replaced_section_is_encoded() -> None:
+    state = decode(encode_json(make_json()))
+    state.physics = {'ppm': 30}
+    assert decode(bytes(state.encode().bytes)).physics == {'ppm': 30}
+
+
+def test_dict_access_is_deprecated() -> None:
+    state = decode(encode_json(make_json()))
+    with pytest.deprecated_call():
+        assert state['seed'] == 1234
+    with pytest.deprecated_call():
+        assert state['discs'][0]['x'] == 1.5
+    with pytest.deprecated_call():
+        assert state.get('missing', 5) == 5
+    with pytest.deprecated_call(), pytest.raises(KeyError):
+        state['missing']
+    assert 'lscr' in state
+    assert list(state.keys()) == list(make_json())
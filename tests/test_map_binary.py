@@ -0,0 +1,60 @@
+import pytest
+
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.map import BonkMap, binary_to_database, database_to_binary
+
+
+def generate(seed: int) -> 'BonkMap':
+    return MapGenerator(MapTemplate()).generate(seed)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_binary_round_trip(seed: int) -> None:
+    bonk_map = generate(seed)
+    bonk_map.metadata.contributors = ['a', 'b']
+    bonk_map.metadata.votes_up = 3
+    decoded = BonkMap.from_binary(bonk_map.to_binary())
+    assert decoded.encode_to_database() == bonk_map.encode_to_database()
+    assert decoded.to_json() == bonk_map.to_json()
+    assert decoded.metadata.votes_up == 3
+    assert decoded.metadata.votes_down is None
+
+
+def test_binary_accepts_buffers() -> None:
+    data = generate(1).to_binary()
+    expected = BonkMap.from_binary(data).encode_to_database()
+    for buffer in (bytearray(data), memoryview(data)):
+        assert BonkMap.from_binary(buffer).encode_to_database() == expected
+
+
+def test_database_conversion_round_trip() -> None:
+    encoded = generate(2).encode_to_database()
+    assert binary_to_database(database_to_binary(encoded)) == encoded
+
+
+def test_binary_keeps_fields_the_database_drops() -> None:
+    bonk_map = generate(1)
+    fixture = bonk_map.physics.fixtures[0]
+    fixture.friction_players = False
+    fixture.density = None
+    fixture.fs = 'scale'
+    fixture.zp = 2
+    decoded = BonkMap.from_binary(bonk_map.to_binary()).physics.fixtures[0]
+    assert decoded.friction_players is False
+    assert decoded.density is None
+    assert decoded.fs == 'scale'
+    assert decoded.zp == 2
+
+
+def test_decoded_binary_map_is_tracked() -> None:
+    decoded = BonkMap.from_binary(generate(1).to_binary())
+    before = decoded.encode_to_database()
+    decoded.physics.bodies[0].position = (1.0, 2.0)
+    assert decoded.encode_to_database() != before
+
+
+def test_invalid_data_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        BonkMap.from_binary(b'')
+    with pytest.raises(ValueError):
+        BonkMap.from_binary(b'\0' * 256)
@@ -0,0 +1,86 @@
+from bonkbot.types.map import BonkMap, CaptureZone
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body
+from bonkbot.types.map.physics.joint import GearJoint, RevoluteJoint
+from bonkbot.types.map.physics.shape import BoxShape, CircleShape
+
+
+def make_map() -> 'BonkMap':
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [
+        BoxShape(width=1.0),
+        BoxShape(width=2.0),  # unused
+        CircleShape(radius=3.0),
+    ]
+    physics.fixtures = [
+        Fixture(shape_id=0, name='a'),
+        Fixture(shape_id=2, name='orphan'),  # no body uses it
+        Fixture(shape_id=2, name='c'),
+        Fixture(shape_id=7, name='dangling'),
+    ]
+    physics.bodies = [
+        Body(name='main', fixtures=[0, 2, 3]),
+        Body(name='empty'),  # no fixtures and no joint
+        Body(name='anchor'),  # no fixtures, held by a joint
+    ]
+    physics.joints = [
+        RevoluteJoint(body_a_id=2, body_b_id=-1),
+        RevoluteJoint(body_a_id=9, body_b_id=-1),  # dangling
+        GearJoint(joint_a_id=0, joint_b_id=1),  # uses the dangling joint
+    ]
+    physics.bro = [2, 1, 0]
+    bonk_map.cap_zones = [
+        CaptureZone(name='kept', shape_id=2),
+        CaptureZone(name='gone', shape_id=1),
+    ]
+    return bonk_map
+
+
+def test_reference_index() -> None:
+    index = make_map().physics.reference_index()
+    assert index.fixture_shape == [0, 2, 2, 7]
+    assert index.shape_fixtures == [[0], [], [1, 2]]
+    assert index.fixture_bodies == [[0], [], [0], [0]]
+    assert index.body_joints == [[], [], [0]]
+    assert index.joint_gears == [[2], [2], []]
+    assert index.unused_shapes() == [1]
+    assert index.unused_fixtures() == [1]
+    assert index.dangling_fixtures() == [3]
+
+
+def test_compact_removes_unreachable_entries() -> None:
+    bonk_map = make_map()
+    result = bonk_map.compact()
+
+    assert result.removed_shapes == 1
+    assert result.removed_fixtures == 2
+    assert result.removed_bodies == 1
+    assert result.removed_joints == 2
+    assert result.removed_cap_zones == 1
+    assert result.removed == 7
+    assert result.size_after == len(bonk_map.encode_to_database())
+    assert result.bytes_saved > 0
+
+    physics = bonk_map.physics
+    assert [shape.width for shape in physics.shapes[:1]] == [1.0]
+    assert physics.shapes[1].radius == 3.0
+    assert [fixture.name for fixture in physics.fixtures] == ['a', 'c']
+    assert [fixture.shape_id for fixture in physics.fixtures] == [0, 1]
+    assert [body.name for body in physics.bodies] == ['main', 'anchor']
+    assert physics.bodies[0].fixtures == [0, 1]
+    assert len(physics.joints) == 1
+    assert physics.joints[0].body_a_id == 1
+    assert physics.bro == [1, 0]
+    assert [cap_zone.name for cap_zone in bonk_map.cap_zones] == ['kept']
+    assert bonk_map.cap_zones[0].shape_id == 1
+
+
+def test_compact_is_idempotent() -> None:
+    bonk_map = make_map()
+    bonk_map.compact()
+    encoded = bonk_map.encode_to_database()
+    result = bonk_map.compact()
+    assert result.removed == 0
+    assert result.bytes_saved == 0
+    assert bonk_map.encode_to_database() == encoded
@@ -0,0 +1,40 @@
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.map import BonkMap
+
+
+def generate(seed: int) -> 'BonkMap':
+    return MapGenerator(MapTemplate()).generate(seed)
+
+
+def test_equal_maps_have_equal_fingerprints() -> None:
+    bonk_map = generate(1)
+    decoded = BonkMap.decode_from_database(bonk_map.encode_to_database())
+    assert decoded is not bonk_map
+    assert decoded.fingerprint() == bonk_map.fingerprint()
+    assert generate(1).fingerprint() == bonk_map.fingerprint()
+    assert generate(2).fingerprint() != bonk_map.fingerprint()
+
+
+def test_edit_changes_fingerprint() -> None:
+    bonk_map = generate(1)
+    before = bonk_map.fingerprint()
+    bonk_map.physics.bodies[0].shape.density += 1
+    assert bonk_map.fingerprint() != before
+
+
+def test_negative_zero_equals_zero() -> None:
+    first, second = generate(1), generate(1)
+    first.physics.bodies[0].position = (0.0, 0.0)
+    second.physics.bodies[0].position = (-0.0, -0.0)
+    assert first.fingerprint() == second.fingerprint()
+
+
+def test_metadata_is_excluded_by_default() -> None:
+    first, second = generate(1), generate(1)
+    second.metadata.name = 'renamed'
+    second.metadata.database_id = 1234
+    second.metadata.votes_up = 10
+    assert first.fingerprint() == second.fingerprint()
+    assert first.fingerprint(include_metadata=True) != second.fingerprint(
+        include_metadata=True
+    )
@@ -0,0 +1,94 @@
+import math
+
+import pytest
+
+from bonkbot.types.map import BonkMap
+from bonkbot.types.map.geometry import AABB, convex_decomposition, signed_area
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body
+from bonkbot.types.map.physics.shape import BoxShape, CircleShape, PolygonShape
+
+L_SHAPE = [
+    (0.0, 0.0),
+    (20.0, 0.0),
+    (20.0, 10.0),
+    (10.0, 10.0),
+    (10.0, 30.0),
+    (0.0, 30.0),
+]
+
+
+def make_map() -> 'BonkMap':
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [
+        BoxShape(width=40.0, height=10.0, position=(10.0, 0.0)),
+        CircleShape(radius=5.0, position=(0.0, 20.0)),
+        PolygonShape(vertices=list(reversed(L_SHAPE))),  # clockwise
+        PolygonShape(vertices=[(0.0, 0.0), (1.0, 1.0)]),  # degenerate
+    ]
+    physics.fixtures = [Fixture(shape_id=index) for index in range(4)]
+    physics.fixtures.append(Fixture(shape_id=9))  # dangling shape
+    physics.bodies = [
+        Body(fixtures=[0, 1], position=(100.0, 50.0), angle=math.pi / 2),
+        Body(fixtures=[2, 3, 4, 7], position=(-50.0, 0.0)),
+    ]
+    physics.bro = [0, 1]
+    return bonk_map
+
+
+def test_fixtures_in_world_space() -> None:
+    geometry = make_map().geometry()
+    assert [(g.body_id, g.fixture_id) for g in geometry.fixtures] == [
+        (0, 0),
+        (0, 1),
+        (1, 2),
+    ]
+    box, circle, polygon = geometry.fixtures
+
+    # The body is turned a quarter, the box is 10 wide and 40 tall around (100, 60).
+    assert box.aabb.min_x == pytest.approx(95)
+    assert box.aabb.max_x == pytest.approx(105)
+    assert box.aabb.min_y == pytest.approx(40)
+    assert box.aabb.max_y == pytest.approx(80)
+    assert box.area == pytest.approx(400)
+    assert box.centroid == pytest.approx((100, 60))
+    assert signed_area(box.vertices) > 0
+
+    assert circle.is_circle
+    assert circle.center == pytest.approx((80, 50))
+    assert circle.aabb == AABB(75, 45, 85, 55)
+    assert circle.convex_parts() == []
+
+    assert signed_area(polygon.vertices) > 0
+    assert polygon.area == pytest.approx(400)
+    assert polygon.aabb == AABB(-50, 0, -30, 30)
+
+
+def test_bounds_and_lookup() -> None:
+    geometry = make_map().geometry()
+    assert geometry.bounds == AABB(-50, 0, 105, 80)
+    assert geometry.total_area == pytest.approx(400 + 25 * math.pi + 400)
+    assert [g.body_id for g in geometry.for_fixture(2)] == [1]
+    assert geometry.for_fixture(3) == []
+    assert BonkMap().geometry().bounds is None
+
+
+def test_convex_decomposition_covers_polygon() -> None:
+    parts = convex_decomposition(L_SHAPE)
+    assert len(parts) == 2
+    assert sum(signed_area(part) for part in parts) == pytest.approx(400)
+    assert convex_decomposition(L_SHAPE[:3]) == [tuple(L_SHAPE[:3])]
+    assert convex_decomposition(L_SHAPE[:2]) == []
+
+
+def test_held_geometry_is_a_snapshot() -> None:
+    bonk_map = make_map()
+    geometry = bonk_map.geometry()
+    assert bonk_map.geometry() is geometry
+    bonk_map.physics.bodies[1].position = (0.0, 0.0)
+    assert geometry.fixtures[2].aabb == AABB(-50, 0, -30, 30)
+    assert geometry.bounds == AABB(-50, 0, 105, 80)
+    rebuilt = bonk_map.geometry()
+    assert rebuilt is not geometry
+    assert rebuilt.fixtures[2].aabb == AABB(0, 0, 20, 30)
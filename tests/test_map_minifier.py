@@ -0,0 +1,76 @@
+from bonkbot.types.map import BonkMap
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body, ForceZone
+from bonkbot.types.map.physics.shape import BoxShape, PolygonShape
+
+
+def make_map() -> 'BonkMap':
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [
+        BoxShape(width=100.0, height=20.0, position=(-0.0, 10.0)),
+        PolygonShape(
+            vertices=[(0.0, 0.0), (0.0, 0.0), (10.0, 0.0), (5.0, 7.3), (0.0, 0.0)]
+        ),
+    ]
+    physics.fixtures = [Fixture(shape_id=0), Fixture(shape_id=1)]
+    physics.bodies = [
+        Body(
+            fixtures=[0, 1],
+            position=(12.34, -56.78),
+            force_zone=ForceZone(enabled=False, force=(3.0, 4.0), center_force=2.0),
+        ),
+    ]
+    physics.bro = [0]
+    return bonk_map
+
+
+def test_lossless_keeps_values() -> None:
+    bonk_map = make_map()
+    report = bonk_map.minify()
+    decoded = BonkMap.decode_from_database(bonk_map.encode_to_database())
+
+    assert decoded.physics.shapes[0].width == 100
+    assert decoded.physics.shapes[0].position == (0, 10)
+    assert decoded.physics.bodies[0].position == (12.34, -56.78)
+    assert decoded.physics.shapes[1].vertices == [(0, 0), (10, 0), (5, 7.3)]
+    assert report.changed_values > 0
+
+
+def test_lossless_shrinks_json_not_numbers() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.shapes[1].vertices = [(0.0, 0.0), (10.0, 0.0), (5.0, 7.0)]
+    report = bonk_map.minify()
+    # Every number stays a float64 in the database string, only the JSON form shrinks.
+    assert report.size_saved == 0
+    assert report.json_size_saved > 0
+
+
+def test_lossless_drops_duplicate_vertices() -> None:
+    report = make_map().minify()
+    assert report.size_saved > 0
+
+
+def test_disabled_force_zone_is_kept() -> None:
+    bonk_map = make_map()
+    bonk_map.minify()
+    force_zone = bonk_map.physics.bodies[0].force_zone
+    assert not force_zone.enabled
+    assert force_zone.force == (3, 4)
+    assert force_zone.center_force == 2
+
+
+def test_quantize_snaps_to_grid() -> None:
+    bonk_map = make_map()
+    bonk_map.minify(quantize=True, grid=0.5)
+    assert bonk_map.physics.bodies[0].position == (12.5, -57)
+    assert bonk_map.physics.shapes[1].vertices == [(0, 0), (10, 0), (5, 7.5)]
+
+
+def test_unchanged_map_reports_nothing() -> None:
+    bonk_map = make_map()
+    bonk_map.minify()
+    report = bonk_map.minify()
+    assert report.changed_values == 0
+    assert report.size_saved == 0
+    assert report.json_size_saved == 0
@@ -0,0 +1,86 @@
+import copy
+import pickle
+
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.map import BonkMap
+
+
+def generate(seed: int) -> 'BonkMap':
+    return MapGenerator(MapTemplate()).generate(seed)
+
+
+def test_encodings_are_cached() -> None:
+    bonk_map = generate(1)
+    assert bonk_map.encode_to_database() is bonk_map.encode_to_database()
+    assert bonk_map.to_json() is bonk_map.to_json()
+
+
+def test_nested_attribute_change_invalidates() -> None:
+    bonk_map = generate(1)
+    before = bonk_map.encode_to_database()
+    bonk_map.physics.bodies[0].shape.density = 5.0
+    after = bonk_map.encode_to_database()
+    assert after != before
+    assert BonkMap.decode_from_database(after).physics.bodies[0].shape.density == 5.0
+
+
+def test_list_mutation_invalidates() -> None:
+    bonk_map = generate(1)
+    before = bonk_map.to_json()
+    bonk_map.metadata.contributors.append('someone')
+    assert bonk_map.to_json() is not before
+    assert bonk_map.to_json()['m']['cr'] == ['someone']
+
+
+def test_replaced_list_is_tracked() -> None:
+    bonk_map = generate(1)
+    bonk_map.metadata.contributors = []
+    before = bonk_map.encode_to_database()
+    bonk_map.metadata.contributors.append('someone')
+    assert bonk_map.encode_to_database() != before
+
+
+def test_adopting_owned_object_copies_it() -> None:
+    first, second = generate(1), generate(2)
+    shape = first.physics.shapes[0]
+    second.physics.shapes.append(shape)
+    assert second.physics.shapes[-1] is not shape
+    assert second.physics.shapes[-1] == shape
+
+    # Both maps still see changes to their own objects.
+    first_before = first.encode_to_database()
+    second_before = second.encode_to_database()
+    first.physics.shapes[0].shrink = not first.physics.shapes[0].shrink
+    assert first.encode_to_database() != first_before
+    assert second.encode_to_database() == second_before
+    second.physics.shapes[-1].shrink = not second.physics.shapes[-1].shrink
+    assert second.encode_to_database() != second_before
+
+
+def test_removed_object_moves_without_copy() -> None:
+    first, second = generate(1), generate(2)
+    shape = first.physics.shapes.pop()
+    second.physics.shapes.append(shape)
+    assert second.physics.shapes[-1] is shape
+    before = second.encode_to_database()
+    shape.shrink = not shape.shrink
+    assert second.encode_to_database() != before
+
+
+def test_rebuilt_list_keeps_objects() -> None:
+    bonk_map = generate(1)
+    shapes = list(bonk_map.physics.shapes)
+    bonk_map.physics.shapes = list(reversed(bonk_map.physics.shapes))
+    assert all(a is b for a, b in zip(reversed(shapes), bonk_map.physics.shapes))
+    before = bonk_map.encode_to_database()
+    shapes[0].shrink = not shapes[0].shrink
+    assert bonk_map.encode_to_database() != before
+
+
+def test_copies_stay_tracked() -> None:
+    bonk_map = generate(1)
+    for other in (copy.deepcopy(bonk_map), pickle.loads(pickle.dumps(bonk_map))):
+        assert other.encode_to_database() == bonk_map.encode_to_database()
+        before = other.encode_to_database()
+        other.physics.bodies[0].position = (1.0, 2.0)
+        assert other.encode_to_database() != before
@@ -0,0 +1,115 @@
+import math
+from typing import Tuple
+
+import pytest
+
+from bonkbot.types.map import AffineTransform, BonkMap
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body
+from bonkbot.types.map.physics.shape import BoxShape, PolygonShape
+
+
+def make_map() -> 'BonkMap':
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [
+        BoxShape(width=40.0, height=10.0, position=(15.0, -5.0), angle=0.3),
+        PolygonShape(vertices=[(0.0, 0.0), (10.0, 0.0), (0.0, 10.0)]),
+    ]
+    physics.fixtures = [Fixture(shape_id=0), Fixture(shape_id=1)]
+    physics.bodies = [
+        Body(
+            fixtures=[0, 1],
+            position=(100.0, 50.0),
+            angle=0.5,
+            linear_velocity=(3.0, -1.0),
+            angular_velocity=2.0,
+        ),
+    ]
+    physics.bro = [0]
+    return bonk_map
+
+
+def world_point(body: 'Body', local: Tuple[float, float]) -> Tuple[float, float]:
+    cos, sin = math.cos(body.angle), math.sin(body.angle)
+    x, y = local
+    return (
+        body.position[0] + cos * x - sin * y,
+        body.position[1] + sin * x + cos * y,
+    )
+
+
+def polygon_area(vertices: list) -> float:
+    return sum(
+        x1 * y2 - x2 * y1
+        for (x1, y1), (x2, y2) in zip(vertices, vertices[1:] + vertices[:1])
+    )
+
+
+def test_then_applies_in_order() -> None:
+    transform = AffineTransform.translation(10, 0).then(
+        AffineTransform.rotation(math.pi / 2)
+    )
+    assert transform.apply((1, 0)) == pytest.approx((0, 11))
+    half_turn = AffineTransform.rotation(math.pi, origin=(5, 5))
+    assert half_turn.apply((0, 0)) == pytest.approx((10, 10))
+
+
+def test_decompose_rejects_shear() -> None:
+    scale, _, mirrored = (
+        AffineTransform.scaling(2).then(AffineTransform.mirror_x()).decompose()
+    )
+    assert (scale, mirrored) == (2, True)
+    with pytest.raises(ValueError):
+        AffineTransform(b=1.0).decompose()
+    with pytest.raises(ValueError):
+        AffineTransform(a=2.0).decompose()
+
+
+@pytest.mark.parametrize(
+    'transform',
+    [
+        AffineTransform.translation(-30, 20),
+        AffineTransform.rotation(1.1, origin=(20, 30)),
+        AffineTransform.scaling(1.5).then(AffineTransform.rotation(-0.7)),
+        AffineTransform.mirror_x(12).then(AffineTransform.scaling(0.5)),
+        AffineTransform.mirror_y().then(AffineTransform.rotation(2.0)),
+    ],
+)
+def test_world_geometry_follows_transform(transform: 'AffineTransform') -> None:
+    bonk_map = make_map()
+    body = bonk_map.physics.bodies[0]
+    box, polygon = bonk_map.physics.shapes
+    corner = (box.position[0] + box.width / 2, box.position[1])
+    expected_corner = transform.apply(world_point(body, corner))
+    expected_vertices = {
+        transform.apply(world_point(body, vertex)) for vertex in polygon.vertices
+    }
+
+    bonk_map.transform(transform)
+
+    scale, _, mirrored = transform.decompose()
+    corner = (box.position[0] + box.width / 2, box.position[1])
+    assert world_point(body, corner) == pytest.approx(expected_corner)
+    vertices = [world_point(body, vertex) for vertex in polygon.vertices]
+    for vertex in vertices:
+        assert any(vertex == pytest.approx(expected) for expected in expected_vertices)
+    # The winding is kept when mirroring.
+    assert polygon_area(polygon.vertices) > 0
+    assert body.angular_velocity == pytest.approx(-2.0 if mirrored else 2.0)
+    assert math.hypot(*body.linear_velocity) == pytest.approx(
+        scale * math.hypot(3.0, -1.0)
+    )
+
+
+def test_mirror_twice_restores_map() -> None:
+    bonk_map = make_map()
+    original = make_map()
+    bonk_map.transform(AffineTransform.mirror_x(7))
+    bonk_map.transform(AffineTransform.mirror_x(7))
+    body, expected = bonk_map.physics.bodies[0], original.physics.bodies[0]
+    assert body.position == pytest.approx(expected.position)
+    assert math.cos(body.angle) == pytest.approx(math.cos(expected.angle))
+    assert math.sin(body.angle) == pytest.approx(math.sin(expected.angle))
+    assert body.angular_velocity == expected.angular_velocity
+    assert bonk_map.physics.shapes[1].vertices == original.physics.shapes[1].vertices
@@ -0,0 +1,173 @@
+import asyncio
+import math
+from typing import Any, List
+
+import pytest
+
+from bonkbot.core.room.room import Room
+from bonkbot.types.errors import MapValidationError
+from bonkbot.types.map import BonkMap, MapIssueType
+from bonkbot.types.map.capture_zone import CaptureZone
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body
+from bonkbot.types.map.physics.joint import GearJoint, RevoluteJoint
+from bonkbot.types.map.physics.shape import BoxShape, PolygonShape
+from bonkbot.types.map.spawn import Spawn
+from bonkbot.types.map.validation import MAX_JOINTS, validate_map
+from bonkbot.types.room.room_create_params import RoomCreateParams
+from bonkbot.types.room.room_data import RoomData
+
+
+def make_map() -> 'BonkMap':
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [BoxShape(width=100.0, height=20.0)]
+    physics.fixtures = [Fixture(shape_id=0)]
+    physics.bodies = [Body(fixtures=[0])]
+    physics.bro = [0]
+    return bonk_map
+
+
+def issue_paths(bonk_map: 'BonkMap', issue_type: 'MapIssueType') -> List[str]:
+    return [issue.path for issue in validate_map(bonk_map) if issue.type == issue_type]
+
+
+def test_valid_map_has_no_issues() -> None:
+    assert validate_map(make_map()) == []
+    assert BonkMap().validate() == []
+
+
+def test_numbers_out_of_range() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.shapes[0].width = 100000.0
+    bonk_map.physics.ppm = 4
+    bonk_map.physics.bodies[0].position = (0.0, -100000.0)
+    bonk_map.spawns = [Spawn(priority=1001)]
+    assert issue_paths(bonk_map, MapIssueType.OUT_OF_RANGE) == [
+        'physics.ppm',
+        'physics.shapes[0].width',
+        'physics.bodies[0].position.y',
+        'spawns[0].priority',
+    ]
+
+
+def test_limits_are_inclusive() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.shapes[0].width = 99999.0
+    bonk_map.physics.ppm = 30
+    bonk_map.spawns = [Spawn(priority=1000, position=(-10000.0, 10000.0))]
+    assert validate_map(bonk_map) == []
+
+
+def test_numbers_not_finite() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.bodies[0].angle = math.nan
+    bonk_map.physics.fixtures[0].density = math.inf
+    assert issue_paths(bonk_map, MapIssueType.NOT_FINITE) == [
+        'physics.fixtures[0].density',
+        'physics.bodies[0].angle',
+    ]
+
+
+def test_strings_too_long() -> None:
+    bonk_map = make_map()
+    bonk_map.metadata.name = 'x' * 26
+    bonk_map.physics.bodies[0].name = 'x' * 30
+    assert issue_paths(bonk_map, MapIssueType.TOO_LONG) == ['metadata.name']
+
+
+def test_too_many_joints() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.joints = [
+        RevoluteJoint(body_a_id=0) for _ in range(MAX_JOINTS + 1)
+    ]
+    assert issue_paths(bonk_map, MapIssueType.TOO_MANY) == ['physics.joints']
+
+
+def test_dangling_references() -> None:
+    bonk_map = make_map()
+    physics = bonk_map.physics
+    physics.bro = [0, 1]
+    physics.fixtures.append(Fixture(shape_id=3))
+    physics.bodies[0].fixtures = [0, 1, 2]
+    physics.joints = [
+        RevoluteJoint(body_a_id=0, body_b_id=-1),
+        RevoluteJoint(body_a_id=0, body_b_id=5),
+        GearJoint(joint_a_id=0, joint_b_id=3),
+        GearJoint(joint_a_id=2, joint_b_id=0),
+    ]
+    bonk_map.cap_zones = [CaptureZone(shape_id=2)]
+    assert issue_paths(bonk_map, MapIssueType.DANGLING_REFERENCE) == [
+        'physics.bro[1]',
+        'physics.fixtures[1].shape_id',
+        'physics.bodies[0].fixtures[2]',
+        'physics.joints[1].body_b_id',
+        'physics.joints[2].joint_b_id',
+        'physics.joints[3].joint_a_id',
+        'cap_zones[0].shape_id',
+    ]
+
+
+def test_degenerate_polygon() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.shapes[0] = PolygonShape(vertices=[(0.0, 0.0), (1.0, 0.0)])
+    assert issue_paths(bonk_map, MapIssueType.DEGENERATE) == [
+        'physics.shapes[0].vertices'
+    ]
+
+
+def test_error_message_is_truncated() -> None:
+    bonk_map = make_map()
+    bonk_map.physics.bro = list(range(1, 8))
+    error = MapValidationError(validate_map(bonk_map))
+    assert len(error.issues) == 7
+    assert str(error).endswith('; and 2 more')
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.sent: List[Any] = []
+
+    async def emit(self, event: int, data: Any) -> None:
+        self.sent.append((event, data))
+
+
+def make_room() -> 'Room':
+    params = RoomCreateParams(
+        name='test',
+        password='',
+        unlisted=True,
+        max_players=8,
+        min_level=0,
+        max_level=999,
+        server=None,
+    )
+    room = Room(None, params)
+    room._room_data = RoomData(name='test')
+    room._socket = FakeSocket()
+    return room
+
+
+def test_set_map_validates_unless_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Room, 'is_host', property(lambda _: True))
+    room = make_room()
+    bonk_map = make_map()
+    bonk_map.physics.bro = [3]
+
+    with pytest.raises(MapValidationError):
+        asyncio.run(room.set_map(bonk_map))
+    assert room._socket.sent == []
+
+    asyncio.run(room.set_map(bonk_map, validate=False))
+    assert room.game_settings.map is bonk_map
+    assert len(room._socket.sent) == 1
+
+
+def test_start_game_sends_room_map_as_is() -> None:
+    room = make_room()
+    bonk_map = make_map()
+    bonk_map.physics.bro = [3]
+    room._room_data.game_settings.map = bonk_map
+    asyncio.run(room.start_game({}))
+    assert room.game_started
+    assert len(room._socket.sent) == 1
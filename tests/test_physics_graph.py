@@ -0,0 +1,191 @@
+import pytest
+
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.map import BonkMap
+from bonkbot.types.map.capture_zone import CaptureZone
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body
+from bonkbot.types.map.physics.joint import GearJoint, RevoluteJoint
+from bonkbot.types.map.physics.shape import BoxShape, CircleShape
+
+
+def make_map() -> 'BonkMap':
+    # Three bodies, body 1 shares the fixture of body 0, body 2 has a capture zone.
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [BoxShape(), CircleShape(), BoxShape()]
+    physics.fixtures = [
+        Fixture(name='a', shape_id=0),
+        Fixture(name='b', shape_id=1),
+        Fixture(name='c', shape_id=2),
+    ]
+    physics.bodies = [
+        Body(name='a', fixtures=[0]),
+        Body(name='b', fixtures=[0, 1]),
+        Body(name='c', fixtures=[2]),
+    ]
+    physics.joints = [
+        RevoluteJoint(body_a_id=0, body_b_id=2),
+        RevoluteJoint(body_a_id=2, body_b_id=-1),
+        GearJoint(joint_a_id=0, joint_b_id=1),
+        RevoluteJoint(body_a_id=1, body_b_id=-1),
+    ]
+    physics.bro = [2, 1, 0]
+    bonk_map.cap_zones = [CaptureZone(shape_id=2)]
+    return bonk_map
+
+
+def test_load_builds_neighbours() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    body_a, body_b, body_c = graph.bodies
+    fixture_a = graph.fixtures[0]
+
+    assert graph.bodies_of(fixture_a) == [body_a, body_b]
+    assert graph.joint_bodies(graph.joints[1]) == (body_c, None)
+    assert graph.gear_joints(graph.joints[2]) == (graph.joints[0], graph.joints[1])
+    assert graph.fixture_of_cap_zone(graph.cap_zones[0]) == graph.fixtures[2]
+    assert not graph.dirty
+
+
+def test_insert_body_writes_back() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    shape = BoxShape(width=5.0)
+    body = Body(name='d')
+    handle = graph.insert_body(
+        body,
+        [(Fixture(name='d1'), shape), (Fixture(name='d2'), shape)],
+    )
+    assert graph.body(handle) is body
+    assert graph.dirty
+
+    physics = bonk_map.physics
+    assert len(physics.bodies) == 3
+    bonk_map.close_physics_graph()
+    assert physics.bodies[3] is body
+    assert body.fixtures == [3, 4]
+    assert physics.fixtures[3].shape_id == physics.fixtures[4].shape_id == 3
+    assert physics.shapes[3] is shape
+    assert physics.bro == [2, 1, 0, 3]
+    assert bonk_map.validate() == []
+
+
+def test_remove_body_cascades() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    body_c = graph.bodies[2]
+    graph.remove_body(body_c)
+
+    # Both joints on body c go, and the gear joint on them.
+    assert graph.joints == [graph.handle(bonk_map.physics.joints[3])]
+    assert graph.cap_zones == []
+    assert len(graph.fixtures) == 2
+    assert len(graph.shapes) == 2
+
+    bonk_map.close_physics_graph()
+    physics = bonk_map.physics
+    assert [body.name for body in physics.bodies] == ['a', 'b']
+    assert [fixture.name for fixture in physics.fixtures] == ['a', 'b']
+    assert physics.bro == [1, 0]
+    assert len(physics.joints) == 1
+    assert physics.joints[0].body_a_id == 1
+    assert bonk_map.cap_zones == []
+    assert bonk_map.validate() == []
+
+
+def test_shared_fixture_survives_removal() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    body_a, body_b, _ = graph.bodies
+    fixture_a = graph.fixtures[0]
+    graph.remove_body(body_a)
+    assert graph.fixtures_of(body_b)[0] == fixture_a
+    graph.remove_body(body_b)
+    assert fixture_a not in graph.fixtures
+
+
+def test_apply_renumbers_ids() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    graph.remove_body(graph.bodies[0])
+    graph.remove_shape(graph.shapes[1])
+    bonk_map.close_physics_graph()
+
+    physics = bonk_map.physics
+    # Body b keeps the shared fixture a and lost fixture b with its shape.
+    assert [body.fixtures for body in physics.bodies] == [[0], [1]]
+    assert [fixture.name for fixture in physics.fixtures] == ['a', 'c']
+    assert [fixture.shape_id for fixture in physics.fixtures] == [0, 1]
+    assert len(physics.shapes) == 2
+    assert bonk_map.cap_zones[0].shape_id == 1
+    assert [(joint.body_a_id, joint.body_b_id) for joint in physics.joints] == [
+        (1, -1),
+        (0, -1),
+    ]
+    assert physics.bro == [1, 0]
+    assert bonk_map.validate() == []
+
+
+def test_add_joint_checks_bodies_first() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    joint = RevoluteJoint()
+    with pytest.raises(KeyError):
+        graph.add_joint(joint, graph.bodies[0], 12345)
+    with pytest.raises(KeyError):
+        graph.handle(joint)
+    assert len(graph.joints) == 4
+    assert len(graph.joints_of(graph.bodies[0])) == 1
+    assert not graph.dirty
+
+    handle = graph.add_joint(joint, graph.bodies[0])
+    assert graph.joint_bodies(handle) == (graph.bodies[0], None)
+
+
+def test_failed_insert_adds_nothing() -> None:
+    bonk_map = make_map()
+    graph = bonk_map.physics_graph()
+    existing = bonk_map.physics.fixtures[0]
+    with pytest.raises(ValueError, match='already in the graph'):
+        graph.insert_body(Body(), [(Fixture(), BoxShape()), (existing, 0)])
+    with pytest.raises(KeyError):
+        graph.insert_body(Body(), [(Fixture(), 12345)])
+    assert len(graph.shapes) == 3
+    assert len(graph.fixtures) == 3
+    assert len(graph.bodies) == 3
+    assert not graph.dirty
+
+
+def test_elements_of_other_maps_are_copied() -> None:
+    first, second = make_map(), make_map()
+    graph = second.physics_graph()
+    foreign_body = first.physics.bodies[2]
+    handle = graph.add_body(foreign_body)
+    body = graph.body(handle)
+    assert body is not foreign_body
+    assert body == foreign_body
+
+    second.close_physics_graph()
+    assert second.physics.bodies[3] is body
+    # Edits through the graph reach the map once the graph is reopened.
+    graph = second.physics_graph()
+    graph.body(graph.bodies[3]).name = 'moved'
+    assert second.physics.bodies[3].name == 'moved'
+    assert first.physics.bodies[2].name == 'c'
+
+
+def test_foreign_shape_is_copied_once() -> None:
+    first = MapGenerator(MapTemplate()).generate(1)
+    second = make_map()
+    graph = second.physics_graph()
+    shape = first.physics.shapes[0]
+    graph.insert_body(Body(), [(Fixture(), shape), (Fixture(), shape)])
+    assert len(graph.shapes) == 4
+    copied = graph.shape(graph.shapes[3])
+    second.close_physics_graph()
+    assert second.physics.shapes[3] is copied
+    assert copied == shape
+    assert second.physics.shapes[3] is not shape
+    assert second.physics.fixtures[3].shape_id == 3
+    assert second.physics.fixtures[4].shape_id == 3
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from typing import List
+
+from bonkbot.core.room.frameclock import FrameClock
+from bonkbot.simulation import PlayerPredictor, Simulation, SimulationState
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.input import Inputs
+from bonkbot.types.player_move import PlayerMove
+
+LEFT = Inputs(left=True)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTimeSyncer:
+    def __init__(self, clock: 'FakeClock') -> None:
+        self.clock = clock
+
+    def now(self) -> float:
+        return 1_000_000 + self.clock.now * 1000
+
+
+def make_simulation() -> 'Simulation':
+    return Simulation(MapGenerator(MapTemplate(spawns_per_team=2)).generate(9))
+
+
+def new_state(simulation: 'Simulation', frame: int = 0) -> 'SimulationState':
+    state = simulation.new_state({0: 1, 1: 1})
+    state.frame = frame
+    return state
+
+
+def make_predictor(clock: 'FakeClock', **options: object) -> 'PlayerPredictor':
+    simulation = make_simulation()
+    return PlayerPredictor(simulation, new_state(simulation, 5), clock=clock, **options)
+
+
+def players(pings: List[float]) -> list:
+    return [SimpleNamespace(id=i, ping=ping) for i, ping in enumerate(pings)]
+
+
+def test_current_frame_from_elapsed_time() -> None:
+    clock = FakeClock()
+    predictor = make_predictor(clock)
+    assert predictor.current_frame() == 5
+    predictor.set_input(0, 10, LEFT)
+    assert predictor.current_frame() == 10
+    clock.now += 1
+    assert predictor.current_frame() == 10 + 30
+    # The ping does not move the frame.
+    predictor.update_players(players([400, 400]))
+    assert predictor.current_frame() == 40
+    # An older input arriving late does not either.
+    predictor.set_input(1, 8, LEFT)
+    assert predictor.current_frame() == 40
+
+
+def test_current_frame_from_frame_clock() -> None:
+    clock = FakeClock()
+    frame_clock = FrameClock(FakeTimeSyncer(clock), clock=clock)
+    predictor = make_predictor(clock, frame_clock=frame_clock)
+    predictor.set_input(0, 3, LEFT)
+    frame_clock.set_frame(50)
+    clock.now += 0.5
+    assert predictor.current_frame() == 65
+    frame_clock.stop()
+    assert predictor.current_frame() == 3 + 15
+
+
+def test_ping_sets_unseen_window() -> None:
+    clock = FakeClock()
+    predictor = make_predictor(clock)
+    predictor.update_players(players([200, 0]))  # 3 frames each way for player 0
+    predictor.set_input(0, 10, LEFT)
+    assert predictor.unseen_frames(0, 11) == 1
+    assert predictor.unseen_frames(0, 30) == 3
+    assert predictor.unseen_frames(1, 30) == 0
+    prediction = predictor.predict(0, 20)
+    assert prediction.frame == 20
+    assert prediction.unseen_frames == 3
+
+
+def test_prediction_follows_inputs() -> None:
+    clock = FakeClock()
+    predictor = make_predictor(clock)
+    simulation = predictor.simulation
+    predictor.set_input(0, 10, LEFT)
+    first = predictor.predict_all(40)
+
+    expected = simulation.run(new_state(simulation, 5), 35, {10: {0: LEFT.flags}})
+    assert first[0].position == expected.position(0)
+    assert first[1].position == expected.position(1)
+
+    # Taking the move back predicts as if it was never made.
+    predictor.on_move(0, PlayerMove(frame=10, inputs=LEFT, reverted=True))
+    plain = simulation.run(new_state(simulation, 5), 35)
+    assert predictor.predict(0, 40).position == plain.position(0)
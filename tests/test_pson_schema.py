@@ -0,0 +1,141 @@
+from typing import List, Optional, Tuple
+
+import pytest
+from attrs import define, field
+
+from bonkbot.pson import ByteBuffer
+from bonkbot.pson.schema import (
+    BinarySchema,
+    array,
+    const,
+    group,
+    point,
+    point_array,
+    scalar,
+    utf,
+)
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.map import BonkMap
+from bonkbot.types.settings import Settings
+
+
+@define(slots=True, auto_attribs=True)
+class Record:
+    version: int = field(default=2)
+    count: int = field(default=0)
+    name: str = field(default='')
+    position: Tuple[float, float] = field(default=(0, 0))
+    ids: List[int] = field(factory=list)
+    vertices: List[Tuple[float, float]] = field(factory=list)
+    limit: Optional[float] = field(default=None)
+    flag: bool = field(default=False)
+    extra: int = field(default=0)
+
+
+RECORD_SCHEMA = BinarySchema(
+    scalar('version', 'H'),
+    scalar('count', 'i'),
+    const('B', 7),
+    utf('name'),
+    point('position'),
+    array('ids', 'h'),
+    point_array('vertices', 'f'),
+    scalar('limit', 'd', none=-1.0),
+    scalar('flag', '?'),
+    group(scalar('extra', 'i'), when=lambda record: record.flag),
+    scalar('extra', 'H', since=2, until=2),
+    version_attr='version',
+)
+
+
+def encode(record: 'Record', *, big_endian: bool = True) -> bytes:
+    buffer = ByteBuffer(big_endian=big_endian)
+    RECORD_SCHEMA.encode(record, buffer)
+    return bytes(buffer.bytes)
+
+
+def decode(data: bytes, *, big_endian: bool = True) -> 'Record':
+    return RECORD_SCHEMA.decode(
+        Record(), ByteBuffer(bytearray(data), big_endian=big_endian)
+    )
+
+
+def test_matches_hand_written_layout() -> None:
+    record = Record(
+        version=1,
+        count=-5,
+        name='hi',
+        position=(1.5, -2.0),
+        ids=[3, 4],
+        vertices=[(0.5, 1.0)],
+        flag=True,
+        extra=9,
+    )
+    buffer = ByteBuffer()
+    buffer.write_uint16(1)
+    buffer.write_int32(-5)
+    buffer.write_uint8(7)
+    buffer.write_utf('hi')
+    buffer.write_float64(1.5)
+    buffer.write_float64(-2.0)
+    buffer.write_int16(2)
+    buffer.write_int16(3)
+    buffer.write_int16(4)
+    buffer.write_int16(1)
+    buffer.write_float32(0.5)
+    buffer.write_float32(1.0)
+    buffer.write_float64(-1.0)
+    buffer.write_uint8(1)  # flag
+    buffer.write_int32(9)
+    assert encode(record) == bytes(buffer.bytes)
+
+
+@pytest.mark.parametrize('big_endian', [True, False])
+@pytest.mark.parametrize('flag', [True, False])
+@pytest.mark.parametrize('version', [1, 2])
+def test_round_trip(version: int, flag: bool, big_endian: bool) -> None:
+    record = Record(
+        version=version,
+        count=12,
+        name='名前',
+        position=(3.25, -0.5),
+        ids=[1, -2, 3],
+        vertices=[(1.0, 2.0), (-3.5, 0.25)],
+        limit=4.5,
+        flag=flag,
+        extra=7,
+    )
+    decoded = decode(encode(record, big_endian=big_endian), big_endian=big_endian)
+    if not flag and version == 1:
+        # Neither the group nor the versioned field hold it.
+        record.extra = 0
+    assert decoded == record
+
+
+def test_none_sentinel() -> None:
+    assert decode(encode(Record(limit=None))).limit is None
+    assert decode(encode(Record(limit=0.0))).limit == 0.0
+
+
+@pytest.mark.parametrize('version', range(7))
+def test_settings_versions_round_trip(version: int) -> None:
+    settings = Settings(version=version, up1=1, special2=2, heavy3=3, quality=3)
+    decoded = Settings.from_base64(settings.to_base64())
+    assert decoded.version == version
+    assert decoded.up1 == (1 if version >= 1 else 38)
+    assert decoded.special2 == (2 if version >= 1 else 89)
+    assert decoded.heavy3 == (3 if version >= 3 else 32)
+    assert decoded.quality == 3
+
+
+def test_settings_layout() -> None:
+    buffer = ByteBuffer()
+    Settings(version=2, up1=1).to_buffer(buffer)
+    assert len(buffer.bytes) == 2 + 12 * 2 + 1
+    assert bytes(buffer.bytes[:4]) == b'\x00\x02\x00\x01'
+
+
+def test_map_database_round_trip() -> None:
+    encoded = MapGenerator(MapTemplate()).generate(3).encode_to_database()
+    decoded = BonkMap.decode_from_database(encoded)
+    assert decoded.encode_to_database() == encoded
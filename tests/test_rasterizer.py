@@ -0,0 +1,96 @@
+import struct
+import zlib
+from typing import List, Tuple
+
+from bonkbot.tools import RasterImage, render_map, render_thumbnails
+from bonkbot.tools.rasterizer import DEFAULT_BACKGROUND
+from bonkbot.types.map import AABB, BonkMap
+from bonkbot.types.map.physics import Fixture
+from bonkbot.types.map.physics.body import Body
+from bonkbot.types.map.physics.shape import BoxShape, CircleShape
+
+RED = 0xFF0000
+BLUE = 0x0000FF
+GREEN = 0x00FF00
+VIEW = AABB(-50, -50, 50, 50)
+
+
+def make_map(bro: List[int]) -> 'BonkMap':
+    bonk_map = BonkMap()
+    physics = bonk_map.physics
+    physics.shapes = [
+        BoxShape(width=40.0, height=40.0),
+        BoxShape(width=40.0, height=40.0),
+        CircleShape(radius=30.0),
+    ]
+    physics.fixtures = [
+        Fixture(shape_id=0, color=RED),
+        Fixture(shape_id=1, color=BLUE),
+        Fixture(shape_id=2, color=GREEN),
+    ]
+    physics.bodies = [
+        Body(fixtures=[0], position=(-10.0, 0.0)),
+        Body(fixtures=[1], position=(10.0, 0.0)),
+        Body(fixtures=[2], position=(0.0, 0.0)),
+    ]
+    physics.bro = bro
+    return bonk_map
+
+
+def center(image: 'RasterImage') -> int:
+    return image.get_pixel(image.width // 2, image.height // 2)
+
+
+def read_png(data: bytes) -> Tuple[int, int, bytes]:
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    offset = 8
+    chunks = {}
+    while offset < len(data):
+        (length,) = struct.unpack('>I', data[offset : offset + 4])
+        kind = data[offset + 4 : offset + 8]
+        body = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack('>I', data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        chunks[kind] = body
+        offset += 12 + length
+    width, height, depth, color_type = struct.unpack('>IIBB', chunks[b'IHDR'][:10])
+    assert (depth, color_type) == (8, 2)
+    return width, height, zlib.decompress(chunks[b'IDAT'])
+
+
+def test_bodies_follow_render_order() -> None:
+    # The first body in bro is in front.
+    assert center(render_map(make_map([1, 0]), 100, 100, view=VIEW)) == BLUE
+    assert center(render_map(make_map([0, 1]), 100, 100, view=VIEW)) == RED
+
+
+def test_bodies_missing_from_render_order_are_behind() -> None:
+    image = render_map(make_map([1, 0]), 100, 100, view=VIEW)
+    # The circle only shows where the boxes do not cover it.
+    assert image.get_pixel(50, 25) == GREEN
+    assert image.get_pixel(5, 50) == DEFAULT_BACKGROUND
+
+
+def test_fit_frames_the_map() -> None:
+    bonk_map = make_map([0, 1, 2])
+    default = render_map(bonk_map, 365, 250)
+    fitted = render_map(bonk_map, 100, 100, fit=True)
+    assert default.get_pixel(0, 0) == DEFAULT_BACKGROUND
+    assert fitted.get_pixel(50, 1) == GREEN
+    assert fitted.get_pixel(0, 50) == RED
+
+
+def test_png_encoding() -> None:
+    image = render_map(make_map([1, 0]), 30, 20, view=VIEW)
+    width, height, raw = read_png(image.to_png())
+    assert (width, height) == (30, 20)
+    rows = [raw[y * 91 : (y + 1) * 91] for y in range(20)]
+    assert all(row[0] == 0 for row in rows)
+    assert b''.join(row[1:] for row in rows) == bytes(image.pixels)
+
+
+def test_render_thumbnails_in_process() -> None:
+    encoded = [make_map([0, 1]).encode_to_database(), BonkMap().encode_to_database()]
+    thumbnails = render_thumbnails(encoded, 40, 30, processes=0)
+    assert [read_png(png)[:2] for png in thumbnails] == [(40, 30), (40, 30)]
+    assert thumbnails[0] == render_map(make_map([0, 1]), 40, 30).to_png()
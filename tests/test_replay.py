@@ -0,0 +1,102 @@
+from typing import Dict
+
+import pytest
+
+from bonkbot.simulation import Replay, Simulation, SimulationState
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.input import Inputs
+from bonkbot.types.player_move import PlayerMove
+
+LEFT = Inputs(left=True)
+RIGHT = Inputs(right=True)
+
+
+def make_simulation() -> 'Simulation':
+    return Simulation(MapGenerator(MapTemplate(spawns_per_team=2)).generate(6))
+
+
+def new_state(simulation: 'Simulation') -> 'SimulationState':
+    return simulation.new_state({0: 1, 1: 1})
+
+
+def expected_at(
+    simulation: 'Simulation', inputs: Dict[int, Dict[int, int]], frame: int
+) -> 'SimulationState':
+    return simulation.run(new_state(simulation), frame, inputs)
+
+
+def test_state_at_matches_run() -> None:
+    simulation = make_simulation()
+    replay = Replay(simulation, new_state(simulation), checkpoint_interval=10)
+    replay.set_input(0, 3, LEFT)
+    replay.set_input(1, 20, RIGHT)
+    inputs = {3: {0: LEFT.flags}, 20: {1: RIGHT.flags}}
+    for frame in (45, 12, 0, 30, 45):
+        assert replay.state_at(frame) == expected_at(simulation, inputs, frame)
+    assert replay.checkpoints == [0, 10, 20, 30, 40]
+    with pytest.raises(ValueError):
+        replay.state_at(-1)
+
+
+def test_changed_input_drops_later_checkpoints() -> None:
+    simulation = make_simulation()
+    replay = Replay(simulation, new_state(simulation), checkpoint_interval=10)
+    replay.set_input(0, 5, LEFT)
+    replay.state_at(50)
+    replay.set_input(0, 25, RIGHT)
+    assert replay.checkpoints == [0, 10, 20]
+    inputs = {5: {0: LEFT.flags}, 25: {0: RIGHT.flags}}
+    assert replay.state_at(50) == expected_at(simulation, inputs, 50)
+
+
+def test_reverted_move_takes_back_its_input() -> None:
+    simulation = make_simulation()
+    replay = Replay(simulation, new_state(simulation), checkpoint_interval=10)
+    move = PlayerMove(frame=8, inputs=LEFT, sequence=1)
+    replay.add_moves(0, [move])
+    replay.state_at(40)
+
+    replay.add_moves(0, [PlayerMove(frame=8, inputs=LEFT, sequence=1, reverted=True)])
+    assert 8 not in replay.inputs
+    assert replay.checkpoints == [0]
+    assert replay.state_at(40) == expected_at(simulation, {}, 40)
+
+    replay.add_moves(
+        0,
+        [PlayerMove(frame=8, inputs=LEFT, sequence=1, reverted=True, unreverted=True)],
+    )
+    assert replay.state_at(40) == expected_at(simulation, {8: {0: LEFT.flags}}, 40)
+
+
+def test_later_sequence_wins() -> None:
+    simulation = make_simulation()
+    replay = Replay(simulation, new_state(simulation))
+    replay.add_moves(
+        0,
+        [
+            PlayerMove(frame=4, inputs=RIGHT, sequence=2),
+            PlayerMove(frame=4, inputs=LEFT, sequence=1),
+        ],
+    )
+    assert replay.inputs == {4: {0: RIGHT.flags}}
+
+
+def test_inputs_before_start_are_held() -> None:
+    simulation = make_simulation()
+    joined = simulation.run(new_state(simulation), 20, {5: {0: LEFT.flags}})
+    start = joined.copy()
+    start.inputs = [0] * len(start.inputs)
+    replay = Replay(simulation, start)
+    replay.set_input(0, 5, LEFT)
+    assert replay.state_at(40) == simulation.run(joined, 20)
+
+
+def test_states_are_consecutive_copies() -> None:
+    simulation = make_simulation()
+    replay = Replay(simulation, new_state(simulation), checkpoint_interval=4)
+    replay.set_input(1, 6, RIGHT)
+    states = list(replay.states(2))
+    assert [state.frame for state in states] == [2, 3, 4, 5, 6]
+    assert states[-1] == expected_at(simulation, {6: {1: RIGHT.flags}}, 6)
+    states[0].x[0] += 1
+    assert replay.state_at(2).x[0] != states[0].x[0]
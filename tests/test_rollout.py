@@ -0,0 +1,88 @@
+import random
+from typing import List
+
+from bonkbot.simulation import RolloutPool, Simulation, SimulationState, rollout
+from bonkbot.tools import MapGenerator, MapTemplate
+
+PLAYERS = 2
+FRAMES = 60
+
+
+def make_simulation() -> 'Simulation':
+    return Simulation(MapGenerator(MapTemplate(spawns_per_team=PLAYERS)).generate(4))
+
+
+def new_state(simulation: 'Simulation') -> 'SimulationState':
+    return simulation.new_state(dict.fromkeys(range(PLAYERS), 1))
+
+
+def make_sequences() -> List[list]:
+    rng = random.Random(5)
+    plan = [rng.randrange(16) for _ in range(FRAMES // 2)]
+    sequences = []
+    for _ in range(12):
+        # Candidates share a prefix and branch off it, some hold their inputs.
+        split = rng.randrange(len(plan))
+        tail = [rng.choice([None, rng.randrange(16)]) for _ in range(FRAMES - split)]
+        sequences.append(plan[:split] + tail)
+    sequences.append(plan[:10])  # shorter, holds its last inputs
+    sequences.append(list(sequences[0]))  # duplicate
+    return sequences
+
+
+def step_through(
+    simulation: 'Simulation', state: 'SimulationState', sequence: list
+) -> 'SimulationState':
+    state = state.copy()
+    for frame in range(FRAMES):
+        step = sequence[frame] if frame < len(sequence) else None
+        simulation.step(state, None if step is None else {0: step})
+    return state
+
+
+def test_rollout_matches_stepping() -> None:
+    simulation = make_simulation()
+    state = simulation.run(new_state(simulation), 5)
+    before = state.copy()
+    sequences = make_sequences()
+
+    results = rollout(simulation, state, sequences, player_id=0, keep_states=True)
+
+    assert state == before
+    assert [result.index for result in results] == list(range(len(sequences)))
+    for result, sequence in zip(results, sequences):
+        expected = step_through(simulation, state, sequence)
+        assert result.state == expected
+        assert result.frame == expected.frame == state.frame + FRAMES
+        assert result.positions == expected.positions()
+    assert results[0].positions == results[-1].positions
+
+
+def test_rollout_states_are_independent() -> None:
+    simulation = make_simulation()
+    state = new_state(simulation)
+    sequences = [[1] * FRAMES, [1] * FRAMES]
+    first, second = rollout(simulation, state, sequences, player_id=0, keep_states=True)
+    assert first.state is not second.state
+    first.state.x[0] += 1
+    assert second.state.x[0] != first.state.x[0]
+
+
+def test_rollout_with_player_mappings() -> None:
+    simulation = make_simulation()
+    state = new_state(simulation)
+    sequence = [{0: 2, 1: 4}] + [None] * (FRAMES - 1)
+    (result,) = rollout(simulation, state, [sequence], keep_states=True)
+    expected = state.copy()
+    simulation.step(expected, {0: 2, 1: 4})
+    simulation.run(expected, FRAMES - 1)
+    assert result.state == expected
+
+
+def test_pool_matches_rollout() -> None:
+    simulation = make_simulation()
+    state = new_state(simulation)
+    sequences = make_sequences()
+    expected = rollout(simulation, state, sequences, player_id=0)
+    with RolloutPool(simulation, processes=2, min_batch=1) as pool:
+        assert pool.run(state, sequences, player_id=0) == expected
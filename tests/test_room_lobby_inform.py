@@ -0,0 +1,133 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+import pytest
+
+from bonkbot.core.api.socket_events import SocketEvents
+from bonkbot.core.room import room as room_module
+from bonkbot.core.room.player import Player
+from bonkbot.core.room.room import Room
+from bonkbot.types.avatar import Avatar
+from bonkbot.types.room.room_create_params import RoomCreateParams
+from bonkbot.types.room.room_data import RoomData
+from bonkbot.types.team import Team
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.sent: List[Tuple[int, Any]] = []
+        self.on_emit: Optional[Callable[[], None]] = None
+
+    async def emit(self, event: int, data: Any) -> None:
+        self.sent.append((event, data))
+        await asyncio.sleep(0)
+        if self.on_emit is not None:
+            on_emit, self.on_emit = self.on_emit, None
+            on_emit()
+
+    def informed(self) -> List[int]:
+        return [
+            data['sid']
+            for event, data in self.sent
+            if event == SocketEvents.Outgoing.INFORM_IN_LOBBY
+        ]
+
+
+def make_room(player_count: int) -> Tuple['Room', 'FakeSocket']:
+    params = RoomCreateParams(
+        name='test',
+        password='',
+        unlisted=True,
+        max_players=8,
+        min_level=0,
+        max_level=999,
+        server=None,
+    )
+    room = Room(None, params)
+    room._room_data = RoomData(name='test')
+    for player_id in range(player_count):
+        room._room_data.players.append(
+            Player(
+                bot=None,
+                room=room,
+                id=player_id,
+                team=Team.FFA,
+                avatar=Avatar(),
+                name=f'player{player_id}',
+                is_guest=True,
+                level=0,
+            ),
+        )
+    socket = FakeSocket()
+    room._socket = socket
+    return room, socket
+
+
+@pytest.fixture(autouse=True)
+def short_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(room_module, 'LOBBY_INFORM_WINDOW', 0.01)
+
+
+def test_join_burst_is_flushed_once() -> None:
+    async def run() -> None:
+        room, socket = make_room(5)
+        for player_id in range(5):
+            room._queue_lobby_inform(player_id)
+        task = room._lobby_inform_task
+        assert task is not None
+        await task
+        assert socket.informed() == [0, 1, 2, 3, 4]
+        assert room._lobby_inform_ids == []
+
+    asyncio.run(run())
+
+
+def test_join_during_flush_is_informed() -> None:
+    async def run() -> None:
+        room, socket = make_room(3)
+        room._queue_lobby_inform(0)
+        task = room._lobby_inform_task
+        # Joins while the first inform is being sent, the task is still running.
+        socket.on_emit = lambda: room._queue_lobby_inform(2)
+        await task
+        assert room._lobby_inform_task is task
+        assert socket.informed() == [0, 2]
+
+    asyncio.run(run())
+
+
+def test_left_players_are_skipped() -> None:
+    async def run() -> None:
+        room, socket = make_room(2)
+        room._queue_lobby_inform(0)
+        room._queue_lobby_inform(1)
+        room.get_player_by_id(0).is_left = True
+        await room._lobby_inform_task
+        assert socket.informed() == [1]
+
+    asyncio.run(run())
+
+
+def test_no_lobby_inform_after_game_start() -> None:
+    async def run() -> None:
+        room, socket = make_room(3)
+        room._queue_lobby_inform(0)
+        room._queue_lobby_inform(1)
+        room.game_started = True
+        await room._lobby_inform_task
+        assert socket.informed() == []
+        assert room._lobby_inform_ids == []
+
+        # A game starting between two informs stops the rest.
+        room.game_started = False
+        room._queue_lobby_inform(0)
+        room._queue_lobby_inform(1)
+
+        def start() -> None:
+            room.game_started = True
+
+        socket.on_emit = start
+        await room._lobby_inform_task
+        assert socket.informed() == [0]
+
+    asyncio.run(run())
@@ -0,0 +1,139 @@
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from bonkbot.tools import (
+    MapEntry,
+    MapGenerator,
+    MapQuery,
+    MapSearchIndex,
+    MapStats,
+    MapTemplate,
+    tokenize,
+)
+from bonkbot.types.mode import Mode
+
+
+def entry(
+    key: int,
+    name: str,
+    author: str = 'someone',
+    *,
+    mode: 'Mode' = Mode.CLASSIC,
+    contributors: Tuple[str, ...] = (),
+    votes: Tuple[int, int] = (0, 0),
+    shapes: int = 1,
+    published: bool = True,
+) -> 'MapEntry':
+    return MapEntry(
+        key=key,
+        name=name,
+        author=author,
+        mode=mode,
+        contributors=contributors,
+        date=f'2020-01-{key + 1:02}',
+        published=published,
+        votes_up=votes[0],
+        votes_down=votes[1],
+        database_id=key,
+        stats=MapStats(shapes=shapes),
+    )
+
+
+def make_index() -> 'MapSearchIndex':
+    index = MapSearchIndex()
+    index.add_entry(entry(0, 'Big Arenas', 'Alice', votes=(10, 2), shapes=30))
+    index.add_entry(entry(1, 'arena_v2', 'bob', contributors=('Alice',), votes=(5, 0)))
+    index.add_entry(entry(2, 'Simple Arena', 'BOB', mode=Mode.SIMPLE, votes=(1, 9)))
+    index.add_entry(entry(3, 'Football pitch', 'carol', mode=Mode.FOOTBALL, shapes=8))
+    index.add_entry(entry(4, 'Arrow tower', 'alice', published=False, votes=(3, 0)))
+    return index
+
+
+def keys(index: 'MapSearchIndex', **query: object) -> list:
+    return index.search(MapQuery(**query), limit=100).keys
+
+
+def test_tokenize() -> None:
+    assert tokenize('Big_Arena-v2!  (Remix)') == ['big', 'arena', 'v2', 'remix']
+
+
+def test_filters() -> None:
+    index = make_index()
+    assert keys(index, name='arena') == [0, 1, 2]
+    assert keys(index, name='ARENA simple') == [2]
+    assert keys(index, name='arenas') == [0]
+    assert keys(index, author='ALICE') == [0, 4]
+    assert keys(index, contributor='alice') == [1]
+    assert keys(index, mode=Mode.FOOTBALL) == [3]
+    assert keys(index, published=False) == [4]
+    assert keys(index, name='arena', author='bob') == [1, 2]
+    assert keys(index, name='missing') == []
+    assert keys(index) == [0, 1, 2, 3, 4]
+
+
+def test_range_filters() -> None:
+    index = make_index()
+    assert keys(index, ranges={'shapes': (8, None)}) == [0, 3]
+    assert keys(index, ranges={'score': (None, 3)}) == [2, 3, 4]
+    assert keys(index, ranges={'date': ('2020-01-02', '2020-01-03')}) == [1, 2]
+    assert keys(index, name='arena', ranges={'votes_up': (2, 5)}) == [1]
+    with pytest.raises(ValueError, match='Unknown range field'):
+        keys(index, ranges={'nope': (0, 1)})
+
+
+def test_ordering_and_paging() -> None:
+    index = make_index()
+    assert keys(index, order_by='-score') == [0, 1, 4, 3, 2]
+    assert keys(index, order_by='name') == [1, 4, 0, 3, 2]
+    # Narrow matches are sorted directly, broad ones walk the sorted column.
+    assert keys(index, author='bob', order_by='-votes_up') == [1, 2]
+    assert keys(index, name='arena', order_by='score') == [2, 1, 0]
+
+    page = index.search(MapQuery(order_by='-score'), offset=1, limit=2)
+    assert page.keys == [1, 4]
+    assert page.total == 5
+    assert page.has_more
+    assert not index.search(offset=3, limit=2).has_more
+    with pytest.raises(ValueError, match='Unknown order field'):
+        keys(index, order_by='nope')
+
+
+def test_remove_and_replace() -> None:
+    index = make_index()
+    index.remove(0)
+    assert 0 not in index
+    assert len(index) == 4
+    assert keys(index, name='arenas') == []
+    assert keys(index, author='alice') == [4]
+    assert keys(index, order_by='-score') == [1, 4, 3, 2]
+
+    index.add_entry(entry(1, 'Renamed', 'dave'))
+    assert index.get(1).name == 'Renamed'
+    assert keys(index, name='arena') == [2]
+    assert keys(index, author='bob') == [2]
+    assert keys(index, name='renamed') == [1]
+    assert [item.key for item in index] == [2, 3, 4, 1]
+
+
+def test_add_map() -> None:
+    bonk_map = MapGenerator(MapTemplate()).generate(1)
+    bonk_map.metadata.name = 'Generated arena'
+    index = MapSearchIndex()
+    added = index.add('generated', bonk_map)
+    assert added.stats == MapStats.from_map(bonk_map)
+    assert keys(index, name='gen') == ['generated']
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    index = make_index()
+    index.remove(2)
+    for name in ('index.json', 'index.json.gz'):
+        path = tmp_path / name
+        index.save(path)
+        loaded = MapSearchIndex.load(path)
+        assert list(loaded) == list(index)
+        assert keys(loaded, name='arena') == [0, 1]
+        # Ties in descending order come newest first.
+        assert keys(loaded, order_by='-shapes') == [0, 3, 4, 1]
@@ -0,0 +1,72 @@
+from bonkbot.tools import MapGenerator, MapSimilarityIndex, MapTemplate
+from bonkbot.types.map import BonkMap
+
+TEMPLATE = MapTemplate(platforms=(20, 20))
+
+
+def generate(seed: int) -> 'BonkMap':
+    return MapGenerator(TEMPLATE).generate(seed)
+
+
+def remix(bonk_map: 'BonkMap') -> 'BonkMap':
+    remixed = BonkMap.decode_from_database(bonk_map.encode_to_database())
+    remixed.metadata.name = 'remix'
+    remixed.metadata.author = 'someone else'
+    # Nudges below the grid keep most descriptors, one platform moves for real.
+    for body in remixed.physics.bodies:
+        body.position = (body.position[0] + 1.0, body.position[1] - 1.0)
+    x, y = remixed.physics.bodies[0].position
+    remixed.physics.bodies[0].position = (x + 120.0, y)
+    return remixed
+
+
+def make_index() -> 'MapSimilarityIndex':
+    index = MapSimilarityIndex()
+    for seed in range(1, 21):
+        index.add(seed, generate(seed))
+    return index
+
+
+def test_near_duplicate_is_found() -> None:
+    index = make_index()
+    matches = index.query(remix(generate(7)), threshold=0.5)
+    assert matches
+    key, similarity = matches[0]
+    assert key == 7
+    assert similarity >= 0.6
+    assert all(other == 7 for other, _ in matches)
+
+
+def test_identical_map_matches_exactly() -> None:
+    index = make_index()
+    assert index.query(generate(3), limit=1) == [(3, 1.0)]
+    assert index.get_signature(3).similarity(index.signature(generate(3))) == 1.0
+
+
+def test_unrelated_maps_are_not_found() -> None:
+    index = make_index()
+    for seed in range(100, 110):
+        assert index.query(generate(seed), threshold=0.5) == []
+
+
+def test_remove_and_replace() -> None:
+    index = make_index()
+    assert len(index) == 20
+    index.remove(7)
+    assert 7 not in index
+    assert index.query(generate(7)) == []
+    # Adding under an existing key replaces the map.
+    index.add(8, generate(7))
+    assert len(index) == 19
+    assert index.query(generate(7), limit=1) == [(8, 1.0)]
+    assert index.query(generate(8)) == []
+
+
+def test_empty_maps() -> None:
+    index = MapSimilarityIndex()
+    empty = BonkMap()
+    empty.spawns = []
+    signature = index.signature(empty)
+    assert signature.shingles == 0
+    assert signature.similarity(index.signature(empty)) == 1.0
+    assert signature.similarity(index.signature(generate(1))) == 0.0
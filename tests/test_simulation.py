@@ -0,0 +1,89 @@
+import random
+from typing import Dict
+
+import pytest
+
+from bonkbot.simulation import TIME_STEP, Simulation, SimulationState
+from bonkbot.simulation.simulation import GRAVITY, PLAYER_RADIUS
+from bonkbot.tools import MapGenerator, MapTemplate
+from bonkbot.types.map import BonkMap
+
+PLAYERS = 4
+FRAMES = 150
+
+
+def make_simulation(seed: int = 1) -> 'Simulation':
+    template = MapTemplate(spawns_per_team=PLAYERS)
+    return Simulation(MapGenerator(template).generate(seed))
+
+
+def random_inputs(seed: int) -> Dict[int, Dict[int, int]]:
+    rng = random.Random(seed)
+    return {
+        frame: {player_id: rng.randrange(32) for player_id in range(PLAYERS)}
+        for frame in range(0, FRAMES, 7)
+    }
+
+
+def new_state(simulation: 'Simulation') -> 'SimulationState':
+    return simulation.new_state(dict.fromkeys(range(PLAYERS), 1))
+
+
+def test_same_inputs_same_state() -> None:
+    simulation = make_simulation()
+    inputs = random_inputs(1)
+    first = simulation.run(new_state(simulation), FRAMES, inputs)
+    second = simulation.run(new_state(simulation), FRAMES, inputs)
+    assert first == second
+    assert first.frame == FRAMES
+
+    other = make_simulation()
+    assert other.run(new_state(other), FRAMES, inputs) == first
+
+
+def test_different_inputs_diverge() -> None:
+    simulation = make_simulation()
+    first = simulation.run(new_state(simulation), FRAMES, random_inputs(1))
+    second = simulation.run(new_state(simulation), FRAMES, random_inputs(2))
+    assert first != second
+
+
+def test_copy_continues_identically() -> None:
+    simulation = make_simulation(2)
+    inputs = random_inputs(3)
+    state = simulation.run(new_state(simulation), FRAMES // 2, inputs)
+    copied = state.copy()
+    simulation.run(state, FRAMES - FRAMES // 2, inputs)
+    simulation.run(copied, FRAMES - FRAMES // 2, inputs)
+    assert copied == state
+
+
+def test_candidates_match_linear_scan() -> None:
+    template = MapTemplate(platforms=(40, 40), spinners=(2, 2))
+    simulation = Simulation(MapGenerator(template).generate(4))
+    state = simulation.run(new_state(simulation), 20)
+    rng = random.Random(5)
+    min_x, min_y, max_x, max_y = simulation.kill_bounds
+    for _ in range(2000):
+        # Also past the kill bounds, where the grid clamps to its border cells.
+        x = rng.uniform(min_x - 20, max_x + 20)
+        y = rng.uniform(min_y - 20, max_y + 20)
+        expected = [
+            collider
+            for collider in simulation.colliders
+            if collider.body == -1
+            and x + PLAYER_RADIUS >= collider.aabb[0]
+            and x - PLAYER_RADIUS <= collider.aabb[2]
+            and y + PLAYER_RADIUS >= collider.aabb[1]
+            and y - PLAYER_RADIUS <= collider.aabb[3]
+        ]
+        found = simulation.candidates(state, x, y)
+        assert [collider for collider in found if collider.body == -1] == expected
+
+
+def test_falls_with_gravity() -> None:
+    simulation = Simulation(BonkMap())
+    state = simulation.new_state({0: 1})
+    simulation.run(state, 10)
+    assert state.vy[0] == pytest.approx(GRAVITY * TIME_STEP * 10)
+    assert state.vx[0] == 0